@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Dict, Type, TypeVar, Generic
+from typing import Dict, Type, TypeVar, Generic, Union
 
 from repositories.repository import Repository
 from repositories.patient_repository import PatientRepository
@@ -10,11 +10,38 @@ from repositories.inmemory.inmemory_patient_repository import InMemoryPatientRep
 from repositories.inmemory.inmemory_doctor_repository import InMemoryDoctorRepository
 from repositories.inmemory.inmemory_appointment_repository import InMemoryAppointmentRepository
 
+from repositories.inmemory.sharded_patient_repository import ShardedInMemoryPatientRepository
+from repositories.inmemory.sharded_doctor_repository import ShardedInMemoryDoctorRepository
+from repositories.inmemory.sharded_appointment_repository import ShardedInMemoryAppointmentRepository
+
+from repositories.filesystem.filesystem_patient_repository import FileSystemPatientRepository
+from repositories.filesystem.filesystem_doctor_repository import FileSystemDoctorRepository
+from repositories.filesystem.filesystem_appointment_repository import FileSystemAppointmentRepository
+
+from repositories.database.database_patient_repository import DatabasePatientRepository
+from repositories.database.database_doctor_repository import DatabaseDoctorRepository
+from repositories.database.database_appointment_repository import DatabaseAppointmentRepository
+
+from repositories.sharedmemory.sharedmemory_appointment_repository import SharedMemoryAppointmentRepository
+
+from repositories.async_repository import AsyncRepository
+from repositories.aio.async_patient_repository import (
+    AsyncInMemoryPatientRepository, AsyncFileSystemPatientRepository, AsyncDatabasePatientRepository
+)
+from repositories.aio.async_doctor_repository import (
+    AsyncInMemoryDoctorRepository, AsyncFileSystemDoctorRepository, AsyncDatabaseDoctorRepository
+)
+from repositories.aio.async_appointment_repository import (
+    AsyncInMemoryAppointmentRepository, AsyncFileSystemAppointmentRepository, AsyncDatabaseAppointmentRepository
+)
+
 # Define storage types
 class StorageType(Enum):
     MEMORY = "MEMORY"
+    SHARDED_MEMORY = "SHARDED_MEMORY"
     DATABASE = "DATABASE"
     FILE_SYSTEM = "FILE_SYSTEM"
+    SHARED_MEMORY = "SHARED_MEMORY"
 
 # Type variable for repository interfaces
 R = TypeVar('R', bound=Repository)
@@ -29,32 +56,54 @@ class RepositoryFactory:
     _repository_mappings: Dict[Type[R], Dict[StorageType, Type[R]]] = {
         PatientRepository: {
             StorageType.MEMORY: InMemoryPatientRepository,
-            # Future implementations will be added here
-            # StorageType.DATABASE: DatabasePatientRepository,
-            # StorageType.FILE_SYSTEM: FileSystemPatientRepository,
+            StorageType.SHARDED_MEMORY: ShardedInMemoryPatientRepository,
+            StorageType.FILE_SYSTEM: FileSystemPatientRepository,
+            StorageType.DATABASE: DatabasePatientRepository,
         },
         DoctorRepository: {
             StorageType.MEMORY: InMemoryDoctorRepository,
-            # Future implementations will be added here
-            # StorageType.DATABASE: DatabaseDoctorRepository,
-            # StorageType.FILE_SYSTEM: FileSystemDoctorRepository,
+            StorageType.SHARDED_MEMORY: ShardedInMemoryDoctorRepository,
+            StorageType.FILE_SYSTEM: FileSystemDoctorRepository,
+            StorageType.DATABASE: DatabaseDoctorRepository,
         },
         AppointmentRepository: {
             StorageType.MEMORY: InMemoryAppointmentRepository,
-            # Future implementations will be added here
-            # StorageType.DATABASE: DatabaseAppointmentRepository,
-            # StorageType.FILE_SYSTEM: FileSystemAppointmentRepository,
+            StorageType.SHARDED_MEMORY: ShardedInMemoryAppointmentRepository,
+            StorageType.FILE_SYSTEM: FileSystemAppointmentRepository,
+            StorageType.DATABASE: DatabaseAppointmentRepository,
+            StorageType.SHARED_MEMORY: SharedMemoryAppointmentRepository,
+        },
+    }
+    
+    # Asyncio counterparts, keyed by the synchronous repository interface
+    _async_repository_mappings: Dict[Type[R], Dict[StorageType, Type[AsyncRepository]]] = {
+        PatientRepository: {
+            StorageType.MEMORY: AsyncInMemoryPatientRepository,
+            StorageType.FILE_SYSTEM: AsyncFileSystemPatientRepository,
+            StorageType.DATABASE: AsyncDatabasePatientRepository,
+        },
+        DoctorRepository: {
+            StorageType.MEMORY: AsyncInMemoryDoctorRepository,
+            StorageType.FILE_SYSTEM: AsyncFileSystemDoctorRepository,
+            StorageType.DATABASE: AsyncDatabaseDoctorRepository,
+        },
+        AppointmentRepository: {
+            StorageType.MEMORY: AsyncInMemoryAppointmentRepository,
+            StorageType.FILE_SYSTEM: AsyncFileSystemAppointmentRepository,
+            StorageType.DATABASE: AsyncDatabaseAppointmentRepository,
         },
     }
     
     @classmethod
-    def get_repository(cls, repository_interface: Type[R], storage_type: StorageType = StorageType.MEMORY, **kwargs) -> R:
+    def get_repository(cls, repository_interface: Type[R], storage_type: StorageType = StorageType.MEMORY,
+                       asynchronous: bool = False, **kwargs) -> Union[R, AsyncRepository]:
         """
         Get a repository instance for the specified interface and storage type.
         
         Args:
             repository_interface: The repository interface class
             storage_type: The storage type to use (default: MEMORY)
+            asynchronous: Whether to get the asyncio counterpart of the repository, whose methods are awaited
             **kwargs: Additional arguments to pass to the repository constructor
             
         Returns:
@@ -63,10 +112,11 @@ class RepositoryFactory:
         Raises:
             ValueError: If the repository interface or storage type is not supported
         """
-        if repository_interface not in cls._repository_mappings:
+        mappings = cls._async_repository_mappings if asynchronous else cls._repository_mappings
+        if repository_interface not in mappings:
             raise ValueError(f"Unsupported repository interface: {repository_interface.__name__}")
         
-        storage_mappings = cls._repository_mappings[repository_interface]
+        storage_mappings = mappings[repository_interface]
         if storage_type not in storage_mappings:
             raise ValueError(f"Unsupported storage type {storage_type} for {repository_interface.__name__}")
         
@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import List, Optional
+from repositories.aio.base_async_repository import BaseAsyncRepository
+from repositories.async_repository import AsyncAppointmentRepository
+from repositories.appointment_repository import AppointmentRepository
+from repositories.inmemory.inmemory_appointment_repository import InMemoryAppointmentRepository
+from repositories.filesystem.filesystem_appointment_repository import FileSystemAppointmentRepository
+from repositories.database.database_appointment_repository import DatabaseAppointmentRepository
+from repositories.paging import Page
+from src.appointment import Appointment
+from src.enums import AppointmentStatus, AppointmentType
+
+class AsyncAppointmentRepositoryAdapter(BaseAsyncRepository[Appointment, str], AsyncAppointmentRepository):
+    """
+    Implementation of the AsyncAppointmentRepository interface over a
+    synchronous AppointmentRepository.
+    """
+    
+    def __init__(self, repository: AppointmentRepository, max_workers: int = 0):
+        """
+        Initialize the repository.
+        
+        Args:
+            repository: The synchronous repository to call
+            max_workers: The number of worker threads, or 0 to call the repository on the event loop
+        """
+        super().__init__(repository, max_workers)
+    
+    async def find_by_patient_id(self, patient_id: str) -> List[Appointment]:
+        """Find appointments by patient ID."""
+        return await self._run(self._repository.find_by_patient_id, patient_id)
+    
+    async def find_by_doctor_id(self, doctor_id: str) -> List[Appointment]:
+        """Find appointments by doctor ID."""
+        return await self._run(self._repository.find_by_doctor_id, doctor_id)
+    
+    async def find_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Appointment]:
+        """Find appointments within a date range, ordered by date/time."""
+        return await self._run(self._repository.find_by_date_range, start_date, end_date)
+    
+    async def find_overlapping(self, doctor_id: str, start: datetime, end: datetime) -> List[Appointment]:
+        """Find a doctor's non-cancelled appointments overlapping the interval [start, end)."""
+        return await self._run(self._repository.find_overlapping, doctor_id, start, end)
+    
+    async def find_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False,
+                        status: Optional[AppointmentStatus] = None,
+                        appointment_type: Optional[AppointmentType] = None,
+                        start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None) -> Page[Appointment]:
+        """
+        Find one page of appointments ordered by date/time, then by ID.
+        
+        Raises:
+            ValueError: If the limit is not positive or the cursor is invalid
+        """
+        return await self._run(self._repository.find_page, limit, cursor, descending,
+                               status, appointment_type, start_date, end_date)
+
+class AsyncInMemoryAppointmentRepository(AsyncAppointmentRepositoryAdapter):
+    """
+    Asyncio in-memory appointment repository, called directly on the event loop.
+    """
+    
+    def __init__(self):
+        """Initialize the in-memory storage."""
+        super().__init__(InMemoryAppointmentRepository())
+
+class AsyncFileSystemAppointmentRepository(AsyncAppointmentRepositoryAdapter):
+    """
+    Asyncio file system appointment repository. The log file is read and
+    written on one dedicated thread, like aiofiles does.
+    """
+    
+    def __init__(self, file_path: str, compaction_threshold: int = 10000, fsync: bool = True):
+        """
+        Load the stored appointments and start the file thread.
+        
+        Args:
+            file_path: Path to the JSON file for storing appointments
+            compaction_threshold: Number of logged mutations that triggers compaction
+            fsync: Whether each mutation is flushed to disk before returning
+        """
+        super().__init__(FileSystemAppointmentRepository(file_path, compaction_threshold, fsync), max_workers=1)
+
+class AsyncDatabaseAppointmentRepository(AsyncAppointmentRepositoryAdapter):
+    """
+    Asyncio SQLite appointment repository. Queries run on worker threads using
+    the database's connection pool, like aiosqlite does, so several can be
+    in progress at once.
+    """
+    
+    def __init__(self, database_path: str, max_workers: int = 4):
+        """
+        Initialize the repository and create its table if needed.
+        
+        Args:
+            database_path: Path or "file:" URI of the SQLite database
+            max_workers: The number of queries that may run at once
+        """
+        super().__init__(DatabaseAppointmentRepository(database_path), max_workers)
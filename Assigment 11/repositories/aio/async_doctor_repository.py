@@ -0,0 +1,75 @@
+from typing import List, Optional
+from repositories.aio.base_async_repository import BaseAsyncRepository
+from repositories.async_repository import AsyncDoctorRepository
+from repositories.doctor_repository import DoctorRepository
+from repositories.inmemory.inmemory_doctor_repository import InMemoryDoctorRepository
+from repositories.filesystem.filesystem_doctor_repository import FileSystemDoctorRepository
+from repositories.database.database_doctor_repository import DatabaseDoctorRepository
+from src.doctor import Doctor
+
+class AsyncDoctorRepositoryAdapter(BaseAsyncRepository[Doctor, str], AsyncDoctorRepository):
+    """
+    Implementation of the AsyncDoctorRepository interface over a
+    synchronous DoctorRepository.
+    """
+    
+    def __init__(self, repository: DoctorRepository, max_workers: int = 0):
+        """
+        Initialize the repository.
+        
+        Args:
+            repository: The synchronous repository to call
+            max_workers: The number of worker threads, or 0 to call the repository on the event loop
+        """
+        super().__init__(repository, max_workers)
+    
+    async def find_by_specialization(self, specialization: str) -> List[Doctor]:
+        """Find doctors by their specialization."""
+        return await self._run(self._repository.find_by_specialization, specialization)
+    
+    async def find_by_name(self, name: str, limit: Optional[int] = None) -> List[Doctor]:
+        """Find doctors whose name contains the given text, best matches first."""
+        return await self._run(self._repository.find_by_name, name, limit)
+
+class AsyncInMemoryDoctorRepository(AsyncDoctorRepositoryAdapter):
+    """
+    Asyncio in-memory doctor repository, called directly on the event loop.
+    """
+    
+    def __init__(self):
+        """Initialize the in-memory storage."""
+        super().__init__(InMemoryDoctorRepository())
+
+class AsyncFileSystemDoctorRepository(AsyncDoctorRepositoryAdapter):
+    """
+    Asyncio file system doctor repository. The log file is read and
+    written on one dedicated thread, like aiofiles does.
+    """
+    
+    def __init__(self, file_path: str, compaction_threshold: int = 10000, fsync: bool = True):
+        """
+        Load the stored doctors and start the file thread.
+        
+        Args:
+            file_path: Path to the JSON file for storing doctors
+            compaction_threshold: Number of logged mutations that triggers compaction
+            fsync: Whether each mutation is flushed to disk before returning
+        """
+        super().__init__(FileSystemDoctorRepository(file_path, compaction_threshold, fsync), max_workers=1)
+
+class AsyncDatabaseDoctorRepository(AsyncDoctorRepositoryAdapter):
+    """
+    Asyncio SQLite doctor repository. Queries run on worker threads using
+    the database's connection pool, like aiosqlite does, so several can be
+    in progress at once.
+    """
+    
+    def __init__(self, database_path: str, max_workers: int = 4):
+        """
+        Initialize the repository and create its table if needed.
+        
+        Args:
+            database_path: Path or "file:" URI of the SQLite database
+            max_workers: The number of queries that may run at once
+        """
+        super().__init__(DatabaseDoctorRepository(database_path), max_workers)
@@ -0,0 +1,75 @@
+from typing import List, Optional
+from repositories.aio.base_async_repository import BaseAsyncRepository
+from repositories.async_repository import AsyncPatientRepository
+from repositories.patient_repository import PatientRepository
+from repositories.inmemory.inmemory_patient_repository import InMemoryPatientRepository
+from repositories.filesystem.filesystem_patient_repository import FileSystemPatientRepository
+from repositories.database.database_patient_repository import DatabasePatientRepository
+from src.patient import Patient
+
+class AsyncPatientRepositoryAdapter(BaseAsyncRepository[Patient, str], AsyncPatientRepository):
+    """
+    Implementation of the AsyncPatientRepository interface over a
+    synchronous PatientRepository.
+    """
+    
+    def __init__(self, repository: PatientRepository, max_workers: int = 0):
+        """
+        Initialize the repository.
+        
+        Args:
+            repository: The synchronous repository to call
+            max_workers: The number of worker threads, or 0 to call the repository on the event loop
+        """
+        super().__init__(repository, max_workers)
+    
+    async def find_by_email(self, email: str) -> Optional[Patient]:
+        """Find a patient by their email address, compared case-insensitively."""
+        return await self._run(self._repository.find_by_email, email)
+    
+    async def find_by_name(self, name: str, limit: Optional[int] = None) -> List[Patient]:
+        """Find patients whose name contains the given text, best matches first."""
+        return await self._run(self._repository.find_by_name, name, limit)
+
+class AsyncInMemoryPatientRepository(AsyncPatientRepositoryAdapter):
+    """
+    Asyncio in-memory patient repository, called directly on the event loop.
+    """
+    
+    def __init__(self):
+        """Initialize the in-memory storage."""
+        super().__init__(InMemoryPatientRepository())
+
+class AsyncFileSystemPatientRepository(AsyncPatientRepositoryAdapter):
+    """
+    Asyncio file system patient repository. The log file is read and
+    written on one dedicated thread, like aiofiles does.
+    """
+    
+    def __init__(self, file_path: str, compaction_threshold: int = 10000, fsync: bool = True):
+        """
+        Load the stored patients and start the file thread.
+        
+        Args:
+            file_path: Path to the JSON file for storing patients
+            compaction_threshold: Number of logged mutations that triggers compaction
+            fsync: Whether each mutation is flushed to disk before returning
+        """
+        super().__init__(FileSystemPatientRepository(file_path, compaction_threshold, fsync), max_workers=1)
+
+class AsyncDatabasePatientRepository(AsyncPatientRepositoryAdapter):
+    """
+    Asyncio SQLite patient repository. Queries run on worker threads using
+    the database's connection pool, like aiosqlite does, so several can be
+    in progress at once.
+    """
+    
+    def __init__(self, database_path: str, max_workers: int = 4):
+        """
+        Initialize the repository and create its table if needed.
+        
+        Args:
+            database_path: Path or "file:" URI of the SQLite database
+            max_workers: The number of queries that may run at once
+        """
+        super().__init__(DatabasePatientRepository(database_path), max_workers)
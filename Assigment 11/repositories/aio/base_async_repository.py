@@ -0,0 +1,108 @@
+import asyncio
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Generic, List, Optional, TypeVar
+from repositories.async_repository import AsyncRepository
+from repositories.paging import Page
+from repositories.repository import Repository
+
+T = TypeVar('T')  # Entity type
+ID = TypeVar('ID')  # ID type
+R = TypeVar('R')  # Result type
+
+# Number of entities fetched per trip to a worker thread by iter_all()
+ITER_BATCH_SIZE = 500
+
+class BaseAsyncRepository(AsyncRepository[T, ID], Generic[T, ID]):
+    """
+    Implementation of the AsyncRepository interface over a synchronous
+    repository.
+    
+    Without worker threads the repository is called directly on the event
+    loop, which suits in-memory storage that never waits for I/O. With
+    worker threads every call runs on one of them, the way aiosqlite and
+    aiofiles run SQLite and file calls, so storage doing disk I/O never
+    blocks the loop and concurrent requests overlap their I/O.
+    
+    Entity repositories combine this class with their async interface and
+    forward their entity-specific finders through _run().
+    """
+    
+    def __init__(self, repository: Repository[T, ID], max_workers: int = 0):
+        """
+        Initialize the repository.
+        
+        Args:
+            repository: The synchronous repository to call
+            max_workers: The number of worker threads, or 0 to call the repository on the event loop
+        """
+        self._repository = repository
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if max_workers:
+            self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix=type(self).__name__)
+    
+    async def save(self, entity: T) -> None:
+        """
+        Save an entity.
+        
+        Raises:
+            ConcurrentModificationError: If the stored entity has a different version
+        """
+        await self._run(self._repository.save, entity)
+    
+    async def find_by_id(self, id: ID) -> Optional[T]:
+        """Find an entity by its ID."""
+        return await self._run(self._repository.find_by_id, id)
+    
+    async def find_all(self) -> List[T]:
+        """Find all entities."""
+        return await self._run(self._repository.find_all)
+    
+    async def iter_all(self) -> AsyncIterator[T]:
+        """Iterate over all entities, fetching ITER_BATCH_SIZE at a time from a worker thread."""
+        if self._executor is None:
+            for entity in self._repository.iter_all():
+                yield entity
+            return
+        iterator = await self._run(self._repository.iter_all)
+        try:
+            while True:
+                batch = await self._run(list, itertools.islice(iterator, ITER_BATCH_SIZE))
+                for entity in batch:
+                    yield entity
+                if len(batch) < ITER_BATCH_SIZE:
+                    return
+        finally:
+            # Release what a database cursor holds if iteration stopped early
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                await self._run(close)
+    
+    async def find_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False) -> Page[T]:
+        """
+        Find one page of entities ordered by ID.
+        
+        Raises:
+            ValueError: If the limit is not positive or the cursor is invalid
+        """
+        return await self._run(self._repository.find_page, limit, cursor, descending)
+    
+    async def delete(self, id: ID) -> None:
+        """Delete an entity by its ID."""
+        await self._run(self._repository.delete, id)
+    
+    async def close(self) -> None:
+        """Close the synchronous repository, if it holds resources, and stop the worker threads."""
+        close = getattr(self._repository, "close", None)
+        if close is not None:
+            await self._run(close)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+    
+    async def _run(self, function: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """Call a function of the synchronous repository, on a worker thread if there are any."""
+        if self._executor is None:
+            return function(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
@@ -1,7 +1,9 @@
 from typing import Optional, List
 from datetime import datetime
 from repositories.repository import Repository
+from repositories.paging import Page
 from src.appointment import Appointment
+from src.enums import AppointmentStatus, AppointmentType
 
 class AppointmentRepository(Repository[Appointment, str]):
     """
@@ -45,3 +47,43 @@ class AppointmentRepository(Repository[Appointment, str]):
             A list of appointments within the specified date range
         """
         pass
+    
+    def find_overlapping(self, doctor_id: str, start: datetime, end: datetime) -> List[Appointment]:
+        """
+        Find a doctor's non-cancelled appointments overlapping a time interval.
+        
+        Args:
+            doctor_id: The doctor ID to search for
+            start: The inclusive start of the interval
+            end: The exclusive end of the interval
+            
+        Returns:
+            A list of appointments occupying part of [start, end)
+        """
+        pass
+    
+    def find_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False,
+                  status: Optional[AppointmentStatus] = None,
+                  appointment_type: Optional[AppointmentType] = None,
+                  start_date: Optional[datetime] = None,
+                  end_date: Optional[datetime] = None) -> Page[Appointment]:
+        """
+        Find one page of appointments ordered by date/time, then by ID,
+        optionally filtered by status, type and an inclusive date window.
+        
+        Args:
+            limit: The maximum number of appointments on the page
+            cursor: The next_cursor of the previous page, or None for the first page
+            descending: Whether to order from the latest appointment
+            status: Only include appointments with this status
+            appointment_type: Only include appointments of this type
+            start_date: Only include appointments at or after this date/time
+            end_date: Only include appointments at or before this date/time
+            
+        Returns:
+            The page of appointments
+            
+        Raises:
+            ValueError: If the limit is not positive or the cursor is invalid
+        """
+        pass
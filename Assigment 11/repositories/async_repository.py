@@ -0,0 +1,156 @@
+from datetime import datetime
+from typing import AsyncIterator, Generic, List, Optional, TypeVar
+from repositories.paging import Page
+from src.appointment import Appointment
+from src.doctor import Doctor
+from src.enums import AppointmentStatus, AppointmentType
+from src.patient import Patient
+
+# Type variables for generic repository
+T = TypeVar('T')  # Entity type
+ID = TypeVar('ID')  # ID type
+
+class AsyncRepository(Generic[T, ID]):
+    """
+    Generic asyncio repository interface, the awaitable counterpart of
+    Repository for code running on an event loop.
+    
+    Implementations never block the event loop: storage doing I/O runs it
+    off the loop, so many concurrent requests can overlap their I/O.
+    """
+    
+    async def save(self, entity: T) -> None:
+        """
+        Create or update an entity in the repository.
+        
+        Args:
+            entity: The entity to save
+        
+        Raises:
+            ConcurrentModificationError: If the entity was changed and saved by someone else since it was read
+        """
+        pass
+    
+    async def find_by_id(self, id: ID) -> Optional[T]:
+        """
+        Find an entity by its ID.
+        
+        Args:
+            id: The ID of the entity to find
+        
+        Returns:
+            The entity if found, None otherwise
+        """
+        pass
+    
+    async def find_all(self) -> List[T]:
+        """
+        Find all entities in the repository.
+        
+        Returns:
+            A list of all entities
+        """
+        pass
+    
+    def iter_all(self) -> AsyncIterator[T]:
+        """
+        Iterate over all entities without building a list of them.
+        
+        Returns:
+            An async iterator over all entities
+        """
+        pass
+    
+    async def find_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False) -> Page[T]:
+        """
+        Find one page of entities ordered by ID.
+        
+        Args:
+            limit: The maximum number of entities on the page
+            cursor: The next_cursor of the previous page, or None for the first page
+            descending: Whether to order by descending ID
+        
+        Returns:
+            The page of entities
+        
+        Raises:
+            ValueError: If the limit is not positive or the cursor is invalid
+        """
+        pass
+    
+    async def delete(self, id: ID) -> None:
+        """
+        Delete an entity by its ID.
+        
+        Args:
+            id: The ID of the entity to delete
+        """
+        pass
+    
+    async def close(self) -> None:
+        """Release the files, connections and threads held by the repository."""
+        pass
+
+class AsyncPatientRepository(AsyncRepository[Patient, str]):
+    """
+    Asyncio repository interface for Patient entities, the awaitable
+    counterpart of PatientRepository.
+    """
+    
+    async def find_by_email(self, email: str) -> Optional[Patient]:
+        """Find a patient by their email address, compared case-insensitively."""
+        pass
+    
+    async def find_by_name(self, name: str, limit: Optional[int] = None) -> List[Patient]:
+        """Find patients whose name contains the given text, best matches first."""
+        pass
+
+class AsyncDoctorRepository(AsyncRepository[Doctor, str]):
+    """
+    Asyncio repository interface for Doctor entities, the awaitable
+    counterpart of DoctorRepository.
+    """
+    
+    async def find_by_specialization(self, specialization: str) -> List[Doctor]:
+        """Find doctors by their specialization."""
+        pass
+    
+    async def find_by_name(self, name: str, limit: Optional[int] = None) -> List[Doctor]:
+        """Find doctors whose name contains the given text, best matches first."""
+        pass
+
+class AsyncAppointmentRepository(AsyncRepository[Appointment, str]):
+    """
+    Asyncio repository interface for Appointment entities, the awaitable
+    counterpart of AppointmentRepository.
+    """
+    
+    async def find_by_patient_id(self, patient_id: str) -> List[Appointment]:
+        """Find appointments by patient ID."""
+        pass
+    
+    async def find_by_doctor_id(self, doctor_id: str) -> List[Appointment]:
+        """Find appointments by doctor ID."""
+        pass
+    
+    async def find_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Appointment]:
+        """Find appointments within a date range, ordered by date/time."""
+        pass
+    
+    async def find_overlapping(self, doctor_id: str, start: datetime, end: datetime) -> List[Appointment]:
+        """Find a doctor's non-cancelled appointments overlapping the interval [start, end)."""
+        pass
+    
+    async def find_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False,
+                        status: Optional[AppointmentStatus] = None,
+                        appointment_type: Optional[AppointmentType] = None,
+                        start_date: Optional[datetime] = None,
+                        end_date: Optional[datetime] = None) -> Page[Appointment]:
+        """
+        Find one page of appointments ordered by date/time, then by ID,
+        optionally filtered by status, type and an inclusive date window.
+        
+        Raises:
+            ValueError: If the limit is not positive or the cursor is invalid
+        """
+        pass
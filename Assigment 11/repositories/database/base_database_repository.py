@@ -0,0 +1,218 @@
+import sqlite3
+from typing import Any, Dict, Generic, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+from repositories.repository import Repository
+from repositories.database.connection_pool import ConnectionPool
+from repositories.indexes import fold_text
+from repositories.paging import Page, build_page, check_limit, decode_cursor
+
+T = TypeVar('T')  # Entity type
+ID = TypeVar('ID')  # ID type
+
+# Name search ranked like TextIndex.search: exact match, prefix match, word
+# prefix match, other match, then by position of the match and name
+NAME_SEARCH_CLAUSE = """
+    WHERE instr(fold(name), :query) > 0
+    ORDER BY
+        CASE
+            WHEN fold(name) = :query THEN 0
+            WHEN instr(fold(name), :query) = 1 THEN 1
+            WHEN instr(fold(name), ' ' || :query) > 0 THEN 2
+            ELSE 3
+        END,
+        instr(fold(name), :query),
+        fold(name)
+    LIMIT :limit
+"""
+
+class BaseDatabaseRepository(Repository[T, ID], Generic[T, ID]):
+    """
+    Base SQLite implementation of the Repository interface.
+    
+    Subclasses describe their table and map entities to and from rows. All
+    statements are constant parameterized SQL, so each pooled connection
+    compiles them once and reuses the prepared statements from its cache.
+    """
+    
+    # Table name, primary key column and ordered list of columns
+    _table: str = ''
+    _id_column: str = ''
+    _columns: Tuple[str, ...] = ()
+    # CREATE TABLE / CREATE INDEX IF NOT EXISTS statements
+    _schema: str = ''
+    
+    def __init__(self, database_path: str, pool: Optional[ConnectionPool] = None):
+        """
+        Initialize the repository and create its table and indexes if needed.
+        
+        Args:
+            database_path: Path or "file:" URI of the SQLite database
+            pool: Connection pool to use instead of the shared pool of the database,
+                which the caller closes
+        """
+        # Only a reference to the shared pool is given back on close()
+        self._shares_pool = pool is None
+        self._pool = pool if pool is not None else ConnectionPool.for_database(database_path)
+        self._save_sql = (
+            f"INSERT OR REPLACE INTO {self._table} ({', '.join(self._columns)}) "
+            f"VALUES ({', '.join('?' for _ in self._columns)})"
+        )
+        self._select_sql = f"SELECT {', '.join(self._columns)} FROM {self._table}"
+        # Keyset pagination clauses keyed by descending order
+        self._page_clauses = {
+            False: f"WHERE (:after IS NULL OR {self._id_column} > :after) "
+                   f"ORDER BY {self._id_column} LIMIT :limit",
+            True: f"WHERE (:after IS NULL OR {self._id_column} < :after) "
+                  f"ORDER BY {self._id_column} DESC LIMIT :limit"
+        }
+        with self._pool.transaction() as connection:
+            connection.executescript(self._schema)
+    
+    def save(self, entity: T) -> None:
+        """
+        Insert or replace an entity in the database.
+        
+        Args:
+            entity: The entity to save
+        """
+        row = self._entity_to_row(entity)
+        with self._pool.transaction() as connection:
+            connection.execute(self._save_sql, [row[column] for column in self._columns])
+    
+    def find_by_id(self, id: ID) -> Optional[T]:
+        """
+        Find an entity by its ID.
+        
+        Args:
+            id: The ID of the entity to find
+            
+        Returns:
+            The entity if found, None otherwise
+        """
+        entities = self._query(f"WHERE {self._id_column} = ?", (id,))
+        return entities[0] if entities else None
+    
+    def find_all(self) -> List[T]:
+        """
+        Find all entities in the repository.
+        
+        Returns:
+            A list of all entities
+        """
+        return self._query("", ())
+    
+    def iter_all(self, batch_size: int = 500) -> Iterator[T]:
+        """
+        Iterate over all entities, fetching them in pages by ID.
+        No connection is held between pages, so a slow consumer does not
+        keep a pooled connection busy.
+        
+        Args:
+            batch_size: The number of entities fetched per query
+            
+        Returns:
+            An iterator over all entities
+        """
+        cursor = None
+        while True:
+            page = self.find_page(batch_size, cursor)
+            yield from page.items
+            cursor = page.next_cursor
+            if cursor is None:
+                return
+    
+    def find_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False) -> Page[T]:
+        """
+        Find one page of entities ordered by ID, seeking through the primary key.
+        
+        Args:
+            limit: The maximum number of entities on the page
+            cursor: The next_cursor of the previous page, or None for the first page
+            descending: Whether to order by descending ID
+            
+        Returns:
+            The page of entities
+            
+        Raises:
+            ValueError: If the limit is not positive or the cursor is invalid
+        """
+        check_limit(limit)
+        after = decode_cursor(cursor, 1)[0] if cursor is not None else None
+        entities = self._query(self._page_clauses[descending], {'after': after, 'limit': limit + 1})
+        return build_page(entities, limit, lambda entity: (self._entity_to_row(entity)[self._id_column],))
+    
+    def delete(self, id: ID) -> None:
+        """
+        Delete an entity by its ID.
+        
+        Args:
+            id: The ID of the entity to delete
+        """
+        with self._pool.transaction() as connection:
+            connection.execute(f"DELETE FROM {self._table} WHERE {self._id_column} = ?", (id,))
+    
+    def _search_by_name(self, name: str, limit: Optional[int]) -> List[T]:
+        """
+        Select entities whose name column contains the given text, ignoring
+        case and accents, best matches first.
+        
+        Args:
+            name: The text to search for
+            limit: The maximum number of entities to return, or None for all
+            
+        Returns:
+            A list of the matching entities
+        """
+        return self._query(NAME_SEARCH_CLAUSE, {
+            'query': fold_text(name),
+            'limit': -1 if limit is None else limit
+        })
+    
+    def close(self) -> None:
+        """
+        Release the shared pool of the database, which is closed once no
+        other repository of the database uses it.
+        """
+        if self._shares_pool:
+            self._shares_pool = False
+            self._pool.release()
+    
+    def _query(self, clause: str, parameters: Union[Sequence[Any], Dict[str, Any]]) -> List[T]:
+        """
+        Select entities with a WHERE/ORDER BY clause appended to the base query.
+        
+        Args:
+            clause: The SQL following the FROM clause, using ? placeholders
+            parameters: The values bound to the placeholders, by position or name
+            
+        Returns:
+            A list of the matching entities
+        """
+        with self._pool.connection() as connection:
+            rows = connection.execute(f"{self._select_sql} {clause}", parameters).fetchall()
+        return [self._row_to_entity(row) for row in rows]
+    
+    def _entity_to_row(self, entity: T) -> Dict[str, Any]:
+        """
+        Map an entity to column values.
+        Must be overridden by subclasses.
+        
+        Args:
+            entity: The entity to map
+            
+        Returns:
+            The value of every column keyed by column name
+        """
+        raise NotImplementedError
+    
+    def _row_to_entity(self, row: sqlite3.Row) -> T:
+        """
+        Map a row to an entity.
+        Must be overridden by subclasses.
+        
+        Args:
+            row: The row selected from the table
+            
+        Returns:
+            The entity
+        """
+        raise NotImplementedError
@@ -0,0 +1,154 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+from repositories.indexes import fold_text
+
+class ConnectionPool:
+    """
+    Thread-safe pool of SQLite connections to one database.
+    
+    Connections are opened lazily up to the pool size and handed out to one
+    thread at a time, so concurrent requests do not share a connection and
+    each connection keeps its own prepared statement cache. Repositories
+    using the same database share one pool through for_database(), which
+    counts its users so that the pool is closed only by the last release().
+    """
+    
+    # Shared pools keyed by database path
+    _pools: Dict[str, 'ConnectionPool'] = {}
+    _pools_lock = threading.Lock()
+    
+    def __init__(self, database_path: str, size: int = 5, timeout: float = 30.0):
+        """
+        Initialize the pool.
+        
+        Args:
+            database_path: Path or "file:" URI of the SQLite database
+            size: Maximum number of open connections
+            timeout: Seconds to wait for a free connection or a database lock
+        """
+        self._database_path = database_path
+        self._size = size
+        self._timeout = timeout
+        self._idle: 'queue.LifoQueue[sqlite3.Connection]' = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        # Number of for_database() callers that have not released the pool
+        self._references = 0
+    
+    @classmethod
+    def for_database(cls, database_path: str, size: int = 5) -> 'ConnectionPool':
+        """
+        Get the shared pool of a database, creating it on first use. Every
+        call must be paired with a call to release() on the pool.
+        
+        Args:
+            database_path: Path or "file:" URI of the SQLite database
+            size: Maximum number of open connections if the pool is created
+            
+        Returns:
+            The pool for the database
+        """
+        with cls._pools_lock:
+            pool = cls._pools.get(database_path)
+            if pool is None:
+                pool = cls(database_path, size)
+                cls._pools[database_path] = pool
+            pool._references += 1
+        return pool
+    
+    def release(self) -> None:
+        """Give back a reference taken by for_database(), closing the pool after the last one."""
+        with ConnectionPool._pools_lock:
+            self._references -= 1
+            last = self._references <= 0
+            if last and ConnectionPool._pools.get(self._database_path) is self:
+                del ConnectionPool._pools[self._database_path]
+        if last:
+            self.close()
+    
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection for the duration of a with block.
+        
+        Yields:
+            An open connection that no other thread is using
+            
+        Raises:
+            TimeoutError: If no connection becomes free within the timeout
+        """
+        connection = self._acquire()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+    
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection and run the with block in a transaction that is
+        committed on success and rolled back on error.
+        
+        Yields:
+            An open connection inside a transaction
+        """
+        with self.connection() as connection:
+            with connection:
+                yield connection
+    
+    def close(self) -> None:
+        """Close all idle connections and forget the shared pool of the database."""
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            connection.close()
+            with self._lock:
+                self._created -= 1
+        with ConnectionPool._pools_lock:
+            if ConnectionPool._pools.get(self._database_path) is self:
+                del ConnectionPool._pools[self._database_path]
+    
+    def _acquire(self) -> sqlite3.Connection:
+        """Take an idle connection, opening a new one while below the pool size."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            can_open = self._created < self._size
+            if can_open:
+                self._created += 1
+        if can_open:
+            try:
+                return self._open()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        
+        try:
+            return self._idle.get(timeout=self._timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No database connection available after {self._timeout} seconds")
+    
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection."""
+        connection = sqlite3.connect(
+            self._database_path,
+            timeout=self._timeout,
+            check_same_thread=False,
+            uri=self._database_path.startswith("file:")
+        )
+        connection.row_factory = sqlite3.Row
+        # Case- and accent-insensitive matching shared with the in-memory indexes
+        connection.create_function("fold", 1, fold_text, deterministic=True)
+        # Write-ahead logging lets readers proceed while another connection writes
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
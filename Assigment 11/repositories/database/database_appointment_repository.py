@@ -0,0 +1,207 @@
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from repositories.database.base_database_repository import BaseDatabaseRepository
+from repositories.appointment_repository import AppointmentRepository
+from repositories.paging import Page, build_page, check_limit, decode_cursor
+from src.appointment import Appointment
+from src.enums import AppointmentStatus, AppointmentType
+
+# Values sorting before and after every ISO date/time and appointment ID,
+# used as open bounds so the page queries stay constant and can seek
+# through the (date_time, appointment_id) index
+MIN_KEY = ''
+MAX_KEY = '\uffff'
+
+# Keyset pagination clauses keyed by descending order
+PAGE_CLAUSES = {
+    False: """
+        WHERE (date_time, appointment_id) > (:after_time, :after_id)
+          AND date_time BETWEEN :start_date AND :end_date
+          AND (:status IS NULL OR status = :status)
+          AND (:type IS NULL OR type = :type)
+        ORDER BY date_time, appointment_id
+        LIMIT :limit
+    """,
+    True: """
+        WHERE (date_time, appointment_id) < (:after_time, :after_id)
+          AND date_time BETWEEN :start_date AND :end_date
+          AND (:status IS NULL OR status = :status)
+          AND (:type IS NULL OR type = :type)
+        ORDER BY date_time DESC, appointment_id DESC
+        LIMIT :limit
+    """
+}
+
+class DatabaseAppointmentRepository(BaseDatabaseRepository[Appointment, str], AppointmentRepository):
+    """
+    SQLite implementation of the AppointmentRepository interface.
+    Date/times are stored as ISO 8601 text, which sorts chronologically, so
+    range queries are answered from the B-tree indexes.
+    """
+    
+    _table = 'appointments'
+    _id_column = 'appointment_id'
+    _columns = ('appointment_id', 'patient_id', 'doctor_id', 'date_time', 'end_time', 'duration',
+                'type', 'status', 'notes', 'created_at', 'updated_at')
+    _schema = """
+        CREATE TABLE IF NOT EXISTS appointments (
+            appointment_id TEXT PRIMARY KEY,
+            patient_id TEXT NOT NULL,
+            doctor_id TEXT NOT NULL,
+            date_time TEXT NOT NULL,
+            end_time TEXT NOT NULL,
+            duration INTEGER NOT NULL,
+            type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            notes TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_appointments_doctor_date_time ON appointments (doctor_id, date_time);
+        CREATE INDEX IF NOT EXISTS idx_appointments_patient_date_time ON appointments (patient_id, date_time);
+        CREATE INDEX IF NOT EXISTS idx_appointments_date_time_id ON appointments (date_time, appointment_id);
+        CREATE INDEX IF NOT EXISTS idx_appointments_doctor_end_time ON appointments (doctor_id, end_time);
+    """
+    
+    def find_by_patient_id(self, patient_id: str) -> List[Appointment]:
+        """
+        Find appointments by patient ID.
+        
+        Args:
+            patient_id: The patient ID to search for
+            
+        Returns:
+            A list of appointments for the specified patient, ordered by date/time
+        """
+        return self._query("WHERE patient_id = ? ORDER BY date_time", (patient_id,))
+    
+    def find_by_doctor_id(self, doctor_id: str) -> List[Appointment]:
+        """
+        Find appointments by doctor ID.
+        
+        Args:
+            doctor_id: The doctor ID to search for
+            
+        Returns:
+            A list of appointments for the specified doctor, ordered by date/time
+        """
+        return self._query("WHERE doctor_id = ? ORDER BY date_time", (doctor_id,))
+    
+    def find_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Appointment]:
+        """
+        Find appointments within a date range.
+        
+        Args:
+            start_date: The start date of the range
+            end_date: The end date of the range
+            
+        Returns:
+            A list of appointments within the specified date range, ordered by date/time
+        """
+        return self._query(
+            "WHERE date_time BETWEEN ? AND ? ORDER BY date_time",
+            (start_date.isoformat(), end_date.isoformat())
+        )
+    
+    def find_overlapping(self, doctor_id: str, start: datetime, end: datetime) -> List[Appointment]:
+        """
+        Find a doctor's non-cancelled appointments overlapping a time interval.
+        The (doctor_id, end_time) index limits the search to bookings ending
+        after the interval starts.
+        
+        Args:
+            doctor_id: The doctor ID to search for
+            start: The inclusive start of the interval
+            end: The exclusive end of the interval
+            
+        Returns:
+            A list of appointments occupying part of [start, end), ordered by date/time
+        """
+        return self._query(
+            "INDEXED BY idx_appointments_doctor_end_time "
+            "WHERE doctor_id = ? AND end_time > ? AND date_time < ? AND status != ? ORDER BY date_time",
+            (doctor_id, start.isoformat(), end.isoformat(), AppointmentStatus.CANCELLED.name)
+        )
+    
+    def find_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False,
+                  status: Optional[AppointmentStatus] = None,
+                  appointment_type: Optional[AppointmentType] = None,
+                  start_date: Optional[datetime] = None,
+                  end_date: Optional[datetime] = None) -> Page[Appointment]:
+        """
+        Find one page of appointments ordered by date/time, then by ID,
+        optionally filtered by status, type and an inclusive date window.
+        The cursor seeks directly into the (date_time, appointment_id) index.
+        
+        Args:
+            limit: The maximum number of appointments on the page
+            cursor: The next_cursor of the previous page, or None for the first page
+            descending: Whether to order from the latest appointment
+            status: Only include appointments with this status
+            appointment_type: Only include appointments of this type
+            start_date: Only include appointments at or after this date/time
+            end_date: Only include appointments at or before this date/time
+            
+        Returns:
+            The page of appointments
+            
+        Raises:
+            ValueError: If the limit is not positive or the cursor is invalid
+        """
+        check_limit(limit)
+        if cursor is not None:
+            after_time, after_id = decode_cursor(cursor, 2)
+        elif descending:
+            after_time, after_id = MAX_KEY, MAX_KEY
+        else:
+            after_time, after_id = MIN_KEY, MIN_KEY
+        appointments = self._query(PAGE_CLAUSES[descending], {
+            'after_time': after_time,
+            'after_id': after_id,
+            'start_date': start_date.isoformat() if start_date else MIN_KEY,
+            'end_date': end_date.isoformat() if end_date else MAX_KEY,
+            'status': status.name if status else None,
+            'type': appointment_type.name if appointment_type else None,
+            'limit': limit + 1
+        })
+        return build_page(
+            appointments, limit,
+            lambda appointment: (appointment.date_time.isoformat(), appointment.appointment_id)
+        )
+    
+    def _entity_to_row(self, appointment: Appointment) -> Dict[str, Any]:
+        """Map an appointment to column values."""
+        end_time = appointment.date_time + timedelta(minutes=appointment.duration)
+        return {
+            'appointment_id': appointment.appointment_id,
+            'patient_id': appointment.patient_id,
+            'doctor_id': appointment.doctor_id,
+            'date_time': appointment.date_time.isoformat(),
+            'end_time': end_time.isoformat(),
+            'duration': appointment.duration,
+            'type': appointment.type.name,
+            'status': appointment.status.name,
+            'notes': appointment.notes,
+            'created_at': appointment.created_at.isoformat(),
+            'updated_at': appointment.updated_at.isoformat()
+        }
+    
+    def _row_to_entity(self, row: sqlite3.Row) -> Appointment:
+        """Map a row to an appointment."""
+        appointment = Appointment(
+            appointment_id=row['appointment_id'],
+            patient_id=row['patient_id'],
+            doctor_id=row['doctor_id'],
+            date_time=datetime.fromisoformat(row['date_time']),
+            duration=row['duration'],
+            appointment_type=AppointmentType[row['type']],
+            status=AppointmentStatus[row['status']],
+            notes=row['notes']
+        )
+        
+        # Restore the audit timestamps set by the constructor
+        appointment._created_at = datetime.fromisoformat(row['created_at'])
+        appointment._updated_at = datetime.fromisoformat(row['updated_at'])
+        
+        return appointment
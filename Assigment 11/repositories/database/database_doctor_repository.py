@@ -0,0 +1,83 @@
+import sqlite3
+from typing import Any, Dict, List, Optional
+from repositories.database.base_database_repository import BaseDatabaseRepository
+from repositories.doctor_repository import DoctorRepository
+from src.doctor import Doctor
+from src.contact_info import ContactInfo
+
+class DatabaseDoctorRepository(BaseDatabaseRepository[Doctor, str], DoctorRepository):
+    """
+    SQLite implementation of the DoctorRepository interface.
+    """
+    
+    _table = 'doctors'
+    _id_column = 'doctor_id'
+    _columns = ('doctor_id', 'name', 'specialization', 'department', 'license_number', 'email', 'phone', 'address')
+    _schema = """
+        CREATE TABLE IF NOT EXISTS doctors (
+            doctor_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            specialization TEXT NOT NULL,
+            department TEXT,
+            license_number TEXT,
+            email TEXT,
+            phone TEXT,
+            address TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_doctors_specialization ON doctors (specialization);
+    """
+    
+    def find_by_specialization(self, specialization: str) -> List[Doctor]:
+        """
+        Find doctors by their specialization.
+        
+        Args:
+            specialization: The specialization to search for
+            
+        Returns:
+            A list of doctors with the specified specialization
+        """
+        return self._query("WHERE specialization = ?", (specialization,))
+    
+    def find_by_name(self, name: str, limit: Optional[int] = None) -> List[Doctor]:
+        """
+        Find doctors whose name contains the given text, ignoring case and accents.
+        
+        Args:
+            name: The name to search for
+            limit: The maximum number of doctors to return, or None for all
+            
+        Returns:
+            A list of doctors with matching names, best matches first
+        """
+        return self._search_by_name(name, limit)
+    
+    def _entity_to_row(self, doctor: Doctor) -> Dict[str, Any]:
+        """Map a doctor to column values."""
+        return {
+            'doctor_id': doctor.doctor_id,
+            'name': doctor.name,
+            'specialization': doctor.specialization,
+            'department': doctor.department,
+            'license_number': doctor.license_number,
+            'email': doctor.contact_info.email,
+            'phone': doctor.contact_info.phone,
+            'address': doctor.contact_info.address
+        }
+    
+    def _row_to_entity(self, row: sqlite3.Row) -> Doctor:
+        """Map a row to a doctor."""
+        contact_info = ContactInfo(
+            email=row['email'],
+            phone=row['phone'],
+            address=row['address']
+        )
+        
+        return Doctor(
+            doctor_id=row['doctor_id'],
+            name=row['name'],
+            specialization=row['specialization'],
+            department=row['department'],
+            license_number=row['license_number'],
+            contact_info=contact_info
+        )
@@ -0,0 +1,84 @@
+import sqlite3
+from datetime import date
+from typing import Any, Dict, List, Optional
+from repositories.database.base_database_repository import BaseDatabaseRepository
+from repositories.patient_repository import PatientRepository
+from src.patient import Patient
+from src.contact_info import ContactInfo
+
+class DatabasePatientRepository(BaseDatabaseRepository[Patient, str], PatientRepository):
+    """
+    SQLite implementation of the PatientRepository interface.
+    """
+    
+    _table = 'patients'
+    _id_column = 'patient_id'
+    _columns = ('patient_id', 'name', 'date_of_birth', 'medical_history_id', 'email', 'phone', 'address')
+    _schema = """
+        CREATE TABLE IF NOT EXISTS patients (
+            patient_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            date_of_birth TEXT,
+            medical_history_id TEXT,
+            email TEXT NOT NULL,
+            phone TEXT,
+            address TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_patients_email ON patients (email COLLATE NOCASE);
+    """
+    
+    def find_by_email(self, email: str) -> Optional[Patient]:
+        """
+        Find a patient by their email address, ignoring case.
+        
+        Args:
+            email: The email address to search for
+            
+        Returns:
+            The patient if found, None otherwise
+        """
+        patients = self._query("WHERE email = ? COLLATE NOCASE LIMIT 1", (email.strip(),))
+        return patients[0] if patients else None
+    
+    def find_by_name(self, name: str, limit: Optional[int] = None) -> List[Patient]:
+        """
+        Find patients whose name contains the given text, ignoring case and accents.
+        
+        Args:
+            name: The name to search for
+            limit: The maximum number of patients to return, or None for all
+            
+        Returns:
+            A list of patients with matching names, best matches first
+        """
+        return self._search_by_name(name, limit)
+    
+    def _entity_to_row(self, patient: Patient) -> Dict[str, Any]:
+        """Map a patient to column values."""
+        return {
+            'patient_id': patient.patient_id,
+            'name': patient.name,
+            'date_of_birth': patient.date_of_birth.isoformat() if patient.date_of_birth else None,
+            'medical_history_id': patient.medical_history_id,
+            'email': patient.email,
+            'phone': patient.phone,
+            'address': patient.address
+        }
+    
+    def _row_to_entity(self, row: sqlite3.Row) -> Patient:
+        """Map a row to a patient."""
+        contact_info = ContactInfo(
+            email=row['email'],
+            phone=row['phone'],
+            address=row['address']
+        )
+        
+        dob = date.fromisoformat(row['date_of_birth']) if row['date_of_birth'] else None
+        
+        return Patient(
+            patient_id=row['patient_id'],
+            name=row['name'],
+            date_of_birth=dob,
+            medical_history_id=row['medical_history_id'],
+            contact_info=contact_info
+        )
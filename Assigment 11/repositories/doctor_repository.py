@@ -20,14 +20,17 @@ class DoctorRepository(Repository[Doctor, str]):
         """
         pass
     
-    def find_by_name(self, name: str) -> List[Doctor]:
+    def find_by_name(self, name: str, limit: Optional[int] = None) -> List[Doctor]:
         """
-        Find doctors by their name.
+        Find doctors whose name contains the given text, ignoring case and accents.
+        Exact matches come first, then names starting with the text, then
+        names with a word starting with the text, then other matches.
         
         Args:
             name: The name to search for
+            limit: The maximum number of doctors to return, or None for all
             
         Returns:
-            A list of doctors with matching names
+            A list of doctors with matching names, best matches first
         """
         pass
@@ -0,0 +1,148 @@
+import json
+import os
+from typing import Dict, Iterable, Tuple
+
+class AppendOnlyLog:
+    """
+    Durable storage for JSON records based on a snapshot file plus a
+    write-ahead log of mutations.
+    
+    The snapshot is a JSON object mapping IDs to records. Every mutation is
+    appended to "<snapshot>.log" as one JSON line and fsync'd, so a write
+    costs one small append instead of rewriting every record. Once the log
+    has grown past the compaction threshold, the current records are written
+    to a new snapshot and the log is truncated.
+    """
+    
+    def __init__(self, file_path: str, compaction_threshold: int = 10000, fsync: bool = True):
+        """
+        Initialize the log storage.
+        
+        Args:
+            file_path: Path to the JSON snapshot file; the log lives next to it
+            compaction_threshold: Number of logged mutations that triggers compaction
+            fsync: Whether each append is flushed to disk before returning
+        """
+        self._file_path = file_path
+        self._log_path = file_path + ".log"
+        self._compaction_threshold = compaction_threshold
+        self._fsync = fsync
+        self._log_entries = 0
+        self._log_file = None
+        self._ensure_file_exists()
+    
+    @property
+    def needs_compaction(self) -> bool:
+        """Whether the log has grown past the compaction threshold."""
+        return self._log_entries >= self._compaction_threshold
+    
+    def load(self) -> Dict[str, Dict]:
+        """
+        Load all records by reading the snapshot and replaying the log.
+        A partially written last line, left by a crash during an append,
+        is discarded.
+        
+        Returns:
+            The current records keyed by ID
+        """
+        with open(self._file_path, 'r') as f:
+            try:
+                records = json.load(f)
+            except json.JSONDecodeError:
+                records = {}
+        
+        self._log_entries = 0
+        valid_length = 0
+        with open(self._log_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if entry['op'] == 'put':
+                    records[entry['id']] = entry['data']
+                else:
+                    records.pop(entry['id'], None)
+                valid_length += len(line)
+                self._log_entries += 1
+        
+        if valid_length < os.path.getsize(self._log_path):
+            with open(self._log_path, 'r+b') as f:
+                f.truncate(valid_length)
+        return records
+    
+    def append_put(self, id: str, record: Dict) -> None:
+        """
+        Log the creation or update of a record.
+        
+        Args:
+            id: The ID of the record
+            record: The record data
+        """
+        self._append({'op': 'put', 'id': id, 'data': record})
+    
+    def append_delete(self, id: str) -> None:
+        """
+        Log the deletion of a record.
+        
+        Args:
+            id: The ID of the deleted record
+        """
+        self._append({'op': 'delete', 'id': id})
+    
+    def compact(self, records: Iterable[Tuple[str, Dict]]) -> None:
+        """
+        Write the given records as the new snapshot and empty the log.
+        The snapshot is replaced atomically, and replaying the old log on
+        top of the new snapshot is harmless, so a crash at any point leaves
+        the data intact.
+        
+        Args:
+            records: The current (ID, record) pairs
+        """
+        temp_path = self._file_path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(dict(records), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self._file_path)
+        
+        self._close_log_file()
+        with open(self._log_path, 'wb') as f:
+            os.fsync(f.fileno())
+        self._log_entries = 0
+    
+    def close(self) -> None:
+        """Close the open log file handle."""
+        self._close_log_file()
+    
+    def _append(self, entry: Dict) -> None:
+        """Append one entry to the log."""
+        if self._log_file is None:
+            self._log_file = open(self._log_path, 'ab')
+        self._log_file.write(json.dumps(entry, separators=(',', ':')).encode('utf-8') + b"\n")
+        self._log_file.flush()
+        if self._fsync:
+            os.fsync(self._log_file.fileno())
+        self._log_entries += 1
+    
+    def _close_log_file(self) -> None:
+        """Close the log file handle if it is open."""
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+    
+    def _ensure_file_exists(self) -> None:
+        """Ensure the snapshot and log files exist."""
+        directory = os.path.dirname(self._file_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        
+        if not os.path.exists(self._file_path):
+            with open(self._file_path, 'w') as f:
+                json.dump({}, f)
+        
+        if not os.path.exists(self._log_path):
+            open(self._log_path, 'wb').close()
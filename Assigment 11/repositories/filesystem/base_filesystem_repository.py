@@ -0,0 +1,106 @@
+from typing import Dict, Generic, TypeVar
+from repositories.filesystem.append_only_log import AppendOnlyLog
+from repositories.inmemory.base_inmemory_repository import BaseInMemoryRepository
+
+T = TypeVar('T')  # Entity type
+ID = TypeVar('ID')  # ID type
+
+class BaseFileSystemRepository(BaseInMemoryRepository[T, ID], Generic[T, ID]):
+    """
+    Base file system implementation of the Repository interface.
+    Entities are held in memory, so reads never touch the disk, and every
+    mutation is appended to a write-ahead log that is periodically compacted
+    into a JSON snapshot file (see AppendOnlyLog).
+    
+    Entity repositories combine this class with their in-memory counterpart
+    so that they inherit its indexed query methods, and implement the
+    serialization hooks.
+    """
+    
+    def __init__(self, file_path: str, compaction_threshold: int = 10000, fsync: bool = True):
+        """
+        Initialize the file system repository and load the stored entities.
+        
+        Args:
+            file_path: Path to the JSON file for storing entities
+            compaction_threshold: Number of logged mutations that triggers compaction
+            fsync: Whether each mutation is flushed to disk before returning
+        """
+        super().__init__()
+        self._log = AppendOnlyLog(file_path, compaction_threshold, fsync)
+        for data in self._log.load().values():
+            super().save(self._deserialize_entity(data))
+        self._compact_if_needed()
+    
+    def save(self, entity: T) -> None:
+        """
+        Save an entity to the file system.
+        
+        Args:
+            entity: The entity to save
+            
+        Raises:
+            ConcurrentModificationError: If the stored entity has a different version
+        """
+        entity_id = self._get_entity_id(entity)
+        with self._lock:
+            # Check the version before logging, so a rejected save leaves no trace
+            self._check_version(entity_id, entity)
+            self._log.append_put(entity_id, self._serialize_entity(entity))
+            super().save(entity)
+            self._compact_if_needed()
+    
+    def delete(self, id: ID) -> None:
+        """
+        Delete an entity by its ID.
+        
+        Args:
+            id: The ID of the entity to delete
+        """
+        with self._lock:
+            if id in self._storage:
+                self._log.append_delete(id)
+                super().delete(id)
+                self._compact_if_needed()
+    
+    def compact(self) -> None:
+        """Rewrite the snapshot file from the current entities and empty the log."""
+        self._log.compact(
+            (entity_id, self._serialize_entity(entity))
+            for entity_id, entity in self._storage.items()
+        )
+    
+    def close(self) -> None:
+        """Release the open log file handle."""
+        self._log.close()
+    
+    def _compact_if_needed(self) -> None:
+        """Compact the log once it has grown past the threshold."""
+        if self._log.needs_compaction:
+            self.compact()
+    
+    def _serialize_entity(self, entity: T) -> Dict:
+        """
+        Serialize an entity to a JSON-compatible dictionary.
+        Must be overridden by subclasses.
+        
+        Args:
+            entity: The entity to serialize
+        
+        Returns:
+            The serialized entity
+        """
+        raise NotImplementedError
+    
+    def _deserialize_entity(self, data: Dict) -> T:
+        """
+        Deserialize an entity from a dictionary.
+        Must be overridden by subclasses.
+        
+        Args:
+            data: The serialized entity
+        
+        Returns:
+            The deserialized entity
+        """
+        raise NotImplementedError
@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import Dict
+from repositories.filesystem.base_filesystem_repository import BaseFileSystemRepository
+from repositories.inmemory.inmemory_appointment_repository import InMemoryAppointmentRepository
+from src.appointment import Appointment
+from src.enums import AppointmentStatus, AppointmentType
+
+class FileSystemAppointmentRepository(BaseFileSystemRepository[Appointment, str], InMemoryAppointmentRepository):
+    """
+    File system implementation of the AppointmentRepository interface.
+    Appointments are held in memory, together with the secondary indexes
+    of the in-memory repository, and persisted through an append-only log.
+    """
+    
+    def _serialize_entity(self, appointment: Appointment) -> Dict:
+        """Serialize an appointment to a dictionary."""
+        return {
+            'appointment_id': appointment.appointment_id,
+            'patient_id': appointment.patient_id,
+            'doctor_id': appointment.doctor_id,
+            'date_time': appointment.date_time.isoformat(),
+            'duration': appointment.duration,
+            'type': appointment.type.name,
+            'status': appointment.status.name,
+            'notes': appointment.notes,
+            'created_at': appointment.created_at.isoformat(),
+            'updated_at': appointment.updated_at.isoformat()
+        }
+    
+    def _deserialize_entity(self, data: Dict) -> Appointment:
+        """Deserialize an appointment from a dictionary."""
+        appointment = Appointment(
+            appointment_id=data['appointment_id'],
+            patient_id=data['patient_id'],
+            doctor_id=data['doctor_id'],
+            date_time=datetime.fromisoformat(data['date_time']),
+            duration=data['duration'],
+            appointment_type=AppointmentType[data['type']],
+            status=AppointmentStatus[data['status']],
+            notes=data['notes']
+        )
+        
+        # Restore the audit timestamps set by the constructor
+        appointment._created_at = datetime.fromisoformat(data['created_at'])
+        appointment._updated_at = datetime.fromisoformat(data['updated_at'])
+        
+        return appointment
@@ -0,0 +1,43 @@
+from typing import Dict
+from repositories.filesystem.base_filesystem_repository import BaseFileSystemRepository
+from repositories.inmemory.inmemory_doctor_repository import InMemoryDoctorRepository
+from src.doctor import Doctor
+from src.contact_info import ContactInfo
+
+class FileSystemDoctorRepository(BaseFileSystemRepository[Doctor, str], InMemoryDoctorRepository):
+    """
+    File system implementation of the DoctorRepository interface.
+    Doctors are held in memory and persisted through an append-only log.
+    """
+    
+    def _serialize_entity(self, doctor: Doctor) -> Dict:
+        """Serialize a doctor to a dictionary."""
+        return {
+            'doctor_id': doctor.doctor_id,
+            'name': doctor.name,
+            'specialization': doctor.specialization,
+            'department': doctor.department,
+            'license_number': doctor.license_number,
+            'contact_info': {
+                'email': doctor.contact_info.email,
+                'phone': doctor.contact_info.phone,
+                'address': doctor.contact_info.address
+            }
+        }
+    
+    def _deserialize_entity(self, data: Dict) -> Doctor:
+        """Deserialize a doctor from a dictionary."""
+        contact_info = ContactInfo(
+            email=data['contact_info']['email'],
+            phone=data['contact_info']['phone'],
+            address=data['contact_info']['address']
+        )
+        
+        return Doctor(
+            doctor_id=data['doctor_id'],
+            name=data['name'],
+            specialization=data['specialization'],
+            department=data['department'],
+            license_number=data['license_number'],
+            contact_info=contact_info
+        )
@@ -0,0 +1,359 @@
+import heapq
+import unicodedata
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Generic, Iterator, List, Optional, Set, Tuple, TypeVar
+
+K = TypeVar('K')  # Index key type
+ID = TypeVar('ID')  # ID type
+
+def fold_text(text: str) -> str:
+    """
+    Fold text for case- and accent-insensitive matching, so that
+    "José Peña" and "jose pena" compare equal.
+    
+    Args:
+        text: The text to fold
+    
+    Returns:
+        The text with accents removed and case folded
+    """
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+class HashIndex(Generic[K, ID]):
+    """
+    Secondary index mapping a key to the IDs of all entities sharing that key.
+    IDs are kept in insertion order so lookups return stable results.
+    """
+    
+    def __init__(self):
+        """Initialize an empty index."""
+        self._entries: Dict[K, Dict[ID, None]] = {}
+    
+    def add(self, key: K, id: ID) -> None:
+        """
+        Add an ID under the given key.
+        
+        Args:
+            key: The indexed value
+            id: The ID of the entity holding that value
+        """
+        self._entries.setdefault(key, {})[id] = None
+    
+    def remove(self, key: K, id: ID) -> None:
+        """
+        Remove an ID from the given key, dropping the key once it is empty.
+        
+        Args:
+            key: The indexed value
+            id: The ID of the entity holding that value
+        """
+        ids = self._entries.get(key)
+        if ids is None:
+            return
+        ids.pop(id, None)
+        if not ids:
+            del self._entries[key]
+    
+    def get(self, key: K) -> List[ID]:
+        """
+        Get the IDs stored under the given key.
+        
+        Args:
+            key: The indexed value to look up
+        
+        Returns:
+            A list of matching IDs, empty if the key is unknown
+        """
+        return list(self._entries.get(key, ()))
+    
+    def clear(self) -> None:
+        """Remove all entries from the index."""
+        self._entries.clear()
+
+class SortedIndex(Generic[K, ID]):
+    """
+    Secondary index keeping (key, ID) pairs sorted by key, then by ID.
+    Range queries and keyset scans locate their bounds with binary search.
+    """
+    
+    def __init__(self):
+        """Initialize an empty index."""
+        self._keys: List[K] = []
+        self._ids: List[ID] = []
+    
+    def add(self, key: K, id: ID) -> None:
+        """
+        Insert an ID at the position of its key.
+        
+        Args:
+            key: The indexed value
+            id: The ID of the entity holding that value
+        """
+        start = bisect_left(self._keys, key)
+        end = bisect_right(self._keys, key, start)
+        position = bisect_right(self._ids, id, start, end)
+        self._keys.insert(position, key)
+        self._ids.insert(position, id)
+    
+    def remove(self, key: K, id: ID) -> None:
+        """
+        Remove an ID previously added under the given key.
+        
+        Args:
+            key: The indexed value the ID was added with
+            id: The ID of the entity to remove
+        """
+        start = bisect_left(self._keys, key)
+        end = bisect_right(self._keys, key, start)
+        position = bisect_left(self._ids, id, start, end)
+        if position < end and self._ids[position] == id:
+            del self._keys[position]
+            del self._ids[position]
+    
+    def range(self, start: Any, end: Any) -> List[ID]:
+        """
+        Get the IDs whose key lies within an inclusive range, ordered by key.
+        
+        Args:
+            start: The lower bound of the range
+            end: The upper bound of the range
+        
+        Returns:
+            A list of IDs with start <= key <= end
+        """
+        lo = bisect_left(self._keys, start)
+        hi = bisect_right(self._keys, end, lo)
+        return self._ids[lo:hi]
+    
+    def scan(self, start: Any = None, end: Any = None, after: Optional[Tuple[K, ID]] = None,
+             descending: bool = False) -> Iterator[Tuple[K, ID]]:
+        """
+        Iterate over the (key, ID) pairs within an inclusive key range,
+        resuming after a given pair, for keyset pagination.
+        
+        Args:
+            start: The lower bound of the range, or None for no bound
+            end: The upper bound of the range, or None for no bound
+            after: The last (key, ID) pair already seen, or None to start at the beginning
+            descending: Whether to iterate from the largest key down
+        
+        Returns:
+            An iterator over (key, ID) pairs in scan order
+        """
+        lo = 0 if start is None else bisect_left(self._keys, start)
+        hi = len(self._keys) if end is None else bisect_right(self._keys, end)
+        if after is not None:
+            key, id = after
+            key_start = bisect_left(self._keys, key)
+            key_end = bisect_right(self._keys, key, key_start)
+            if descending:
+                hi = min(hi, bisect_left(self._ids, id, key_start, key_end))
+            else:
+                lo = max(lo, bisect_right(self._ids, id, key_start, key_end))
+        positions = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+        return ((self._keys[position], self._ids[position]) for position in positions)
+    
+    def clear(self) -> None:
+        """Remove all entries from the index."""
+        self._keys.clear()
+        self._ids.clear()
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+
+class IntervalIndex(Generic[K, ID]):
+    """
+    Secondary index of half-open [start, end) intervals grouped by key.
+    Intervals of each key are sorted by start, and the longest indexed span
+    bounds how far back an overlapping interval can start, so overlap
+    queries only inspect a small window found by binary search.
+    """
+    
+    def __init__(self):
+        """Initialize an empty index."""
+        self._starts: Dict[K, List[Any]] = {}
+        self._ends: Dict[K, List[Any]] = {}
+        self._ids: Dict[K, List[ID]] = {}
+        self._max_spans: Dict[K, Any] = {}
+    
+    def add(self, key: K, start: Any, end: Any, id: ID) -> None:
+        """
+        Add an interval under the given key.
+        
+        Args:
+            key: The key grouping the interval (e.g. a doctor ID)
+            start: The inclusive start of the interval
+            end: The exclusive end of the interval
+            id: The ID of the entity occupying the interval
+        """
+        starts = self._starts.setdefault(key, [])
+        position = bisect_right(starts, start)
+        starts.insert(position, start)
+        self._ends.setdefault(key, []).insert(position, end)
+        self._ids.setdefault(key, []).insert(position, id)
+        span = end - start
+        if key not in self._max_spans or span > self._max_spans[key]:
+            self._max_spans[key] = span
+    
+    def remove(self, key: K, start: Any, id: ID) -> None:
+        """
+        Remove an interval previously added under the given key.
+        
+        Args:
+            key: The key the interval was added under
+            start: The start the interval was added with
+            id: The ID of the entity occupying the interval
+        """
+        starts = self._starts.get(key)
+        if starts is None:
+            return
+        ids = self._ids[key]
+        lo = bisect_left(starts, start)
+        hi = bisect_right(starts, start, lo)
+        for position in range(lo, hi):
+            if ids[position] == id:
+                del starts[position]
+                del self._ends[key][position]
+                del ids[position]
+                break
+        if not starts:
+            del self._starts[key]
+            del self._ends[key]
+            del self._ids[key]
+            del self._max_spans[key]
+    
+    def overlapping(self, key: K, start: Any, end: Any) -> List[ID]:
+        """
+        Get the IDs of intervals under the given key that overlap [start, end).
+        
+        Args:
+            key: The key to search within
+            start: The inclusive start of the query interval
+            end: The exclusive end of the query interval
+        
+        Returns:
+            A list of IDs of overlapping intervals, ordered by start
+        """
+        starts = self._starts.get(key)
+        if starts is None:
+            return []
+        ends = self._ends[key]
+        ids = self._ids[key]
+        # An interval starting at or before start - max_span ends by start
+        lo = bisect_right(starts, start - self._max_spans[key])
+        hi = bisect_left(starts, end, lo)
+        return [ids[position] for position in range(lo, hi) if ends[position] > start]
+    
+    def clear(self) -> None:
+        """Remove all entries from the index."""
+        self._starts.clear()
+        self._ends.clear()
+        self._ids.clear()
+        self._max_spans.clear()
+
+class TextIndex(Generic[ID]):
+    """
+    Substring search index over short texts such as names.
+    
+    Texts are folded with fold_text() once when added, and every substring
+    of up to GRAM_SIZE characters is mapped to the IDs containing it. A
+    query of up to GRAM_SIZE characters is answered by a single lookup;
+    longer queries only verify the IDs listed under their rarest trigram.
+    Matches are ranked exact match first, then prefix matches, then matches
+    at the start of a word, then any other substring match.
+    """
+    
+    GRAM_SIZE = 3
+    
+    def __init__(self):
+        """Initialize an empty index."""
+        self._texts: Dict[ID, str] = {}
+        self._grams: Dict[str, Dict[ID, None]] = {}
+    
+    def add(self, id: ID, text: str) -> None:
+        """
+        Index the text of an entity, replacing any text indexed for it before.
+        
+        Args:
+            id: The ID of the entity
+            text: The text to index
+        """
+        folded = fold_text(text)
+        if self._texts.get(id) == folded:
+            return
+        self.remove(id)
+        self._texts[id] = folded
+        for gram in self._grams_of(folded):
+            self._grams.setdefault(gram, {})[id] = None
+    
+    def remove(self, id: ID) -> None:
+        """
+        Remove the text indexed for an entity.
+        
+        Args:
+            id: The ID of the entity
+        """
+        folded = self._texts.pop(id, None)
+        if folded is None:
+            return
+        for gram in self._grams_of(folded):
+            ids = self._grams[gram]
+            del ids[id]
+            if not ids:
+                del self._grams[gram]
+    
+    def search(self, query: str, limit: Optional[int] = None) -> List[ID]:
+        """
+        Get the IDs whose text contains the query, best matches first.
+        
+        Args:
+            query: The text to search for, matched ignoring case and accents
+            limit: The maximum number of IDs to return, or None for all
+        
+        Returns:
+            A list of matching IDs ordered by rank, position of the match
+            and text
+        """
+        folded = fold_text(query)
+        if not folded:
+            candidates = list(self._texts)
+        elif len(folded) <= self.GRAM_SIZE:
+            candidates = list(self._grams.get(folded, ()))
+        else:
+            postings = [self._grams.get(gram) for gram in self._grams_of(folded, self.GRAM_SIZE)]
+            if not all(postings):
+                return []
+            rarest = min(postings, key=len)
+            candidates = [id for id in rarest if folded in self._texts[id]]
+        
+        def rank(id: ID) -> Tuple[int, int, str]:
+            text = self._texts[id]
+            position = text.find(folded)
+            if text == folded:
+                return (0, position, text)
+            if position == 0:
+                return (1, position, text)
+            if (' ' + folded) in text:
+                return (2, position, text)
+            return (3, position, text)
+        
+        if limit is None:
+            return sorted(candidates, key=rank)
+        return heapq.nsmallest(limit, candidates, key=rank)
+    
+    def clear(self) -> None:
+        """Remove all entries from the index."""
+        self._texts.clear()
+        self._grams.clear()
+    
+    def __len__(self) -> int:
+        return len(self._texts)
+    
+    def _grams_of(self, text: str, min_size: int = 1) -> Set[str]:
+        """Get the distinct substrings of text from min_size up to GRAM_SIZE characters."""
+        return {
+            text[position:position + size]
+            for size in range(min_size, self.GRAM_SIZE + 1)
+            for position in range(len(text) - size + 1)
+        }
@@ -0,0 +1,137 @@
+import sys
+from array import array
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Tuple
+from src.appointment import Appointment
+from src.enums import AppointmentStatus, AppointmentType
+
+# Timestamps are stored as whole microseconds since this naive epoch
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+def to_epoch_micros(value: datetime) -> int:
+    """
+    Convert a naive datetime to microseconds since EPOCH.
+    
+    Raises:
+        ValueError: If the datetime is aware, since its time zone could not be stored
+    """
+    if value.utcoffset() is not None:
+        raise ValueError(f"Only naive datetimes can be stored, got {value.isoformat()}")
+    return (value - EPOCH) // MICROSECOND
+
+def from_epoch_micros(value: int) -> datetime:
+    """Convert microseconds since EPOCH back to a naive datetime."""
+    return EPOCH + timedelta(microseconds=value)
+
+class AppointmentTable(MutableMapping):
+    """
+    Columnar store of appointments, usable as the storage mapping of an
+    in-memory repository.
+    
+    Each field lives in its own column: timestamps and durations in packed
+    integer arrays, status and type as one-byte enum codes, and patient and
+    doctor IDs as interned strings shared by every row that references them.
+    A row takes about half the memory of an Appointment object with its
+    datetimes, and no per-row objects are left for the garbage collector.
+    index_values() reads the indexed fields of a row without building an
+    Appointment, so a repository does not need to keep its own copy of them.
+    
+    Rows are materialized into new Appointment objects on every read, so
+    changing a returned appointment does not change the table until it is
+    saved again.
+    """
+    
+    def __init__(self):
+        """Initialize the empty columns."""
+        self._rows: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._patient_ids: List[str] = []
+        self._doctor_ids: List[str] = []
+        self._notes: List[str] = []
+        self._date_times = array('q')
+        self._created_at = array('q')
+        self._updated_at = array('q')
+        self._durations = array('l')
+        self._versions = array('q')
+        self._statuses = array('B')
+        self._types = array('B')
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+    
+    def __contains__(self, appointment_id: object) -> bool:
+        return appointment_id in self._rows
+    
+    def __getitem__(self, appointment_id: str) -> Appointment:
+        """Materialize the appointment stored under an ID."""
+        row = self._rows[appointment_id]
+        appointment = Appointment(
+            appointment_id=self._ids[row],
+            patient_id=self._patient_ids[row],
+            doctor_id=self._doctor_ids[row],
+            date_time=from_epoch_micros(self._date_times[row]),
+            duration=self._durations[row],
+            appointment_type=AppointmentType(self._types[row]),
+            status=AppointmentStatus(self._statuses[row]),
+            notes=self._notes[row]
+        )
+        appointment._created_at = from_epoch_micros(self._created_at[row])
+        appointment._updated_at = from_epoch_micros(self._updated_at[row])
+        appointment._version = self._versions[row]
+        return appointment
+    
+    def __setitem__(self, appointment_id: str, appointment: Appointment) -> None:
+        """Store an appointment, overwriting the row of an existing ID in place."""
+        values = (
+            sys.intern(appointment.patient_id),
+            sys.intern(appointment.doctor_id),
+            appointment.notes,
+            to_epoch_micros(appointment.date_time),
+            to_epoch_micros(appointment.created_at),
+            to_epoch_micros(appointment.updated_at),
+            appointment.duration,
+            appointment.version,
+            appointment.status.value,
+            appointment.type.value
+        )
+        row = self._rows.get(appointment_id)
+        if row is None:
+            self._rows[appointment_id] = len(self._ids)
+            self._ids.append(appointment_id)
+            for column, value in zip(self._columns(), values):
+                column.append(value)
+        else:
+            for column, value in zip(self._columns(), values):
+                column[row] = value
+    
+    def __delitem__(self, appointment_id: str) -> None:
+        """Remove an appointment, moving the last row into its place."""
+        row = self._rows.pop(appointment_id)
+        last_id = self._ids.pop()
+        for column in self._columns():
+            last_value = column.pop()
+            if last_id != appointment_id:
+                column[row] = last_value
+        if last_id != appointment_id:
+            self._ids[row] = last_id
+            self._rows[last_id] = row
+    
+    def index_values(self, appointment_id: str) -> Tuple[str, str, int, int, AppointmentStatus]:
+        """
+        Get the doctor ID, patient ID, date/time in epoch microseconds,
+        duration and status stored under an ID.
+        """
+        row = self._rows[appointment_id]
+        return (self._doctor_ids[row], self._patient_ids[row], self._date_times[row],
+                self._durations[row], AppointmentStatus(self._statuses[row]))
+    
+    def _columns(self) -> tuple:
+        """Get the value columns in the order __setitem__ fills them."""
+        return (self._patient_ids, self._doctor_ids, self._notes, self._date_times,
+                self._created_at, self._updated_at, self._durations, self._versions,
+                self._statuses, self._types)
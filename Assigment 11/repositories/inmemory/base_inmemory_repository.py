@@ -1,5 +1,11 @@
-from typing import Generic, TypeVar, Dict, List, Optional
-from repositories.repository import Repository
+import copy
+import heapq
+import itertools
+import threading
+import uuid
+from typing import Generic, TypeVar, Dict, Iterator, List, Optional
+from repositories.repository import ConcurrentModificationError, Repository
+from repositories.paging import Page, build_page, check_limit, decode_cursor
 
 T = TypeVar('T')  # Entity type
 ID = TypeVar('ID')  # ID type
@@ -8,11 +14,30 @@ class BaseInMemoryRepository(Repository[T, ID], Generic[T, ID]):
     """
     Base in-memory implementation of the Repository interface.
     Uses a HashMap (dictionary) for storage.
+    
+    Saves are compare-and-set on the entity version: an entity read at
+    version n (n > 0) can only be saved while the stored version is still n,
+    and each save increments it. Entities at version 0 have never been
+    saved and are stored unconditionally.
+    
+    Entities are stored and handed out as copies, so every reader holds
+    the version it read even while another one changes and saves the same
+    entity, and changes only reach the storage through save().
     """
     
+    # Storage that builds a new entity on every read, such as a columnar
+    # table, turns copying off
+    _copy_entities = True
+    
     def __init__(self):
         """Initialize the in-memory storage."""
         self._storage: Dict[ID, T] = {}
+        # Makes the version check, the write and the index updates one step
+        self._lock = threading.RLock()
+        # Versions start over with the storage, so each instance is a new epoch
+        self._epoch = uuid.uuid4().hex[:12]
+        self._change_counter = itertools.count(1)
+        self._change_count = 0
     
     def save(self, entity: T) -> None:
         """
@@ -20,10 +45,24 @@ class BaseInMemoryRepository(Repository[T, ID], Generic[T, ID]):
         
         Args:
             entity: The entity to save
+            
+        Raises:
+            ConcurrentModificationError: If the stored entity has a different version
         """
         # We assume entity has an id attribute or property
         entity_id = self._get_entity_id(entity)
-        self._storage[entity_id] = entity
+        with self._lock:
+            version = self._check_version(entity_id, entity)
+            # The caller's entity only gets the new version once the storage
+            # has accepted it, so a failed save can be corrected and retried
+            stored = copy.copy(entity)
+            if version is not None:
+                stored._version = version + 1
+            self._storage[entity_id] = stored
+            if version is not None:
+                entity._version = stored.version
+            self._update_indexes(entity_id, entity)
+            self._record_change()
     
     def find_by_id(self, id: ID) -> Optional[T]:
         """
@@ -35,7 +74,7 @@ class BaseInMemoryRepository(Repository[T, ID], Generic[T, ID]):
         Returns:
             The entity if found, None otherwise
         """
-        return self._storage.get(id)
+        return self._get(id)
     
     def find_all(self) -> List[T]:
         """
@@ -44,7 +83,60 @@ class BaseInMemoryRepository(Repository[T, ID], Generic[T, ID]):
         Returns:
             A list of all entities
         """
-        return list(self._storage.values())
+        with self._lock:
+            entities = list(self._storage.values())
+        return [self._copy(entity) for entity in entities]
+    
+    def iter_all(self) -> Iterator[T]:
+        """
+        Iterate over all entities.
+        Works on a snapshot of the IDs, so entities may be saved or deleted
+        while a consumer is still iterating; deleted entities are skipped.
+        
+        Returns:
+            An iterator over all entities
+        """
+        with self._lock:
+            ids = list(self._storage)
+        for id in ids:
+            entity = self._get(id)
+            if entity is not None:
+                yield entity
+    
+    def find_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False) -> Page[T]:
+        """
+        Find one page of entities ordered by ID.
+        Selects the page with a bounded heap instead of sorting every ID.
+        Works on a snapshot of the IDs, so concurrent saves and deletes do
+        not disturb it; entities deleted meanwhile are left off the page.
+        
+        Args:
+            limit: The maximum number of entities on the page
+            cursor: The next_cursor of the previous page, or None for the first page
+            descending: Whether to order by descending ID
+            
+        Returns:
+            The page of entities
+            
+        Raises:
+            ValueError: If the limit is not positive or the cursor is invalid
+        """
+        check_limit(limit)
+        with self._lock:
+            ids = list(self._storage)
+        if cursor is not None:
+            after = decode_cursor(cursor, 1)[0]
+            if descending:
+                ids = (id for id in ids if id < after)
+            else:
+                ids = (id for id in ids if id > after)
+        select = heapq.nlargest if descending else heapq.nsmallest
+        page_ids = select(limit + 1, ids)
+        entities = (self._get(id) for id in page_ids)
+        return build_page(
+            [entity for entity in entities if entity is not None], limit,
+            lambda entity: (self._get_entity_id(entity),)
+        )
     
     def delete(self, id: ID) -> None:
         """
@@ -53,8 +145,97 @@ class BaseInMemoryRepository(Repository[T, ID], Generic[T, ID]):
         Args:
             id: The ID of the entity to delete
         """
-        if id in self._storage:
-            del self._storage[id]
+        with self._lock:
+            if id in self._storage:
+                del self._storage[id]
+                self._remove_from_indexes(id)
+                self._record_change()
+    
+    def storage_epoch(self) -> Optional[str]:
+        """
+        Get an identifier of this copy of the stored data.
+        
+        Returns:
+            The epoch, random for every repository instance
+        """
+        return self._epoch
+    
+    def change_count(self) -> Optional[int]:
+        """
+        Get a counter of the saves and deletes made in the current epoch.
+        
+        Returns:
+            The change count
+        """
+        return self._change_count
+    
+    def _record_change(self) -> None:
+        """
+        Advance the change count after a write.
+        Concurrent writers may publish their counts out of order, but each
+        count is only published once, so a count never describes two
+        different states of the collection.
+        """
+        self._change_count = next(self._change_counter)
+    
+    def _copy(self, entity: Optional[T]) -> Optional[T]:
+        """
+        Copy an entity going into or out of the storage, unless copying is off.
+        
+        Args:
+            entity: The entity, or None
+        
+        Returns:
+            The copy, or None if there is no entity
+        """
+        if entity is None or not self._copy_entities:
+            return entity
+        return copy.copy(entity)
+    
+    def _get(self, id: ID) -> Optional[T]:
+        """
+        Get a copy of a stored entity for a caller.
+        Stored copies are replaced on save, never changed, so looking one
+        up needs no lock; storage that builds entities from several columns
+        is read under the lock so that a read never sees half a write.
+        
+        Args:
+            id: The ID of the entity
+        
+        Returns:
+            The copy, or None if the entity is not stored
+        """
+        if self._copy_entities:
+            return self._copy(self._storage.get(id))
+        with self._lock:
+            return self._storage.get(id)
+    
+    def _check_version(self, entity_id: ID, entity: T) -> Optional[int]:
+        """
+        Check that an entity was read at the stored version.
+        
+        Args:
+            entity_id: The ID of the entity being saved
+            entity: The entity being saved
+            
+        Returns:
+            The version the entity was read at, or None if the entity is not versioned
+            
+        Raises:
+            ConcurrentModificationError: If the stored entity has a different version
+        """
+        version = getattr(entity, 'version', None)
+        if not isinstance(version, int):
+            return None
+        if version > 0:
+            stored = self._storage.get(entity_id)
+            stored_version = stored.version if stored is not None else 0
+            if stored_version != version:
+                raise ConcurrentModificationError(
+                    f"Entity {entity_id} was modified concurrently "
+                    f"(read at version {version}, stored version is {stored_version})"
+                )
+        return version
     
     def _get_entity_id(self, entity: T) -> ID:
         """
@@ -69,3 +250,24 @@ class BaseInMemoryRepository(Repository[T, ID], Generic[T, ID]):
             The ID of the entity
         """
         return getattr(entity, 'id')
+    
+    def _update_indexes(self, entity_id: ID, entity: T) -> None:
+        """
+        Refresh any secondary indexes after an entity has been saved.
+        Subclasses that maintain indexes override this; the entity may be
+        a re-save of an existing ID whose indexed values have changed.
+        
+        Args:
+            entity_id: The ID of the saved entity
+            entity: The saved entity
+        """
+        pass
+    
+    def _remove_from_indexes(self, entity_id: ID) -> None:
+        """
+        Drop an entity from any secondary indexes after it has been deleted.
+        
+        Args:
+            entity_id: The ID of the deleted entity
+        """
+        pass
@@ -0,0 +1,90 @@
+import copy
+import threading
+from typing import Generic, Iterator, TypeVar
+from repositories.inmemory.base_inmemory_repository import BaseInMemoryRepository
+from repositories.inmemory.sharded_storage import ShardedStorage
+
+T = TypeVar('T')  # Entity type
+ID = TypeVar('ID')  # ID type
+
+class BaseShardedInMemoryRepository(BaseInMemoryRepository[T, ID], Generic[T, ID]):
+    """
+    Thread-safe in-memory implementation of the Repository interface for
+    servers handling requests on many threads.
+    
+    Entities are spread over a ShardedStorage with one lock per shard, so
+    saves and deletes of entities on different shards do not wait for each
+    other, and lookups by ID and iteration take no lock at all. The
+    secondary indexes are shared by every shard and guarded by a separate
+    lock that is only held while they are updated or read.
+    
+    Entity repositories combine this class with their in-memory counterpart
+    and run its index-based finders under the index lock.
+    """
+    
+    def __init__(self, shard_count: int = 16):
+        """
+        Initialize the sharded storage and its locks.
+        
+        Args:
+            shard_count: The number of shards, and of write locks
+        
+        Raises:
+            ValueError: If the shard count is not positive
+        """
+        super().__init__()
+        self._storage: ShardedStorage[ID, T] = ShardedStorage(shard_count)
+        self._shard_locks = [threading.Lock() for _ in range(shard_count)]
+        # Lock order is shard lock, then index lock; readers only take the index lock
+        self._index_lock = threading.RLock()
+    
+    def save(self, entity: T) -> None:
+        """
+        Save an entity to its shard.
+        
+        Args:
+            entity: The entity to save
+        
+        Raises:
+            ConcurrentModificationError: If the stored entity has a different version
+        """
+        entity_id = self._get_entity_id(entity)
+        with self._shard_locks[self._storage.shard_of(entity_id)]:
+            version = self._check_version(entity_id, entity)
+            # The caller's entity only gets the new version once the storage
+            # has accepted it, so a failed save can be corrected and retried
+            stored = copy.copy(entity)
+            if version is not None:
+                stored._version = version + 1
+            self._storage[entity_id] = stored
+            if version is not None:
+                entity._version = stored.version
+            with self._index_lock:
+                self._update_indexes(entity_id, entity)
+            self._record_change()
+    
+    def iter_all(self) -> Iterator[T]:
+        """
+        Iterate over all entities, one shard snapshot at a time.
+        
+        Returns:
+            An iterator over all entities
+        """
+        for entity in self._storage.values():
+            yield self._copy(entity)
+    
+    def delete(self, id: ID) -> None:
+        """
+        Delete an entity by its ID.
+        The entity leaves the indexes before the storage, so an index read
+        under the index lock never finds an ID that is no longer stored.
+        
+        Args:
+            id: The ID of the entity to delete
+        """
+        with self._shard_locks[self._storage.shard_of(id)]:
+            if id in self._storage:
+                with self._index_lock:
+                    self._remove_from_indexes(id)
+                del self._storage[id]
+                self._record_change()
@@ -1,18 +1,142 @@
-from typing import List
-from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
 from repositories.inmemory.base_inmemory_repository import BaseInMemoryRepository
+from repositories.inmemory.appointment_table import AppointmentTable, to_epoch_micros
 from repositories.appointment_repository import AppointmentRepository
+from repositories.indexes import HashIndex, IntervalIndex, SortedIndex
+from repositories.paging import Page, build_page, check_limit, decode_cursor
 from src.appointment import Appointment
+from src.enums import AppointmentStatus, AppointmentType
+
+# One minute in epoch microseconds, the unit of times indexed by columnar storage
+MINUTE_MICROS = 60 * 1000 * 1000
 
 class InMemoryAppointmentRepository(BaseInMemoryRepository[Appointment, str], AppointmentRepository):
     """
     In-memory implementation of the AppointmentRepository interface.
+    Maintains secondary indexes on doctor ID, patient ID and date/time, plus
+    a per-doctor interval index of active bookings, so that the finder
+    methods do not scan every stored appointment. The finders read the
+    indexes and the storage under the lock that saves and deletes update
+    them under, so they never see an ID that is not stored.
+    
+    With columnar storage the appointments are kept in an AppointmentTable
+    instead of as objects, at the cost of building a new Appointment on
+    every read. The indexes then key times by epoch microseconds and
+    unindex an appointment using the values in its row, so no datetime or
+    tuple is kept per appointment outside the table.
     """
     
+    def __init__(self, columnar: bool = False):
+        """
+        Initialize the storage and the secondary indexes.
+        
+        Args:
+            columnar: Whether to store appointments in an AppointmentTable
+        """
+        super().__init__()
+        self._columnar = columnar
+        if columnar:
+            # Every read builds a new appointment from its row
+            self._storage = AppointmentTable()
+            self._copy_entities = False
+        self._doctor_index: HashIndex[str, str] = HashIndex()
+        self._patient_index: HashIndex[str, str] = HashIndex()
+        self._date_time_index: SortedIndex[Any, str] = SortedIndex()
+        self._booking_index: IntervalIndex[str, str] = IntervalIndex()
+        # Values each appointment was indexed under, needed to unindex it
+        # after the stored object has been mutated in place
+        self._indexed_values: Dict[str, Tuple[str, str, datetime, int, AppointmentStatus]] = {}
+        # Length of a minute in the units of the indexed times
+        self._minute = MINUTE_MICROS if columnar else timedelta(minutes=1)
+    
+    def save(self, entity: Appointment) -> None:
+        """
+        Save an appointment to the in-memory storage.
+        
+        Args:
+            entity: The appointment to save
+            
+        Raises:
+            ConcurrentModificationError: If the stored appointment has a different version
+            ValueError: If a time is aware and the storage is columnar
+        """
+        if not self._columnar:
+            super().save(entity)
+            return
+        entity_id = entity.appointment_id
+        with self._lock:
+            # The row is about to be overwritten, so unindex its values first
+            self._check_version(entity_id, entity)
+            self._remove_from_indexes(entity_id)
+            try:
+                super().save(entity)
+            except BaseException:
+                if entity_id in self._storage:
+                    self._update_indexes(entity_id, entity)
+                raise
+    
+    def delete(self, id: str) -> None:
+        """
+        Delete an appointment by its ID.
+        
+        Args:
+            id: The ID of the appointment to delete
+        """
+        with self._lock:
+            if self._columnar:
+                # The row is about to be removed, so unindex its values first
+                self._remove_from_indexes(id)
+            super().delete(id)
+    
     def _get_entity_id(self, entity: Appointment) -> str:
         """Get the ID of an appointment entity."""
         return entity.appointment_id
     
+    def _index_time(self, value: datetime) -> Any:
+        """Convert a date/time to the key it is indexed under."""
+        return to_epoch_micros(value) if self._columnar else value
+    
+    def _update_indexes(self, entity_id: str, entity: Appointment) -> None:
+        """Re-index an appointment under its current doctor, patient, time and status."""
+        if self._columnar:
+            # Saves unindex the old row before overwriting it
+            self._add_to_indexes(entity_id, *self._storage.index_values(entity_id))
+            return
+        values = (entity.doctor_id, entity.patient_id, entity.date_time,
+                  entity.duration, entity.status)
+        if self._indexed_values.get(entity_id) == values:
+            return
+        self._remove_from_indexes(entity_id)
+        self._add_to_indexes(entity_id, *values)
+        self._indexed_values[entity_id] = values
+    
+    def _add_to_indexes(self, entity_id: str, doctor_id: str, patient_id: str, date_time: Any,
+                        duration: int, status: AppointmentStatus) -> None:
+        """Add an appointment to every secondary index."""
+        self._doctor_index.add(doctor_id, entity_id)
+        self._patient_index.add(patient_id, entity_id)
+        self._date_time_index.add(date_time, entity_id)
+        if status != AppointmentStatus.CANCELLED:
+            end_time = date_time + self._minute * duration
+            self._booking_index.add(doctor_id, date_time, end_time, entity_id)
+    
+    def _remove_from_indexes(self, entity_id: str) -> None:
+        """Remove an appointment from every secondary index."""
+        if self._columnar:
+            values = self._storage.index_values(entity_id) if entity_id in self._storage else None
+        else:
+            values = self._indexed_values.pop(entity_id, None)
+        if values is None:
+            return
+        doctor_id, patient_id, date_time, _, status = values
+        self._doctor_index.remove(doctor_id, entity_id)
+        self._patient_index.remove(patient_id, entity_id)
+        self._date_time_index.remove(date_time, entity_id)
+        if status != AppointmentStatus.CANCELLED:
+            self._booking_index.remove(doctor_id, date_time, entity_id)
+    
     def find_by_patient_id(self, patient_id: str) -> List[Appointment]:
         """
         Find appointments by patient ID.
@@ -23,10 +147,8 @@ class InMemoryAppointmentRepository(BaseInMemoryRepository[Appointment, str], Ap
         Returns:
             A list of appointments for the specified patient
         """
-        return [
-            appointment for appointment in self._storage.values()
-            if appointment.patient_id == patient_id
-        ]
+        with self._lock:
+            return [self._get(id) for id in self._patient_index.get(patient_id)]
     
     def find_by_doctor_id(self, doctor_id: str) -> List[Appointment]:
         """
@@ -38,10 +160,8 @@ class InMemoryAppointmentRepository(BaseInMemoryRepository[Appointment, str], Ap
         Returns:
             A list of appointments for the specified doctor
         """
-        return [
-            appointment for appointment in self._storage.values()
-            if appointment.doctor_id == doctor_id
-        ]
+        with self._lock:
+            return [self._get(id) for id in self._doctor_index.get(doctor_id)]
     
     def find_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Appointment]:
         """
@@ -52,9 +172,77 @@ class InMemoryAppointmentRepository(BaseInMemoryRepository[Appointment, str], Ap
             end_date: The end date of the range
             
         Returns:
-            A list of appointments within the specified date range
+            A list of appointments within the specified date range, ordered by date/time
+        """
+        with self._lock:
+            ids = self._date_time_index.range(self._index_time(start_date), self._index_time(end_date))
+            return [self._get(id) for id in ids]
+    
+    def find_overlapping(self, doctor_id: str, start: datetime, end: datetime) -> List[Appointment]:
+        """
+        Find a doctor's non-cancelled appointments overlapping a time interval.
+        
+        Args:
+            doctor_id: The doctor ID to search for
+            start: The inclusive start of the interval
+            end: The exclusive end of the interval
+            
+        Returns:
+            A list of appointments occupying part of [start, end), ordered by date/time
         """
-        return [
-            appointment for appointment in self._storage.values()
-            if start_date <= appointment.date_time <= end_date
-        ]
+        with self._lock:
+            ids = self._booking_index.overlapping(doctor_id, self._index_time(start), self._index_time(end))
+            return [self._get(id) for id in ids]
+    
+    def find_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False,
+                  status: Optional[AppointmentStatus] = None,
+                  appointment_type: Optional[AppointmentType] = None,
+                  start_date: Optional[datetime] = None,
+                  end_date: Optional[datetime] = None) -> Page[Appointment]:
+        """
+        Find one page of appointments ordered by date/time, then by ID,
+        optionally filtered by status, type and an inclusive date window.
+        Scans the date/time index from the cursor position and stops as soon
+        as the page is full.
+        
+        Args:
+            limit: The maximum number of appointments on the page
+            cursor: The next_cursor of the previous page, or None for the first page
+            descending: Whether to order from the latest appointment
+            status: Only include appointments with this status
+            appointment_type: Only include appointments of this type
+            start_date: Only include appointments at or after this date/time
+            end_date: Only include appointments at or before this date/time
+            
+        Returns:
+            The page of appointments
+            
+        Raises:
+            ValueError: If the limit is not positive or the cursor is invalid
+        """
+        check_limit(limit)
+        after = None
+        if cursor is not None:
+            date_time, appointment_id = decode_cursor(cursor, 2)
+            try:
+                after = (self._index_time(datetime.fromisoformat(date_time)), appointment_id)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid cursor: {cursor}")
+        
+        # Writers update the index and the storage under the same lock
+        with self._lock:
+            entries = self._date_time_index.scan(
+                self._index_time(start_date) if start_date is not None else None,
+                self._index_time(end_date) if end_date is not None else None,
+                after, descending
+            )
+            appointments = (self._storage[id] for _, id in entries)
+            if status is not None:
+                appointments = (a for a in appointments if a.status == status)
+            if appointment_type is not None:
+                appointments = (a for a in appointments if a.type == appointment_type)
+            items = [self._copy(a) for a in islice(appointments, limit + 1)]
+        return build_page(
+            items, limit,
+            lambda appointment: (appointment.date_time.isoformat(), appointment.appointment_id)
+        )
@@ -1,17 +1,33 @@
-from typing import List
+from typing import List, Optional
 from repositories.inmemory.base_inmemory_repository import BaseInMemoryRepository
 from repositories.doctor_repository import DoctorRepository
+from repositories.indexes import TextIndex
 from src.doctor import Doctor
 
 class InMemoryDoctorRepository(BaseInMemoryRepository[Doctor, str], DoctorRepository):
     """
     In-memory implementation of the DoctorRepository interface.
+    Maintains a text search index over names for find_by_name, read under
+    the lock that saves and deletes update it under.
     """
     
+    def __init__(self):
+        """Initialize the storage and the name index."""
+        super().__init__()
+        self._name_index: TextIndex[str] = TextIndex()
+    
     def _get_entity_id(self, entity: Doctor) -> str:
         """Get the ID of a doctor entity."""
         return entity.doctor_id
     
+    def _update_indexes(self, entity_id: str, entity: Doctor) -> None:
+        """Re-index a doctor under its current name."""
+        self._name_index.add(entity_id, entity.name)
+    
+    def _remove_from_indexes(self, entity_id: str) -> None:
+        """Remove a doctor from the name index."""
+        self._name_index.remove(entity_id)
+    
     def find_by_specialization(self, specialization: str) -> List[Doctor]:
         """
         Find doctors by their specialization.
@@ -22,22 +38,20 @@ class InMemoryDoctorRepository(BaseInMemoryRepository[Doctor, str], DoctorReposi
         Returns:
             A list of doctors with the specified specialization
         """
-        return [
-            doctor for doctor in self._storage.values()
-            if doctor.specialization == specialization
-        ]
+        with self._lock:
+            doctors = list(self._storage.values())
+        return [self._copy(doctor) for doctor in doctors if doctor.specialization == specialization]
     
-    def find_by_name(self, name: str) -> List[Doctor]:
+    def find_by_name(self, name: str, limit: Optional[int] = None) -> List[Doctor]:
         """
-        Find doctors by their name.
+        Find doctors whose name contains the given text, ignoring case and accents.
         
         Args:
             name: The name to search for
+            limit: The maximum number of doctors to return, or None for all
             
         Returns:
-            A list of doctors with matching names
+            A list of doctors with matching names, best matches first
         """
-        return [
-            doctor for doctor in self._storage.values()
-            if name.lower() in doctor.name.lower()
-        ]
+        with self._lock:
+            return [self._get(id) for id in self._name_index.search(name, limit)]
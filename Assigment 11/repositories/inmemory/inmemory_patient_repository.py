@@ -1,20 +1,52 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
 from repositories.inmemory.base_inmemory_repository import BaseInMemoryRepository
 from repositories.patient_repository import PatientRepository
+from repositories.indexes import HashIndex, TextIndex
 from src.patient import Patient
 
 class InMemoryPatientRepository(BaseInMemoryRepository[Patient, str], PatientRepository):
     """
     In-memory implementation of the PatientRepository interface.
+    Maintains a case-normalized email index for find_by_email and a text
+    search index over names for find_by_name. The finders read the indexes
+    under the lock that saves and deletes update them under.
     """
     
+    def __init__(self):
+        """Initialize the storage and the secondary indexes."""
+        super().__init__()
+        self._name_index: TextIndex[str] = TextIndex()
+        self._email_index: HashIndex[str, str] = HashIndex()
+        # Email each patient was indexed under, needed to unindex it after
+        # the stored contact info has been changed in place
+        self._indexed_emails: Dict[str, str] = {}
+    
     def _get_entity_id(self, entity: Patient) -> str:
         """Get the ID of a patient entity."""
         return entity.patient_id
     
+    def _update_indexes(self, entity_id: str, entity: Patient) -> None:
+        """Re-index a patient under its current name and email."""
+        self._name_index.add(entity_id, entity.name)
+        email = self._normalize_email(entity.email)
+        indexed_email = self._indexed_emails.get(entity_id)
+        if indexed_email == email:
+            return
+        if indexed_email is not None:
+            self._email_index.remove(indexed_email, entity_id)
+        self._email_index.add(email, entity_id)
+        self._indexed_emails[entity_id] = email
+    
+    def _remove_from_indexes(self, entity_id: str) -> None:
+        """Remove a patient from the name and email indexes."""
+        self._name_index.remove(entity_id)
+        email = self._indexed_emails.pop(entity_id, None)
+        if email is not None:
+            self._email_index.remove(email, entity_id)
+    
     def find_by_email(self, email: str) -> Optional[Patient]:
         """
-        Find a patient by their email address.
+        Find a patient by their email address, ignoring case.
         
         Args:
             email: The email address to search for
@@ -22,22 +54,25 @@ class InMemoryPatientRepository(BaseInMemoryRepository[Patient, str], PatientRep
         Returns:
             The patient if found, None otherwise
         """
-        for patient in self._storage.values():
-            if patient.email == email:
-                return patient
-        return None
+        with self._lock:
+            patient_ids = self._email_index.get(self._normalize_email(email))
+            return self._get(patient_ids[0]) if patient_ids else None
     
-    def find_by_name(self, name: str) -> List[Patient]:
+    def find_by_name(self, name: str, limit: Optional[int] = None) -> List[Patient]:
         """
-        Find patients by their name.
+        Find patients whose name contains the given text, ignoring case and accents.
         
         Args:
             name: The name to search for
+            limit: The maximum number of patients to return, or None for all
             
         Returns:
-            A list of patients with matching names
+            A list of patients with matching names, best matches first
         """
-        return [
-            patient for patient in self._storage.values()
-            if name.lower() in patient.name.lower()
-        ]
+        with self._lock:
+            return [self._get(id) for id in self._name_index.search(name, limit)]
+    
+    @staticmethod
+    def _normalize_email(email: str) -> str:
+        """Normalize an email address for case-insensitive comparison."""
+        return email.strip().lower()
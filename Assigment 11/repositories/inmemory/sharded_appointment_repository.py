@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import List, Optional
+from repositories.inmemory.base_sharded_repository import BaseShardedInMemoryRepository
+from repositories.inmemory.inmemory_appointment_repository import InMemoryAppointmentRepository
+from repositories.paging import Page
+from src.appointment import Appointment
+from src.enums import AppointmentStatus, AppointmentType
+
+class ShardedInMemoryAppointmentRepository(BaseShardedInMemoryRepository[Appointment, str],
+                                           InMemoryAppointmentRepository):
+    """
+    Thread-safe sharded in-memory implementation of the AppointmentRepository interface.
+    """
+    
+    def find_by_patient_id(self, patient_id: str) -> List[Appointment]:
+        """Find appointments by patient ID."""
+        with self._index_lock:
+            return super().find_by_patient_id(patient_id)
+    
+    def find_by_doctor_id(self, doctor_id: str) -> List[Appointment]:
+        """Find appointments by doctor ID."""
+        with self._index_lock:
+            return super().find_by_doctor_id(doctor_id)
+    
+    def find_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Appointment]:
+        """Find appointments within a date range, ordered by date/time."""
+        with self._index_lock:
+            return super().find_by_date_range(start_date, end_date)
+    
+    def find_overlapping(self, doctor_id: str, start: datetime, end: datetime) -> List[Appointment]:
+        """Find a doctor's non-cancelled appointments overlapping a time interval."""
+        with self._index_lock:
+            return super().find_overlapping(doctor_id, start, end)
+    
+    def find_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False,
+                  status: Optional[AppointmentStatus] = None,
+                  appointment_type: Optional[AppointmentType] = None,
+                  start_date: Optional[datetime] = None,
+                  end_date: Optional[datetime] = None) -> Page[Appointment]:
+        """Find one page of appointments ordered by date/time, then by ID."""
+        with self._index_lock:
+            return super().find_page(limit, cursor, descending, status, appointment_type,
+                                     start_date, end_date)
@@ -0,0 +1,14 @@
+from typing import List, Optional
+from repositories.inmemory.base_sharded_repository import BaseShardedInMemoryRepository
+from repositories.inmemory.inmemory_doctor_repository import InMemoryDoctorRepository
+from src.doctor import Doctor
+
+class ShardedInMemoryDoctorRepository(BaseShardedInMemoryRepository[Doctor, str], InMemoryDoctorRepository):
+    """
+    Thread-safe sharded in-memory implementation of the DoctorRepository interface.
+    """
+    
+    def find_by_name(self, name: str, limit: Optional[int] = None) -> List[Doctor]:
+        """Find doctors whose name contains the given text, ignoring case and accents."""
+        with self._index_lock:
+            return super().find_by_name(name, limit)
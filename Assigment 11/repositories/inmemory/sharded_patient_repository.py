@@ -0,0 +1,19 @@
+from typing import List, Optional
+from repositories.inmemory.base_sharded_repository import BaseShardedInMemoryRepository
+from repositories.inmemory.inmemory_patient_repository import InMemoryPatientRepository
+from src.patient import Patient
+
+class ShardedInMemoryPatientRepository(BaseShardedInMemoryRepository[Patient, str], InMemoryPatientRepository):
+    """
+    Thread-safe sharded in-memory implementation of the PatientRepository interface.
+    """
+    
+    def find_by_email(self, email: str) -> Optional[Patient]:
+        """Find a patient by their email address, ignoring case."""
+        with self._index_lock:
+            return super().find_by_email(email)
+    
+    def find_by_name(self, name: str, limit: Optional[int] = None) -> List[Patient]:
+        """Find patients whose name contains the given text, ignoring case and accents."""
+        with self._index_lock:
+            return super().find_by_name(name, limit)
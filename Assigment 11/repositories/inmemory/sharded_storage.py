@@ -0,0 +1,86 @@
+from collections.abc import MutableMapping
+from typing import Dict, Generic, Iterator, List, Tuple, TypeVar
+
+K = TypeVar('K')  # Key type
+V = TypeVar('V')  # Value type
+
+class ShardedStorage(MutableMapping, Generic[K, V]):
+    """
+    Dictionary split into a fixed number of shards by key hash, usable as
+    the storage mapping of an in-memory repository.
+    
+    Single-key reads and writes only touch the key's shard and are atomic
+    under the GIL, so readers take no lock. Iteration walks the shards one
+    after another over a snapshot of each shard, so it never fails with
+    "dictionary changed size during iteration" and never copies more than
+    one shard at a time. Entries saved or deleted while an iteration is in
+    progress may or may not be seen by it.
+    """
+    
+    def __init__(self, shard_count: int = 16):
+        """
+        Initialize empty shards.
+        
+        Args:
+            shard_count: The number of shards
+        
+        Raises:
+            ValueError: If the shard count is not positive
+        """
+        if shard_count < 1:
+            raise ValueError("Shard count must be positive")
+        self._shards: List[Dict[K, V]] = [{} for _ in range(shard_count)]
+    
+    @property
+    def shard_count(self) -> int:
+        """The number of shards."""
+        return len(self._shards)
+    
+    def shard_of(self, key: K) -> int:
+        """
+        Get the index of the shard holding a key.
+        
+        Args:
+            key: The key to locate
+        
+        Returns:
+            The shard index, in range(shard_count)
+        """
+        return hash(key) % len(self._shards)
+    
+    def __getitem__(self, key: K) -> V:
+        return self._shards[hash(key) % len(self._shards)][key]
+    
+    def get(self, key: K, default=None):
+        return self._shards[hash(key) % len(self._shards)].get(key, default)
+    
+    def __contains__(self, key) -> bool:
+        return key in self._shards[hash(key) % len(self._shards)]
+    
+    def __setitem__(self, key: K, value: V) -> None:
+        self._shards[hash(key) % len(self._shards)][key] = value
+    
+    def __delitem__(self, key: K) -> None:
+        del self._shards[hash(key) % len(self._shards)][key]
+    
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+    
+    def __iter__(self) -> Iterator[K]:
+        for shard in self._shards:
+            yield from list(shard)
+    
+    def values(self) -> Iterator[V]:
+        """Iterate over the values, one shard snapshot at a time."""
+        for shard in self._shards:
+            yield from list(shard.values())
+    
+    def items(self) -> Iterator[Tuple[K, V]]:
+        """Iterate over the (key, value) pairs, one shard snapshot at a time."""
+        for shard in self._shards:
+            yield from list(shard.items())
+    
+    def clear(self) -> None:
+        """Remove every entry."""
+        for shard in self._shards:
+            shard.clear()
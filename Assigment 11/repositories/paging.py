@@ -0,0 +1,103 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, Generic, List, Optional, Sequence, TypeVar
+
+T = TypeVar('T')  # Entity type
+
+class Page(Generic[T]):
+    """
+    One page of entities returned by a keyset-paginated query.
+    
+    The cursor is an opaque token encoding the sort key of the last entity
+    on the page; passing it back returns the entities that follow it, so
+    fetching a page costs the same no matter how deep into the results it is.
+    """
+    
+    def __init__(self, items: List[T], next_cursor: Optional[str] = None):
+        """
+        Initialize the page.
+        
+        Args:
+            items: The entities on the page
+            next_cursor: The cursor of the next page, or None if this is the last page
+        """
+        self.items = items
+        self.next_cursor = next_cursor
+    
+    def __iter__(self):
+        return iter(self.items)
+    
+    def __len__(self) -> int:
+        return len(self.items)
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of an entity as an opaque cursor.
+    
+    Args:
+        values: The JSON-compatible sort key values
+    
+    Returns:
+        A URL-safe cursor string
+    """
+    payload = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str, size: int, value_type: type = str) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Args:
+        cursor: The cursor string
+        size: The number of sort key values the cursor must hold
+        value_type: The type every sort key value must have
+    
+    Returns:
+        The sort key values
+    
+    Raises:
+        ValueError: If the cursor is malformed or holds values of another type
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    # A well-formed cursor of the wrong type would fail comparing sort keys
+    if not all(isinstance(value, value_type) for value in values):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
+
+def build_page(items: Sequence[T], limit: int, sort_key: Callable[[T], Sequence[Any]]) -> Page[T]:
+    """
+    Build a page from up to limit + 1 entities in sort order; the extra
+    entity only signals that another page follows.
+    
+    Args:
+        items: The entities fetched for the page
+        limit: The page size
+        sort_key: Function returning the JSON-compatible sort key of an entity
+    
+    Returns:
+        The page, with a cursor pointing after its last entity if more follow
+    """
+    if len(items) <= limit:
+        return Page(list(items))
+    items = list(items[:limit])
+    return Page(items, encode_cursor(*sort_key(items[-1])))
+
+def check_limit(limit: int) -> None:
+    """
+    Validate a page size.
+    
+    Args:
+        limit: The requested page size
+    
+    Raises:
+        ValueError: If the page size is not positive
+    """
+    if limit < 1:
+        raise ValueError(f"Page limit must be positive, got {limit}")
@@ -11,6 +11,7 @@ class PatientRepository(Repository[Patient, str]):
     def find_by_email(self, email: str) -> Optional[Patient]:
         """
         Find a patient by their email address.
+        Email addresses are compared case-insensitively.
         
         Args:
             email: The email address to search for
@@ -20,14 +21,17 @@ class PatientRepository(Repository[Patient, str]):
         """
         pass
     
-    def find_by_name(self, name: str) -> List[Patient]:
+    def find_by_name(self, name: str, limit: Optional[int] = None) -> List[Patient]:
         """
-        Find patients by their name.
+        Find patients whose name contains the given text, ignoring case and accents.
+        Exact matches come first, then names starting with the text, then
+        names with a word starting with the text, then other matches.
         
         Args:
             name: The name to search for
+            limit: The maximum number of patients to return, or None for all
             
         Returns:
-            A list of patients with matching names
+            A list of patients with matching names, best matches first
         """
         pass
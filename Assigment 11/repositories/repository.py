@@ -1,9 +1,16 @@
-from typing import Generic, TypeVar, List, Optional
+from typing import Generic, TypeVar, Iterator, List, Optional
+from repositories.paging import Page
 
 # Type variables for generic repository
 T = TypeVar('T')  # Entity type
 ID = TypeVar('ID')  # ID type
 
+class ConcurrentModificationError(ValueError):
+    """
+    Raised when an entity is saved over a newer version than the one it was read at.
+    """
+    pass
+
 class Repository(Generic[T, ID]):
     """
     Generic repository interface with standard CRUD operations.
@@ -14,8 +21,14 @@ class Repository(Generic[T, ID]):
         """
         Create or update an entity in the repository.
         
+        Implementations supporting optimistic concurrency compare the version
+        an entity was read at with the stored version, and increment it.
+        
         Args:
             entity: The entity to save
+            
+        Raises:
+            ConcurrentModificationError: If the entity was changed and saved by someone else since it was read
         """
         pass
     
@@ -40,6 +53,33 @@ class Repository(Generic[T, ID]):
         """
         pass
     
+    def iter_all(self) -> Iterator[T]:
+        """
+        Iterate over all entities without building a list of them,
+        for streaming large result sets.
+        
+        Returns:
+            An iterator over all entities
+        """
+        pass
+    
+    def find_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False) -> Page[T]:
+        """
+        Find one page of entities ordered by ID, without loading the others.
+        
+        Args:
+            limit: The maximum number of entities on the page
+            cursor: The next_cursor of the previous page, or None for the first page
+            descending: Whether to order by descending ID
+            
+        Returns:
+            The page of entities
+            
+        Raises:
+            ValueError: If the limit is not positive or the cursor is invalid
+        """
+        pass
+    
     def delete(self, id: ID) -> None:
         """
         Delete an entity by its ID.
@@ -48,3 +88,26 @@ class Repository(Generic[T, ID]):
             id: The ID of the entity to delete
         """
         pass
+    
+    def storage_epoch(self) -> Optional[str]:
+        """
+        Get an identifier of this copy of the stored data.
+        Entity versions and change counts are only comparable within one
+        epoch; storage whose versions can start over, such as an in-memory
+        store after a restart, starts a new epoch.
+        
+        Returns:
+            The epoch, or None if the repository does not track versions
+        """
+        return None
+    
+    def change_count(self) -> Optional[int]:
+        """
+        Get a counter of the saves and deletes made in the current epoch,
+        usable as a version of the whole collection. Read it before the
+        entities it describes: it changes after each write is visible.
+        
+        Returns:
+            The change count, or None if the repository does not track changes
+        """
+        return None
@@ -0,0 +1,308 @@
+import mmap
+import os
+import random
+import struct
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Set, Tuple
+from repositories.inmemory.appointment_table import from_epoch_micros, to_epoch_micros
+from src.appointment import Appointment
+from src.enums import AppointmentStatus, AppointmentType
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+MAGIC = b'APPTSHM1'
+# Magic, capacity, row count, change sequence number, journal size, epoch
+HEADER = struct.Struct('<8sqqqqq')
+HEADER_FIELD = struct.Struct('<q')
+CAPACITY_OFFSET, ROW_COUNT_OFFSET, SEQ_OFFSET = 8, 16, 24
+JOURNAL_ENTRY = struct.Struct('<q')
+# Date/time, created at, updated at, version, duration, status, type,
+# then appointment, patient and doctor IDs and notes as NUL-padded UTF-8
+RECORD = struct.Struct('<qqqqqBB64s64s64s512s')
+
+class SharedAppointmentTable(MutableMapping):
+    """
+    Appointment store kept in a memory-mapped file, so that every process
+    on the host that maps the same file sees the same appointments.
+    
+    The file holds a header, a ring buffer journal of the rows changed by
+    each write, and fixed-size rows kept dense by moving the last row into
+    a deleted one. Rows are materialized into new Appointment objects on
+    every read. IDs are limited to 64 bytes and notes to 512 bytes of UTF-8.
+    
+    Access is coordinated with an fcntl lock on the file: any number of
+    processes may read at once, while a write excludes everyone else. Each
+    instance keeps its own ID-to-row map, which refresh() brings up to date
+    from the journal, so callers must hold lock() around every access.
+    Each process must open the store itself rather than inherit an open
+    one across fork(), and an instance must not be shared between threads
+    without a lock of its own.
+    """
+    
+    def __init__(self, file_path: str, capacity: int = 10000, journal_size: int = 65536):
+        """
+        Open the store, creating the file if it does not exist yet.
+        
+        Args:
+            file_path: Path of the file backing the shared memory, e.g. under /dev/shm
+            capacity: The initial number of rows; the file doubles when it is full
+            journal_size: The number of changes kept for other processes to catch up
+        
+        Raises:
+            RuntimeError: If the platform has no fcntl file locks
+            ValueError: If the file is not a shared appointment store
+        """
+        if fcntl is None:
+            raise RuntimeError("Shared appointment storage requires POSIX file locks")
+        if capacity < 1 or journal_size < 1:
+            raise ValueError("Capacity and journal size must be positive")
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(file_path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._map = None
+        self._rows: Dict[str, int] = {}
+        self._row_ids: Dict[int, str] = {}
+        self._seq = 0
+        # Nesting depth and mode of lock(), which only the outermost call takes
+        self._lock_depth = 0
+        self._exclusive = False
+        
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                self._journal_size = journal_size
+                os.ftruncate(self._fd, self._file_size(capacity))
+                self._remap()
+                HEADER.pack_into(self._map, 0, MAGIC, capacity, 0, 0, journal_size,
+                                 random.getrandbits(63))
+            else:
+                magic = os.pread(self._fd, HEADER.size, 0)[:len(MAGIC)]
+                if magic != MAGIC:
+                    raise ValueError(f"{file_path} is not a shared appointment store")
+                self._journal_size = HEADER.unpack_from(os.pread(self._fd, HEADER.size, 0))[4]
+                self._remap()
+        except BaseException:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self.close()
+            raise
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        # Rebuild the row map from scratch on the first refresh
+        self._seq = -self._journal_size - 1
+    
+    @contextmanager
+    def lock(self, exclusive: bool = False) -> Iterator[None]:
+        """
+        Hold the file lock, shared for reading or exclusive for writing.
+        Nested calls keep the lock of the outermost one, which must be
+        exclusive if any nested call is.
+        
+        Args:
+            exclusive: Whether the lock excludes every other process
+        
+        Raises:
+            RuntimeError: If an exclusive lock is requested inside a shared one
+        """
+        if self._lock_depth:
+            if exclusive and not self._exclusive:
+                raise RuntimeError("Cannot take an exclusive lock while holding a shared one")
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+        
+        fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        self._lock_depth, self._exclusive = 1, exclusive
+        try:
+            # Another process may have grown the file since it was mapped
+            if self._header()[1] != self._mapped_capacity:
+                self._remap()
+            yield
+        finally:
+            self._lock_depth = 0
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+    
+    def refresh(self) -> List[Tuple[str, bool]]:
+        """
+        Catch up with the writes of other processes since the last refresh.
+        Must be called under lock().
+        
+        Returns:
+            (appointment ID, whether it is still stored) for each changed appointment
+        """
+        _, _, row_count, seq, _, _ = self._header()
+        if seq == self._seq:
+            return []
+        changed: Set[str] = set()
+        if seq - self._seq > self._journal_size:
+            # Fell too far behind for the journal, so reload every row
+            changed.update(self._rows)
+            self._rows.clear()
+            self._row_ids.clear()
+            rows = range(row_count)
+        else:
+            rows = {self._journal_row(s) for s in range(self._seq, seq)}
+        for row in rows:
+            self._reload_row(row, row_count, changed)
+        self._seq = seq
+        return [(appointment_id, appointment_id in self._rows) for appointment_id in changed]
+    
+    @property
+    def epoch(self) -> int:
+        """Random number chosen when the file was created, telling recreated files apart."""
+        return self._header()[5]
+    
+    @property
+    def change_count(self) -> int:
+        """Number of row changes made by every process; read it under lock()."""
+        return self._header()[3]
+    
+    def close(self) -> None:
+        """Unmap and close the file; the data stays in it for other processes."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._rows))
+    
+    def __contains__(self, appointment_id: object) -> bool:
+        return appointment_id in self._rows
+    
+    def __getitem__(self, appointment_id: str) -> Appointment:
+        """Materialize the appointment stored under an ID."""
+        (date_time, created_at, updated_at, version, duration, status, appointment_type,
+         _, patient_id, doctor_id, notes) = RECORD.unpack_from(
+            self._map, self._row_offset(self._rows[appointment_id]))
+        appointment = Appointment(
+            appointment_id=appointment_id,
+            patient_id=_decode(patient_id),
+            doctor_id=_decode(doctor_id),
+            date_time=from_epoch_micros(date_time),
+            duration=duration,
+            appointment_type=AppointmentType(appointment_type),
+            status=AppointmentStatus(status),
+            notes=_decode(notes)
+        )
+        appointment._created_at = from_epoch_micros(created_at)
+        appointment._updated_at = from_epoch_micros(updated_at)
+        appointment._version = version
+        return appointment
+    
+    def __setitem__(self, appointment_id: str, appointment: Appointment) -> None:
+        """Store an appointment, overwriting the row of an existing ID in place. Must be called under lock(True)."""
+        record = RECORD.pack(
+            to_epoch_micros(appointment.date_time),
+            to_epoch_micros(appointment.created_at),
+            to_epoch_micros(appointment.updated_at),
+            appointment.version,
+            appointment.duration,
+            appointment.status.value,
+            appointment.type.value,
+            _encode(appointment_id, 64, "ID"),
+            _encode(appointment.patient_id, 64, "patient ID"),
+            _encode(appointment.doctor_id, 64, "doctor ID"),
+            _encode(appointment.notes or "", 512, "notes")
+        )
+        row = self._rows.get(appointment_id)
+        if row is None:
+            _, capacity, row, _, _, _ = self._header()
+            if row == capacity:
+                self._grow(2 * capacity)
+            HEADER_FIELD.pack_into(self._map, ROW_COUNT_OFFSET, row + 1)
+            self._rows[appointment_id] = row
+            self._row_ids[row] = appointment_id
+        offset = self._row_offset(row)
+        self._map[offset:offset + RECORD.size] = record
+        self._log_changes(row)
+    
+    def __delitem__(self, appointment_id: str) -> None:
+        """Remove an appointment, moving the last row into its place. Must be called under lock(True)."""
+        row = self._rows.pop(appointment_id)
+        last = self._header()[2] - 1
+        del self._row_ids[row]
+        if last != row:
+            offset, last_offset = self._row_offset(row), self._row_offset(last)
+            self._map[offset:offset + RECORD.size] = self._map[last_offset:last_offset + RECORD.size]
+            last_id = self._row_ids.pop(last)
+            self._rows[last_id] = row
+            self._row_ids[row] = last_id
+        HEADER_FIELD.pack_into(self._map, ROW_COUNT_OFFSET, last)
+        self._log_changes(row, last)
+    
+    def _header(self) -> Tuple[bytes, int, int, int, int, int]:
+        """Read the header: magic, capacity, row count, change sequence number, journal size and epoch."""
+        return HEADER.unpack_from(self._map, 0)
+    
+    def _file_size(self, capacity: int) -> int:
+        """Get the size of the file holding a number of rows."""
+        return self._row_offset(capacity)
+    
+    def _row_offset(self, row: int) -> int:
+        """Get the offset of a row in the file."""
+        return HEADER.size + self._journal_size * JOURNAL_ENTRY.size + row * RECORD.size
+    
+    def _journal_offset(self, seq: int) -> int:
+        """Get the offset of the journal entry of a sequence number in the file."""
+        return HEADER.size + (seq % self._journal_size) * JOURNAL_ENTRY.size
+    
+    def _journal_row(self, seq: int) -> int:
+        """Get the row changed by the write with a sequence number."""
+        return JOURNAL_ENTRY.unpack_from(self._map, self._journal_offset(seq))[0]
+    
+    def _log_changes(self, *rows: int) -> None:
+        """Append changed rows to the journal and publish the new sequence number."""
+        seq = self._header()[3]
+        for row in rows:
+            JOURNAL_ENTRY.pack_into(self._map, self._journal_offset(seq), row)
+            seq += 1
+        HEADER_FIELD.pack_into(self._map, SEQ_OFFSET, seq)
+        self._seq = seq
+    
+    def _reload_row(self, row: int, row_count: int, changed: Set[str]) -> None:
+        """Re-read which appointment a row holds after another process changed it."""
+        old_id = self._row_ids.pop(row, None)
+        if old_id is not None and self._rows.get(old_id) == row:
+            del self._rows[old_id]
+            changed.add(old_id)
+        if row < row_count:
+            new_id = _decode(RECORD.unpack_from(self._map, self._row_offset(row))[7])
+            self._rows[new_id] = row
+            self._row_ids[row] = new_id
+            changed.add(new_id)
+    
+    def _grow(self, capacity: int) -> None:
+        """Enlarge the file; other processes remap it the next time they lock it."""
+        os.ftruncate(self._fd, self._file_size(capacity))
+        HEADER_FIELD.pack_into(self._map, CAPACITY_OFFSET, capacity)
+        self._remap()
+    
+    def _remap(self) -> None:
+        """Map the whole file again after it was created or grown."""
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._fd, os.fstat(self._fd).st_size)
+        self._mapped_capacity = self._header()[1]
+
+def _encode(value: str, size: int, field: str) -> bytes:
+    """Encode a string for a fixed-size field."""
+    encoded = value.encode('utf-8')
+    if len(encoded) > size:
+        raise ValueError(f"Appointment {field} is longer than {size} bytes")
+    return encoded
+
+def _decode(value: bytes) -> str:
+    """Decode a NUL-padded fixed-size field."""
+    return value.rstrip(b'\0').decode('utf-8')
@@ -0,0 +1,182 @@
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Tuple
+from repositories.inmemory.inmemory_appointment_repository import InMemoryAppointmentRepository
+from repositories.sharedmemory.shared_appointment_table import SharedAppointmentTable
+from repositories.paging import Page
+from src.appointment import Appointment
+from src.enums import AppointmentStatus, AppointmentType
+
+# Called with an appointment ID, the stored appointment or None, and the
+# indexed values this process last knew of it or None
+ChangeListener = Callable[[str, Optional[Appointment],
+                           Optional[Tuple[str, str, datetime, int, AppointmentStatus]]], None]
+
+class SharedMemoryAppointmentRepository(InMemoryAppointmentRepository):
+    """
+    Shared-memory implementation of the AppointmentRepository interface.
+    
+    Appointments live in a SharedAppointmentTable, so several processes on
+    one host, such as the workers of a multi-worker uvicorn server, read and
+    write the same appointments. Each process keeps its own secondary
+    indexes and catches up with the other processes' writes from the
+    table's journal at the start of every operation, under the file lock.
+    Change listeners are told about the appointments the other processes
+    changed, so that state a process derives from its appointments, such
+    as caches, can follow them too.
+    """
+    
+    def __init__(self, file_path: str, capacity: int = 10000, journal_size: int = 65536):
+        """
+        Open the shared table and index the appointments already in it.
+        
+        Args:
+            file_path: Path of the file backing the shared memory, e.g. under /dev/shm
+            capacity: The initial number of rows if the file is created
+            journal_size: The number of changes kept for lagging processes
+        """
+        super().__init__()
+        self._storage = SharedAppointmentTable(file_path, capacity, journal_size)
+        # Every read builds a new appointment from its row
+        self._copy_entities = False
+        self._change_listeners: List[ChangeListener] = []
+        with self._shared():
+            pass
+    
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """
+        Call a function for each appointment another process saves or deletes.
+        
+        The listener is called with the appointment ID, the stored appointment
+        (None once deleted), and the (doctor ID, patient ID, date/time,
+        duration, status) this process last knew of the appointment (None if
+        it is new to this process). It is called once this process catches up
+        with the change, after the locks are released, on the thread of the
+        operation that caught up. An appointment another process only moved
+        to another row may be reported unchanged.
+        
+        Args:
+            listener: The function to call
+        """
+        self._change_listeners.append(listener)
+    
+    def refresh(self) -> None:
+        """Catch up with the writes of other processes now rather than at the next operation."""
+        with self._shared():
+            pass
+    
+    @contextmanager
+    def _shared(self, exclusive: bool = False) -> Iterator[None]:
+        """Lock the table for this thread and process, and apply the writes of other processes."""
+        changes = []
+        try:
+            with self._lock, self._storage.lock(exclusive):
+                for appointment_id, present in self._storage.refresh():
+                    previous = self._indexed_values.get(appointment_id)
+                    appointment = self._storage[appointment_id] if present else None
+                    if appointment is not None:
+                        self._update_indexes(appointment_id, appointment)
+                    else:
+                        self._remove_from_indexes(appointment_id)
+                    changes.append((appointment_id, appointment, previous))
+                yield
+        finally:
+            for change in changes:
+                for listener in self._change_listeners:
+                    listener(*change)
+    
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Lock out every other thread and process for the duration of a with
+        block, so that a check such as find_overlapping and the save that
+        depends on it happen as one step.
+        """
+        with self._shared(exclusive=True):
+            yield
+    
+    def save(self, entity: Appointment) -> None:
+        """
+        Save an appointment to the shared table.
+        
+        Args:
+            entity: The appointment to save
+        
+        Raises:
+            ConcurrentModificationError: If the stored appointment has a different version
+            ValueError: If an ID or the notes are too long for the table
+        """
+        with self._shared(exclusive=True):
+            super().save(entity)
+    
+    def delete(self, id: str) -> None:
+        """
+        Delete an appointment by its ID.
+        
+        Args:
+            id: The ID of the appointment to delete
+        """
+        with self._shared(exclusive=True):
+            super().delete(id)
+    
+    def find_by_id(self, id: str) -> Optional[Appointment]:
+        """Find an appointment by its ID."""
+        with self._shared():
+            return super().find_by_id(id)
+    
+    def find_all(self) -> List[Appointment]:
+        """Find all appointments."""
+        with self._shared():
+            return super().find_all()
+    
+    def iter_all(self) -> Iterator[Appointment]:
+        """Iterate over all appointments, skipping those deleted while iterating."""
+        with self._shared():
+            ids = list(self._storage)
+        for id in ids:
+            appointment = self.find_by_id(id)
+            if appointment is not None:
+                yield appointment
+    
+    def find_by_patient_id(self, patient_id: str) -> List[Appointment]:
+        """Find appointments by patient ID."""
+        with self._shared():
+            return super().find_by_patient_id(patient_id)
+    
+    def find_by_doctor_id(self, doctor_id: str) -> List[Appointment]:
+        """Find appointments by doctor ID."""
+        with self._shared():
+            return super().find_by_doctor_id(doctor_id)
+    
+    def find_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Appointment]:
+        """Find appointments within a date range, ordered by date/time."""
+        with self._shared():
+            return super().find_by_date_range(start_date, end_date)
+    
+    def find_overlapping(self, doctor_id: str, start: datetime, end: datetime) -> List[Appointment]:
+        """Find a doctor's non-cancelled appointments overlapping a time interval."""
+        with self._shared():
+            return super().find_overlapping(doctor_id, start, end)
+    
+    def find_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False,
+                  status: Optional[AppointmentStatus] = None,
+                  appointment_type: Optional[AppointmentType] = None,
+                  start_date: Optional[datetime] = None,
+                  end_date: Optional[datetime] = None) -> Page[Appointment]:
+        """Find one page of appointments ordered by date/time, then by ID."""
+        with self._shared():
+            return super().find_page(limit, cursor, descending, status, appointment_type,
+                                     start_date, end_date)
+    
+    def storage_epoch(self) -> Optional[str]:
+        """Get the epoch of the shared table file, the same in every process."""
+        return f"{self._storage.epoch:x}"
+    
+    def change_count(self) -> Optional[int]:
+        """Get the number of changes made to the shared table by every process."""
+        with self._shared():
+            return self._storage.change_count
+    
+    def close(self) -> None:
+        """Unmap the shared table; the appointments stay in its file."""
+        self._storage.close()
@@ -3,6 +3,9 @@ from typing import Optional
 from .enums import AppointmentStatus, AppointmentType, NotificationType
 
 class Appointment:
+    __slots__ = ('_appointment_id', '_patient_id', '_doctor_id', '_date_time', '_duration',
+                 '_status', '_type', '_notes', '_created_at', '_updated_at', '_version')
+    
     def __init__(self, appointment_id: str, patient_id: str, doctor_id: str,
                  date_time: datetime, duration: int, 
                  appointment_type: AppointmentType,
@@ -16,8 +19,9 @@ class Appointment:
         self._status = status
         self._type = appointment_type
         self._notes = notes
-        self._created_at = datetime.now()
-        self._updated_at = datetime.now()
+        self._created_at = self._updated_at = datetime.now()
+        # Number of times the appointment has been saved, 0 until it is first saved
+        self._version = 0
     
     @property
     def appointment_id(self) -> str:
@@ -39,6 +43,11 @@ class Appointment:
     def duration(self) -> int:
         return self._duration
     
+    @duration.setter
+    def duration(self, value: int):
+        self._duration = value
+        self._updated_at = datetime.now()
+    
     @property
     def status(self) -> AppointmentStatus:
         return self._status
@@ -47,10 +56,20 @@ class Appointment:
     def type(self) -> AppointmentType:
         return self._type
     
+    @type.setter
+    def type(self, value: AppointmentType):
+        self._type = value
+        self._updated_at = datetime.now()
+    
     @property
     def notes(self) -> str:
         return self._notes
     
+    @notes.setter
+    def notes(self, value: str):
+        self._notes = value
+        self._updated_at = datetime.now()
+    
     @property
     def created_at(self) -> datetime:
         return self._created_at
@@ -59,6 +78,17 @@ class Appointment:
     def updated_at(self) -> datetime:
         return self._updated_at
     
+    @property
+    def version(self) -> int:
+        return self._version
+    
+    def __copy__(self) -> 'Appointment':
+        """Copy the appointment, version included"""
+        appointment = object.__new__(type(self))
+        for name in Appointment.__slots__:
+            setattr(appointment, name, getattr(self, name))
+        return appointment
+    
     def confirm(self) -> bool:
         """Confirm the appointment"""
         if self._status == AppointmentStatus.SCHEDULED:
@@ -1,4 +1,6 @@
 class ContactInfo:
+    __slots__ = ('_email', '_phone', '_address')
+    
     def __init__(self, email: str, phone: str, address: str):
         self._email = email
         self._phone = phone
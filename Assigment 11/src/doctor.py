@@ -3,6 +3,8 @@ from typing import List, Optional
 from .contact_info import ContactInfo
 
 class Doctor:
+    __slots__ = ('_doctor_id', '_name', '_specialization', '_department', '_license_number', '_contact_info', '_version')
+    
     def __init__(self, doctor_id: str, name: str, specialization: str, 
                  department: str, license_number: str, contact_info: ContactInfo):
         self._doctor_id = doctor_id
@@ -11,6 +13,8 @@ class Doctor:
         self._department = department
         self._license_number = license_number
         self._contact_info = contact_info
+        # Number of times the doctor has been saved, 0 until it is first saved
+        self._version = 0
     
     @property
     def doctor_id(self) -> str:
@@ -20,10 +24,18 @@ class Doctor:
     def name(self) -> str:
         return self._name
     
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+    
     @property
     def specialization(self) -> str:
         return self._specialization
     
+    @specialization.setter
+    def specialization(self, value: str):
+        self._specialization = value
+    
     @property
     def email(self) -> str:
         return self._contact_info.email
@@ -44,6 +56,19 @@ class Doctor:
     def contact_info(self) -> ContactInfo:
         return self._contact_info
     
+    @property
+    def version(self) -> int:
+        return self._version
+    
+    def __copy__(self) -> 'Doctor':
+        """Copy the doctor, version included, with its own contact info"""
+        doctor = object.__new__(type(self))
+        for name in Doctor.__slots__:
+            setattr(doctor, name, getattr(self, name))
+        contact_info = self._contact_info
+        doctor._contact_info = ContactInfo(contact_info.email, contact_info.phone, contact_info.address)
+        return doctor
+    
     def set_availability(self, working_hours, blocked_slots) -> bool:
         """Set doctor's availability"""
         # This would typically interact with a schedule service
@@ -4,6 +4,8 @@ from .contact_info import ContactInfo
 from .enums import AppointmentType
 
 class Patient:
+    __slots__ = ('_patient_id', '_name', '_date_of_birth', '_medical_history_id', '_contact_info', '_version')
+    
     def __init__(self, patient_id: str, name: str, date_of_birth: date, 
                  medical_history_id: str, contact_info: ContactInfo):
         self._patient_id = patient_id
@@ -11,6 +13,8 @@ class Patient:
         self._date_of_birth = date_of_birth
         self._medical_history_id = medical_history_id
         self._contact_info = contact_info
+        # Number of times the patient has been saved, 0 until it is first saved
+        self._version = 0
     
     @property
     def patient_id(self) -> str:
@@ -20,6 +24,10 @@ class Patient:
     def name(self) -> str:
         return self._name
     
+    @name.setter
+    def name(self, value: str):
+        self._name = value
+    
     @property
     def email(self) -> str:
         return self._contact_info.email
@@ -44,6 +52,19 @@ class Patient:
     def contact_info(self) -> ContactInfo:
         return self._contact_info
     
+    @property
+    def version(self) -> int:
+        return self._version
+    
+    def __copy__(self) -> 'Patient':
+        """Copy the patient, version included, with its own contact info"""
+        patient = object.__new__(type(self))
+        for name in Patient.__slots__:
+            setattr(patient, name, getattr(self, name))
+        contact_info = self._contact_info
+        patient._contact_info = ContactInfo(contact_info.email, contact_info.phone, contact_info.address)
+        return patient
+    
     def book_appointment(self, doctor_id: str, date_time: datetime, 
                          appointment_type: AppointmentType):
         """Book an appointment with a doctor"""
@@ -1,8 +1,10 @@
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterator, List, Tuple
 from enum import Enum
 from .time_slot import TimeSlot
 
+MINUTES_PER_DAY = 24 * 60
+
 class DayOfWeek(Enum):
     MONDAY = 0
     TUESDAY = 1
@@ -17,13 +19,87 @@ class TimeRange:
         self.start_time = start_time
         self.end_time = end_time
 
+def _minute_mask(start_minute: int, end_minute: int) -> int:
+    """Bitmask with the bits of the minutes [start_minute, end_minute) set"""
+    if end_minute <= start_minute:
+        return 0
+    return ((1 << (end_minute - start_minute)) - 1) << start_minute
+
+def _minute_of(value: time) -> int:
+    """Minute of the day of a time"""
+    return value.hour * 60 + value.minute
+
+def _day_spans(start_time: datetime, end_time: datetime) -> Iterator[Tuple[date, int, int]]:
+    """Split a time range into (day, start minute, end minute) spans, rounding outward to whole minutes"""
+    current = start_time.replace(second=0, microsecond=0)
+    while current < end_time:
+        day = current.date()
+        next_day = datetime.combine(day + timedelta(days=1), time.min, current.tzinfo)
+        span_end = min(end_time, next_day)
+        start_minute = _minute_of(current.time())
+        if span_end == next_day:
+            end_minute = MINUTES_PER_DAY
+        else:
+            partial_minute = span_end.second or span_end.microsecond
+            end_minute = _minute_of(span_end.time()) + (1 if partial_minute else 0)
+        yield day, start_minute, end_minute
+        current = next_day
+
+class DayOccupancy:
+    """Occupied minutes of one day as a bitmap: bit i is set while minute i is taken"""
+    
+    def __init__(self):
+        self._intervals: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._mask = 0
+    
+    @property
+    def is_empty(self) -> bool:
+        return not self._intervals
+    
+    @property
+    def mask(self) -> int:
+        return self._mask
+    
+    def add(self, key: Tuple[str, str], start_minute: int, end_minute: int) -> None:
+        """Mark the minutes [start_minute, end_minute) as taken by key"""
+        self._intervals[key] = (start_minute, end_minute)
+        self._mask |= _minute_mask(start_minute, end_minute)
+    
+    def remove(self, key: Tuple[str, str]) -> None:
+        """Release the minutes taken by key, keeping those other keys still take"""
+        if self._intervals.pop(key, None) is None:
+            return
+        # Rebuild from the few intervals of the day, since they may overlap
+        self._mask = 0
+        for start_minute, end_minute in self._intervals.values():
+            self._mask |= _minute_mask(start_minute, end_minute)
+    
+    def is_free(self, start_minute: int, end_minute: int) -> bool:
+        """Check if no minute of [start_minute, end_minute) is taken"""
+        return not self._mask & _minute_mask(start_minute, end_minute)
+    
+    def free_ranges(self, start_minute: int, end_minute: int) -> Iterator[Tuple[int, int]]:
+        """Iterate over the maximal free minute ranges within [start_minute, end_minute)"""
+        free = ~self._mask & _minute_mask(start_minute, end_minute)
+        while free:
+            # Lowest free minute, then the length of the run of free minutes from it
+            run_start = (free & -free).bit_length() - 1
+            run = free >> run_start
+            run_length = (run ^ (run + 1)).bit_length() - 1
+            yield run_start, run_start + run_length
+            free &= ~_minute_mask(run_start, run_start + run_length)
+
 class Schedule:
     def __init__(self, schedule_id: str, doctor_id: str):
         self._schedule_id = schedule_id
         self._doctor_id = doctor_id
         self._working_hours: Dict[DayOfWeek, TimeRange] = {}
-        self._blocked_slots: List[TimeSlot] = []
-        self._available_slots: List[TimeSlot] = []
+        self._blocked_slots: Dict[str, TimeSlot] = {}
+        self._available_slots: Dict[str, TimeSlot] = {}
+        # Available slots and occupied minutes (blocked or booked) per day,
+        # so availability reads never scan the whole schedule
+        self._available_slots_by_day: Dict[date, Dict[str, TimeSlot]] = {}
+        self._occupancy: Dict[date, DayOccupancy] = {}
         self._last_updated = datetime.now()
     
     @property
@@ -40,11 +116,11 @@ class Schedule:
     
     @property
     def blocked_slots(self) -> List[TimeSlot]:
-        return self._blocked_slots
+        return list(self._blocked_slots.values())
     
     @property
     def available_slots(self) -> List[TimeSlot]:
-        return self._available_slots
+        return list(self._available_slots.values())
     
     @property
     def last_updated(self) -> datetime:
@@ -52,32 +128,81 @@ class Schedule:
     
     def add_blocked_time(self, time_slot: TimeSlot) -> bool:
         """Add a blocked time slot"""
-        self._blocked_slots.append(time_slot)
+        self._blocked_slots[time_slot.slot_id] = time_slot
         # Remove from available slots if present
-        self._available_slots = [slot for slot in self._available_slots 
-                               if slot.slot_id != time_slot.slot_id]
+        self._remove_available_slot(time_slot.slot_id)
+        self._occupy(('blocked', time_slot.slot_id), time_slot)
         self._last_updated = datetime.now()
         return True
     
     def remove_blocked_time(self, time_slot: TimeSlot) -> bool:
         """Remove a blocked time slot"""
-        self._blocked_slots = [slot for slot in self._blocked_slots 
-                             if slot.slot_id != time_slot.slot_id]
+        blocked = self._blocked_slots.pop(time_slot.slot_id, time_slot)
+        self._release(('blocked', time_slot.slot_id), blocked)
         # Add to available slots
-        self._available_slots.append(time_slot)
+        self._available_slots[time_slot.slot_id] = time_slot
+        self._available_slots_by_day.setdefault(time_slot.start_time.date(), {})[time_slot.slot_id] = time_slot
+        self._last_updated = datetime.now()
+        return True
+    
+    def book_slot(self, time_slot: TimeSlot) -> bool:
+        """Book a time slot if none of its time is blocked or booked"""
+        if not self.is_range_available(time_slot.start_time, time_slot.end_time):
+            return False
+        if not time_slot.book():
+            return False
+        self._occupy(('booked', time_slot.slot_id), time_slot)
+        self._last_updated = datetime.now()
+        return True
+    
+    def release_slot(self, time_slot: TimeSlot) -> bool:
+        """Release a booked time slot"""
+        if not time_slot.release():
+            return False
+        self._release(('booked', time_slot.slot_id), time_slot)
         self._last_updated = datetime.now()
         return True
     
     def get_available_slots(self, date: datetime) -> List[TimeSlot]:
         """Get available time slots for a specific date"""
-        # Filter available slots for the given date
-        day_slots = []
-        for slot in self._available_slots:
-            if (slot.start_time.year == date.year and 
-                slot.start_time.month == date.month and 
-                slot.start_time.day == date.day):
-                day_slots.append(slot)
-        return day_slots
+        day = date.date() if isinstance(date, datetime) else date
+        day_slots = self._available_slots_by_day.get(day, {})
+        return [slot for slot in day_slots.values() if slot.is_available()]
+    
+    def get_free_time_ranges(self, date: datetime, min_duration: int = 1) -> List[TimeRange]:
+        """Get the free time ranges of at least min_duration minutes within the working hours of a date"""
+        day = date.date() if isinstance(date, datetime) else date
+        working_range = self._working_hours.get(DayOfWeek(day.weekday()))
+        if working_range is None:
+            return []
+        start_minute = _minute_of(working_range.start_time.time())
+        end_minute = _minute_of(working_range.end_time.time())
+        occupancy = self._occupancy.get(day, DayOccupancy())
+        midnight = datetime.combine(day, time.min)
+        return [
+            TimeRange(midnight + timedelta(minutes=run_start), midnight + timedelta(minutes=run_end))
+            for run_start, run_end in occupancy.free_ranges(start_minute, end_minute)
+            if run_end - run_start >= min_duration
+        ]
+    
+    def get_free_minute_mask(self, date: datetime) -> int:
+        """Get a bitmap of the free minutes of a date within its working hours: bit i is set while minute i is free"""
+        day = date.date() if isinstance(date, datetime) else date
+        working_range = self._working_hours.get(DayOfWeek(day.weekday()))
+        if working_range is None:
+            return 0
+        working_mask = _minute_mask(_minute_of(working_range.start_time.time()),
+                                    _minute_of(working_range.end_time.time()))
+        occupancy = self._occupancy.get(day)
+        return working_mask if occupancy is None else working_mask & ~occupancy.mask
+    
+    def is_range_available(self, start_time: datetime, end_time: datetime) -> bool:
+        """Check if no part of a time range is blocked or booked"""
+        for day, start_minute, end_minute in _day_spans(start_time, end_time):
+            occupancy = self._occupancy.get(day)
+            if occupancy is not None and not occupancy.is_free(start_minute, end_minute):
+                return False
+        return True
     
     def check_availability(self, date_time: datetime) -> bool:
         """Check if a specific date and time is available"""
@@ -90,9 +215,35 @@ class Schedule:
         if not (working_range.start_time.time() <= date_time.time() <= working_range.end_time.time()):
             return False
         
-        # Check if the datetime is not in any blocked slot
-        for blocked in self._blocked_slots:
-            if blocked.start_time <= date_time < blocked.end_time:
-                return False
-        
-        return True
+        # Check if the minute is not blocked or booked
+        occupancy = self._occupancy.get(date_time.date())
+        if occupancy is None:
+            return True
+        minute = _minute_of(date_time.time())
+        return occupancy.is_free(minute, minute + 1)
+    
+    def _remove_available_slot(self, slot_id: str) -> None:
+        """Remove a slot from the available slots and their per-day index"""
+        slot = self._available_slots.pop(slot_id, None)
+        if slot is None:
+            return
+        day = slot.start_time.date()
+        day_slots = self._available_slots_by_day.get(day)
+        if day_slots is not None:
+            day_slots.pop(slot_id, None)
+            if not day_slots:
+                del self._available_slots_by_day[day]
+    
+    def _occupy(self, key: Tuple[str, str], time_slot: TimeSlot) -> None:
+        """Mark the minutes of a slot as taken in the occupancy of each day it covers"""
+        for day, start_minute, end_minute in _day_spans(time_slot.start_time, time_slot.end_time):
+            self._occupancy.setdefault(day, DayOccupancy()).add(key, start_minute, end_minute)
+    
+    def _release(self, key: Tuple[str, str], time_slot: TimeSlot) -> None:
+        """Release the minutes of a slot in the occupancy of each day it covers"""
+        for day, _, _ in _day_spans(time_slot.start_time, time_slot.end_time):
+            occupancy = self._occupancy.get(day)
+            if occupancy is not None:
+                occupancy.remove(key)
+                if occupancy.is_empty:
+                    del self._occupancy[day]
@@ -2,6 +2,8 @@ from datetime import datetime
 from .enums import SlotStatus
 
 class TimeSlot:
+    __slots__ = ('_slot_id', '_start_time', '_end_time', '_status')
+    
     def __init__(self, slot_id: str, start_time: datetime, end_time: datetime, 
                  status: SlotStatus = SlotStatus.AVAILABLE):
         self._slot_id = slot_id
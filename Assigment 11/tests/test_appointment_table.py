@@ -0,0 +1,187 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from src.appointment import Appointment
+from src.enums import AppointmentStatus, AppointmentType
+from repositories.inmemory.appointment_table import AppointmentTable
+from repositories.inmemory.inmemory_appointment_repository import InMemoryAppointmentRepository
+from repositories.repository import ConcurrentModificationError
+
+class TestAppointmentTable(unittest.TestCase):
+    """
+    Test case for the AppointmentTable class and columnar in-memory storage.
+    """
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.table = AppointmentTable()
+        self.date_time = datetime(2025, 5, 1, 9, 30, 15, 250)
+        self.appointments = [
+            Appointment(
+                appointment_id=f"appointment{i}",
+                patient_id=f"patient{i % 2}",
+                doctor_id="doctor1",
+                date_time=self.date_time + timedelta(hours=i),
+                duration=30,
+                appointment_type=AppointmentType.FOLLOW_UP,
+                status=AppointmentStatus.CONFIRMED,
+                notes=f"Note {i}"
+            )
+            for i in range(3)
+        ]
+    
+    def test_round_trip(self):
+        """Test that a stored appointment reads back with the same values."""
+        appointment = self.appointments[0]
+        self.table[appointment.appointment_id] = appointment
+        
+        found = self.table["appointment0"]
+        self.assertIsNot(found, appointment)
+        self.assertEqual(found.appointment_id, "appointment0")
+        self.assertEqual(found.patient_id, "patient0")
+        self.assertEqual(found.doctor_id, "doctor1")
+        self.assertEqual(found.date_time, self.date_time)
+        self.assertEqual(found.duration, 30)
+        self.assertEqual(found.type, AppointmentType.FOLLOW_UP)
+        self.assertEqual(found.status, AppointmentStatus.CONFIRMED)
+        self.assertEqual(found.notes, "Note 0")
+        self.assertEqual(found.created_at, appointment.created_at)
+        self.assertEqual(found.updated_at, appointment.updated_at)
+    
+    def test_overwrite_and_delete(self):
+        """Test overwriting a row and deleting rows from the middle and the end."""
+        for appointment in self.appointments:
+            self.table[appointment.appointment_id] = appointment
+        
+        # Overwrite a row in place
+        self.appointments[1].cancel("Patient request")
+        self.table["appointment1"] = self.appointments[1]
+        self.assertEqual(len(self.table), 3)
+        self.assertEqual(self.table["appointment1"].status, AppointmentStatus.CANCELLED)
+        
+        # Delete a middle row, which moves the last row into its place
+        del self.table["appointment0"]
+        self.assertEqual(sorted(self.table), ["appointment1", "appointment2"])
+        self.assertEqual(self.table["appointment2"].date_time, self.date_time + timedelta(hours=2))
+        self.assertNotIn("appointment0", self.table)
+        
+        # Delete the last row
+        del self.table["appointment1"]
+        self.assertEqual(list(self.table), ["appointment2"])
+        with self.assertRaises(KeyError):
+            self.table["appointment1"]
+    
+    def test_columnar_repository(self):
+        """Test that the in-memory repository works on top of the table."""
+        repository = InMemoryAppointmentRepository(columnar=True)
+        for appointment in self.appointments:
+            repository.save(appointment)
+        repository.delete("appointment1")
+        
+        self.assertIsInstance(repository._storage, AppointmentTable)
+        self.assertEqual(
+            [a.appointment_id for a in repository.find_by_doctor_id("doctor1")],
+            ["appointment0", "appointment2"]
+        )
+        self.assertEqual(
+            [a.appointment_id for a in repository.find_by_patient_id("patient0")],
+            ["appointment0", "appointment2"]
+        )
+        self.assertEqual(repository.find_by_id("appointment2").notes, "Note 2")
+        self.assertEqual(len(repository.find_all()), 2)
+    
+    def test_columnar_repository_reindexes_from_rows(self):
+        """Test that the time-based finders follow saves, reschedules and deletes."""
+        repository = InMemoryAppointmentRepository(columnar=True)
+        for appointment in self.appointments:
+            repository.save(appointment)
+        
+        # Move the first appointment after the last one and cancel the second
+        moved = repository.find_by_id("appointment0")
+        moved.reschedule(self.date_time + timedelta(hours=5))
+        repository.save(moved)
+        cancelled = repository.find_by_id("appointment1")
+        cancelled.cancel("Patient request")
+        repository.save(cancelled)
+        
+        self.assertEqual(
+            [a.appointment_id for a in repository.find_by_date_range(self.date_time, self.date_time + timedelta(days=1))],
+            ["appointment1", "appointment2", "appointment0"]
+        )
+        self.assertEqual(
+            [a.appointment_id for a in repository.find_overlapping(
+                "doctor1", self.date_time, self.date_time + timedelta(hours=6))],
+            ["appointment2", "appointment0"]
+        )
+        first_page = repository.find_page(2)
+        self.assertEqual([a.appointment_id for a in first_page], ["appointment1", "appointment2"])
+        self.assertEqual([a.appointment_id for a in repository.find_page(2, first_page.next_cursor)],
+                         ["appointment0"])
+        
+        repository.delete("appointment2")
+        self.assertEqual(
+            [a.appointment_id for a in repository.find_overlapping(
+                "doctor1", self.date_time, self.date_time + timedelta(hours=6))],
+            ["appointment0"]
+        )
+    
+    def test_aware_date_time_is_rejected(self):
+        """Test that an aware date/time is rejected instead of stored shifted."""
+        repository = InMemoryAppointmentRepository(columnar=True)
+        repository.save(self.appointments[0])
+        
+        changed = repository.find_by_id("appointment0")
+        changed.reschedule(datetime(2025, 5, 2, 9, 0, tzinfo=timezone.utc))
+        with self.assertRaises(ValueError):
+            repository.save(changed)
+        
+        # The stored row and its index entries are unchanged
+        self.assertEqual(repository.find_by_id("appointment0").date_time, self.date_time)
+        self.assertEqual(
+            [a.appointment_id for a in repository.find_overlapping(
+                "doctor1", self.date_time, self.date_time + timedelta(minutes=1))],
+            ["appointment0"]
+        )
+    
+    def test_failed_save_can_be_retried(self):
+        """Test that a rejected save leaves the version alone, so the corrected save succeeds."""
+        repository = InMemoryAppointmentRepository(columnar=True)
+        repository.save(self.appointments[0])
+        
+        changed = repository.find_by_id("appointment0")
+        changed.reschedule(datetime(2025, 5, 2, 9, 0, tzinfo=timezone.utc))
+        with self.assertRaises(ValueError):
+            repository.save(changed)
+        self.assertEqual(changed.version, 1)
+        
+        changed.reschedule(datetime(2025, 5, 2, 9, 0))
+        repository.save(changed)
+        self.assertEqual(changed.version, 2)
+        self.assertEqual(repository.find_by_id("appointment0").date_time, datetime(2025, 5, 2, 9, 0))
+    
+    def test_concurrent_save_is_rejected(self):
+        """Test that saving an appointment read at an outdated version fails."""
+        repository = InMemoryAppointmentRepository(columnar=True)
+        repository.save(self.appointments[0])
+        self.assertEqual(self.appointments[0].version, 1)
+        
+        # Two readers get their own copies at version 1
+        first = repository.find_by_id("appointment0")
+        second = repository.find_by_id("appointment0")
+        first.reschedule(self.date_time + timedelta(days=1))
+        repository.save(first)
+        self.assertEqual(repository.find_by_id("appointment0").version, 2)
+        
+        # The second writer lost the race and must re-read
+        second.cancel("Patient request")
+        with self.assertRaises(ConcurrentModificationError):
+            repository.save(second)
+        stored = repository.find_by_id("appointment0")
+        self.assertEqual(stored.status, AppointmentStatus.CONFIRMED)
+        self.assertEqual(stored.date_time, self.date_time + timedelta(days=1))
+    
+    def test_entities_have_no_instance_dict(self):
+        """Test that appointments use slots instead of a per-instance dictionary."""
+        self.assertFalse(hasattr(self.appointments[0], "__dict__"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from src.appointment import Appointment
+from src.contact_info import ContactInfo
+from src.enums import AppointmentType
+from src.patient import Patient
+from factories.repository_factory import RepositoryFactory, StorageType
+from repositories.patient_repository import PatientRepository
+from repositories.appointment_repository import AppointmentRepository
+from repositories.aio import base_async_repository
+from repositories.aio.async_patient_repository import (
+    AsyncInMemoryPatientRepository, AsyncDatabasePatientRepository
+)
+from repositories.aio.async_appointment_repository import AsyncFileSystemAppointmentRepository
+
+class TestAsyncRepository(unittest.TestCase):
+    """
+    Test case for the asyncio repositories.
+    """
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.directory = tempfile.mkdtemp()
+        self.patient = Patient(
+            patient_id="patient1",
+            name="John Doe",
+            date_of_birth=datetime(1980, 1, 1).date(),
+            medical_history_id="mh1",
+            contact_info=ContactInfo(
+                email="john.doe@example.com",
+                phone="123-456-7890",
+                address="123 Main St, Anytown, USA"
+            )
+        )
+    
+    def tearDown(self):
+        """Tear down the test case."""
+        shutil.rmtree(self.directory)
+    
+    def _create_appointment(self, i):
+        """Create a sample appointment for testing."""
+        return Appointment(
+            appointment_id=f"appointment{i:03d}",
+            patient_id="patient1",
+            doctor_id="doctor1",
+            date_time=datetime(2025, 5, 1, 9, 0) + timedelta(minutes=30 * i),
+            duration=30,
+            appointment_type=AppointmentType.CONSULTATION
+        )
+    
+    def test_in_memory_repository(self):
+        """Test saving, finding and deleting a patient with the in-memory repository."""
+        repository = AsyncInMemoryPatientRepository()
+        
+        async def run():
+            await repository.save(self.patient)
+            found = await repository.find_by_id("patient1")
+            by_email = await repository.find_by_email("JOHN.DOE@example.com")
+            by_name = await repository.find_by_name("john")
+            await repository.delete("patient1")
+            return found, by_email, by_name, await repository.find_all()
+        
+        found, by_email, by_name, remaining = asyncio.run(run())
+        
+        self.assertEqual(found.patient_id, "patient1")
+        self.assertEqual(by_email.patient_id, "patient1")
+        self.assertEqual([patient.patient_id for patient in by_name], ["patient1"])
+        self.assertEqual(remaining, [])
+    
+    def test_database_repository_runs_off_the_event_loop(self):
+        """Test that database queries run on worker threads and overlap."""
+        repository = AsyncDatabasePatientRepository(os.path.join(self.directory, "test.db"))
+        threads = set()
+        find_by_id = repository._repository.find_by_id
+        
+        def recording_find_by_id(id):
+            threads.add(threading.get_ident())
+            return find_by_id(id)
+        repository._repository.find_by_id = recording_find_by_id
+        
+        async def run():
+            await repository.save(self.patient)
+            results = await asyncio.gather(*(repository.find_by_id("patient1") for _ in range(8)))
+            await repository.close()
+            return results
+        
+        results = asyncio.run(run())
+        
+        self.assertTrue(all(patient.name == "John Doe" for patient in results))
+        self.assertNotIn(threading.get_ident(), threads)
+    
+    def test_iter_all_in_batches(self):
+        """Test that iterating a threaded repository returns every entity across batches."""
+        file_path = os.path.join(self.directory, "appointments.json")
+        repository = AsyncFileSystemAppointmentRepository(file_path, fsync=False)
+        original_batch_size = base_async_repository.ITER_BATCH_SIZE
+        base_async_repository.ITER_BATCH_SIZE = 3
+        
+        async def run():
+            for i in range(7):
+                await repository.save(self._create_appointment(i))
+            ids = [appointment.appointment_id async for appointment in repository.iter_all()]
+            page = await repository.find_page(2, descending=True)
+            await repository.close()
+            return ids, page
+        
+        try:
+            ids, page = asyncio.run(run())
+        finally:
+            base_async_repository.ITER_BATCH_SIZE = original_batch_size
+        
+        self.assertEqual(sorted(ids), [f"appointment{i:03d}" for i in range(7)])
+        self.assertEqual([a.appointment_id for a in page.items], ["appointment006", "appointment005"])
+    
+    def test_factory_returns_async_repositories(self):
+        """Test getting asyncio repositories from the factory."""
+        repository = RepositoryFactory.get_repository(PatientRepository, StorageType.MEMORY, asynchronous=True)
+        self.assertIsInstance(repository, AsyncInMemoryPatientRepository)
+        
+        repository = RepositoryFactory.get_repository(
+            AppointmentRepository, StorageType.FILE_SYSTEM, asynchronous=True,
+            file_path=os.path.join(self.directory, "appointments.json")
+        )
+        self.assertIsInstance(repository, AsyncFileSystemAppointmentRepository)
+        asyncio.run(repository.close())
+        
+        with self.assertRaises(ValueError):
+            RepositoryFactory.get_repository(AppointmentRepository, StorageType.SHARED_MEMORY, asynchronous=True)
+
+if __name__ == "__main__":
+    unittest.main()
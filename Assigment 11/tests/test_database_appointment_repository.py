@@ -0,0 +1,203 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from src.appointment import Appointment
+from src.enums import AppointmentStatus, AppointmentType
+from repositories.database.database_appointment_repository import DatabaseAppointmentRepository
+
+class TestDatabaseAppointmentRepository(unittest.TestCase):
+    """
+    Test case for the DatabaseAppointmentRepository class.
+    """
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.directory = tempfile.mkdtemp()
+        self.database_path = os.path.join(self.directory, "appointment_system.db")
+        self.repository = DatabaseAppointmentRepository(self.database_path)
+        
+        # Create test appointments
+        self.start = datetime(2030, 1, 7, 9, 0)
+        
+        self.appointment1 = Appointment(
+            appointment_id="appointment1",
+            patient_id="patient1",
+            doctor_id="doctor1",
+            date_time=self.start,
+            duration=30,
+            appointment_type=AppointmentType.REGULAR,
+            status=AppointmentStatus.SCHEDULED,
+            notes="Regular checkup"
+        )
+        
+        self.appointment2 = Appointment(
+            appointment_id="appointment2",
+            patient_id="patient1",
+            doctor_id="doctor1",
+            date_time=self.start + timedelta(days=1),
+            duration=30,
+            appointment_type=AppointmentType.FOLLOW_UP,
+            status=AppointmentStatus.SCHEDULED,
+            notes="Follow-up"
+        )
+    
+    def tearDown(self):
+        """Tear down the test case."""
+        self.repository.close()
+        shutil.rmtree(self.directory)
+    
+    def test_save_and_find_by_id(self):
+        """Test saving an appointment and finding it by ID."""
+        # Save an appointment
+        self.repository.save(self.appointment1)
+        
+        # Find the appointment by ID
+        found_appointment = self.repository.find_by_id("appointment1")
+        
+        # Assert that the found appointment matches the saved appointment
+        self.assertIsNotNone(found_appointment)
+        self.assertEqual(found_appointment.patient_id, "patient1")
+        self.assertEqual(found_appointment.date_time, self.start)
+        self.assertEqual(found_appointment.type, AppointmentType.REGULAR)
+        self.assertEqual(found_appointment.status, AppointmentStatus.SCHEDULED)
+        self.assertEqual(found_appointment.created_at, self.appointment1.created_at)
+    
+    def test_save_replaces_existing_row(self):
+        """Test that saving an existing appointment updates it."""
+        # Save an appointment, cancel it and save it again
+        self.repository.save(self.appointment1)
+        self.appointment1.cancel("Patient request")
+        self.repository.save(self.appointment1)
+        
+        # Assert that there is one cancelled appointment
+        self.assertEqual(len(self.repository.find_all()), 1)
+        self.assertEqual(self.repository.find_by_id("appointment1").status, AppointmentStatus.CANCELLED)
+    
+    def test_delete(self):
+        """Test deleting an appointment."""
+        # Save an appointment and delete it
+        self.repository.save(self.appointment1)
+        self.repository.delete("appointment1")
+        
+        # Assert that the appointment is deleted
+        self.assertIsNone(self.repository.find_by_id("appointment1"))
+    
+    def test_find_by_patient_and_doctor_id(self):
+        """Test finding appointments by patient and doctor ID."""
+        # Save two appointments
+        self.repository.save(self.appointment2)
+        self.repository.save(self.appointment1)
+        
+        # Assert that both are found in chronological order
+        self.assertEqual(
+            [a.appointment_id for a in self.repository.find_by_patient_id("patient1")],
+            ["appointment1", "appointment2"]
+        )
+        self.assertEqual(len(self.repository.find_by_doctor_id("doctor1")), 2)
+        self.assertEqual(self.repository.find_by_doctor_id("doctor2"), [])
+    
+    def test_find_by_date_range(self):
+        """Test finding appointments within a date range."""
+        # Save two appointments
+        self.repository.save(self.appointment1)
+        self.repository.save(self.appointment2)
+        
+        # Find appointments on the second day
+        found_appointments = self.repository.find_by_date_range(
+            self.start + timedelta(hours=1), self.start + timedelta(days=1)
+        )
+        
+        # Assert that only the second appointment is found
+        self.assertEqual([a.appointment_id for a in found_appointments], ["appointment2"])
+    
+    def test_find_overlapping(self):
+        """Test finding a doctor's appointments that overlap a time interval."""
+        # Save two appointments and cancel the second one
+        self.repository.save(self.appointment1)
+        self.appointment2.cancel("Patient request")
+        self.repository.save(self.appointment2)
+        
+        # An interval inside the first appointment overlaps it
+        found_appointments = self.repository.find_overlapping(
+            "doctor1", self.start + timedelta(minutes=10), self.start + timedelta(minutes=20)
+        )
+        self.assertEqual([a.appointment_id for a in found_appointments], ["appointment1"])
+        
+        # Adjacent intervals and cancelled appointments do not overlap
+        self.assertEqual(self.repository.find_overlapping(
+            "doctor1", self.start + timedelta(minutes=30), self.start + timedelta(minutes=60)
+        ), [])
+        self.assertEqual(self.repository.find_overlapping(
+            "doctor1", self.appointment2.date_time, self.appointment2.date_time + timedelta(minutes=30)
+        ), [])
+    
+    def test_find_page(self):
+        """Test paging through appointments with cursors and filters."""
+        # Save three appointments, two of them at the same time
+        self.repository.save(self.appointment2)
+        self.repository.save(self.appointment1)
+        self.repository.save(Appointment(
+            appointment_id="appointment0",
+            patient_id="patient2",
+            doctor_id="doctor2",
+            date_time=self.appointment1.date_time,
+            duration=30,
+            appointment_type=AppointmentType.FOLLOW_UP,
+            status=AppointmentStatus.SCHEDULED,
+            notes="Follow-up"
+        ))
+        
+        # Page through in date/time order, ties broken by ID
+        first_page = self.repository.find_page(2)
+        self.assertEqual([a.appointment_id for a in first_page], ["appointment0", "appointment1"])
+        self.assertIsNotNone(first_page.next_cursor)
+        second_page = self.repository.find_page(2, first_page.next_cursor)
+        self.assertEqual([a.appointment_id for a in second_page], ["appointment2"])
+        self.assertIsNone(second_page.next_cursor)
+        
+        # Page through in reverse order
+        first_page = self.repository.find_page(2, descending=True)
+        self.assertEqual([a.appointment_id for a in first_page], ["appointment2", "appointment1"])
+        second_page = self.repository.find_page(2, first_page.next_cursor, descending=True)
+        self.assertEqual([a.appointment_id for a in second_page], ["appointment0"])
+        
+        # Filter by type and date window
+        page = self.repository.find_page(10, appointment_type=AppointmentType.FOLLOW_UP,
+                                         end_date=self.appointment1.date_time)
+        self.assertEqual([a.appointment_id for a in page], ["appointment0"])
+        self.assertEqual(len(self.repository.find_page(10, status=AppointmentStatus.CANCELLED)), 0)
+        
+        # Reject invalid cursors and limits
+        with self.assertRaises(ValueError):
+            self.repository.find_page(2, "not-a-cursor")
+        with self.assertRaises(ValueError):
+            self.repository.find_page(0)
+    
+    def test_concurrent_saves(self):
+        """Test that repositories can be used from several threads at once."""
+        # Save appointments from several threads
+        def save_appointments(thread_index):
+            for i in range(20):
+                self.repository.save(Appointment(
+                    appointment_id=f"appointment-{thread_index}-{i}",
+                    patient_id=f"patient{thread_index}",
+                    doctor_id="doctor1",
+                    date_time=self.start + timedelta(hours=i),
+                    duration=30,
+                    appointment_type=AppointmentType.REGULAR
+                ))
+        
+        threads = [threading.Thread(target=save_appointments, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Assert that every appointment was saved
+        self.assertEqual(len(self.repository.find_all()), 160)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.doctor import Doctor
+from src.contact_info import ContactInfo
+from repositories.database.database_doctor_repository import DatabaseDoctorRepository
+
+class TestDatabaseDoctorRepository(unittest.TestCase):
+    """
+    Test case for the DatabaseDoctorRepository class.
+    """
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.directory = tempfile.mkdtemp()
+        self.repository = DatabaseDoctorRepository(os.path.join(self.directory, "appointment_system.db"))
+        
+        # Create test doctors
+        self.doctor1 = Doctor(
+            doctor_id="doctor1",
+            name="Dr. Smith",
+            specialization="Cardiology",
+            department="Cardiology",
+            license_number="LIC123",
+            contact_info=ContactInfo("dr.smith@example.com", "123-456-7890", "123 Medical Center, Anytown, USA")
+        )
+        self.doctor2 = Doctor(
+            doctor_id="doctor2",
+            name="Dr. Jones",
+            specialization="Neurology",
+            department="Neurology",
+            license_number="LIC456",
+            contact_info=ContactInfo("dr.jones@example.com", "987-654-3210", "456 Hospital St, Anytown, USA")
+        )
+    
+    def tearDown(self):
+        """Tear down the test case."""
+        self.repository.close()
+        shutil.rmtree(self.directory)
+    
+    def test_find_by_specialization(self):
+        """Test finding doctors by specialization."""
+        # Save two doctors
+        self.repository.save(self.doctor1)
+        self.repository.save(self.doctor2)
+        
+        # Find doctors by specialization
+        found_doctors = self.repository.find_by_specialization("Cardiology")
+        
+        # Assert that the correct doctor is found with all its fields
+        self.assertEqual(len(found_doctors), 1)
+        self.assertEqual(found_doctors[0].doctor_id, "doctor1")
+        self.assertEqual(found_doctors[0].license_number, "LIC123")
+        self.assertEqual(found_doctors[0].email, "dr.smith@example.com")
+    
+    def test_find_by_name(self):
+        """Test finding doctors by name."""
+        # Save two doctors
+        self.repository.save(self.doctor1)
+        self.repository.save(self.doctor2)
+        
+        # Find doctors by name
+        found_doctors = self.repository.find_by_name("jones")
+        
+        # Assert that the correct doctor is found
+        self.assertEqual([d.doctor_id for d in found_doctors], ["doctor2"])
+    
+    def test_find_by_name_ignores_accents_and_ranks_matches(self):
+        """Test that name search folds accents and ranks better matches first."""
+        # Save doctors whose names contain "jo" at different positions
+        self.repository.save(self.doctor2)
+        for doctor_id, name in (("doctor1", "Dr. Rojo"), ("doctor3", "José Álvarez")):
+            self.repository.save(Doctor(doctor_id, name, "Cardiology", "Cardiology", "LIC789",
+                                        self.doctor1.contact_info))
+        
+        # Assert that matches are ranked like the in-memory index ranks them
+        found_doctors = self.repository.find_by_name("JO")
+        self.assertEqual([d.doctor_id for d in found_doctors], ["doctor3", "doctor2", "doctor1"])
+        self.assertEqual([d.doctor_id for d in self.repository.find_by_name("jo", limit=1)], ["doctor3"])
+        self.assertEqual([d.doctor_id for d in self.repository.find_by_name("alvarez")], ["doctor3"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from src.patient import Patient
+from src.contact_info import ContactInfo
+from repositories.database.database_patient_repository import DatabasePatientRepository
+from repositories.database.connection_pool import ConnectionPool
+from repositories.database.database_doctor_repository import DatabaseDoctorRepository
+
+class TestDatabasePatientRepository(unittest.TestCase):
+    """
+    Test case for the DatabasePatientRepository class.
+    """
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.directory = tempfile.mkdtemp()
+        self.database_path = os.path.join(self.directory, "appointment_system.db")
+        self.repository = DatabasePatientRepository(self.database_path)
+        
+        # Create a test patient
+        contact_info = ContactInfo(
+            email="john.doe@example.com",
+            phone="123-456-7890",
+            address="123 Main St, Anytown, USA"
+        )
+        self.patient = Patient(
+            patient_id="patient1",
+            name="John Doe",
+            date_of_birth=datetime(1980, 1, 1).date(),
+            medical_history_id="mh1",
+            contact_info=contact_info
+        )
+    
+    def tearDown(self):
+        """Tear down the test case."""
+        self.repository.close()
+        shutil.rmtree(self.directory)
+    
+    def test_save_and_find_by_id(self):
+        """Test saving a patient and finding it by ID."""
+        # Save a patient
+        self.repository.save(self.patient)
+        
+        # Find the patient by ID
+        found_patient = self.repository.find_by_id("patient1")
+        
+        # Assert that the found patient matches the saved patient
+        self.assertIsNotNone(found_patient)
+        self.assertEqual(found_patient.name, "John Doe")
+        self.assertEqual(found_patient.date_of_birth, self.patient.date_of_birth)
+        self.assertEqual(found_patient.email, "john.doe@example.com")
+    
+    def test_find_by_email_and_name(self):
+        """Test finding a patient by email and by part of the name."""
+        # Save a patient
+        self.repository.save(self.patient)
+        
+        # Assert that the patient is found by email and name
+        self.assertEqual(self.repository.find_by_email("john.doe@example.com").patient_id, "patient1")
+        self.assertIsNone(self.repository.find_by_email("nobody@example.com"))
+        self.assertEqual(len(self.repository.find_by_name("doe")), 1)
+        self.assertEqual(self.repository.find_by_name("Smith"), [])
+    
+    def test_iter_all(self):
+        """Test iterating over patients across several fetched batches."""
+        # Save five patients
+        for i in range(5):
+            self.repository.save(Patient(
+                patient_id=f"patient{i}",
+                name=f"Patient {i}",
+                date_of_birth=self.patient.date_of_birth,
+                medical_history_id=f"history{i}",
+                contact_info=self.patient.contact_info
+            ))
+        
+        # Assert that all patients are yielded in ID order
+        patient_ids = [p.patient_id for p in self.repository.iter_all(batch_size=2)]
+        self.assertEqual(patient_ids, [f"patient{i}" for i in range(5)])
+    
+    def test_repositories_share_database(self):
+        """Test that repositories of different entities can use the same database."""
+        # Create a doctor repository on the same database
+        doctor_repository = DatabaseDoctorRepository(self.database_path)
+        self.repository.save(self.patient)
+        
+        # Assert that both tables exist and are independent
+        self.assertEqual(doctor_repository.find_all(), [])
+        self.assertEqual(len(self.repository.find_all()), 1)
+    
+    def test_closing_one_repository_keeps_shared_pool_open(self):
+        """Test that the shared pool stays open until every repository using it is closed."""
+        # Create a doctor repository on the same database and close it
+        doctor_repository = DatabaseDoctorRepository(self.database_path)
+        pool = ConnectionPool.for_database(self.database_path)
+        pool.release()
+        doctor_repository.close()
+        doctor_repository.close()
+        
+        # Assert that the patient repository still uses the same open pool
+        self.repository.save(self.patient)
+        self.assertIsNotNone(self.repository.find_by_id("patient1"))
+        self.assertIs(ConnectionPool._pools.get(self.database_path), pool)
+        
+        # Assert that the pool is dropped with its last user
+        self.repository.close()
+        self.assertNotIn(self.database_path, ConnectionPool._pools)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from src.appointment import Appointment
+from src.enums import AppointmentStatus, AppointmentType
+from repositories.filesystem.filesystem_appointment_repository import FileSystemAppointmentRepository
+
+class TestFileSystemAppointmentRepository(unittest.TestCase):
+    """
+    Test case for the FileSystemAppointmentRepository class.
+    """
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "appointments.json")
+        self.repository = FileSystemAppointmentRepository(self.file_path)
+        
+        # Create test appointments
+        self.start = datetime(2030, 1, 7, 9, 0)
+        
+        self.appointment1 = Appointment(
+            appointment_id="appointment1",
+            patient_id="patient1",
+            doctor_id="doctor1",
+            date_time=self.start,
+            duration=30,
+            appointment_type=AppointmentType.REGULAR,
+            status=AppointmentStatus.SCHEDULED,
+            notes="Regular checkup"
+        )
+        
+        self.appointment2 = Appointment(
+            appointment_id="appointment2",
+            patient_id="patient2",
+            doctor_id="doctor1",
+            date_time=self.start + timedelta(days=1),
+            duration=45,
+            appointment_type=AppointmentType.FOLLOW_UP,
+            status=AppointmentStatus.CONFIRMED,
+            notes="Follow-up"
+        )
+    
+    def tearDown(self):
+        """Tear down the test case."""
+        self.repository.close()
+        shutil.rmtree(self.directory)
+    
+    def _reopen(self):
+        """Close the repository and load a new one from the same file."""
+        self.repository.close()
+        self.repository = FileSystemAppointmentRepository(self.file_path)
+    
+    def test_save_persists_across_reopen(self):
+        """Test that every appointment field survives reopening the repository."""
+        # Save an appointment and reopen the repository
+        self.repository.save(self.appointment2)
+        self._reopen()
+        
+        # Assert that the loaded appointment matches the saved one
+        found_appointment = self.repository.find_by_id("appointment2")
+        self.assertIsNotNone(found_appointment)
+        self.assertEqual(found_appointment.patient_id, "patient2")
+        self.assertEqual(found_appointment.doctor_id, "doctor1")
+        self.assertEqual(found_appointment.date_time, self.appointment2.date_time)
+        self.assertEqual(found_appointment.duration, 45)
+        self.assertEqual(found_appointment.type, AppointmentType.FOLLOW_UP)
+        self.assertEqual(found_appointment.status, AppointmentStatus.CONFIRMED)
+        self.assertEqual(found_appointment.notes, "Follow-up")
+        self.assertEqual(found_appointment.created_at, self.appointment2.created_at)
+    
+    def test_indexed_queries_after_reopen(self):
+        """Test that the secondary indexes are rebuilt when the repository is loaded."""
+        # Save two appointments, delete one and reopen the repository
+        self.repository.save(self.appointment1)
+        self.repository.save(self.appointment2)
+        self.repository.delete("appointment1")
+        self._reopen()
+        
+        # Assert that the finders only see the remaining appointment
+        self.assertEqual(
+            [a.appointment_id for a in self.repository.find_by_doctor_id("doctor1")],
+            ["appointment2"]
+        )
+        self.assertEqual(self.repository.find_by_patient_id("patient1"), [])
+        self.assertEqual(len(self.repository.find_by_date_range(
+            self.start, self.start + timedelta(days=2)
+        )), 1)
+        self.assertEqual(len(self.repository.find_overlapping(
+            "doctor1", self.appointment2.date_time, self.appointment2.date_time + timedelta(minutes=5)
+        )), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+import unittest
+from src.doctor import Doctor
+from src.contact_info import ContactInfo
+from repositories.filesystem.filesystem_doctor_repository import FileSystemDoctorRepository
+
+class TestFileSystemDoctorRepository(unittest.TestCase):
+    """
+    Test case for the FileSystemDoctorRepository class.
+    """
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "doctors.json")
+        self.repository = FileSystemDoctorRepository(self.file_path)
+        
+        # Create a test doctor
+        contact_info = ContactInfo(
+            email="dr.smith@example.com",
+            phone="123-456-7890",
+            address="123 Medical Center, Anytown, USA"
+        )
+        self.doctor = Doctor(
+            doctor_id="doctor1",
+            name="Dr. Smith",
+            specialization="Cardiology",
+            department="Cardiology",
+            license_number="LIC123",
+            contact_info=contact_info
+        )
+    
+    def tearDown(self):
+        """Tear down the test case."""
+        self.repository.close()
+        shutil.rmtree(self.directory)
+    
+    def test_save_persists_across_reopen(self):
+        """Test that a saved doctor is loaded again after reopening."""
+        # Save a doctor and reopen the repository
+        self.repository.save(self.doctor)
+        self.repository.close()
+        self.repository = FileSystemDoctorRepository(self.file_path)
+        
+        # Assert that the doctor is found with all its fields
+        found_doctor = self.repository.find_by_id("doctor1")
+        self.assertIsNotNone(found_doctor)
+        self.assertEqual(found_doctor.name, "Dr. Smith")
+        self.assertEqual(found_doctor.department, "Cardiology")
+        self.assertEqual(found_doctor.license_number, "LIC123")
+        self.assertEqual(found_doctor.email, "dr.smith@example.com")
+        self.assertEqual(len(self.repository.find_by_specialization("Cardiology")), 1)
+
+if __name__ == "__main__":
+    unittest.main()
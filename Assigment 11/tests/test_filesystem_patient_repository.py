@@ -0,0 +1,139 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from src.patient import Patient
+from src.contact_info import ContactInfo
+from repositories.filesystem.filesystem_patient_repository import FileSystemPatientRepository
+
+class TestFileSystemPatientRepository(unittest.TestCase):
+    """
+    Test case for the FileSystemPatientRepository class.
+    """
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "patients.json")
+        self.repository = FileSystemPatientRepository(self.file_path)
+        
+        # Create test patients
+        contact_info1 = ContactInfo(
+            email="john.doe@example.com",
+            phone="123-456-7890",
+            address="123 Main St, Anytown, USA"
+        )
+        self.patient1 = Patient(
+            patient_id="patient1",
+            name="John Doe",
+            date_of_birth=datetime(1980, 1, 1).date(),
+            medical_history_id="mh1",
+            contact_info=contact_info1
+        )
+        
+        contact_info2 = ContactInfo(
+            email="jane.smith@example.com",
+            phone="987-654-3210",
+            address="456 Oak St, Anytown, USA"
+        )
+        self.patient2 = Patient(
+            patient_id="patient2",
+            name="Jane Smith",
+            date_of_birth=datetime(1985, 5, 15).date(),
+            medical_history_id="mh2",
+            contact_info=contact_info2
+        )
+    
+    def tearDown(self):
+        """Tear down the test case."""
+        self.repository.close()
+        shutil.rmtree(self.directory)
+    
+    def _reopen(self, **kwargs):
+        """Close the repository and load a new one from the same file."""
+        self.repository.close()
+        self.repository = FileSystemPatientRepository(self.file_path, **kwargs)
+    
+    def test_save_persists_across_reopen(self):
+        """Test that saved patients are loaded again from the log."""
+        # Save two patients and reopen the repository
+        self.repository.save(self.patient1)
+        self.repository.save(self.patient2)
+        self._reopen()
+        
+        # Assert that both patients are found
+        found_patient = self.repository.find_by_id("patient1")
+        self.assertIsNotNone(found_patient)
+        self.assertEqual(found_patient.name, self.patient1.name)
+        self.assertEqual(found_patient.date_of_birth, self.patient1.date_of_birth)
+        self.assertEqual(found_patient.email, self.patient1.email)
+        self.assertEqual(len(self.repository.find_all()), 2)
+    
+    def test_delete_persists_across_reopen(self):
+        """Test that deleted patients stay deleted after reopening."""
+        # Save a patient, delete it and reopen the repository
+        self.repository.save(self.patient1)
+        self.repository.delete("patient1")
+        self._reopen()
+        
+        # Assert that the patient is deleted
+        self.assertIsNone(self.repository.find_by_id("patient1"))
+    
+    def test_save_appends_to_log(self):
+        """Test that a save appends a line instead of rewriting the snapshot."""
+        # Save two patients
+        self.repository.save(self.patient1)
+        self.repository.save(self.patient2)
+        
+        # Assert that the snapshot is untouched and the log has one line per save
+        with open(self.file_path) as f:
+            self.assertEqual(f.read(), "{}")
+        with open(self.file_path + ".log") as f:
+            self.assertEqual(len(f.readlines()), 2)
+    
+    def test_compaction(self):
+        """Test that the log is compacted into the snapshot past the threshold."""
+        # Reopen with a small threshold and save three times
+        self._reopen(compaction_threshold=3)
+        self.repository.save(self.patient1)
+        self.repository.save(self.patient2)
+        self.repository.delete("patient1")
+        
+        # Assert that the log is empty and the data survives reopening
+        self.assertEqual(os.path.getsize(self.file_path + ".log"), 0)
+        self._reopen()
+        self.assertIsNone(self.repository.find_by_id("patient1"))
+        self.assertIsNotNone(self.repository.find_by_id("patient2"))
+    
+    def test_torn_log_tail_is_discarded(self):
+        """Test that a partially written last log entry is ignored on load."""
+        # Save a patient and simulate a crash during the next append
+        self.repository.save(self.patient1)
+        self.repository.close()
+        with open(self.file_path + ".log", "ab") as f:
+            f.write(b'{"op":"put","id":"patient2","da')
+        self._reopen()
+        
+        # Assert that the complete entry is kept and new saves still work
+        self.assertIsNotNone(self.repository.find_by_id("patient1"))
+        self.assertIsNone(self.repository.find_by_id("patient2"))
+        self.repository.save(self.patient2)
+        self._reopen()
+        self.assertIsNotNone(self.repository.find_by_id("patient2"))
+    
+    def test_find_by_email(self):
+        """Test finding a patient by email."""
+        # Save two patients
+        self.repository.save(self.patient1)
+        self.repository.save(self.patient2)
+        
+        # Find a patient by email
+        found_patient = self.repository.find_by_email("jane.smith@example.com")
+        
+        # Assert that the correct patient is found
+        self.assertIsNotNone(found_patient)
+        self.assertEqual(found_patient.patient_id, self.patient2.patient_id)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
+import threading
 import unittest
 from datetime import datetime, timedelta
 from src.appointment import Appointment
 from src.enums import AppointmentStatus, AppointmentType
 from repositories.inmemory.inmemory_appointment_repository import InMemoryAppointmentRepository
+from repositories.repository import ConcurrentModificationError
 
 class TestInMemoryAppointmentRepository(unittest.TestCase):
     """
@@ -88,6 +90,24 @@ class TestInMemoryAppointmentRepository(unittest.TestCase):
         # Assert that the appointment is deleted
         self.assertIsNone(self.repository.find_by_id("appointment1"))
     
+    def test_lost_update_is_rejected(self):
+        """Test that saving an appointment read before another save of it fails."""
+        # Read the saved appointment twice, as two concurrent requests would
+        self.repository.save(self.appointment1)
+        first = self.repository.find_by_id("appointment1")
+        second = self.repository.find_by_id("appointment1")
+        
+        # Changes to a read appointment only reach the storage when it is saved
+        first.confirm()
+        self.assertEqual(self.repository.find_by_id("appointment1").status, AppointmentStatus.SCHEDULED)
+        self.repository.save(first)
+        
+        # Assert that the stale read cannot overwrite the first update
+        second.cancel("Patient request")
+        with self.assertRaises(ConcurrentModificationError):
+            self.repository.save(second)
+        self.assertEqual(self.repository.find_by_id("appointment1").status, AppointmentStatus.CONFIRMED)
+    
     def test_find_by_patient_id(self):
         """Test finding appointments by patient ID."""
         # Save two appointments
@@ -132,6 +152,188 @@ class TestInMemoryAppointmentRepository(unittest.TestCase):
         # Assert that only the second appointment is found
         self.assertEqual(len(found_appointments), 1)
         self.assertEqual(found_appointments[0].appointment_id, self.appointment2.appointment_id)
+    
+    def test_resave_with_changed_doctor_and_time_updates_indexes(self):
+        """Test that re-saving a mutated appointment moves it in the indexes."""
+        # Save an appointment, then change its doctor and time in place
+        self.repository.save(self.appointment1)
+        new_date_time = self.appointment1.date_time + timedelta(days=10)
+        self.appointment1._doctor_id = "doctor2"
+        self.appointment1._date_time = new_date_time
+        self.repository.save(self.appointment1)
+        
+        # Assert that the appointment is only found under its new values
+        self.assertEqual(self.repository.find_by_doctor_id("doctor1"), [])
+        self.assertEqual(
+            [a.appointment_id for a in self.repository.find_by_doctor_id("doctor2")],
+            ["appointment1"]
+        )
+        self.assertEqual(
+            [a.appointment_id for a in self.repository.find_by_date_range(new_date_time, new_date_time)],
+            ["appointment1"]
+        )
+        self.assertEqual(self.repository.find_by_date_range(
+            new_date_time - timedelta(days=10),
+            new_date_time - timedelta(days=1)
+        ), [])
+    
+    def test_delete_removes_from_indexes(self):
+        """Test that deleted appointments are no longer returned by the finders."""
+        # Save two appointments and delete one
+        self.repository.save(self.appointment1)
+        self.repository.save(self.appointment2)
+        self.repository.delete("appointment1")
+        
+        # Assert that only the remaining appointment is found
+        self.assertEqual([a.appointment_id for a in self.repository.find_by_patient_id("patient1")],
+                         ["appointment2"])
+        self.assertEqual([a.appointment_id for a in self.repository.find_by_doctor_id("doctor1")],
+                         ["appointment2"])
+        found_appointments = self.repository.find_by_date_range(
+            self.appointment1.date_time, self.appointment2.date_time
+        )
+        self.assertEqual([a.appointment_id for a in found_appointments], ["appointment2"])
+    
+    def test_find_overlapping(self):
+        """Test finding a doctor's appointments that overlap a time interval."""
+        # Save two appointments
+        self.repository.save(self.appointment1)
+        self.repository.save(self.appointment2)
+        start = self.appointment1.date_time
+        
+        # An interval entirely inside an existing appointment overlaps it
+        found_appointments = self.repository.find_overlapping(
+            "doctor1", start + timedelta(minutes=10), start + timedelta(minutes=20)
+        )
+        self.assertEqual([a.appointment_id for a in found_appointments], ["appointment1"])
+        
+        # Intervals touching the appointment boundaries do not overlap it
+        self.assertEqual(self.repository.find_overlapping(
+            "doctor1", start - timedelta(minutes=30), start
+        ), [])
+        self.assertEqual(self.repository.find_overlapping(
+            "doctor1", start + timedelta(minutes=30), start + timedelta(minutes=60)
+        ), [])
+        
+        # Other doctors are not affected
+        self.assertEqual(self.repository.find_overlapping(
+            "doctor2", start, start + timedelta(minutes=30)
+        ), [])
+    
+    def test_find_overlapping_ignores_cancelled_appointments(self):
+        """Test that cancelled appointments no longer occupy their time slot."""
+        # Save an appointment, then cancel it
+        self.repository.save(self.appointment1)
+        self.appointment1.cancel("Patient request")
+        self.repository.save(self.appointment1)
+        
+        # Assert that the slot is free again
+        start = self.appointment1.date_time
+        self.assertEqual(self.repository.find_overlapping(
+            "doctor1", start, start + timedelta(minutes=30)
+        ), [])
+    
+    def test_finders_during_concurrent_writes(self):
+        """Test the index-based finders while other threads book, cancel and delete appointments."""
+        start = datetime(2030, 1, 7, 9, 0)
+        
+        def create_appointment(i):
+            return Appointment(
+                appointment_id=f"appointment{i:06d}",
+                patient_id=f"patient{i % 10}",
+                doctor_id=f"doctor{i % 5}",
+                date_time=start + timedelta(minutes=30 * i),
+                duration=30,
+                appointment_type=AppointmentType.REGULAR,
+                status=AppointmentStatus.SCHEDULED
+            )
+        
+        errors = []
+        done = threading.Event()
+        
+        def write(offset):
+            try:
+                for i in range(offset, 4000, 4):
+                    appointment = create_appointment(i)
+                    self.repository.save(appointment)
+                    if i % 3 == 0:
+                        self.repository.delete(appointment.appointment_id)
+                    elif i % 3 == 1:
+                        appointment.cancel("Patient request")
+                        self.repository.save(appointment)
+            except Exception as e:
+                errors.append(e)
+        
+        def read():
+            end = start + timedelta(days=100)
+            try:
+                while not done.is_set():
+                    for appointments in (self.repository.find_by_doctor_id("doctor1"),
+                                         self.repository.find_by_patient_id("patient2"),
+                                         self.repository.find_by_date_range(start, end),
+                                         self.repository.find_overlapping("doctor3", start, end)):
+                        self.assertNotIn(None, appointments)
+            except Exception as e:
+                errors.append(e)
+        
+        writers = [threading.Thread(target=write, args=(offset,)) for offset in range(4)]
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        done.set()
+        for thread in readers:
+            thread.join()
+        
+        # Assert that every read succeeded and only the cancellations left the booking index
+        self.assertEqual(errors, [])
+        end = start + timedelta(days=100)
+        self.assertEqual(len(self.repository.find_by_date_range(start, end)), 4000 - len(range(0, 4000, 3)))
+        booked = sum(len(self.repository.find_overlapping(f"doctor{d}", start, end)) for d in range(5))
+        self.assertEqual(booked, len(range(2, 4000, 3)))
+    
+    def test_find_page(self):
+        """Test paging through appointments with cursors and filters."""
+        # Save three appointments, two of them at the same time
+        self.repository.save(self.appointment2)
+        self.repository.save(self.appointment1)
+        self.repository.save(Appointment(
+            appointment_id="appointment0",
+            patient_id="patient2",
+            doctor_id="doctor2",
+            date_time=self.appointment1.date_time,
+            duration=30,
+            appointment_type=AppointmentType.FOLLOW_UP,
+            status=AppointmentStatus.SCHEDULED,
+            notes="Follow-up"
+        ))
+        
+        # Page through in date/time order, ties broken by ID
+        first_page = self.repository.find_page(2)
+        self.assertEqual([a.appointment_id for a in first_page], ["appointment0", "appointment1"])
+        self.assertIsNotNone(first_page.next_cursor)
+        second_page = self.repository.find_page(2, first_page.next_cursor)
+        self.assertEqual([a.appointment_id for a in second_page], ["appointment2"])
+        self.assertIsNone(second_page.next_cursor)
+        
+        # Page through in reverse order
+        first_page = self.repository.find_page(2, descending=True)
+        self.assertEqual([a.appointment_id for a in first_page], ["appointment2", "appointment1"])
+        second_page = self.repository.find_page(2, first_page.next_cursor, descending=True)
+        self.assertEqual([a.appointment_id for a in second_page], ["appointment0"])
+        
+        # Filter by type and date window
+        page = self.repository.find_page(10, appointment_type=AppointmentType.FOLLOW_UP,
+                                         end_date=self.appointment1.date_time)
+        self.assertEqual([a.appointment_id for a in page], ["appointment0"])
+        self.assertEqual(len(self.repository.find_page(10, status=AppointmentStatus.CANCELLED)), 0)
+        
+        # Reject invalid cursors and limits
+        with self.assertRaises(ValueError):
+            self.repository.find_page(2, "not-a-cursor")
+        with self.assertRaises(ValueError):
+            self.repository.find_page(0)
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,6 +2,7 @@ import unittest
 from src.doctor import Doctor
 from src.contact_info import ContactInfo
 from repositories.inmemory.inmemory_doctor_repository import InMemoryDoctorRepository
+from repositories.repository import ConcurrentModificationError
 
 class TestInMemoryDoctorRepository(unittest.TestCase):
     """
@@ -90,6 +91,25 @@ class TestInMemoryDoctorRepository(unittest.TestCase):
         # Assert that the doctor is deleted
         self.assertIsNone(self.repository.find_by_id("doctor1"))
     
+    def test_lost_update_is_rejected(self):
+        """Test that saving a doctor read before another save of it fails."""
+        # Read the saved doctor twice, as two concurrent requests would
+        self.repository.save(self.doctor1)
+        first = self.repository.find_by_id("doctor1")
+        second = self.repository.find_by_id("doctor1")
+        
+        # Changes to a read doctor only reach the storage when it is saved
+        first.contact_info.phone = "1111111111"
+        self.assertEqual(self.repository.find_by_id("doctor1").contact_info.phone,
+                         self.doctor1.contact_info.phone)
+        self.repository.save(first)
+        
+        # Assert that the stale read cannot overwrite the first update
+        second.contact_info.phone = "2222222222"
+        with self.assertRaises(ConcurrentModificationError):
+            self.repository.save(second)
+        self.assertEqual(self.repository.find_by_id("doctor1").contact_info.phone, "1111111111")
+    
     def test_find_by_specialization(self):
         """Test finding doctors by specialization."""
         # Save two doctors
@@ -115,6 +135,53 @@ class TestInMemoryDoctorRepository(unittest.TestCase):
         # Assert that the correct doctor is found
         self.assertEqual(len(found_doctors), 1)
         self.assertEqual(found_doctors[0].doctor_id, self.doctor1.doctor_id)
+    
+    def test_find_by_name_ignores_accents_and_ranks_matches(self):
+        """Test that name search folds accents and ranks better matches first."""
+        # Save doctors whose names contain "jo" at different positions,
+        # renaming the first one
+        self.repository.save(self.doctor1)
+        self.repository.save(self.doctor2)
+        self.repository.save(self._create_doctor("doctor1", "Dr. Rojo"))
+        self.repository.save(self._create_doctor("doctor3", "José Álvarez"))
+        
+        # Assert that a prefix match ranks before a word prefix match,
+        # which ranks before any other match
+        found_doctors = self.repository.find_by_name("JO")
+        self.assertEqual([doctor.doctor_id for doctor in found_doctors],
+                         ["doctor3", "doctor2", "doctor1"])
+        
+        # Assert that accents are ignored on both sides and limits apply
+        self.assertEqual(self.repository.find_by_name("jose alv")[0].doctor_id, "doctor3")
+        self.assertEqual(self.repository.find_by_name("Álvarez")[0].doctor_id, "doctor3")
+        self.assertEqual(len(self.repository.find_by_name("jo", limit=2)), 2)
+        
+        # Assert that renamed and deleted doctors are no longer found by old names
+        self.assertEqual(self.repository.find_by_name("Smith"), [])
+        self.repository.delete("doctor3")
+        self.assertEqual(self.repository.find_by_name("jose"), [])
+    
+    def _create_doctor(self, doctor_id, name):
+        """Create a doctor with the given ID and name."""
+        return Doctor(
+            doctor_id=doctor_id,
+            name=name,
+            specialization="Cardiology",
+            department="Cardiology",
+            license_number="LIC789",
+            contact_info=self.doctor1.contact_info
+        )
+    
+    def test_change_count(self):
+        """Test that every save and delete changes the collection version."""
+        self.assertEqual(self.repository.change_count(), 0)
+        self.repository.save(self.doctor1)
+        self.repository.save(self.doctor2)
+        self.repository.delete("doctor1")
+        self.repository.delete("doctor1")
+        
+        self.assertEqual(self.repository.change_count(), 3)
+        self.assertNotEqual(self.repository.storage_epoch(), InMemoryDoctorRepository().storage_epoch())
 
 if __name__ == "__main__":
     unittest.main()
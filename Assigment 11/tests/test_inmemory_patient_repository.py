@@ -1,7 +1,10 @@
+import threading
 import unittest
 from datetime import datetime
 from src.patient import Patient
 from src.contact_info import ContactInfo
+from repositories.paging import encode_cursor
+from repositories.repository import ConcurrentModificationError
 from repositories.inmemory.inmemory_patient_repository import InMemoryPatientRepository
 
 class TestInMemoryPatientRepository(unittest.TestCase):
@@ -89,6 +92,144 @@ class TestInMemoryPatientRepository(unittest.TestCase):
         # Assert that the patient is deleted
         self.assertIsNone(self.repository.find_by_id("patient1"))
     
+    def test_lost_update_is_rejected(self):
+        """Test that saving a patient read before another save of it fails."""
+        # Read the saved patient twice, as two concurrent requests would
+        self.repository.save(self.patient1)
+        first = self.repository.find_by_id("patient1")
+        second = self.repository.find_by_id("patient1")
+        
+        # Changes to a read patient only reach the storage when it is saved
+        first.contact_info.phone = "1111111111"
+        self.assertEqual(self.repository.find_by_id("patient1").phone, self.patient1.phone)
+        self.repository.save(first)
+        
+        # Assert that the stale read cannot overwrite the first update
+        second.contact_info.phone = "2222222222"
+        with self.assertRaises(ConcurrentModificationError):
+            self.repository.save(second)
+        self.assertEqual(self.repository.find_by_id("patient1").phone, "1111111111")
+    
+    def test_iter_all(self):
+        """Test iterating over patients while one is deleted mid-iteration."""
+        # Save two patients
+        self.repository.save(self.patient1)
+        self.repository.save(self.patient2)
+        
+        # Delete the second patient after the first one is yielded
+        iterator = self.repository.iter_all()
+        self.assertEqual(next(iterator).patient_id, "patient1")
+        self.repository.delete("patient2")
+        
+        # Assert that the deleted patient is skipped
+        self.assertEqual(list(iterator), [])
+    
+    def test_find_page(self):
+        """Test paging through patients in ID order."""
+        # Save two patients
+        self.repository.save(self.patient2)
+        self.repository.save(self.patient1)
+        
+        # Assert that each page holds one patient and links to the next
+        first_page = self.repository.find_page(1)
+        self.assertEqual([p.patient_id for p in first_page], ["patient1"])
+        second_page = self.repository.find_page(1, first_page.next_cursor)
+        self.assertEqual([p.patient_id for p in second_page], ["patient2"])
+        self.assertIsNone(second_page.next_cursor)
+        
+        # Assert that descending pages start from the largest ID
+        self.assertEqual([p.patient_id for p in self.repository.find_page(5, descending=True)],
+                         ["patient2", "patient1"])
+    
+    def test_find_page_rejects_cursor_of_wrong_type(self):
+        """Test that a well-formed cursor holding a non-ID value is rejected."""
+        self.repository.save(self.patient1)
+        with self.assertRaises(ValueError):
+            self.repository.find_page(1, encode_cursor(1))
+        with self.assertRaises(ValueError):
+            self.repository.find_page(1, encode_cursor("patient1", "patient2"))
+    
+    def test_find_page_during_concurrent_writes(self):
+        """Test paging while another thread saves and deletes patients."""
+        def create_patient(i):
+            return Patient(
+                patient_id=f"patient{i:06d}",
+                name="Writer Patient",
+                date_of_birth=datetime(1990, 1, 1).date(),
+                medical_history_id=f"mh{i}",
+                contact_info=ContactInfo(f"writer{i}@example.com", "555-0100", "1 Writer St")
+            )
+        
+        # Enough patients that a page scan spans many thread switches
+        patients = [create_patient(i) for i in range(20000)]
+        for patient in patients[:10000]:
+            self.repository.save(patient)
+        stop = threading.Event()
+        
+        def write():
+            for i, patient in enumerate(patients[10000:]):
+                if stop.is_set():
+                    break
+                self.repository.save(patient)
+                self.repository.delete(patients[i].patient_id)
+        
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            # Assert that every page is read without errors
+            for _ in range(50):
+                page = self.repository.find_page(10)
+                self.assertLessEqual(len(page), 10)
+        finally:
+            stop.set()
+            writer.join()
+    
+    def test_finders_during_concurrent_writes(self):
+        """Test the email and name finders while other threads save and delete patients."""
+        def create_patient(i):
+            return Patient(
+                patient_id=f"patient{i:06d}",
+                name=f"Writer Patient {i}",
+                date_of_birth=datetime(1990, 1, 1).date(),
+                medical_history_id=f"mh{i}",
+                contact_info=ContactInfo(f"writer{i}@example.com", "555-0100", "1 Writer St")
+            )
+        
+        errors = []
+        done = threading.Event()
+        
+        def write(offset):
+            try:
+                for i in range(offset, 4000, 4):
+                    self.repository.save(create_patient(i))
+                    if i % 3 == 0:
+                        self.repository.delete(f"patient{i:06d}")
+            except Exception as e:
+                errors.append(e)
+        
+        def read():
+            try:
+                while not done.is_set():
+                    patients = self.repository.find_by_name("writer patient", limit=50)
+                    self.assertNotIn(None, patients)
+                    self.repository.find_by_email("writer3@example.com")
+            except Exception as e:
+                errors.append(e)
+        
+        writers = [threading.Thread(target=write, args=(offset,)) for offset in range(4)]
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        done.set()
+        for thread in readers:
+            thread.join()
+        
+        # Assert that every read succeeded and the indexes match the storage
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.repository.find_by_name("writer patient")), 4000 - len(range(0, 4000, 3)))
+    
     def test_find_by_email(self):
         """Test finding a patient by email."""
         # Save two patients
@@ -102,6 +243,33 @@ class TestInMemoryPatientRepository(unittest.TestCase):
         self.assertIsNotNone(found_patient)
         self.assertEqual(found_patient.patient_id, self.patient1.patient_id)
     
+    def test_find_by_email_ignores_case(self):
+        """Test that email lookups are case-insensitive."""
+        # Save a patient
+        self.repository.save(self.patient1)
+        
+        # Find the patient with a differently cased email
+        found_patient = self.repository.find_by_email("John.Doe@Example.COM")
+        
+        # Assert that the patient is found
+        self.assertIsNotNone(found_patient)
+        self.assertEqual(found_patient.patient_id, self.patient1.patient_id)
+    
+    def test_find_by_email_after_email_change(self):
+        """Test that changing a patient's email and saving updates the index."""
+        # Save a patient, then change its email in place and save it again
+        self.repository.save(self.patient1)
+        self.patient1.contact_info.email = "johnny@example.com"
+        self.repository.save(self.patient1)
+        
+        # Assert that only the new email finds the patient
+        self.assertIsNone(self.repository.find_by_email("john.doe@example.com"))
+        self.assertEqual(self.repository.find_by_email("johnny@example.com").patient_id, "patient1")
+        
+        # Assert that deleting the patient frees the email
+        self.repository.delete("patient1")
+        self.assertIsNone(self.repository.find_by_email("johnny@example.com"))
+    
     def test_find_by_name(self):
         """Test finding patients by name."""
         # Save two patients
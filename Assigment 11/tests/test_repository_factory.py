@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 import unittest
 from factories.repository_factory import RepositoryFactory, StorageType
 from repositories.patient_repository import PatientRepository
@@ -6,6 +9,9 @@ from repositories.appointment_repository import AppointmentRepository
 from repositories.inmemory.inmemory_patient_repository import InMemoryPatientRepository
 from repositories.inmemory.inmemory_doctor_repository import InMemoryDoctorRepository
 from repositories.inmemory.inmemory_appointment_repository import InMemoryAppointmentRepository
+from repositories.inmemory.sharded_appointment_repository import ShardedInMemoryAppointmentRepository
+from repositories.filesystem.filesystem_appointment_repository import FileSystemAppointmentRepository
+from repositories.database.database_patient_repository import DatabasePatientRepository
 
 class TestRepositoryFactory(unittest.TestCase):
     """
@@ -36,6 +42,34 @@ class TestRepositoryFactory(unittest.TestCase):
         # Assert that the repository is an instance of InMemoryAppointmentRepository
         self.assertIsInstance(repository, InMemoryAppointmentRepository)
     
+    def test_get_sharded_memory_repository(self):
+        """Test getting a repository with sharded memory storage."""
+        # Get an appointment repository with 4 shards
+        repository = RepositoryFactory.get_repository(
+            AppointmentRepository, StorageType.SHARDED_MEMORY, shard_count=4
+        )
+        
+        # Assert that the repository is an instance of ShardedInMemoryAppointmentRepository
+        self.assertIsInstance(repository, ShardedInMemoryAppointmentRepository)
+        self.assertEqual(repository._storage.shard_count, 4)
+    
+    def test_get_file_system_repository(self):
+        """Test getting a repository with file system storage."""
+        directory = tempfile.mkdtemp()
+        try:
+            # Get an appointment repository with file system storage
+            repository = RepositoryFactory.get_repository(
+                AppointmentRepository,
+                StorageType.FILE_SYSTEM,
+                file_path=os.path.join(directory, "appointments.json")
+            )
+            
+            # Assert that the repository is an instance of FileSystemAppointmentRepository
+            self.assertIsInstance(repository, FileSystemAppointmentRepository)
+            repository.close()
+        finally:
+            shutil.rmtree(directory)
+    
     def test_get_repository_with_unsupported_interface(self):
         """Test getting a repository with an unsupported interface."""
         # Define a dummy class that doesn't extend Repository
@@ -46,11 +80,28 @@ class TestRepositoryFactory(unittest.TestCase):
         with self.assertRaises(ValueError):
             RepositoryFactory.get_repository(DummyClass, StorageType.MEMORY)
     
+    def test_get_database_repository(self):
+        """Test getting a repository with database storage."""
+        directory = tempfile.mkdtemp()
+        try:
+            # Get a patient repository with database storage
+            repository = RepositoryFactory.get_repository(
+                PatientRepository,
+                StorageType.DATABASE,
+                database_path=os.path.join(directory, "appointment_system.db")
+            )
+            
+            # Assert that the repository is an instance of DatabasePatientRepository
+            self.assertIsInstance(repository, DatabasePatientRepository)
+            repository.close()
+        finally:
+            shutil.rmtree(directory)
+    
     def test_get_repository_with_unsupported_storage_type(self):
         """Test getting a repository with an unsupported storage type."""
         # Assert that getting a repository with an unsupported storage type raises a ValueError
         with self.assertRaises(ValueError):
-            RepositoryFactory.get_repository(PatientRepository, StorageType.DATABASE)
+            RepositoryFactory.get_repository(PatientRepository, "CLOUD")
 
 if __name__ == "__main__":
     unittest.main()
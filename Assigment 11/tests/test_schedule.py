@@ -0,0 +1,102 @@
+import unittest
+from datetime import datetime, timedelta
+from src.enums import SlotStatus
+from src.schedule import DayOfWeek, Schedule, TimeRange
+from src.time_slot import TimeSlot
+
+class TestSchedule(unittest.TestCase):
+    """
+    Test case for the Schedule class.
+    """
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.schedule = Schedule("schedule1", "doctor1")
+        
+        # Work from 9:00 to 17:00 on Mondays
+        self.monday = datetime(2030, 1, 7)
+        self.schedule.working_hours[DayOfWeek.MONDAY] = TimeRange(
+            self.monday.replace(hour=9), self.monday.replace(hour=17)
+        )
+        
+        self.slot1 = TimeSlot("slot1", self.monday.replace(hour=10), self.monday.replace(hour=11))
+        self.slot2 = TimeSlot("slot2", self.monday.replace(hour=10, minute=30), self.monday.replace(hour=12))
+    
+    def test_blocked_time_is_unavailable(self):
+        """Test that blocked minutes are unavailable until they are unblocked."""
+        # Block two overlapping slots
+        self.schedule.add_blocked_time(self.slot1)
+        self.schedule.add_blocked_time(self.slot2)
+        
+        # Assert that the blocked minutes are unavailable
+        self.assertTrue(self.schedule.check_availability(self.monday.replace(hour=9, minute=59)))
+        self.assertFalse(self.schedule.check_availability(self.monday.replace(hour=10)))
+        self.assertFalse(self.schedule.check_availability(self.monday.replace(hour=11, minute=59)))
+        self.assertTrue(self.schedule.check_availability(self.monday.replace(hour=12)))
+        
+        # Unblock the first slot; the minutes the second slot covers stay blocked
+        self.schedule.remove_blocked_time(self.slot1)
+        self.assertTrue(self.schedule.check_availability(self.monday.replace(hour=10)))
+        self.assertFalse(self.schedule.check_availability(self.monday.replace(hour=10, minute=30)))
+        
+        # Assert that the unblocked slot is listed as available on its day only
+        self.assertEqual(self.schedule.get_available_slots(self.monday), [self.slot1])
+        self.assertEqual(self.schedule.get_available_slots(self.monday + timedelta(days=1)), [])
+    
+    def test_outside_working_hours_is_unavailable(self):
+        """Test that times outside the working hours are unavailable."""
+        self.assertFalse(self.schedule.check_availability(self.monday.replace(hour=8)))
+        self.assertFalse(self.schedule.check_availability(self.monday + timedelta(days=1, hours=10)))
+    
+    def test_book_and_release_slot(self):
+        """Test that booking a slot occupies it and releasing it frees it."""
+        # Book a slot
+        self.assertTrue(self.schedule.book_slot(self.slot1))
+        self.assertEqual(self.slot1.status, SlotStatus.BOOKED)
+        
+        # Assert that overlapping slots can no longer be booked
+        self.assertFalse(self.schedule.is_range_available(self.slot2.start_time, self.slot2.end_time))
+        self.assertFalse(self.schedule.book_slot(self.slot2))
+        self.assertEqual(self.slot2.status, SlotStatus.AVAILABLE)
+        
+        # Release the slot and book the overlapping one
+        self.assertTrue(self.schedule.release_slot(self.slot1))
+        self.assertTrue(self.schedule.book_slot(self.slot2))
+    
+    def test_get_free_time_ranges(self):
+        """Test listing the free time within the working hours of a day."""
+        # Block one slot and book another
+        self.schedule.add_blocked_time(self.slot1)
+        self.schedule.book_slot(TimeSlot("slot3", self.monday.replace(hour=13), self.monday.replace(hour=13, minute=20)))
+        
+        # Assert that the free ranges are the gaps between them
+        free_ranges = self.schedule.get_free_time_ranges(self.monday)
+        self.assertEqual(
+            [(r.start_time.hour, r.start_time.minute, r.end_time.hour, r.end_time.minute) for r in free_ranges],
+            [(9, 0, 10, 0), (11, 0, 13, 0), (13, 20, 17, 0)]
+        )
+        
+        # Assert that short gaps are left out and days off have no free time
+        self.assertEqual(len(self.schedule.get_free_time_ranges(self.monday, min_duration=150)), 1)
+        self.assertEqual(self.schedule.get_free_time_ranges(self.monday + timedelta(days=1)), [])
+    
+    def test_slot_across_midnight(self):
+        """Test that a slot spanning midnight occupies both days."""
+        # Block a slot from 23:30 to 00:30
+        self.schedule.add_blocked_time(TimeSlot(
+            "night", self.monday.replace(hour=23, minute=30), self.monday + timedelta(days=1, minutes=30)
+        ))
+        
+        # Assert that both parts are unavailable
+        self.assertFalse(self.schedule.is_range_available(
+            self.monday.replace(hour=23, minute=45), self.monday.replace(hour=23, minute=50)
+        ))
+        self.assertFalse(self.schedule.is_range_available(
+            self.monday + timedelta(days=1, minutes=10), self.monday + timedelta(days=1, minutes=20)
+        ))
+        self.assertTrue(self.schedule.is_range_available(
+            self.monday + timedelta(days=1, minutes=30), self.monday + timedelta(days=1, minutes=40)
+        ))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import threading
+import unittest
+from datetime import datetime, timedelta
+from src.appointment import Appointment
+from src.contact_info import ContactInfo
+from src.doctor import Doctor
+from src.enums import AppointmentStatus, AppointmentType
+from repositories.inmemory.sharded_storage import ShardedStorage
+from repositories.inmemory.sharded_appointment_repository import ShardedInMemoryAppointmentRepository
+from repositories.inmemory.sharded_doctor_repository import ShardedInMemoryDoctorRepository
+from repositories.repository import ConcurrentModificationError
+
+class TestShardedRepository(unittest.TestCase):
+    """
+    Test case for the sharded in-memory repositories.
+    """
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.repository = ShardedInMemoryAppointmentRepository(shard_count=4)
+        self.date_time = datetime(2025, 5, 1, 9, 0)
+    
+    def _create_appointment(self, i, doctor_id="doctor1"):
+        """Create a sample appointment for testing."""
+        return Appointment(
+            appointment_id=f"appointment{i}",
+            patient_id=f"patient{i % 3}",
+            doctor_id=doctor_id,
+            date_time=self.date_time + timedelta(minutes=30 * i),
+            duration=30,
+            appointment_type=AppointmentType.CONSULTATION
+        )
+    
+    def _create_doctor(self, i):
+        """Create a sample doctor for testing."""
+        return Doctor(
+            doctor_id=f"doctor{i}",
+            name=f"Dr. Smith {i}",
+            specialization="Cardiology" if i % 2 else "Neurology",
+            department="Medicine",
+            license_number=f"LIC{i}",
+            contact_info=ContactInfo(email=f"doctor{i}@example.com", phone="123-456-7890", address="")
+        )
+    
+    def test_storage_spreads_keys_over_shards(self):
+        """Test that the storage behaves like a dictionary split over its shards."""
+        storage = ShardedStorage(4)
+        for i in range(100):
+            storage[f"key{i}"] = i
+        del storage["key0"]
+        
+        self.assertEqual(len(storage), 99)
+        self.assertNotIn("key0", storage)
+        self.assertEqual(storage["key5"], 5)
+        self.assertEqual(sorted(storage.values()), list(range(1, 100)))
+        self.assertTrue(all(storage._shards))
+        with self.assertRaises(ValueError):
+            ShardedStorage(0)
+    
+    def test_save_find_and_delete(self):
+        """Test that the indexed finders work on top of the shards."""
+        for i in range(6):
+            self.repository.save(self._create_appointment(i))
+        self.repository.delete("appointment3")
+        
+        self.assertEqual(len(self.repository.find_all()), 5)
+        self.assertIsNone(self.repository.find_by_id("appointment3"))
+        self.assertEqual(
+            [a.appointment_id for a in self.repository.find_by_patient_id("patient0")],
+            ["appointment0"]
+        )
+        self.assertEqual(
+            [a.appointment_id for a in self.repository.find_by_date_range(
+                self.date_time, self.date_time + timedelta(hours=2))],
+            ["appointment0", "appointment1", "appointment2", "appointment4"]
+        )
+        page = self.repository.find_page(2, status=AppointmentStatus.SCHEDULED)
+        self.assertEqual([a.appointment_id for a in page.items], ["appointment0", "appointment1"])
+        self.assertEqual(len(list(self.repository.iter_all())), 5)
+    
+    def test_concurrent_save_is_rejected(self):
+        """Test that saves stay compare-and-set on the entity version."""
+        appointment = self._create_appointment(0)
+        self.repository.save(appointment)
+        stale = self._create_appointment(0)
+        stale._version = 1
+        self.repository.save(appointment)
+        
+        with self.assertRaises(ConcurrentModificationError):
+            self.repository.save(stale)
+    
+    def test_reads_during_concurrent_writes(self):
+        """Test that scans and index reads never fail while other threads write."""
+        repository = ShardedInMemoryDoctorRepository(shard_count=8)
+        errors = []
+        done = threading.Event()
+        
+        def write(offset):
+            try:
+                for i in range(offset, 4000, 4):
+                    repository.save(self._create_doctor(i))
+                    if i % 3 == 0:
+                        repository.delete(f"doctor{i}")
+            except Exception as e:
+                errors.append(e)
+        
+        def read():
+            try:
+                while not done.is_set():
+                    repository.find_by_specialization("Cardiology")
+                    repository.find_by_name("smith", limit=5)
+                    sum(1 for _ in repository.iter_all())
+            except Exception as e:
+                errors.append(e)
+        
+        writers = [threading.Thread(target=write, args=(offset,)) for offset in range(4)]
+        readers = [threading.Thread(target=read) for _ in range(2)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        done.set()
+        for thread in readers:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(len(repository.find_all()), 4000 - len(range(0, 4000, 3)))
+        self.assertEqual(len(repository.find_by_name("smith")), len(repository.find_all()))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from src.appointment import Appointment
+from src.enums import AppointmentStatus, AppointmentType
+from repositories.sharedmemory.sharedmemory_appointment_repository import SharedMemoryAppointmentRepository
+from repositories.repository import ConcurrentModificationError
+
+DATE_TIME = datetime(2025, 5, 1, 9, 0)
+
+def create_appointment(i, doctor_id="doctor1", notes=None):
+    """Create a sample appointment for testing."""
+    return Appointment(
+        appointment_id=f"appointment{i}",
+        patient_id=f"patient{i % 2}",
+        doctor_id=doctor_id,
+        date_time=DATE_TIME + timedelta(minutes=30 * i),
+        duration=30,
+        appointment_type=AppointmentType.CONSULTATION,
+        notes=notes if notes is not None else f"Note {i}"
+    )
+
+def book_in_other_process(file_path, start, count):
+    """Save appointments from a separate worker process."""
+    repository = SharedMemoryAppointmentRepository(file_path, capacity=4)
+    for i in range(start, start + count):
+        repository.save(create_appointment(i, doctor_id="doctor2"))
+    repository.close()
+
+class TestSharedMemoryAppointmentRepository(unittest.TestCase):
+    """
+    Test case for the SharedMemoryAppointmentRepository class.
+    """
+    
+    def setUp(self):
+        """Set up two repositories mapping the same file, as two workers would."""
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, "appointments.shm")
+        self.worker1 = SharedMemoryAppointmentRepository(self.file_path, capacity=4)
+        self.worker2 = SharedMemoryAppointmentRepository(self.file_path, capacity=4)
+    
+    def tearDown(self):
+        """Clean up the test case."""
+        self.worker1.close()
+        self.worker2.close()
+        shutil.rmtree(self.directory)
+    
+    def test_writes_are_seen_by_other_workers(self):
+        """Test that saves, updates and deletes of one worker reach the other's finders."""
+        for i in range(6):
+            self.worker1.save(create_appointment(i))
+        
+        found = self.worker2.find_by_id("appointment2")
+        self.assertEqual(found.notes, "Note 2")
+        self.assertEqual(found.date_time, DATE_TIME + timedelta(hours=1))
+        self.assertEqual(len(self.worker2.find_by_doctor_id("doctor1")), 6)
+        
+        # Update from the second worker, delete from the first
+        found.cancel("Patient request")
+        self.worker2.save(found)
+        self.worker1.delete("appointment0")
+        
+        self.assertEqual(self.worker1.find_by_id("appointment2").status, AppointmentStatus.CANCELLED)
+        self.assertIsNone(self.worker2.find_by_id("appointment0"))
+        self.assertEqual(
+            sorted(a.appointment_id for a in self.worker2.find_by_patient_id("patient0")),
+            ["appointment2", "appointment4"]
+        )
+        self.assertEqual(
+            [a.appointment_id for a in self.worker2.find_overlapping(
+                "doctor1", DATE_TIME, DATE_TIME + timedelta(hours=3))],
+            ["appointment1", "appointment3", "appointment4", "appointment5"]
+        )
+        self.assertEqual(len(list(self.worker2.iter_all())), 5)
+    
+    def test_reopened_store_keeps_appointments(self):
+        """Test that a worker started later indexes the appointments already stored."""
+        self.worker1.save(create_appointment(1))
+        worker3 = SharedMemoryAppointmentRepository(self.file_path)
+        try:
+            self.assertEqual(
+                [a.appointment_id for a in worker3.find_by_date_range(DATE_TIME, DATE_TIME + timedelta(hours=1))],
+                ["appointment1"]
+            )
+        finally:
+            worker3.close()
+    
+    def test_concurrent_save_is_rejected(self):
+        """Test that a save based on an outdated read in another worker fails."""
+        self.worker1.save(create_appointment(0))
+        first = self.worker1.find_by_id("appointment0")
+        second = self.worker2.find_by_id("appointment0")
+        first.reschedule(DATE_TIME + timedelta(days=1))
+        self.worker1.save(first)
+        
+        second.cancel("Patient request")
+        with self.assertRaises(ConcurrentModificationError):
+            self.worker2.save(second)
+    
+    def test_transaction_spans_check_and_save(self):
+        """Test that operations nested in a transaction keep its exclusive lock."""
+        with self.worker1.transaction():
+            self.assertEqual(self.worker1.find_overlapping("doctor1", DATE_TIME, DATE_TIME + timedelta(hours=1)), [])
+            self.worker1.save(create_appointment(0))
+            self.assertEqual(self.worker1._storage._lock_depth, 1)
+        self.assertEqual(self.worker1._storage._lock_depth, 0)
+        self.assertEqual(self.worker2.find_by_id("appointment0").notes, "Note 0")
+    
+    def test_change_count_is_shared(self):
+        """Test that every worker sees the same epoch and collection version."""
+        before = self.worker2.change_count()
+        self.worker1.save(create_appointment(0))
+        
+        self.assertGreater(self.worker2.change_count(), before)
+        self.assertEqual(self.worker2.change_count(), self.worker1.change_count())
+        self.assertEqual(self.worker2.storage_epoch(), self.worker1.storage_epoch())
+    
+    def test_values_too_long_are_rejected(self):
+        """Test that notes longer than their field are rejected."""
+        appointment = create_appointment(0, notes="x" * 513)
+        with self.assertRaises(ValueError):
+            self.worker1.save(appointment)
+        self.assertIsNone(self.worker2.find_by_id("appointment0"))
+    
+    def test_failed_save_can_be_retried(self):
+        """Test that an update rejected by the table can be corrected and saved again."""
+        self.worker1.save(create_appointment(0))
+        appointment = self.worker1.find_by_id("appointment0")
+        
+        appointment.cancel("x" * 512)
+        with self.assertRaises(ValueError):
+            self.worker1.save(appointment)
+        self.assertEqual(appointment.version, 1)
+        
+        appointment._notes = "Note 0"
+        self.worker1.save(appointment)
+        self.assertEqual(self.worker2.find_by_id("appointment0").status, AppointmentStatus.CANCELLED)
+        self.assertEqual(self.worker2.find_by_id("appointment0").version, 2)
+    
+    def test_change_listeners_follow_other_workers(self):
+        """Test that listeners hear of another worker's saves and deletes, but not of their own worker's."""
+        changes = []
+        self.worker2.add_change_listener(
+            lambda appointment_id, appointment, previous: changes.append((appointment_id, appointment, previous))
+        )
+        self.worker2.save(create_appointment(9))
+        self.worker1.save(create_appointment(0))
+        self.worker2.refresh()
+        
+        self.assertEqual([(c[0], c[2]) for c in changes], [("appointment0", None)])
+        self.assertEqual(changes[0][1].status, AppointmentStatus.SCHEDULED)
+        
+        changes.clear()
+        appointment = self.worker1.find_by_id("appointment0")
+        appointment.cancel("Patient request")
+        self.worker1.save(appointment)
+        self.worker2.find_by_doctor_id("doctor1")
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0][1].status, AppointmentStatus.CANCELLED)
+        self.assertEqual(changes[0][2], ("doctor1", "patient0", DATE_TIME, 30, AppointmentStatus.SCHEDULED))
+        
+        changes.clear()
+        self.worker1.delete("appointment0")
+        self.worker2.refresh()
+        self.assertEqual([(c[0], c[1]) for c in changes], [("appointment0", None)])
+        self.assertEqual(changes[0][2][4], AppointmentStatus.CANCELLED)
+    
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "requires fork")
+    def test_writes_from_other_processes(self):
+        """Test appointments saved by other processes, growing the file, while this one has it mapped."""
+        self.worker1.save(create_appointment(0))
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(target=book_in_other_process, args=(self.file_path, start, 20))
+            for start in (100, 200)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        
+        self.assertEqual([process.exitcode for process in processes], [0, 0])
+        self.assertEqual(len(self.worker1.find_by_doctor_id("doctor2")), 40)
+        self.assertEqual(len(self.worker2.find_all()), 41)
+        self.assertEqual(self.worker1.find_by_id("appointment219").notes, "Note 219")
+
+if __name__ == "__main__":
+    unittest.main()
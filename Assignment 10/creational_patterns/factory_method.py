@@ -18,23 +18,31 @@ class NotificationSender(ABC):
     but lets subclasses decide which class to instantiate.
     """
     
+    # Delivery channel the notifications of this sender are dispatched on
+    channel = "default"
+    
     @abstractmethod
-    def create_notification(self, recipient_id: str, content: str, appointment_id: str) -> Notification:
+    def create_notification(self, recipient_id: str, content: str, appointment_id: str,
+                            notification_type: NotificationType = NotificationType.GENERAL) -> Notification:
         """Factory method to be implemented by subclasses"""
         pass
     
-    def send_notification(self, recipient_id: str, content: str, appointment_id: str) -> bool:
+    def send_notification(self, recipient_id: str, content: str, appointment_id: str,
+                          notification_type: NotificationType = NotificationType.GENERAL) -> bool:
         """
         Template method that uses the factory method
         """
-        notification = self.create_notification(recipient_id, content, appointment_id)
+        notification = self.create_notification(recipient_id, content, appointment_id, notification_type)
         return notification.send()
 
 
 class EmailNotificationSender(NotificationSender):
     """Concrete Creator for Email Notifications"""
     
-    def create_notification(self, recipient_id: str, content: str, appointment_id: str) -> Notification:
+    channel = "email"
+    
+    def create_notification(self, recipient_id: str, content: str, appointment_id: str,
+                            notification_type: NotificationType = NotificationType.GENERAL) -> Notification:
         notification_id = str(uuid.uuid4())
         email_content = f"EMAIL: {content}"
         
@@ -42,7 +50,7 @@ class EmailNotificationSender(NotificationSender):
             notification_id=notification_id,
             recipient_id=recipient_id,
             recipient_type=RecipientType.PATIENT,  # Default, could be parameterized
-            type=NotificationType.GENERAL,  # Default, could be parameterized
+            type=notification_type,
             content=email_content,
             appointment_id=appointment_id,
             status=NotificationStatus.PENDING
@@ -52,7 +60,10 @@ class EmailNotificationSender(NotificationSender):
 class SMSNotificationSender(NotificationSender):
     """Concrete Creator for SMS Notifications"""
     
-    def create_notification(self, recipient_id: str, content: str, appointment_id: str) -> Notification:
+    channel = "sms"
+    
+    def create_notification(self, recipient_id: str, content: str, appointment_id: str,
+                            notification_type: NotificationType = NotificationType.GENERAL) -> Notification:
         notification_id = str(uuid.uuid4())
         sms_content = f"SMS: {content}"
         
@@ -60,7 +71,7 @@ class SMSNotificationSender(NotificationSender):
             notification_id=notification_id,
             recipient_id=recipient_id,
             recipient_type=RecipientType.PATIENT,  # Default, could be parameterized
-            type=NotificationType.GENERAL,  # Default, could be parameterized
+            type=notification_type,
             content=sms_content,
             appointment_id=appointment_id,
             status=NotificationStatus.PENDING
@@ -70,7 +81,10 @@ class SMSNotificationSender(NotificationSender):
 class PushNotificationSender(NotificationSender):
     """Concrete Creator for Push Notifications"""
     
-    def create_notification(self, recipient_id: str, content: str, appointment_id: str) -> Notification:
+    channel = "push"
+    
+    def create_notification(self, recipient_id: str, content: str, appointment_id: str,
+                            notification_type: NotificationType = NotificationType.GENERAL) -> Notification:
         notification_id = str(uuid.uuid4())
         push_content = f"PUSH: {content}"
         
@@ -78,7 +92,7 @@ class PushNotificationSender(NotificationSender):
             notification_id=notification_id,
             recipient_id=recipient_id,
             recipient_type=RecipientType.PATIENT,  # Default, could be parameterized
-            type=NotificationType.GENERAL,  # Default, could be parameterized
+            type=notification_type,
             content=push_content,
             appointment_id=appointment_id,
             status=NotificationStatus.PENDING
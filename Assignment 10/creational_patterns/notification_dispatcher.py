@@ -0,0 +1,270 @@
+import asyncio
+import random
+import sys
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+# Add the parent directory to the path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.notification import Notification
+from src.enums import NotificationStatus
+from creational_patterns.factory_method import NotificationSender
+
+class NotificationTransport(ABC):
+    """
+    Delivery backend used by the NotificationDispatcher
+    
+    A transport sends a whole batch of notifications on one channel and
+    reports which of them were accepted.
+    """
+    
+    @abstractmethod
+    async def deliver(self, channel: str, notifications: Sequence[Notification]) -> List[bool]:
+        """Deliver a batch of notifications, returning whether each one was accepted"""
+        pass
+
+class FakeTransport(NotificationTransport):
+    """
+    Local transport for tests and benchmarks
+    
+    Waits a fixed latency per batch and rejects the notifications the fail
+    predicate returns True for, recording what it delivered.
+    """
+    
+    def __init__(self, latency: float = 0.0, fail: Optional[Callable[[Notification], bool]] = None):
+        self._latency = latency
+        self._fail = fail
+        self.delivered: Dict[str, List[Notification]] = defaultdict(list)
+        self.batch_sizes: Dict[str, List[int]] = defaultdict(list)
+        self.max_in_flight: Counter = Counter()
+        self._in_flight: Counter = Counter()
+    
+    async def deliver(self, channel: str, notifications: Sequence[Notification]) -> List[bool]:
+        """Deliver a batch after the configured latency"""
+        self._in_flight[channel] += 1
+        self.max_in_flight[channel] = max(self.max_in_flight[channel], self._in_flight[channel])
+        try:
+            await asyncio.sleep(self._latency)
+        finally:
+            self._in_flight[channel] -= 1
+        self.batch_sizes[channel].append(len(notifications))
+        results = []
+        for notification in notifications:
+            accepted = self._fail is None or not self._fail(notification)
+            if accepted:
+                self.delivered[channel].append(notification)
+            results.append(accepted)
+        return results
+
+class DispatchMetrics:
+    """Per-channel counters of a NotificationDispatcher"""
+    
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.enqueued: Counter = Counter()
+        self.sent: Counter = Counter()
+        self.failed: Counter = Counter()
+        self.retried: Counter = Counter()
+        self.batches: Counter = Counter()
+    
+    def throughput(self) -> float:
+        """Get the number of notifications sent per second since the dispatcher started"""
+        elapsed = time.monotonic() - self.started_at
+        return sum(self.sent.values()) / elapsed if elapsed > 0 else 0.0
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a copy of the counters and the current throughput"""
+        return {
+            'enqueued': dict(self.enqueued),
+            'sent': dict(self.sent),
+            'failed': dict(self.failed),
+            'retried': dict(self.retried),
+            'batches': dict(self.batches),
+            'throughput_per_second': self.throughput()
+        }
+
+class NotificationDispatcher:
+    """
+    Asynchronous dispatch queue for notifications
+    
+    Notifications are queued per channel without waiting for delivery. A
+    worker per channel groups them into batches of up to batch_size, waiting
+    at most max_batch_delay seconds for a batch to fill, and hands each batch
+    to the transport with at most the channel's concurrency limit of batches
+    in flight. Rejected notifications are marked FAILED and retried with
+    exponential backoff until max_retries is exhausted.
+    
+    Must be used from a running event loop, e.g.
+    
+        async with NotificationDispatcher(FakeTransport()) as dispatcher:
+            dispatcher.submit(EmailNotificationSender(), patient_id, content, appointment_id)
+    """
+    
+    def __init__(self, transport: NotificationTransport, batch_size: int = 100,
+                 max_batch_delay: float = 0.05, concurrency: Optional[Dict[str, int]] = None,
+                 default_concurrency: int = 4, max_retries: int = 3, backoff: float = 0.5,
+                 max_backoff: float = 30.0, max_queue_size: int = 0):
+        """
+        Initialize the dispatcher
+        
+        concurrency maps channel names to their limit of batches in flight,
+        other channels get default_concurrency; max_queue_size bounds each
+        channel queue (0 means unbounded), making enqueue raise
+        asyncio.QueueFull once a channel falls that far behind
+        """
+        if batch_size < 1 or default_concurrency < 1 or max_retries < 0:
+            raise ValueError("Batch size and concurrency must be positive and retries non-negative")
+        self._transport = transport
+        self._batch_size = batch_size
+        self._max_batch_delay = max_batch_delay
+        self._concurrency = dict(concurrency or {})
+        self._default_concurrency = default_concurrency
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._max_queue_size = max_queue_size
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._attempts: Dict[str, int] = {}
+        self._pending = 0
+        self._idle: Optional[asyncio.Event] = None
+        self._closed = False
+        self.metrics = DispatchMetrics()
+    
+    async def __aenter__(self) -> 'NotificationDispatcher':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+    
+    @property
+    def pending(self) -> int:
+        """Number of notifications queued, in flight or waiting for a retry"""
+        return self._pending
+    
+    def enqueue(self, notification: Notification, channel: str) -> None:
+        """Queue a notification for delivery on a channel without waiting for it"""
+        if self._closed:
+            raise RuntimeError("Dispatcher is closed")
+        queue = self._channel_queue(channel)
+        queue.put_nowait(notification)
+        self._pending += 1
+        self._idle_event().clear()
+        self.metrics.enqueued[channel] += 1
+    
+    def submit(self, sender: NotificationSender, recipient_id: str, content: str,
+               appointment_id: str) -> Notification:
+        """Create a notification with a sender's factory method and queue it on the sender's channel"""
+        notification = sender.create_notification(recipient_id, content, appointment_id)
+        self.enqueue(notification, sender.channel)
+        return notification
+    
+    async def join(self) -> None:
+        """Wait until every queued notification has been sent or has run out of retries"""
+        await self._idle_event().wait()
+    
+    async def close(self) -> None:
+        """Stop accepting notifications, wait for the queued ones and stop the workers"""
+        self._closed = True
+        await self.join()
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+    
+    def _idle_event(self) -> asyncio.Event:
+        """Get the event set while nothing is pending, creating it in the running loop"""
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            if self._pending == 0:
+                self._idle.set()
+        return self._idle
+    
+    def _channel_queue(self, channel: str) -> asyncio.Queue:
+        """Get the queue of a channel, starting its worker on first use"""
+        queue = self._queues.get(channel)
+        if queue is None:
+            queue = asyncio.Queue(self._max_queue_size)
+            self._queues[channel] = queue
+            self._limits[channel] = asyncio.Semaphore(self._concurrency.get(channel, self._default_concurrency))
+            self._workers[channel] = asyncio.get_running_loop().create_task(self._run_channel(channel))
+        return queue
+    
+    async def _run_channel(self, channel: str) -> None:
+        """Cut the queue of a channel into batches and start delivering each one"""
+        queue = self._queues[channel]
+        limit = self._limits[channel]
+        while True:
+            batch = [await queue.get()]
+            self._drain(queue, batch)
+            if len(batch) < self._batch_size and self._max_batch_delay > 0:
+                await asyncio.sleep(self._max_batch_delay)
+                self._drain(queue, batch)
+            # Stop taking from the queue while the channel is at its limit
+            await limit.acquire()
+            self._spawn(self._deliver(channel, batch))
+    
+    def _drain(self, queue: asyncio.Queue, batch: List[Notification]) -> None:
+        """Move queued notifications into a batch until it is full"""
+        while len(batch) < self._batch_size and not queue.empty():
+            batch.append(queue.get_nowait())
+    
+    async def _deliver(self, channel: str, batch: List[Notification]) -> None:
+        """Deliver a batch and settle or retry each of its notifications"""
+        try:
+            try:
+                results = await self._transport.deliver(channel, batch)
+            except Exception:
+                results = None
+            if results is None or len(results) != len(batch):
+                results = [False] * len(batch)
+        finally:
+            self._limits[channel].release()
+        self.metrics.batches[channel] += 1
+        
+        for notification, accepted in zip(batch, results):
+            notification_id = notification.notification_id
+            if accepted:
+                if notification.status == NotificationStatus.FAILED:
+                    notification.resend()
+                else:
+                    notification.send()
+                self._attempts.pop(notification_id, None)
+                self.metrics.sent[channel] += 1
+                self._settle()
+                continue
+            
+            notification.mark_as_failed()
+            attempt = self._attempts.get(notification_id, 0) + 1
+            if attempt > self._max_retries:
+                self._attempts.pop(notification_id, None)
+                self.metrics.failed[channel] += 1
+                self._settle()
+            else:
+                self._attempts[notification_id] = attempt
+                self.metrics.retried[channel] += 1
+                self._spawn(self._retry(channel, notification, attempt))
+    
+    async def _retry(self, channel: str, notification: Notification, attempt: int) -> None:
+        """Queue a failed notification again after an exponential, jittered backoff"""
+        delay = min(self._max_backoff, self._backoff * 2 ** (attempt - 1))
+        await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+        await self._queues[channel].put(notification)
+    
+    def _settle(self) -> None:
+        """Count a notification as done, waking join() when nothing is left"""
+        self._pending -= 1
+        if self._pending == 0:
+            self._idle_event().set()
+    
+    def _spawn(self, coroutine) -> None:
+        """Run a coroutine as a task, keeping a reference until it is done"""
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
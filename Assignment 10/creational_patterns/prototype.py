@@ -1,15 +1,15 @@
-import copy
 import uuid
 import sys
 import os
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
 # Add the parent directory to the path so we can import from src
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.time_slot import TimeSlot
 from src.enums import SlotStatus
+from creational_patterns.recurrence import WeeklyRecurrence, daily, weekly
 
 class TimeSlotPrototype:
     """
@@ -25,13 +25,21 @@ class TimeSlotPrototype:
         self._end_time = end_time
         self._status = status
     
+    @property
+    def start_time(self) -> datetime:
+        return self._start_time
+    
+    @property
+    def end_time(self) -> datetime:
+        return self._end_time
+    
     def clone(self) -> TimeSlot:
-        """Create a deep copy of the time slot with a new ID"""
-        # Create a new TimeSlot with the same properties but a new ID
+        """Create a copy of the time slot with a new ID"""
+        # Datetimes are immutable, so the clone can share them
         return TimeSlot(
             slot_id=str(uuid.uuid4()),
-            start_time=copy.deepcopy(self._start_time),
-            end_time=copy.deepcopy(self._end_time),
+            start_time=self._start_time,
+            end_time=self._end_time,
             status=self._status
         )
     
@@ -83,26 +91,34 @@ class TimeSlotCache:
             return prototype.clone()
         return None
     
+    def iter_recurring_slots(self, name: str, rule: WeeklyRecurrence) -> Iterator[TimeSlot]:
+        """
+        Lazily create a time slot for each occurrence of a recurrence rule,
+        with the status of a named prototype
+        
+        Only the slots actually consumed are built, so callers can stream a
+        long-running schedule or stop early without paying for the rest.
+        """
+        prototype = self.get_prototype(name)
+        if not prototype:
+            return
+        for start_time, end_time in rule:
+            yield prototype.clone_with_new_time(start_time, end_time)
+    
+    def create_recurring_slots(self, name: str, rule: WeeklyRecurrence) -> List[TimeSlot]:
+        """Create the time slots of every occurrence of a recurrence rule"""
+        return list(self.iter_recurring_slots(name, rule))
+    
     def create_daily_slots(self, name: str, days: int) -> List[TimeSlot]:
         """Create time slots for multiple consecutive days based on a prototype"""
         prototype = self.get_prototype(name)
         if not prototype:
             return []
-        
-        slots = []
-        for day in range(days):
-            slots.append(prototype.clone_with_offset(days=day))
-        
-        return slots
+        return self.create_recurring_slots(name, daily(prototype.start_time, prototype.end_time, days))
     
     def create_weekly_recurring_slot(self, name: str, weeks: int) -> List[TimeSlot]:
         """Create time slots for the same day of the week for multiple weeks"""
         prototype = self.get_prototype(name)
         if not prototype:
             return []
-        
-        slots = []
-        for week in range(weeks):
-            slots.append(prototype.clone_with_offset(days=week * 7))
-        
-        return slots
+        return self.create_recurring_slots(name, weekly(prototype.start_time, prototype.end_time, weeks))
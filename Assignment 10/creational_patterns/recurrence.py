@@ -0,0 +1,151 @@
+from array import array
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+_SECOND = timedelta(seconds=1)
+
+class WeeklyRecurrence:
+    """
+    Recurrence rule for slots repeating on set weekdays (like an RRULE with
+    FREQ=WEEKLY;BYDAY=...;INTERVAL=...;UNTIL=...;COUNT=...)
+    
+    Every matching day is cut into back-to-back slots between the daily start
+    and end times. Holidays drop whole days and exceptions drop single slots.
+    Slots are generated lazily as (start, end) pairs, or as a compact array of
+    second offsets, so no TimeSlot is built until a caller asks for one.
+    """
+    
+    def __init__(self, start_date: date, day_start: time, day_end: Optional[time], slot_minutes: int,
+                 weekdays: Optional[Iterable[int]] = None, interval: int = 1,
+                 until: Optional[date] = None, count: Optional[int] = None,
+                 holidays: Iterable[date] = (), exceptions: Iterable[datetime] = (),
+                 slot_length: Optional[timedelta] = None):
+        """
+        Initialize the rule
+        
+        day_end of None gives one slot per day starting at day_start; weekdays
+        are numbered as in date.weekday() (Monday is 0) and default to every
+        day; interval is the number of weeks between repeats; until is the last
+        day (inclusive) and count the maximum number of slots generated.
+        Slots carry the tzinfo of day_start, and slot_length gives an exact
+        slot length in place of slot_minutes
+        """
+        if slot_length is None:
+            if slot_minutes < 1:
+                raise ValueError("Slot length must be at least one minute")
+            slot_length = timedelta(minutes=slot_minutes)
+        elif slot_length <= timedelta(0):
+            raise ValueError("Slot length must be positive")
+        if interval < 1:
+            raise ValueError("Interval must be at least one week")
+        weekdays = frozenset(range(7) if weekdays is None else weekdays)
+        if not weekdays:
+            raise ValueError("At least one weekday must be given")
+        if until is None and count is None:
+            raise ValueError("Either until or count must be given")
+        self._start_date = start_date.date() if isinstance(start_date, datetime) else start_date
+        self._slot_minutes = slot_minutes
+        self._slot_length = slot_length
+        self._tzinfo = day_start.tzinfo
+        self._weekdays = weekdays
+        self._interval = interval
+        self._until = until
+        self._count = count
+        self._holidays = frozenset(holidays)
+        self._exceptions = frozenset(exceptions)
+        # Offsets from midnight of the slots of any matching day, computed once
+        first = timedelta(hours=day_start.hour, minutes=day_start.minute,
+                          seconds=day_start.second, microseconds=day_start.microsecond)
+        if day_end is None:
+            self._day_offsets = [first]
+        else:
+            last = timedelta(minutes=MINUTES_PER_DAY if day_end == time.min else day_end.hour * 60 + day_end.minute)
+            slots_per_day = max(0, (last - first) // slot_length)
+            self._day_offsets = [first + slot_length * slot for slot in range(slots_per_day)]
+    
+    @property
+    def slot_minutes(self) -> int:
+        return self._slot_minutes
+    
+    @property
+    def slot_length(self) -> timedelta:
+        return self._slot_length
+    
+    def add_holiday(self, day: date) -> None:
+        """Exclude every slot of a day"""
+        self._holidays = self._holidays | {day}
+    
+    def add_exception(self, start_time: datetime) -> None:
+        """Exclude the slot starting at a given time"""
+        self._exceptions = self._exceptions | {start_time}
+    
+    def days(self) -> Iterator[date]:
+        """Iterate over the days the rule repeats on, skipping holidays"""
+        # Weeks are counted from the Monday of the first week
+        week_start = self._start_date - timedelta(days=self._start_date.weekday())
+        weekdays = sorted(self._weekdays)
+        while self._until is None or week_start <= self._until:
+            for weekday in weekdays:
+                day = week_start + timedelta(days=weekday)
+                if day < self._start_date or day in self._holidays:
+                    continue
+                if self._until is not None and day > self._until:
+                    return
+                yield day
+            week_start += timedelta(weeks=self._interval)
+    
+    def __iter__(self) -> Iterator[Tuple[datetime, datetime]]:
+        """Iterate over the (start, end) times of the slots in order"""
+        length = self._slot_length
+        offsets = self._day_offsets
+        remaining = self._count
+        if remaining == 0 or not offsets:
+            return
+        for day in self.days():
+            midnight = self._midnight(day)
+            for offset in offsets:
+                start_time = midnight + offset
+                if start_time in self._exceptions:
+                    continue
+                yield start_time, start_time + length
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining == 0:
+                        return
+    
+    def to_array(self) -> array:
+        """
+        Get the slot starts as seconds since midnight of the start date, in a
+        compact array of machine integers instead of datetime pairs
+        """
+        origin = self._midnight(self._start_date)
+        return array('q', ((start_time - origin) // _SECOND for start_time, _ in self))
+    
+    def range_at(self, offsets: array, index: int) -> Tuple[datetime, datetime]:
+        """Get the (start, end) times of the slot at an index of an array from to_array"""
+        start_time = self._midnight(self._start_date) + timedelta(seconds=offsets[index])
+        return start_time, start_time + self._slot_length
+    
+    def count_slots(self) -> int:
+        """Count the slots without materializing them"""
+        return sum(1 for _ in self)
+    
+    def _midnight(self, day: date) -> datetime:
+        """Get the start of a day in the time zone of the rule"""
+        return datetime.combine(day, time.min, tzinfo=self._tzinfo)
+
+def daily(start_time: datetime, end_time: datetime, days: int) -> WeeklyRecurrence:
+    """Rule repeating a slot at the same time every day for a number of days"""
+    return _repeating(start_time, end_time, range(7), days)
+
+def weekly(start_time: datetime, end_time: datetime, weeks: int) -> WeeklyRecurrence:
+    """Rule repeating a slot at the same time on the same weekday for a number of weeks"""
+    return _repeating(start_time, end_time, [start_time.weekday()], weeks)
+
+def _repeating(start_time: datetime, end_time: datetime, weekdays: List[int], count: int) -> WeeklyRecurrence:
+    """Rule with one slot per matching day, starting at the time of day of start_time"""
+    length = end_time - start_time
+    minutes = max(1, round(length.total_seconds() / 60))
+    return WeeklyRecurrence(start_time.date(), start_time.timetz(), None, minutes,
+                            weekdays=weekdays, count=max(0, count), slot_length=length)
@@ -0,0 +1,185 @@
+import asyncio
+import heapq
+import sys
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+# Add the parent directory to the path so we can import from src
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.appointment import Appointment
+from src.notification import Notification
+from src.enums import AppointmentStatus, NotificationType
+from creational_patterns.factory_method import NotificationSender
+from creational_patterns.notification_dispatcher import NotificationDispatcher
+from creational_patterns.singleton import SystemConfiguration
+
+# Appointments in these states get no reminder
+_CLOSED_STATUSES = (AppointmentStatus.CANCELLED, AppointmentStatus.COMPLETED, AppointmentStatus.NO_SHOW)
+
+class ReminderScheduler:
+    """
+    Time-ordered queue of the reminders still to be sent
+    
+    Keeps a min-heap of (reminder time, appointment ID) entries, so adding,
+    moving or cancelling a reminder costs O(log n) and finding the due ones
+    only looks at the front of the heap instead of scanning every upcoming
+    appointment. Moved and cancelled reminders leave stale heap entries that
+    are skipped when they reach the front, and the heap is rebuilt once they
+    outnumber the live ones.
+    
+    Each appointment time is reminded exactly once: an appointment that was
+    already reminded is only scheduled again if it is moved to another time.
+    The record of a sent reminder is dropped once its appointment has
+    started, so memory only grows with the upcoming appointments.
+    """
+    
+    def __init__(self, hours_before: Optional[float] = None):
+        """
+        Initialize the scheduler
+        
+        hours_before defaults to the reminder_hours_before setting of the
+        SystemConfiguration
+        """
+        if hours_before is None:
+            hours_before = SystemConfiguration().get('reminder_hours_before', 24)
+        self._lead_time = timedelta(hours=hours_before)
+        self._heap: List[Tuple[datetime, str]] = []
+        # Reminder time, appointment time and patient ID of each pending reminder
+        self._pending: Dict[str, Tuple[datetime, datetime, str]] = {}
+        # Appointment time each sent reminder was for, and a min-heap of
+        # those times to forget them once the appointments have started
+        self._reminded: Dict[str, datetime] = {}
+        self._reminded_heap: List[Tuple[datetime, str]] = []
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    @property
+    def lead_time(self) -> timedelta:
+        return self._lead_time
+    
+    def schedule(self, appointment: Appointment) -> bool:
+        """
+        Add or move the reminder of an appointment after it is created or rescheduled
+        
+        Returns whether a reminder is now pending; closed appointments and
+        appointments already reminded for their current time get none.
+        """
+        return self.schedule_reminder(appointment.appointment_id, appointment.patient_id,
+                                      appointment.date_time, appointment.status)
+    
+    def schedule_reminder(self, appointment_id: str, patient_id: str, date_time: datetime,
+                          status: AppointmentStatus = AppointmentStatus.SCHEDULED) -> bool:
+        """
+        Add or move the reminder of an appointment given by its values, such
+        as those carried by an appointment lifecycle event
+        
+        Returns whether a reminder is now pending, as for schedule().
+        """
+        if status in _CLOSED_STATUSES:
+            self.cancel(appointment_id)
+            return False
+        if self._reminded.get(appointment_id) == date_time:
+            return False
+        
+        remind_at = date_time - self._lead_time
+        entry = (remind_at, date_time, patient_id)
+        if self._pending.get(appointment_id) != entry:
+            self._pending[appointment_id] = entry
+            self._reminded.pop(appointment_id, None)
+            heapq.heappush(self._heap, (remind_at, appointment_id))
+            self._compact_if_needed()
+        return True
+    
+    def cancel(self, appointment_id: str) -> None:
+        """Drop the reminder of a cancelled or deleted appointment"""
+        self._pending.pop(appointment_id, None)
+        self._reminded.pop(appointment_id, None)
+        self._compact_if_needed()
+    
+    def next_reminder_time(self) -> Optional[datetime]:
+        """Get the time the earliest pending reminder is due, or None if none are pending"""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+    
+    def pop_due(self, now: Optional[datetime] = None) -> List[Tuple[str, str, datetime]]:
+        """
+        Remove the reminders due at or before now
+        
+        Returns (appointment ID, patient ID, appointment time) tuples in
+        reminder time order; reminders for appointments that have already
+        started are dropped.
+        """
+        now = now or datetime.now()
+        self._forget_started(now)
+        due = []
+        while True:
+            self._discard_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            _, appointment_id = heapq.heappop(self._heap)
+            _, date_time, patient_id = self._pending.pop(appointment_id)
+            if date_time > now:
+                self._reminded[appointment_id] = date_time
+                heapq.heappush(self._reminded_heap, (date_time, appointment_id))
+                due.append((appointment_id, patient_id, date_time))
+    
+    def send_due_reminders(self, sender: NotificationSender, now: Optional[datetime] = None,
+                           dispatcher: Optional[NotificationDispatcher] = None) -> List[Notification]:
+        """
+        Create a REMINDER notification with the sender for each due reminder
+        
+        With a dispatcher the notifications are queued on the sender's
+        channel, otherwise each one is sent right away.
+        """
+        notifications = []
+        for appointment_id, patient_id, date_time in self.pop_due(now):
+            notification = sender.create_notification(
+                patient_id, f"Reminder: you have an appointment on {date_time}",
+                appointment_id, NotificationType.REMINDER
+            )
+            if dispatcher is not None:
+                dispatcher.enqueue(notification, sender.channel)
+            else:
+                notification.send()
+            notifications.append(notification)
+        return notifications
+    
+    async def run(self, sender: NotificationSender, dispatcher: Optional[NotificationDispatcher] = None,
+                  max_sleep: float = 60.0) -> None:
+        """Send reminders as they fall due until cancelled, sleeping until the next one or max_sleep seconds"""
+        while True:
+            self.send_due_reminders(sender, dispatcher=dispatcher)
+            next_time = self.next_reminder_time()
+            delay = max_sleep
+            if next_time is not None:
+                delay = min(max_sleep, max(0.0, (next_time - datetime.now()).total_seconds()))
+            await asyncio.sleep(delay)
+    
+    def _forget_started(self, now: datetime) -> None:
+        """
+        Drop the records of sent reminders for appointments that have started;
+        scheduling such an appointment again never makes a reminder due
+        """
+        while self._reminded_heap and self._reminded_heap[0][0] <= now:
+            date_time, appointment_id = heapq.heappop(self._reminded_heap)
+            if self._reminded.get(appointment_id) == date_time:
+                del self._reminded[appointment_id]
+    
+    def _is_stale(self, remind_at: datetime, appointment_id: str) -> bool:
+        """Check if a heap entry no longer matches the pending reminder of its appointment"""
+        entry = self._pending.get(appointment_id)
+        return entry is None or entry[0] != remind_at
+    
+    def _discard_stale(self) -> None:
+        """Pop stale entries off the front of the heap"""
+        while self._heap and self._is_stale(*self._heap[0]):
+            heapq.heappop(self._heap)
+    
+    def _compact_if_needed(self) -> None:
+        """Rebuild the heap from the pending reminders once most of its entries are stale"""
+        if len(self._heap) > 2 * len(self._pending) + 64:
+            self._heap = [(entry[0], appointment_id) for appointment_id, entry in self._pending.items()]
+            heapq.heapify(self._heap)
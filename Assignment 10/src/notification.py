@@ -68,6 +68,13 @@ class Notification:
             return True
         return False
     
+    def mark_as_failed(self) -> bool:
+        """Mark a pending notification as failed to send"""
+        if self._status == NotificationStatus.PENDING:
+            self._status = NotificationStatus.FAILED
+            return True
+        return False
+    
     def resend(self) -> bool:
         """Resend a failed notification"""
         if self._status == NotificationStatus.FAILED:
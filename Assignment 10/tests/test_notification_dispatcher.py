@@ -0,0 +1,116 @@
+import asyncio
+import unittest
+from creational_patterns.factory_method import EmailNotificationSender, SMSNotificationSender
+from creational_patterns.notification_dispatcher import FakeTransport, NotificationDispatcher
+from src.enums import NotificationStatus
+
+class TestNotificationDispatcher(unittest.IsolatedAsyncioTestCase):
+    """
+    Test case for the NotificationDispatcher class.
+    """
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.sender = EmailNotificationSender()
+    
+    def submit(self, dispatcher, count):
+        """Submit a number of email notifications."""
+        return [
+            dispatcher.submit(self.sender, f"patient{i}", f"Reminder {i}", f"appointment{i}")
+            for i in range(count)
+        ]
+    
+    async def test_full_batches_are_sent_without_waiting(self):
+        """Test that a batch is flushed as soon as it reaches the batch size."""
+        transport = FakeTransport()
+        dispatcher = NotificationDispatcher(transport, batch_size=3, max_batch_delay=60)
+        self.submit(dispatcher, 6)
+        
+        # Far shorter than max_batch_delay, so only full batches can have been sent
+        await asyncio.wait_for(dispatcher.join(), timeout=1)
+        self.assertEqual(transport.batch_sizes["email"], [3, 3])
+        self.assertEqual(dispatcher.metrics.sent["email"], 6)
+        await dispatcher.close()
+    
+    async def test_partial_batch_is_sent_after_delay(self):
+        """Test that notifications arriving within the delay share a batch that is sent once it expires."""
+        transport = FakeTransport()
+        dispatcher = NotificationDispatcher(transport, batch_size=100, max_batch_delay=0.05)
+        self.submit(dispatcher, 1)
+        await asyncio.sleep(0.01)
+        self.submit(dispatcher, 1)
+        self.assertEqual(transport.batch_sizes["email"], [])
+        
+        await asyncio.wait_for(dispatcher.join(), timeout=1)
+        self.assertEqual(transport.batch_sizes["email"], [2])
+        await dispatcher.close()
+    
+    async def test_channels_are_batched_separately(self):
+        """Test that each channel gets its own batches."""
+        transport = FakeTransport()
+        async with NotificationDispatcher(transport, batch_size=10, max_batch_delay=0) as dispatcher:
+            self.submit(dispatcher, 2)
+            dispatcher.submit(SMSNotificationSender(), "patient1", "Reminder", "appointment1")
+        
+        self.assertEqual(len(transport.delivered["email"]), 2)
+        self.assertEqual(len(transport.delivered["sms"]), 1)
+    
+    async def test_concurrency_limit(self):
+        """Test that a channel never has more batches in flight than its limit."""
+        transport = FakeTransport(latency=0.01)
+        async with NotificationDispatcher(transport, batch_size=1, max_batch_delay=0,
+                                          concurrency={"email": 2}) as dispatcher:
+            self.submit(dispatcher, 6)
+        
+        self.assertEqual(transport.max_in_flight["email"], 2)
+        self.assertEqual(len(transport.delivered["email"]), 6)
+    
+    async def test_rejected_notification_is_retried(self):
+        """Test that a rejected notification is sent again after a backoff."""
+        rejected = set()
+        
+        def fail_once(notification):
+            if notification.notification_id in rejected:
+                return False
+            rejected.add(notification.notification_id)
+            return True
+        
+        transport = FakeTransport(fail=fail_once)
+        dispatcher = NotificationDispatcher(transport, max_batch_delay=0, backoff=0.001)
+        notification, = self.submit(dispatcher, 1)
+        
+        await asyncio.wait_for(dispatcher.join(), timeout=1)
+        self.assertEqual(notification.status, NotificationStatus.SENT)
+        self.assertEqual(transport.delivered["email"], [notification])
+        self.assertEqual(dispatcher.metrics.retried["email"], 1)
+        self.assertEqual(dispatcher.metrics.sent["email"], 1)
+        await dispatcher.close()
+    
+    async def test_retries_are_exhausted(self):
+        """Test that a notification rejected on every attempt fails after max_retries retries."""
+        transport = FakeTransport(fail=lambda notification: True)
+        dispatcher = NotificationDispatcher(transport, max_batch_delay=0, max_retries=2, backoff=0.001)
+        notification, = self.submit(dispatcher, 1)
+        
+        await asyncio.wait_for(dispatcher.join(), timeout=1)
+        self.assertEqual(notification.status, NotificationStatus.FAILED)
+        self.assertEqual(transport.batch_sizes["email"], [1, 1, 1])
+        self.assertEqual(dispatcher.metrics.retried["email"], 2)
+        self.assertEqual(dispatcher.metrics.failed["email"], 1)
+        self.assertEqual(dispatcher.pending, 0)
+        await dispatcher.close()
+    
+    async def test_close_drains_queue(self):
+        """Test that close waits for queued notifications and then refuses new ones."""
+        transport = FakeTransport(latency=0.01)
+        dispatcher = NotificationDispatcher(transport, batch_size=2, max_batch_delay=0.01)
+        self.submit(dispatcher, 5)
+        
+        await asyncio.wait_for(dispatcher.close(), timeout=1)
+        self.assertEqual(len(transport.delivered["email"]), 5)
+        self.assertEqual(dispatcher.pending, 0)
+        with self.assertRaises(RuntimeError):
+            self.submit(dispatcher, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from datetime import date, datetime, time, timedelta, timezone
+from creational_patterns.recurrence import WeeklyRecurrence, daily, weekly
+
+class TestWeeklyRecurrence(unittest.TestCase):
+    """
+    Test case for the WeeklyRecurrence class.
+    """
+    
+    def setUp(self):
+        """Set up the test case."""
+        # A Monday
+        self.start_date = date(2030, 1, 7)
+    
+    def starts(self, rule):
+        """Get the start times of the slots of a rule."""
+        return [start_time for start_time, _ in rule]
+    
+    def test_interval_skips_weeks(self):
+        """Test that an interval of two weeks repeats every other week."""
+        rule = WeeklyRecurrence(self.start_date, time(9, 0), None, 30,
+                                weekdays=[0, 2], interval=2, until=date(2030, 1, 31))
+        
+        self.assertEqual([start_time.date() for start_time in self.starts(rule)], [
+            date(2030, 1, 7), date(2030, 1, 9), date(2030, 1, 21), date(2030, 1, 23)
+        ])
+        self.assertEqual(rule.count_slots(), 4)
+    
+    def test_until_and_count_stop_at_whichever_comes_first(self):
+        """Test that generation stops at the earlier of until and count."""
+        # count is reached first
+        rule = WeeklyRecurrence(self.start_date, time(9, 0), time(12, 0), 60,
+                                until=date(2030, 1, 31), count=5)
+        self.assertEqual(self.starts(rule)[-1], datetime(2030, 1, 8, 10, 0))
+        self.assertEqual(rule.count_slots(), 5)
+        
+        # until is reached first; the last day is inclusive
+        rule = WeeklyRecurrence(self.start_date, time(9, 0), time(12, 0), 60,
+                                until=date(2030, 1, 8), count=100)
+        self.assertEqual(self.starts(rule)[-1], datetime(2030, 1, 8, 11, 0))
+        self.assertEqual(rule.count_slots(), 6)
+    
+    def test_holidays_and_exceptions_are_skipped(self):
+        """Test that holidays drop whole days and exceptions drop single slots."""
+        rule = WeeklyRecurrence(self.start_date, time(9, 0), time(11, 0), 60,
+                                until=date(2030, 1, 10), holidays=[date(2030, 1, 8)],
+                                exceptions=[datetime(2030, 1, 9, 10, 0)])
+        rule.add_holiday(date(2030, 1, 10))
+        rule.add_exception(datetime(2030, 1, 7, 9, 0))
+        
+        self.assertEqual(list(rule.days()), [date(2030, 1, 7), date(2030, 1, 9)])
+        self.assertEqual(self.starts(rule), [datetime(2030, 1, 7, 10, 0), datetime(2030, 1, 9, 9, 0)])
+    
+    def test_exceptions_do_not_use_up_count(self):
+        """Test that a skipped slot does not count towards count."""
+        rule = WeeklyRecurrence(self.start_date, time(9, 0), None, 30, count=2,
+                                exceptions=[datetime(2030, 1, 7, 9, 0)])
+        
+        self.assertEqual(self.starts(rule), [datetime(2030, 1, 8, 9, 0), datetime(2030, 1, 9, 9, 0)])
+    
+    def test_array_round_trip(self):
+        """Test that every slot can be rebuilt from the array of offsets."""
+        rule = WeeklyRecurrence(self.start_date, time(9, 0), time(10, 30), 45,
+                                weekdays=[1, 3], until=date(2030, 1, 24))
+        offsets = rule.to_array()
+        
+        self.assertEqual(len(offsets), rule.count_slots())
+        self.assertEqual([rule.range_at(offsets, index) for index in range(len(offsets))], list(rule))
+    
+    def test_aware_slots_keep_time_zone(self):
+        """Test that slots of an aware rule are in its time zone, also through arrays."""
+        zone = timezone(timedelta(hours=2))
+        rule = WeeklyRecurrence(self.start_date, time(9, 0, tzinfo=zone), time(11, 0), 60,
+                                count=4, exceptions=[datetime(2030, 1, 7, 7, 0, tzinfo=timezone.utc)])
+        slots = list(rule)
+        
+        self.assertEqual(slots[0], (datetime(2030, 1, 7, 10, 0, tzinfo=zone),
+                                    datetime(2030, 1, 7, 11, 0, tzinfo=zone)))
+        self.assertTrue(all(start_time.tzinfo is zone for start_time, _ in slots))
+        offsets = rule.to_array()
+        self.assertEqual([rule.range_at(offsets, index) for index in range(len(offsets))], slots)
+    
+    def test_daily_and_weekly_keep_time_zone_and_exact_length(self):
+        """Test that daily() and weekly() keep the tzinfo and exact length of the first slot."""
+        zone = timezone(timedelta(hours=-5))
+        start_time = datetime(2030, 1, 7, 9, 15, 30, tzinfo=zone)
+        end_time = start_time + timedelta(seconds=45)
+        
+        daily_slots = list(daily(start_time, end_time, 3))
+        self.assertEqual(daily_slots[2], (start_time + timedelta(days=2), end_time + timedelta(days=2)))
+        self.assertTrue(all(end - start == timedelta(seconds=45) for start, end in daily_slots))
+        
+        weekly_slots = list(weekly(start_time, end_time, 2))
+        self.assertEqual(weekly_slots, [(start_time, end_time),
+                                        (start_time + timedelta(weeks=1), end_time + timedelta(weeks=1))])
+        self.assertTrue(all(start.tzinfo is zone for start, _ in weekly_slots))
+    
+    def test_invalid_rules_are_rejected(self):
+        """Test that rules without an end or with a bad length or interval are rejected."""
+        with self.assertRaises(ValueError):
+            WeeklyRecurrence(self.start_date, time(9, 0), None, 30)
+        with self.assertRaises(ValueError):
+            WeeklyRecurrence(self.start_date, time(9, 0), None, 30, count=1, interval=0)
+        with self.assertRaises(ValueError):
+            WeeklyRecurrence(self.start_date, time(9, 0), None, 30, count=1, slot_length=timedelta(0))
+
+if __name__ == "__main__":
+    unittest.main()
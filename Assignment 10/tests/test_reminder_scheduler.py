@@ -0,0 +1,99 @@
+import unittest
+from datetime import datetime, timedelta
+from creational_patterns.reminder_scheduler import ReminderScheduler
+from src.appointment import Appointment
+from src.enums import AppointmentStatus, AppointmentType
+
+class TestReminderScheduler(unittest.TestCase):
+    """
+    Test case for the ReminderScheduler class.
+    """
+    
+    def setUp(self):
+        """Set up the test case."""
+        self.now = datetime(2030, 1, 7, 9, 0)
+        self.scheduler = ReminderScheduler(hours_before=24)
+    
+    def appointment(self, appointment_id, hours_from_now, status=AppointmentStatus.SCHEDULED):
+        """Create an appointment starting a number of hours from now."""
+        return Appointment(appointment_id, f"patient-{appointment_id}", "doctor1",
+                           self.now + timedelta(hours=hours_from_now), 30,
+                           AppointmentType.REGULAR, status)
+    
+    def due_ids(self, hours_from_now):
+        """Pop the reminders due a number of hours from now and get their appointment IDs."""
+        return [appointment_id for appointment_id, _, _ in
+                self.scheduler.pop_due(self.now + timedelta(hours=hours_from_now))]
+    
+    def test_reminders_are_due_in_time_order(self):
+        """Test that reminders fall due lead_time before their appointments, earliest first."""
+        for appointment_id, hours in (("a3", 30), ("a1", 25), ("a2", 28)):
+            self.assertTrue(self.scheduler.schedule(self.appointment(appointment_id, hours)))
+        
+        self.assertEqual(self.scheduler.next_reminder_time(), self.now + timedelta(hours=1))
+        self.assertEqual(self.due_ids(0), [])
+        self.assertEqual(self.due_ids(4), ["a1", "a2"])
+        self.assertEqual(self.due_ids(10), ["a3"])
+        self.assertEqual(len(self.scheduler), 0)
+        self.assertIsNone(self.scheduler.next_reminder_time())
+    
+    def test_cancel_and_closed_statuses_drop_the_reminder(self):
+        """Test that cancelled and closed appointments get no reminder."""
+        self.scheduler.schedule(self.appointment("a1", 25))
+        self.scheduler.schedule(self.appointment("a2", 26))
+        self.scheduler.cancel("a1")
+        self.assertFalse(self.scheduler.schedule(self.appointment("a2", 26, AppointmentStatus.CANCELLED)))
+        self.assertFalse(self.scheduler.schedule(self.appointment("a3", 27, AppointmentStatus.COMPLETED)))
+        
+        self.assertEqual(len(self.scheduler), 0)
+        self.assertEqual(self.due_ids(10), [])
+    
+    def test_reschedule_moves_the_reminder(self):
+        """Test that rescheduling an appointment replaces its pending reminder."""
+        self.scheduler.schedule(self.appointment("a1", 25))
+        self.scheduler.schedule(self.appointment("a1", 48))
+        
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertEqual(self.due_ids(10), [])
+        self.assertEqual(self.due_ids(24), ["a1"])
+    
+    def test_reminded_time_is_not_reminded_again(self):
+        """Test that an appointment is only reminded again after moving to another time."""
+        self.scheduler.schedule(self.appointment("a1", 25))
+        self.assertEqual(self.due_ids(2), ["a1"])
+        
+        # A later update of the appointment at the same time
+        self.assertFalse(self.scheduler.schedule(self.appointment("a1", 25)))
+        self.assertEqual(self.due_ids(3), [])
+        
+        self.assertTrue(self.scheduler.schedule(self.appointment("a1", 50)))
+        self.assertEqual(self.due_ids(26), ["a1"])
+    
+    def test_started_appointments_are_dropped(self):
+        """Test that reminders due after their appointment started are never sent."""
+        self.scheduler.schedule(self.appointment("a1", 2))
+        self.assertEqual(self.due_ids(3), [])
+        self.assertEqual(len(self.scheduler), 0)
+    
+    def test_reminded_records_are_forgotten_once_appointments_start(self):
+        """Test that the record of a sent reminder does not outlive its appointment."""
+        for i in range(100):
+            self.scheduler.schedule(self.appointment(f"a{i}", 25))
+        self.assertEqual(len(self.due_ids(2)), 100)
+        self.assertEqual(len(self.scheduler._reminded), 100)
+        
+        self.due_ids(25)
+        self.assertEqual(self.scheduler._reminded, {})
+        self.assertEqual(self.scheduler._reminded_heap, [])
+    
+    def test_stale_entries_are_compacted(self):
+        """Test that moving reminders many times does not grow the heap without bound."""
+        for hours in range(25, 1025):
+            self.scheduler.schedule(self.appointment("a1", hours))
+        
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertLessEqual(len(self.scheduler._heap), 2 + 64)
+        self.assertEqual(self.due_ids(1000), ["a1"])
+
+if __name__ == '__main__':
+    unittest.main()
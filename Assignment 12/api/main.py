@@ -1,10 +1,13 @@
 """
 Main FastAPI application for the AI-Powered Smart Appointment Booking System.
 """
-from fastapi import FastAPI, HTTPException, Depends, status
+import asyncio
+import os
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.openapi.utils import get_openapi
-from typing import List, Optional
+from typing import Any, Callable, List, Optional, TypeVar
 
 # Import models and services
 from src.patient import Patient
@@ -13,21 +16,29 @@ from src.appointment import Appointment
 from src.enums import AppointmentStatus
 
 # Import repositories
-from repositories.inmemory.inmemory_patient_repository import InMemoryPatientRepository
-from repositories.inmemory.inmemory_doctor_repository import InMemoryDoctorRepository
-from repositories.inmemory.inmemory_appointment_repository import InMemoryAppointmentRepository
+from repositories.patient_repository import PatientRepository
+from repositories.doctor_repository import DoctorRepository
+from repositories.appointment_repository import AppointmentRepository
+from factories.repository_factory import RepositoryFactory, StorageType
 
 # Import services
 from services.patient_service import PatientService
 from services.doctor_service import DoctorService
 from services.appointment_service import AppointmentService
+from services.availability_service import AvailabilityService
+from services.events import EventBus, EventOutbox
+from services.cache import TTLCache
+from services.executor import ServiceBusyError, ServiceExecutor
+from services.locks import LeaderLock
+from services.reminders import ReminderScheduler, ReminderSubscriber
 
-# Import API models
+# Import API models and serializers
 from api.models import (
     PatientCreate, PatientResponse, PatientUpdate,
     DoctorCreate, DoctorResponse, DoctorUpdate,
     AppointmentCreate, AppointmentResponse, AppointmentUpdate
 )
+from api.serializers import JSONBytesResponse, dumps, json_response
 
 # Create FastAPI app
 app = FastAPI(
@@ -46,19 +57,133 @@ app.add_middleware(
 )
 
 # Create repositories
-patient_repository = InMemoryPatientRepository()
-doctor_repository = InMemoryDoctorRepository()
-appointment_repository = InMemoryAppointmentRepository()
+# The storage backend is selected with the STORAGE_TYPE environment variable
+# (MEMORY, SHARDED_MEMORY, SHARED_MEMORY, FILE_SYSTEM or DATABASE); persistent
+# and shared storage keeps its files in DATA_DIR.
+storage_type = StorageType(os.environ.get("STORAGE_TYPE", StorageType.MEMORY.value))
+data_dir = os.environ.get("DATA_DIR", "data")
+
+def repository_storage_type(name: str) -> StorageType:
+    """Get the storage type of the repository storing the named entities."""
+    # Shared memory only holds appointments, so that several worker processes
+    # can serve them; patients and doctors then go to the SQLite database,
+    # which every worker opens too
+    if storage_type == StorageType.SHARED_MEMORY and name != "appointments":
+        return StorageType.DATABASE
+    return storage_type
+
+def repository_options(name: str) -> dict:
+    """Get the constructor arguments of the repository storing the named entities."""
+    entity_storage_type = repository_storage_type(name)
+    if entity_storage_type == StorageType.FILE_SYSTEM:
+        return {"file_path": os.path.join(data_dir, f"{name}.json")}
+    if entity_storage_type == StorageType.DATABASE:
+        os.makedirs(data_dir, exist_ok=True)
+        return {"database_path": os.path.join(data_dir, "appointment_system.db")}
+    if entity_storage_type == StorageType.SHARED_MEMORY:
+        return {"file_path": os.path.join(data_dir, f"{name}.shm")}
+    return {}
+
+patient_repository = RepositoryFactory.get_repository(
+    PatientRepository, repository_storage_type("patients"), **repository_options("patients")
+)
+doctor_repository = RepositoryFactory.get_repository(
+    DoctorRepository, repository_storage_type("doctors"), **repository_options("doctors")
+)
+appointment_repository = RepositoryFactory.get_repository(
+    AppointmentRepository, repository_storage_type("appointments"), **repository_options("appointments")
+)
+
+# Create the event bus
+# Appointment lifecycle events are recorded in a durable outbox when
+# EVENT_OUTBOX names an SQLite file, so undelivered events survive a restart.
+event_outbox_path = os.environ.get("EVENT_OUTBOX")
+event_bus = EventBus(EventOutbox(event_outbox_path) if event_outbox_path else None)
+
+# Create the reminder scheduler
+# Reminders follow the appointment events and are sent to patients
+# REMINDER_HOURS_BEFORE hours ahead of their appointments. When the worker
+# processes share their storage, only the worker holding the reminders.lock
+# file lock in DATA_DIR schedules and sends reminders, so each one is sent
+# once; the other workers retry the lock every REMINDER_LEADER_RETRY
+# seconds and take over if the leader exits. With in-memory storage every
+# worker holds its own appointments, so every worker sends its reminders.
+reminder_scheduler = ReminderScheduler(float(os.environ.get("REMINDER_HOURS_BEFORE", "24")))
+reminder_subscriber = ReminderSubscriber(reminder_scheduler)
+reminder_leader_retry = float(os.environ.get("REMINDER_LEADER_RETRY", "10"))
+reminder_leader: Optional[LeaderLock] = None
+if storage_type in (StorageType.SHARED_MEMORY, StorageType.FILE_SYSTEM, StorageType.DATABASE):
+    reminder_leader = LeaderLock(os.path.join(data_dir, "reminders.lock"))
+reminder_task: Optional[asyncio.Task] = None
+
+# Create caches
+# Reads by ID are cached for CACHE_TTL seconds in LRU caches of CACHE_SIZE
+# entries per service (0 disables caching). With several worker processes,
+# a patient or doctor changed by another worker is seen after at most
+# CACHE_TTL seconds; appointments follow the shared table, see below.
+cache_size = int(os.environ.get("CACHE_SIZE", "1024"))
+cache_ttl = float(os.environ.get("CACHE_TTL", "30"))
+
+def create_cache() -> Optional[TTLCache]:
+    """Create a service cache, or None if caching is disabled."""
+    return TTLCache(cache_size, cache_ttl) if cache_size > 0 else None
+
+caches = {name: create_cache() for name in ("patients", "doctors", "appointments", "responses")}
 
 # Create services
-patient_service = PatientService(patient_repository)
-doctor_service = DoctorService(doctor_repository)
+patient_service = PatientService(patient_repository, caches["patients"])
+doctor_service = DoctorService(doctor_repository, caches["doctors"])
 appointment_service = AppointmentService(
     appointment_repository,
     patient_repository,
-    doctor_repository
+    doctor_repository,
+    event_bus,
+    caches["appointments"]
+)
+
+# Keep the schedules searched for free slots in step with the bookings
+availability_service = AvailabilityService(doctor_repository)
+event_bus.subscribe(availability_service.on_appointment_event)
+
+# Follow the appointments changed by other worker processes
+# With SHARED_MEMORY storage every worker keeps its own caches, schedules
+# and reminders. A worker catches up with the changes of the other workers
+# at its next appointment operation, and at least every
+# SHARED_REFRESH_INTERVAL seconds; each change drops the appointment from
+# the caches and is published on the local event bus, without recording
+# it in the outbox, so the schedules and reminders follow it.
+shared_refresh_interval = float(os.environ.get("SHARED_REFRESH_INTERVAL", "1"))
+shared_refresh_task: Optional[asyncio.Task] = None
+if hasattr(appointment_repository, "add_change_listener"):
+    appointment_repository.add_change_listener(appointment_service.apply_remote_change)
+
+# Create the service executor
+# Routes run blocking service calls on a pool of SERVICE_THREADS threads, so
+# file system and database I/O never stalls the event loop. At most
+# SERVICE_QUEUE more calls wait for a thread; beyond that a request waits up
+# to SERVICE_QUEUE_TIMEOUT seconds for a place and is then answered with 503.
+service_executor = ServiceExecutor(
+    int(os.environ.get("SERVICE_THREADS", "16")),
+    int(os.environ.get("SERVICE_QUEUE", "64")),
+    float(os.environ.get("SERVICE_QUEUE_TIMEOUT", "5"))
 )
 
+T = TypeVar('T')
+
+async def run_blocking(function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking service call on the service executor and wait for its result.
+    
+    Args:
+        function: The service method to call
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+    
+    Raises:
+        ServiceBusyError: If the service executor is overloaded
+    """
+    return await service_executor.run(function, *args, **kwargs)
+
 # Dependency to get services
 def get_patient_service():
     return patient_service
@@ -69,6 +194,84 @@ def get_doctor_service():
 def get_appointment_service():
     return appointment_service
 
+def get_availability_service():
+    return availability_service
+
+def get_event_bus():
+    return event_bus
+
+def get_response_cache():
+    return caches["responses"]
+
+def cached_json_response(kind: str, entity_id: str, entity, build, etag: Optional[str] = None) -> JSONBytesResponse:
+    """
+    Get the JSON response of an entity, reusing the body serialized for the same version.
+    
+    Args:
+        kind: The kind of entity, which namespaces its cache keys
+        entity_id: The ID of the entity
+        entity: The entity to respond with
+        build: Function converting the entity to the fields of its response model
+        etag: The entity tag of the entity, if any, sent in the ETag header
+    """
+    response_cache = get_response_cache()
+    # Unsaved and unversioned entities have version 0 and are never cached
+    version = getattr(entity, "version", 0)
+    if response_cache is None or not version:
+        body = dumps(build(entity))
+    else:
+        body = response_cache.get_or_load((kind, entity_id, version), lambda: dumps(build(entity)))
+    response = json_response(body)
+    add_etag_header(response, etag)
+    return response
+
+# Conditional GET
+# GET endpoints send an ETag header when the repository tracks versions, and
+# answer a request whose If-None-Match header names the current tag with an
+# empty 304 response, so polling clients only download what changed.
+def etag_matches(request: Request, etag: Optional[str]) -> bool:
+    """
+    Check whether the If-None-Match header of a request names the current entity tag.
+    
+    Args:
+        request: The request
+        etag: The current entity tag of the resource, or None if it has none
+    """
+    header = request.headers.get("if-none-match")
+    if etag is None or not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        # GET requests compare tags weakly, ignoring the W/ prefix
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", f'"{etag}"'):
+            return True
+    return False
+
+def add_etag_header(response: Response, etag: Optional[str]) -> None:
+    """Send the entity tag of a resource in the ETag header, if it has one."""
+    if etag is not None:
+        response.headers["ETag"] = f'"{etag}"'
+
+def not_modified_response(etag: str) -> Response:
+    """Get the empty 304 response telling a client its copy of a resource is current."""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    add_etag_header(response, etag)
+    return response
+
+# Pagination of list endpoints
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def add_pagination_headers(request: Request, response: Response, next_cursor: Optional[str]) -> None:
+    """Advertise the next page of a list endpoint in the X-Next-Cursor and Link headers."""
+    if next_cursor is None:
+        return
+    response.headers["X-Next-Cursor"] = next_cursor
+    next_url = request.url.include_query_params(cursor=next_cursor)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
+
 # Custom OpenAPI schema
 def custom_openapi():
     if app.openapi_schema:
@@ -88,19 +291,93 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
+async def run_reminders() -> None:
+    """Schedule and send reminders once this process leads the workers sharing the storage."""
+    if reminder_leader is not None:
+        while not reminder_leader.acquire():
+            await asyncio.sleep(reminder_leader_retry)
+    # Subscribe before loading, so that no change made while loading is missed
+    reminder_subscriber.subscribe(event_bus)
+    # Persistent storage may already hold upcoming appointments
+    reminder_subscriber.load(await run_blocking(appointment_service.get_all_appointments))
+    await reminder_scheduler.run()
+
+async def refresh_shared_appointments() -> None:
+    """Catch up with the appointment changes of the other workers while this one is idle."""
+    while True:
+        await asyncio.sleep(shared_refresh_interval)
+        try:
+            await run_blocking(appointment_repository.refresh)
+        except ServiceBusyError:
+            # A busy worker catches up at its own appointment operations
+            pass
+
+# Deliver events left undelivered by a previous run, and run the async
+# subscribers of events published by service calls on this event loop
+@app.on_event("startup")
+async def replay_events():
+    global reminder_task, shared_refresh_task
+    event_bus.bind_loop(asyncio.get_running_loop())
+    await run_blocking(event_bus.replay_pending)
+    reminder_task = asyncio.create_task(run_reminders())
+    if hasattr(appointment_repository, "add_change_listener"):
+        shared_refresh_task = asyncio.create_task(refresh_shared_appointments())
+
+# Release file handles held by persistent repositories and the event outbox
+@app.on_event("shutdown")
+async def close_repositories():
+    if shared_refresh_task is not None:
+        shared_refresh_task.cancel()
+    # Let running service calls finish first, as they may still publish events
+    service_executor.shutdown()
+    await event_bus.drain()
+    if reminder_task is not None:
+        reminder_task.cancel()
+    if reminder_leader is not None:
+        reminder_leader.release()
+    for repository in (patient_repository, doctor_repository, appointment_repository):
+        if hasattr(repository, "close"):
+            repository.close()
+    if event_bus.outbox is not None:
+        event_bus.outbox.close()
+
+# Shed load when the service executor is full
+@app.exception_handler(ServiceBusyError)
+async def service_busy_handler(request: Request, exc: ServiceBusyError):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"}
+    )
+
 # Root endpoint
 @app.get("/", tags=["Root"])
 async def root():
     return {"message": "Welcome to the AI-Powered Smart Appointment Booking System API"}
 
+# Cache counters for tuning CACHE_SIZE and CACHE_TTL
+@app.get("/api/cache/stats", tags=["Cache"])
+async def cache_stats():
+    return {
+        name: {"size": len(cache), "max_size": cache.max_size, "ttl": cache.ttl, **cache.stats.to_dict()}
+        for name, cache in caches.items() if cache is not None
+    }
+
+# Service executor counters for tuning SERVICE_THREADS and SERVICE_QUEUE
+@app.get("/api/executor/stats", tags=["Executor"])
+async def executor_stats():
+    return service_executor.stats()
+
 # Include routers
 from api.routes.patient_routes import router as patient_router
 from api.routes.doctor_routes import router as doctor_router
 from api.routes.appointment_routes import router as appointment_router
+from api.routes.export_routes import router as export_router
 
 app.include_router(patient_router, prefix="/api", tags=["Patients"])
 app.include_router(doctor_router, prefix="/api", tags=["Doctors"])
 app.include_router(appointment_router, prefix="/api", tags=["Appointments"])
+app.include_router(export_router, prefix="/api", tags=["Export"])
 
 # Run the application
 if __name__ == "__main__":
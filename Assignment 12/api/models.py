@@ -20,6 +20,19 @@ class AppointmentTypeEnum(str, Enum):
     EMERGENCY = "EMERGENCY"
     CONSULTATION = "CONSULTATION"
 
+class SortOrderEnum(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+class ExportEntityEnum(str, Enum):
+    PATIENTS = "patients"
+    DOCTORS = "doctors"
+    APPOINTMENTS = "appointments"
+
+class ExportFormatEnum(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
 # Contact Info models
 class ContactInfoCreate(BaseModel):
     email: EmailStr
@@ -125,3 +138,46 @@ class AppointmentUpdate(BaseModel):
     duration: Optional[int] = None
     type: Optional[AppointmentTypeEnum] = None
     notes: Optional[str] = None
+
+# Batch booking models
+class AppointmentBatchCreate(BaseModel):
+    appointments: List[AppointmentCreate]
+    atomic: bool = Field(True, description="Create nothing unless every appointment in the batch is valid")
+
+class BatchItemStatusEnum(str, Enum):
+    CREATED = "CREATED"
+    FAILED = "FAILED"
+    NOT_COMMITTED = "NOT_COMMITTED"
+
+class AppointmentBatchItemResult(BaseModel):
+    index: int
+    status: BatchItemStatusEnum
+    appointment: Optional[AppointmentResponse] = None
+    error: Optional[str] = None
+
+class AppointmentBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[AppointmentBatchItemResult]
+    
+    class Config:
+        schema_extra = {
+            "example": {
+                "created": 0,
+                "failed": 1,
+                "results": [
+                    {
+                        "index": 0,
+                        "status": "NOT_COMMITTED",
+                        "appointment": None,
+                        "error": None
+                    },
+                    {
+                        "index": 1,
+                        "status": "FAILED",
+                        "appointment": None,
+                        "error": "Doctor is already booked for this time slot by item 0"
+                    }
+                ]
+            }
+        }
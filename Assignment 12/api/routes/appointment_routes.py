@@ -1,20 +1,23 @@
 """
 API routes for appointment management.
 """
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List
+import uuid
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from typing import Dict, List, Optional
 from datetime import datetime
 
 from api.models import AppointmentCreate, AppointmentResponse, AppointmentUpdate, AppointmentStatusEnum, AppointmentTypeEnum
+from api.models import AppointmentBatchCreate, AppointmentBatchResponse, BatchItemStatusEnum, SortOrderEnum
 from services.appointment_service import AppointmentService
 from services.patient_service import PatientService
 from services.doctor_service import DoctorService
 from api.main import get_appointment_service, get_patient_service, get_doctor_service
+from api.main import add_pagination_headers, cached_json_response, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from api.main import etag_matches, add_etag_header, not_modified_response, run_blocking
+from api.serializers import appointment_to_dict, dumps, entity_response, json_response, list_response
 
-# Create factories for domain objects
 from src.appointment import Appointment
 from src.enums import AppointmentStatus, AppointmentType
-from creational_patterns.simple_factory import AppointmentFactory
 
 router = APIRouter()
 
@@ -30,14 +33,14 @@ async def create_appointment(
     """
     try:
         # Get the patient and doctor
-        patient = patient_service.get_patient(appointment_data.patient_id)
+        patient = await run_blocking(patient_service.get_patient, appointment_data.patient_id)
         if not patient:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Patient with ID {appointment_data.patient_id} not found"
             )
         
-        doctor = doctor_service.get_doctor(appointment_data.doctor_id)
+        doctor = await run_blocking(doctor_service.get_doctor, appointment_data.doctor_id)
         if not doctor:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -47,83 +50,174 @@ async def create_appointment(
         # Convert API enum to domain enum
         appointment_type = AppointmentType[appointment_data.type]
         
-        # Create the appointment using the factory
-        appointment = AppointmentFactory.create_appointment(
-            patient=patient,
-            doctor=doctor,
+        appointment = Appointment(
+            appointment_id=str(uuid.uuid4()),
+            patient_id=patient.patient_id,
+            doctor_id=doctor.doctor_id,
             date_time=appointment_data.date_time,
             duration=appointment_data.duration,
-            type=appointment_type,
-            notes=appointment_data.notes
+            appointment_type=appointment_type,
+            notes=appointment_data.notes or ""
         )
         
         # Create the appointment using the service
-        created_appointment = appointment_service.create_appointment(appointment)
+        created_appointment = await run_blocking(appointment_service.create_appointment, appointment)
         
-        # Convert to response model
-        return {
-            "id": created_appointment.id,
-            "patient_id": created_appointment.patient.id,
-            "doctor_id": created_appointment.doctor.id,
-            "date_time": created_appointment.date_time,
-            "duration": created_appointment.duration,
-            "status": created_appointment.status.name,
-            "type": created_appointment.type.name,
-            "notes": created_appointment.notes
-        }
+        return entity_response(created_appointment, appointment_to_dict, status.HTTP_201_CREATED)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+@router.post("/appointments/batch", response_model=AppointmentBatchResponse)
+async def create_appointments_batch(
+    batch_data: AppointmentBatchCreate,
+    appointment_service: AppointmentService = Depends(get_appointment_service),
+    patient_service: PatientService = Depends(get_patient_service),
+    doctor_service: DoctorService = Depends(get_doctor_service)
+):
+    """
+    Create a batch of appointments.
+    
+    The whole batch is validated against one snapshot, including conflicts
+    between items of the batch. With atomic set, nothing is created unless
+    every item is valid; otherwise the valid items are created.
+    """
+    # Resolve each patient and doctor once for the whole batch
+    patients = {}
+    doctors = {}
+    errors: Dict[int, str] = {}
+    appointments = []
+    positions = []
+    for index, item in enumerate(batch_data.appointments):
+        if item.patient_id not in patients:
+            patients[item.patient_id] = await run_blocking(patient_service.get_patient, item.patient_id)
+        if item.doctor_id not in doctors:
+            doctors[item.doctor_id] = await run_blocking(doctor_service.get_doctor, item.doctor_id)
+        
+        patient = patients[item.patient_id]
+        doctor = doctors[item.doctor_id]
+        if not patient:
+            errors[index] = f"Patient with ID {item.patient_id} not found"
+            continue
+        if not doctor:
+            errors[index] = f"Doctor with ID {item.doctor_id} not found"
+            continue
+        
+        appointments.append(Appointment(
+            appointment_id=str(uuid.uuid4()),
+            patient_id=patient.patient_id,
+            doctor_id=doctor.doctor_id,
+            date_time=item.date_time,
+            duration=item.duration,
+            appointment_type=AppointmentType[item.type],
+            notes=item.notes or ""
+        ))
+        positions.append(index)
+    
+    # Validate only when unknown patients or doctors already reject an atomic batch
+    created: Dict[int, Appointment] = {}
+    if batch_data.atomic and errors:
+        validation_errors = await run_blocking(appointment_service.validate_appointments_bulk, appointments)
+        for index, error in zip(positions, validation_errors):
+            if error:
+                errors[index] = error
+    else:
+        results = await run_blocking(appointment_service.create_appointments_bulk, appointments, atomic=batch_data.atomic)
+        for index, result in zip(positions, results):
+            if result.error:
+                errors[index] = result.error
+            elif result.created:
+                created[index] = result.appointment
+    
+    # Convert to response model
+    items = []
+    for index in range(len(batch_data.appointments)):
+        appointment = created.get(index)
+        if appointment is not None:
+            status_value = BatchItemStatusEnum.CREATED
+        elif index in errors:
+            status_value = BatchItemStatusEnum.FAILED
+        else:
+            status_value = BatchItemStatusEnum.NOT_COMMITTED
+        
+        items.append({
+            "index": index,
+            "status": status_value.value,
+            "appointment": appointment_to_dict(appointment) if appointment is not None else None,
+            "error": errors.get(index)
+        })
+    
+    return json_response(dumps({
+        "created": len(created),
+        "failed": len(errors),
+        "results": items
+    }))
+
 @router.get("/appointments", response_model=List[AppointmentResponse])
 async def get_all_appointments(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    order: SortOrderEnum = SortOrderEnum.ASC,
+    status_filter: Optional[AppointmentStatusEnum] = Query(None, alias="status"),
+    type_filter: Optional[AppointmentTypeEnum] = Query(None, alias="type"),
+    start_date: Optional[datetime] = Query(None, description="Earliest appointment date/time"),
+    end_date: Optional[datetime] = Query(None, description="Latest appointment date/time"),
     appointment_service: AppointmentService = Depends(get_appointment_service)
 ):
     """
-    Get all appointments.
+    Get appointments one page at a time, ordered by date/time and
+    optionally filtered by status, type and date window.
+    The cursor of the next page is returned in the X-Next-Cursor header,
+    and 304 is returned if no appointment changed since the If-None-Match ETag.
     """
-    appointments = appointment_service.get_all_appointments()
+    if status_filter is not None and status_filter.value not in AppointmentStatus.__members__:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported status filter {status_filter.value}"
+        )
+    # Taken before the read, so a write racing it changes the tag again
+    etag = await run_blocking(appointment_service.get_appointments_etag)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
     
-    # Convert to response models
-    return [
-        {
-            "id": appointment.id,
-            "patient_id": appointment.patient.id,
-            "doctor_id": appointment.doctor.id,
-            "date_time": appointment.date_time,
-            "duration": appointment.duration,
-            "status": appointment.status.name,
-            "type": appointment.type.name,
-            "notes": appointment.notes
-        }
-        for appointment in appointments
-    ]
+    try:
+        page = await run_blocking(
+            appointment_service.get_appointments_page,
+            limit, cursor, order == SortOrderEnum.DESC,
+            status=AppointmentStatus[status_filter.value] if status_filter else None,
+            appointment_type=AppointmentType[type_filter.value] if type_filter else None,
+            start_date=start_date,
+            end_date=end_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    response = list_response(page.items, appointment_to_dict)
+    add_pagination_headers(request, response, page.next_cursor)
+    add_etag_header(response, etag)
+    return response
 
 @router.get("/appointments/{appointment_id}", response_model=AppointmentResponse)
 async def get_appointment(
     appointment_id: str,
+    request: Request,
     appointment_service: AppointmentService = Depends(get_appointment_service)
 ):
     """
     Get an appointment by ID.
+    The JSON body is cached per appointment version, and 304 is returned if
+    the appointment did not change since the If-None-Match ETag.
     """
-    appointment = appointment_service.get_appointment(appointment_id)
+    appointment = await run_blocking(appointment_service.get_appointment, appointment_id)
     if not appointment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Appointment with ID {appointment_id} not found"
         )
     
-    # Convert to response model
-    return {
-        "id": appointment.id,
-        "patient_id": appointment.patient.id,
-        "doctor_id": appointment.doctor.id,
-        "date_time": appointment.date_time,
-        "duration": appointment.duration,
-        "status": appointment.status.name,
-        "type": appointment.type.name,
-        "notes": appointment.notes
-    }
+    etag = appointment_service.get_appointment_etag(appointment)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    return cached_json_response("appointment", appointment_id, appointment, appointment_to_dict, etag)
 
 @router.put("/appointments/{appointment_id}", response_model=AppointmentResponse)
 async def update_appointment(
@@ -136,16 +230,18 @@ async def update_appointment(
     """
     try:
         # Get the existing appointment
-        existing_appointment = appointment_service.get_appointment(appointment_id)
+        existing_appointment = await run_blocking(appointment_service.get_appointment, appointment_id)
         if not existing_appointment:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Appointment with ID {appointment_id} not found"
             )
         
-        # Update the appointment properties
-        if appointment_data.date_time:
-            existing_appointment.date_time = appointment_data.date_time
+        # Update the appointment properties; the service hands out a copy, so
+        # the stored and cached appointment keeps the state it compares
+        # against, such as the date/time a reschedule moves from
+        if appointment_data.date_time and not existing_appointment.reschedule(appointment_data.date_time):
+            raise ValueError(f"Appointment with ID {appointment_id} cannot be rescheduled")
         
         if appointment_data.duration:
             existing_appointment.duration = appointment_data.duration
@@ -157,19 +253,9 @@ async def update_appointment(
             existing_appointment.notes = appointment_data.notes
         
         # Update the appointment using the service
-        updated_appointment = appointment_service.update_appointment(existing_appointment)
+        updated_appointment = await run_blocking(appointment_service.update_appointment, existing_appointment)
         
-        # Convert to response model
-        return {
-            "id": updated_appointment.id,
-            "patient_id": updated_appointment.patient.id,
-            "doctor_id": updated_appointment.doctor.id,
-            "date_time": updated_appointment.date_time,
-            "duration": updated_appointment.duration,
-            "status": updated_appointment.status.name,
-            "type": updated_appointment.type.name,
-            "notes": updated_appointment.notes
-        }
+        return entity_response(updated_appointment, appointment_to_dict)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -182,86 +268,64 @@ async def cancel_appointment(
     Cancel an appointment.
     """
     try:
-        cancelled_appointment = appointment_service.cancel_appointment(appointment_id)
+        cancelled_appointment = await run_blocking(appointment_service.cancel_appointment, appointment_id)
         
-        # Convert to response model
-        return {
-            "id": cancelled_appointment.id,
-            "patient_id": cancelled_appointment.patient.id,
-            "doctor_id": cancelled_appointment.doctor.id,
-            "date_time": cancelled_appointment.date_time,
-            "duration": cancelled_appointment.duration,
-            "status": cancelled_appointment.status.name,
-            "type": cancelled_appointment.type.name,
-            "notes": cancelled_appointment.notes
-        }
+        return entity_response(cancelled_appointment, appointment_to_dict)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.get("/appointments/patient/{patient_id}", response_model=List[AppointmentResponse])
 async def get_patient_appointments(
     patient_id: str,
+    request: Request,
     appointment_service: AppointmentService = Depends(get_appointment_service),
     patient_service: PatientService = Depends(get_patient_service)
 ):
     """
     Get all appointments for a patient.
+    304 is returned if no appointment changed since the If-None-Match ETag.
     """
     # Check if patient exists
-    patient = patient_service.get_patient(patient_id)
+    patient = await run_blocking(patient_service.get_patient, patient_id)
     if not patient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Patient with ID {patient_id} not found"
         )
     
-    appointments = appointment_service.get_patient_appointments(patient_id)
+    appointments = await run_blocking(appointment_service.get_patient_appointments, patient_id)
+    etag = appointment_service.get_appointment_list_etag(appointments)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
     
-    # Convert to response models
-    return [
-        {
-            "id": appointment.id,
-            "patient_id": appointment.patient.id,
-            "doctor_id": appointment.doctor.id,
-            "date_time": appointment.date_time,
-            "duration": appointment.duration,
-            "status": appointment.status.name,
-            "type": appointment.type.name,
-            "notes": appointment.notes
-        }
-        for appointment in appointments
-    ]
+    response = list_response(appointments, appointment_to_dict)
+    add_etag_header(response, etag)
+    return response
 
 @router.get("/appointments/doctor/{doctor_id}", response_model=List[AppointmentResponse])
 async def get_doctor_appointments(
     doctor_id: str,
+    request: Request,
     appointment_service: AppointmentService = Depends(get_appointment_service),
     doctor_service: DoctorService = Depends(get_doctor_service)
 ):
     """
     Get all appointments for a doctor.
+    304 is returned if no appointment changed since the If-None-Match ETag.
     """
     # Check if doctor exists
-    doctor = doctor_service.get_doctor(doctor_id)
+    doctor = await run_blocking(doctor_service.get_doctor, doctor_id)
     if not doctor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Doctor with ID {doctor_id} not found"
         )
     
-    appointments = appointment_service.get_doctor_appointments(doctor_id)
+    appointments = await run_blocking(appointment_service.get_doctor_appointments, doctor_id)
+    etag = appointment_service.get_appointment_list_etag(appointments)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
     
-    # Convert to response models
-    return [
-        {
-            "id": appointment.id,
-            "patient_id": appointment.patient.id,
-            "doctor_id": appointment.doctor.id,
-            "date_time": appointment.date_time,
-            "duration": appointment.duration,
-            "status": appointment.status.name,
-            "type": appointment.type.name,
-            "notes": appointment.notes
-        }
-        for appointment in appointments
-    ]
+    response = list_response(appointments, appointment_to_dict)
+    add_etag_header(response, etag)
+    return response
@@ -1,18 +1,18 @@
 """
 API routes for doctor management.
 """
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List
+import uuid
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from typing import List, Optional
 
-from api.models import DoctorCreate, DoctorResponse, DoctorUpdate
+from api.models import DoctorCreate, DoctorResponse, DoctorUpdate, SortOrderEnum
 from services.doctor_service import DoctorService
-from api.main import get_doctor_service
+from api.main import get_doctor_service, add_pagination_headers, cached_json_response, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from api.main import etag_matches, add_etag_header, not_modified_response, run_blocking
+from api.serializers import doctor_to_dict, entity_response, list_response
 
-# Create factories for domain objects
 from src.contact_info import ContactInfo
 from src.doctor import Doctor
-from src.schedule import Schedule
-from creational_patterns.simple_factory import ContactInfoFactory, DoctorFactory
 
 router = APIRouter()
 
@@ -25,90 +25,79 @@ async def create_doctor(
     Create a new doctor.
     """
     try:
-        # Create domain objects using factories
-        contact_info = ContactInfoFactory.create_contact_info(
+        # Create the domain objects; the department and license number
+        # are not collected by the API
+        contact_info = ContactInfo(
             email=doctor_data.contact_info.email,
             phone=doctor_data.contact_info.phone,
             address=doctor_data.contact_info.address
         )
         
-        # Create a default schedule
-        schedule = Schedule()
-        
-        doctor = DoctorFactory.create_doctor(
+        doctor = Doctor(
+            doctor_id=str(uuid.uuid4()),
             name=doctor_data.name,
             specialization=doctor_data.specialization,
-            contact_info=contact_info,
-            schedule=schedule
+            department=None,
+            license_number=None,
+            contact_info=contact_info
         )
         
         # Create the doctor using the service
-        created_doctor = doctor_service.create_doctor(doctor)
+        created_doctor = await run_blocking(doctor_service.create_doctor, doctor)
         
-        # Convert to response model
-        return {
-            "id": created_doctor.id,
-            "name": created_doctor.name,
-            "specialization": created_doctor.specialization,
-            "contact_info": {
-                "email": created_doctor.contact_info.email,
-                "phone": created_doctor.contact_info.phone,
-                "address": created_doctor.contact_info.address
-            }
-        }
+        return entity_response(created_doctor, doctor_to_dict, status.HTTP_201_CREATED)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.get("/doctors", response_model=List[DoctorResponse])
 async def get_all_doctors(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    order: SortOrderEnum = SortOrderEnum.ASC,
     doctor_service: DoctorService = Depends(get_doctor_service)
 ):
     """
-    Get all doctors.
+    Get doctors one page at a time, ordered by ID.
+    The cursor of the next page is returned in the X-Next-Cursor header,
+    and 304 is returned if no doctor changed since the If-None-Match ETag.
     """
-    doctors = doctor_service.get_all_doctors()
+    # Taken before the read, so a write racing it changes the tag again
+    etag = await run_blocking(doctor_service.get_doctors_etag)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
     
-    # Convert to response models
-    return [
-        {
-            "id": doctor.id,
-            "name": doctor.name,
-            "specialization": doctor.specialization,
-            "contact_info": {
-                "email": doctor.contact_info.email,
-                "phone": doctor.contact_info.phone,
-                "address": doctor.contact_info.address
-            }
-        }
-        for doctor in doctors
-    ]
+    try:
+        page = await run_blocking(doctor_service.get_doctors_page, limit, cursor, order == SortOrderEnum.DESC)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    response = list_response(page.items, doctor_to_dict)
+    add_pagination_headers(request, response, page.next_cursor)
+    add_etag_header(response, etag)
+    return response
 
 @router.get("/doctors/{doctor_id}", response_model=DoctorResponse)
 async def get_doctor(
     doctor_id: str,
+    request: Request,
     doctor_service: DoctorService = Depends(get_doctor_service)
 ):
     """
     Get a doctor by ID.
+    The JSON body is cached per doctor version, and 304 is returned if the
+    doctor did not change since the If-None-Match ETag.
     """
-    doctor = doctor_service.get_doctor(doctor_id)
+    doctor = await run_blocking(doctor_service.get_doctor, doctor_id)
     if not doctor:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Doctor with ID {doctor_id} not found"
         )
     
-    # Convert to response model
-    return {
-        "id": doctor.id,
-        "name": doctor.name,
-        "specialization": doctor.specialization,
-        "contact_info": {
-            "email": doctor.contact_info.email,
-            "phone": doctor.contact_info.phone,
-            "address": doctor.contact_info.address
-        }
-    }
+    etag = doctor_service.get_doctor_etag(doctor)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    return cached_json_response("doctor", doctor_id, doctor, doctor_to_dict, etag)
 
 @router.put("/doctors/{doctor_id}", response_model=DoctorResponse)
 async def update_doctor(
@@ -121,7 +110,7 @@ async def update_doctor(
     """
     try:
         # Get the existing doctor
-        existing_doctor = doctor_service.get_doctor(doctor_id)
+        existing_doctor = await run_blocking(doctor_service.get_doctor, doctor_id)
         if not existing_doctor:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -141,19 +130,9 @@ async def update_doctor(
             existing_doctor.contact_info.address = doctor_data.contact_info.address
         
         # Update the doctor using the service
-        updated_doctor = doctor_service.update_doctor(existing_doctor)
+        updated_doctor = await run_blocking(doctor_service.update_doctor, existing_doctor)
         
-        # Convert to response model
-        return {
-            "id": updated_doctor.id,
-            "name": updated_doctor.name,
-            "specialization": updated_doctor.specialization,
-            "contact_info": {
-                "email": updated_doctor.contact_info.email,
-                "phone": updated_doctor.contact_info.phone,
-                "address": updated_doctor.contact_info.address
-            }
-        }
+        return entity_response(updated_doctor, doctor_to_dict)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -166,7 +145,7 @@ async def delete_doctor(
     Delete a doctor.
     """
     try:
-        doctor_service.delete_doctor(doctor_id)
+        await run_blocking(doctor_service.delete_doctor, doctor_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     
@@ -180,44 +159,20 @@ async def search_doctors_by_specialization(
     """
     Search for doctors by specialization.
     """
-    doctors = doctor_service.find_doctors_by_specialization(specialization)
+    doctors = await run_blocking(doctor_service.find_doctors_by_specialization, specialization)
     
-    # Convert to response models
-    return [
-        {
-            "id": doctor.id,
-            "name": doctor.name,
-            "specialization": doctor.specialization,
-            "contact_info": {
-                "email": doctor.contact_info.email,
-                "phone": doctor.contact_info.phone,
-                "address": doctor.contact_info.address
-            }
-        }
-        for doctor in doctors
-    ]
+    return list_response(doctors, doctor_to_dict)
 
 @router.get("/doctors/search/{name}", response_model=List[DoctorResponse])
 async def search_doctors_by_name(
     name: str,
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of results"),
     doctor_service: DoctorService = Depends(get_doctor_service)
 ):
     """
-    Search for doctors by name.
+    Search for doctors by name, ignoring case and accents.
+    Best matches come first, so typeahead clients can pass a small limit.
     """
-    doctors = doctor_service.find_doctors_by_name(name)
+    doctors = await run_blocking(doctor_service.find_doctors_by_name, name, limit)
     
-    # Convert to response models
-    return [
-        {
-            "id": doctor.id,
-            "name": doctor.name,
-            "specialization": doctor.specialization,
-            "contact_info": {
-                "email": doctor.contact_info.email,
-                "phone": doctor.contact_info.phone,
-                "address": doctor.contact_info.address
-            }
-        }
-        for doctor in doctors
-    ]
+    return list_response(doctors, doctor_to_dict)
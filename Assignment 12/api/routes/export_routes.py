@@ -0,0 +1,145 @@
+"""
+API routes for exporting data.
+"""
+import csv
+import io
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Iterable, Iterator, List
+
+from api.models import ExportEntityEnum, ExportFormatEnum
+from services.patient_service import PatientService
+from services.doctor_service import DoctorService
+from services.appointment_service import AppointmentService
+from api.main import get_patient_service, get_doctor_service, get_appointment_service
+from api.serializers import dumps
+
+router = APIRouter()
+
+# Number of records encoded into each chunk of the response body
+EXPORT_CHUNK_SIZE = 500
+
+# Exported columns of each entity
+EXPORT_FIELDS = {
+    ExportEntityEnum.PATIENTS: ["id", "name", "email", "phone", "address"],
+    ExportEntityEnum.DOCTORS: ["id", "name", "specialization", "email", "phone", "address"],
+    ExportEntityEnum.APPOINTMENTS: [
+        "id", "patient_id", "doctor_id", "date_time", "duration", "status", "type", "notes"
+    ]
+}
+
+MEDIA_TYPES = {
+    ExportFormatEnum.NDJSON: "application/x-ndjson",
+    ExportFormatEnum.CSV: "text/csv"
+}
+
+def patient_record(patient) -> Dict[str, Any]:
+    """Map a patient to a flat export record."""
+    return {
+        "id": patient.patient_id,
+        "name": patient.name,
+        "email": patient.contact_info.email,
+        "phone": patient.contact_info.phone,
+        "address": patient.contact_info.address
+    }
+
+def doctor_record(doctor) -> Dict[str, Any]:
+    """Map a doctor to a flat export record."""
+    return {
+        "id": doctor.doctor_id,
+        "name": doctor.name,
+        "specialization": doctor.specialization,
+        "email": doctor.contact_info.email,
+        "phone": doctor.contact_info.phone,
+        "address": doctor.contact_info.address
+    }
+
+def appointment_record(appointment) -> Dict[str, Any]:
+    """Map an appointment to a flat export record."""
+    return {
+        "id": appointment.appointment_id,
+        "patient_id": appointment.patient_id,
+        "doctor_id": appointment.doctor_id,
+        "date_time": appointment.date_time.isoformat(),
+        "duration": appointment.duration,
+        "status": appointment.status.name,
+        "type": appointment.type.name,
+        "notes": appointment.notes
+    }
+
+def ndjson_chunks(records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Encode records as newline-delimited JSON, EXPORT_CHUNK_SIZE records per chunk.
+    
+    Args:
+        records: The records to encode
+    
+    Yields:
+        Chunks of the response body
+    """
+    lines: List[bytes] = []
+    for record in records:
+        lines.append(dumps(record))
+        if len(lines) == EXPORT_CHUNK_SIZE:
+            yield b"\n".join(lines) + b"\n"
+            lines.clear()
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+def csv_chunks(records: Iterable[Dict[str, Any]], fields: List[str]) -> Iterator[bytes]:
+    """
+    Encode records as CSV with a header row, EXPORT_CHUNK_SIZE records per chunk.
+    
+    Args:
+        records: The records to encode
+        fields: The column names, in order
+    
+    Yields:
+        Chunks of the response body
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    rows = 0
+    for record in records:
+        writer.writerow(record)
+        rows += 1
+        if rows == EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+            rows = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+@router.get("/export/{entity}", response_class=StreamingResponse)
+async def export_entities(
+    entity: ExportEntityEnum,
+    format: ExportFormatEnum = ExportFormatEnum.NDJSON,
+    patient_service: PatientService = Depends(get_patient_service),
+    doctor_service: DoctorService = Depends(get_doctor_service),
+    appointment_service: AppointmentService = Depends(get_appointment_service)
+):
+    """
+    Export all patients, doctors or appointments as NDJSON or CSV.
+    Records are read from the repository and encoded while the response is
+    being sent, so memory use does not grow with the number of records.
+    """
+    source, to_record = {
+        ExportEntityEnum.PATIENTS: (patient_service.iter_patients, patient_record),
+        ExportEntityEnum.DOCTORS: (doctor_service.iter_doctors, doctor_record),
+        ExportEntityEnum.APPOINTMENTS: (appointment_service.iter_appointments, appointment_record)
+    }[entity]
+    records = (to_record(item) for item in source())
+    
+    if format == ExportFormatEnum.CSV:
+        chunks = csv_chunks(records, EXPORT_FIELDS[entity])
+    else:
+        chunks = ndjson_chunks(records)
+    
+    # A sync generator is iterated in the threadpool, keeping the event loop free
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{entity.value}.{format.value}"'}
+    )
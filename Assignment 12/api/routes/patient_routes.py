@@ -1,17 +1,18 @@
 """
 API routes for patient management.
 """
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import List
+import uuid
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from typing import List, Optional
 
-from api.models import PatientCreate, PatientResponse, PatientUpdate
+from api.models import PatientCreate, PatientResponse, PatientUpdate, SortOrderEnum
 from services.patient_service import PatientService
-from api.main import get_patient_service
+from api.main import get_patient_service, add_pagination_headers, cached_json_response, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from api.main import etag_matches, add_etag_header, not_modified_response, run_blocking
+from api.serializers import patient_to_dict, entity_response, list_response
 
-# Create factories for domain objects
 from src.contact_info import ContactInfo
 from src.patient import Patient
-from creational_patterns.simple_factory import ContactInfoFactory, PatientFactory
 
 router = APIRouter()
 
@@ -24,82 +25,78 @@ async def create_patient(
     Create a new patient.
     """
     try:
-        # Create domain objects using factories
-        contact_info = ContactInfoFactory.create_contact_info(
+        # Create the domain objects; the date of birth and medical history
+        # are not collected by the API
+        contact_info = ContactInfo(
             email=patient_data.contact_info.email,
             phone=patient_data.contact_info.phone,
             address=patient_data.contact_info.address
         )
         
-        patient = PatientFactory.create_patient(
+        patient = Patient(
+            patient_id=str(uuid.uuid4()),
             name=patient_data.name,
+            date_of_birth=None,
+            medical_history_id=None,
             contact_info=contact_info
         )
         
         # Create the patient using the service
-        created_patient = patient_service.create_patient(patient)
+        created_patient = await run_blocking(patient_service.create_patient, patient)
         
-        # Convert to response model
-        return {
-            "id": created_patient.id,
-            "name": created_patient.name,
-            "contact_info": {
-                "email": created_patient.contact_info.email,
-                "phone": created_patient.contact_info.phone,
-                "address": created_patient.contact_info.address
-            }
-        }
+        return entity_response(created_patient, patient_to_dict, status.HTTP_201_CREATED)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 @router.get("/patients", response_model=List[PatientResponse])
 async def get_all_patients(
+    request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    order: SortOrderEnum = SortOrderEnum.ASC,
     patient_service: PatientService = Depends(get_patient_service)
 ):
     """
-    Get all patients.
+    Get patients one page at a time, ordered by ID.
+    The cursor of the next page is returned in the X-Next-Cursor header,
+    and 304 is returned if no patient changed since the If-None-Match ETag.
     """
-    patients = patient_service.get_all_patients()
+    # Taken before the read, so a write racing it changes the tag again
+    etag = await run_blocking(patient_service.get_patients_etag)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
     
-    # Convert to response models
-    return [
-        {
-            "id": patient.id,
-            "name": patient.name,
-            "contact_info": {
-                "email": patient.contact_info.email,
-                "phone": patient.contact_info.phone,
-                "address": patient.contact_info.address
-            }
-        }
-        for patient in patients
-    ]
+    try:
+        page = await run_blocking(patient_service.get_patients_page, limit, cursor, order == SortOrderEnum.DESC)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    response = list_response(page.items, patient_to_dict)
+    add_pagination_headers(request, response, page.next_cursor)
+    add_etag_header(response, etag)
+    return response
 
 @router.get("/patients/{patient_id}", response_model=PatientResponse)
 async def get_patient(
     patient_id: str,
+    request: Request,
     patient_service: PatientService = Depends(get_patient_service)
 ):
     """
     Get a patient by ID.
+    The JSON body is cached per patient version, and 304 is returned if the
+    patient did not change since the If-None-Match ETag.
     """
-    patient = patient_service.get_patient(patient_id)
+    patient = await run_blocking(patient_service.get_patient, patient_id)
     if not patient:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Patient with ID {patient_id} not found"
         )
     
-    # Convert to response model
-    return {
-        "id": patient.id,
-        "name": patient.name,
-        "contact_info": {
-            "email": patient.contact_info.email,
-            "phone": patient.contact_info.phone,
-            "address": patient.contact_info.address
-        }
-    }
+    etag = patient_service.get_patient_etag(patient)
+    if etag_matches(request, etag):
+        return not_modified_response(etag)
+    return cached_json_response("patient", patient_id, patient, patient_to_dict, etag)
 
 @router.put("/patients/{patient_id}", response_model=PatientResponse)
 async def update_patient(
@@ -112,7 +109,7 @@ async def update_patient(
     """
     try:
         # Get the existing patient
-        existing_patient = patient_service.get_patient(patient_id)
+        existing_patient = await run_blocking(patient_service.get_patient, patient_id)
         if not existing_patient:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -129,18 +126,9 @@ async def update_patient(
             existing_patient.contact_info.address = patient_data.contact_info.address
         
         # Update the patient using the service
-        updated_patient = patient_service.update_patient(existing_patient)
+        updated_patient = await run_blocking(patient_service.update_patient, existing_patient)
         
-        # Convert to response model
-        return {
-            "id": updated_patient.id,
-            "name": updated_patient.name,
-            "contact_info": {
-                "email": updated_patient.contact_info.email,
-                "phone": updated_patient.contact_info.phone,
-                "address": updated_patient.contact_info.address
-            }
-        }
+        return entity_response(updated_patient, patient_to_dict)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
@@ -153,7 +141,7 @@ async def delete_patient(
     Delete a patient.
     """
     try:
-        patient_service.delete_patient(patient_id)
+        await run_blocking(patient_service.delete_patient, patient_id)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     
@@ -162,23 +150,13 @@ async def delete_patient(
 @router.get("/patients/search/{name}", response_model=List[PatientResponse])
 async def search_patients_by_name(
     name: str,
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of results"),
     patient_service: PatientService = Depends(get_patient_service)
 ):
     """
-    Search for patients by name.
+    Search for patients by name, ignoring case and accents.
+    Best matches come first, so typeahead clients can pass a small limit.
     """
-    patients = patient_service.find_patients_by_name(name)
+    patients = await run_blocking(patient_service.find_patients_by_name, name, limit)
     
-    # Convert to response models
-    return [
-        {
-            "id": patient.id,
-            "name": patient.name,
-            "contact_info": {
-                "email": patient.contact_info.email,
-                "phone": patient.contact_info.phone,
-                "address": patient.contact_info.address
-            }
-        }
-        for patient in patients
-    ]
+    return list_response(patients, patient_to_dict)
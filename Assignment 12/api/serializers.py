@@ -0,0 +1,114 @@
+"""
+Serializers converting domain objects directly to JSON response bodies.
+
+Routes keep their Pydantic response_model, which documents the response in
+the OpenAPI schema, but return bodies encoded here in a JSONBytesResponse.
+FastAPI sends such a response as it is, skipping the validation of the
+response against the model and the generic re-encoding of it.
+"""
+import json
+from typing import Any, Callable, Dict, Iterable, Optional
+from fastapi import Response, status
+
+from src.appointment import Appointment
+from src.contact_info import ContactInfo
+from src.doctor import Doctor
+from src.patient import Patient
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+class JSONBytesResponse(Response):
+    """
+    Response whose content is an already encoded JSON body.
+    """
+    
+    media_type = "application/json"
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a JSON-compatible value as compact UTF-8 JSON, with orjson if it is installed.
+    
+    Args:
+        value: The value to encode
+    
+    Returns:
+        The encoded value
+    """
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def contact_info_to_dict(contact_info: ContactInfo) -> Dict[str, Any]:
+    """Convert contact information to the fields of ContactInfoResponse."""
+    return {
+        "email": contact_info.email,
+        "phone": contact_info.phone,
+        "address": contact_info.address
+    }
+
+def patient_to_dict(patient: Patient) -> Dict[str, Any]:
+    """Convert a patient to the fields of PatientResponse."""
+    return {
+        "id": patient.patient_id,
+        "name": patient.name,
+        "contact_info": contact_info_to_dict(patient.contact_info)
+    }
+
+def doctor_to_dict(doctor: Doctor) -> Dict[str, Any]:
+    """Convert a doctor to the fields of DoctorResponse."""
+    return {
+        "id": doctor.doctor_id,
+        "name": doctor.name,
+        "specialization": doctor.specialization,
+        "contact_info": contact_info_to_dict(doctor.contact_info)
+    }
+
+def appointment_to_dict(appointment: Appointment) -> Dict[str, Any]:
+    """Convert an appointment to the fields of AppointmentResponse."""
+    return {
+        "id": appointment.appointment_id,
+        "patient_id": appointment.patient_id,
+        "doctor_id": appointment.doctor_id,
+        "date_time": appointment.date_time.isoformat(),
+        "duration": appointment.duration,
+        "status": appointment.status.name,
+        "type": appointment.type.name,
+        "notes": appointment.notes
+    }
+
+def json_response(body: bytes, status_code: int = status.HTTP_200_OK,
+                  headers: Optional[Dict[str, str]] = None) -> JSONBytesResponse:
+    """
+    Wrap an encoded JSON body in a response.
+    
+    Args:
+        body: The encoded body
+        status_code: The HTTP status code
+        headers: Additional response headers, if any
+    """
+    return JSONBytesResponse(content=body, status_code=status_code, headers=headers)
+
+def entity_response(entity: Any, to_dict: Callable[[Any], Dict[str, Any]],
+                    status_code: int = status.HTTP_200_OK) -> JSONBytesResponse:
+    """
+    Serialize one entity into a response.
+    
+    Args:
+        entity: The entity
+        to_dict: Function converting the entity to the fields of its response model
+        status_code: The HTTP status code
+    """
+    return json_response(dumps(to_dict(entity)), status_code)
+
+def list_response(entities: Iterable[Any], to_dict: Callable[[Any], Dict[str, Any]]) -> JSONBytesResponse:
+    """
+    Serialize a list of entities into a response.
+    
+    Args:
+        entities: The entities, in the order they are listed
+        to_dict: Function converting an entity to the fields of its response model
+    """
+    return json_response(dumps([to_dict(entity) for entity in entities]))
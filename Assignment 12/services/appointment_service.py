@@ -1,26 +1,67 @@
 """
 Appointment service implementation for handling business logic related to appointments.
 """
-from typing import List, Optional
-from datetime import datetime, timedelta
+import copy
+from contextlib import ExitStack, contextmanager
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import date, datetime, timedelta
 from src.appointment import Appointment
 from src.patient import Patient
 from src.doctor import Doctor
-from src.enums import AppointmentStatus
+from src.enums import AppointmentStatus, AppointmentType
 from repositories.appointment_repository import AppointmentRepository
 from repositories.patient_repository import PatientRepository
 from repositories.doctor_repository import DoctorRepository
+from repositories.indexes import IntervalIndex
+from repositories.paging import Page
+from services.cache import TTLCache
+from services.etags import collection_tag, entity_tag, list_tag
+from services.events import AppointmentEvent, AppointmentEventType, EventBus
+from services.locks import KeyedLocks
+
+class BulkBookingResult:
+    """
+    Outcome of one appointment in a bulk booking request.
+    """
+    
+    def __init__(self, index: int, appointment: Appointment, error: Optional[str] = None, created: bool = False):
+        """
+        Initialize the result of a bulk booking item.
+        
+        Args:
+            index: Position of the appointment in the submitted batch
+            appointment: The appointment that was submitted
+            error: The validation error, or None if the appointment is valid
+            created: Whether the appointment was saved
+        """
+        self.index = index
+        self.appointment = appointment
+        self.error = error
+        self.created = created
 
 class AppointmentService:
     """
     Service class for handling business logic related to appointments.
+    
+    Bookings check for conflicts and then save, so the check and the save
+    run under a lock per doctor, followed by a lock per patient for the
+    daily limit. Requests for different doctors and patients never wait for
+    each other; locks are always taken doctors first, each group in ID
+    order, so no two requests can deadlock.
+    
+    With a cache, appointments read by ID and the appointment lists of
+    patients and doctors are kept in it until they expire or the service
+    changes one of the appointments.
     """
     
     def __init__(
         self, 
         appointment_repository: AppointmentRepository,
         patient_repository: PatientRepository,
-        doctor_repository: DoctorRepository
+        doctor_repository: DoctorRepository,
+        event_bus: Optional[EventBus] = None,
+        cache: Optional[TTLCache] = None
     ):
         """
         Initialize the appointment service with repositories.
@@ -29,10 +70,16 @@ class AppointmentService:
             appointment_repository: Repository for appointment data access
             patient_repository: Repository for patient data access
             doctor_repository: Repository for doctor data access
+            event_bus: Bus that appointment lifecycle events are published on, if any
+            cache: Cache of appointments by ID and by patient and doctor, if any
         """
         self.appointment_repository = appointment_repository
         self.patient_repository = patient_repository
         self.doctor_repository = doctor_repository
+        self.event_bus = event_bus
+        self.cache = cache
+        self._doctor_locks: KeyedLocks[str] = KeyedLocks()
+        self._patient_locks: KeyedLocks[str] = KeyedLocks()
     
     def create_appointment(self, appointment: Appointment) -> Appointment:
         """
@@ -40,7 +87,7 @@ class AppointmentService:
         
         Args:
             appointment: The appointment to create
-            
+        
         Returns:
             The created appointment
         
@@ -48,51 +95,263 @@ class AppointmentService:
             ValueError: If validation fails
         """
         # Validate patient and doctor exist
-        patient = self.patient_repository.find_by_id(appointment.patient.id)
+        patient = self.patient_repository.find_by_id(appointment.patient_id)
         if not patient:
-            raise ValueError(f"Patient with ID {appointment.patient.id} not found")
+            raise ValueError(f"Patient with ID {appointment.patient_id} not found")
         
-        doctor = self.doctor_repository.find_by_id(appointment.doctor.id)
+        doctor = self.doctor_repository.find_by_id(appointment.doctor_id)
         if not doctor:
-            raise ValueError(f"Doctor with ID {appointment.doctor.id} not found")
+            raise ValueError(f"Doctor with ID {appointment.doctor_id} not found")
         
         # Validate appointment time is in the future and at least 24 hours in advance
+        self._check_booking_time(appointment, datetime.now())
+        
+        with self._booking_locks([doctor.doctor_id], [patient.patient_id]):
+            # Check for doctor availability
+            self._check_doctor_availability(appointment, doctor.doctor_id)
+            
+            # Check patient appointment limit (max 3 per day)
+            patient_appointments = self.appointment_repository.find_by_patient_id(patient.patient_id)
+            same_day_appointments = [
+                a for a in patient_appointments 
+                if a.date_time.date() == appointment.date_time.date() and 
+                a.status != AppointmentStatus.CANCELLED
+            ]
+            
+            if len(same_day_appointments) >= 3:
+                raise ValueError("Patient cannot book more than 3 appointments in a single day")
+            
+            # Save the appointment
+            self.appointment_repository.save(appointment)
+            self._invalidate(appointment)
+        self._publish(AppointmentEventType.CREATED, appointment)
+        return appointment
+    
+    def validate_appointments_bulk(self, appointments: List[Appointment]) -> List[Optional[str]]:
+        """
+        Validate a batch of new appointments against a single snapshot of the repositories.
+        
+        Patients, doctors and existing patient bookings are loaded once per batch.
+        Items are checked in order and every valid item counts as booked for the
+        items after it, so conflicts inside the batch are reported as well.
+        
+        Args:
+            appointments: The appointments to validate
+        
+        Returns:
+            The validation error of each appointment, or None for valid appointments
+        """
         now = datetime.now()
+        patients: Dict[str, Optional[Patient]] = {}
+        doctors: Dict[str, Optional[Doctor]] = {}
+        daily_counts: Dict[Tuple[str, date], int] = {}
+        batch_bookings: IntervalIndex[str, int] = IntervalIndex()
+        errors: List[Optional[str]] = []
+        
+        for index, appointment in enumerate(appointments):
+            patient_id = appointment.patient_id
+            doctor_id = appointment.doctor_id
+            try:
+                if patient_id not in patients:
+                    patients[patient_id] = self.patient_repository.find_by_id(patient_id)
+                    if patients[patient_id]:
+                        self._count_daily_appointments(patient_id, daily_counts)
+                if not patients[patient_id]:
+                    raise ValueError(f"Patient with ID {patient_id} not found")
+                
+                if doctor_id not in doctors:
+                    doctors[doctor_id] = self.doctor_repository.find_by_id(doctor_id)
+                if not doctors[doctor_id]:
+                    raise ValueError(f"Doctor with ID {doctor_id} not found")
+                
+                self._check_booking_time(appointment, now)
+                
+                appointment_end_time = appointment.date_time + timedelta(minutes=appointment.duration)
+                conflicts = batch_bookings.overlapping(doctor_id, appointment.date_time, appointment_end_time)
+                if conflicts:
+                    raise ValueError(f"Doctor is already booked for this time slot by item {conflicts[0]}")
+                self._check_doctor_availability(appointment, doctor_id)
+                
+                day_key = (patient_id, appointment.date_time.date())
+                if daily_counts.get(day_key, 0) >= 3:
+                    raise ValueError("Patient cannot book more than 3 appointments in a single day")
+            except ValueError as e:
+                errors.append(str(e))
+                continue
+            
+            batch_bookings.add(doctor_id, appointment.date_time, appointment_end_time, index)
+            daily_counts[day_key] = daily_counts.get(day_key, 0) + 1
+            errors.append(None)
+        
+        return errors
+    
+    def create_appointments_bulk(self, appointments: List[Appointment], atomic: bool = True) -> List[BulkBookingResult]:
+        """
+        Create a batch of new appointments.
+        
+        Args:
+            appointments: The appointments to create
+            atomic: If True, nothing is saved unless every appointment is valid;
+                otherwise the valid appointments are saved and the rest are reported
+        
+        Returns:
+            One result per submitted appointment, in submission order
+        
+        Raises:
+            Exception: Any error raised while saving; an atomic batch deletes
+                the appointments it saved before the failure first
+        """
+        doctor_ids = {appointment.doctor_id for appointment in appointments}
+        patient_ids = {appointment.patient_id for appointment in appointments}
+        saved: Dict[int, Appointment] = {}
+        try:
+            with self._booking_locks(doctor_ids, patient_ids):
+                errors = self.validate_appointments_bulk(appointments)
+                commit = not atomic or all(error is None for error in errors)
+                
+                try:
+                    for index, (appointment, error) in enumerate(zip(appointments, errors)):
+                        if commit and error is None:
+                            self.appointment_repository.save(appointment)
+                            saved[index] = appointment
+                except BaseException:
+                    if atomic:
+                        # Roll back the part of the batch saved before the failure
+                        for appointment in reversed(list(saved.values())):
+                            self.appointment_repository.delete(appointment.appointment_id)
+                        self._invalidate(*saved.values())
+                        saved.clear()
+                    raise
+                finally:
+                    self._invalidate(*saved.values())
+        finally:
+            for appointment in saved.values():
+                self._publish(AppointmentEventType.CREATED, appointment)
+        
+        return [
+            BulkBookingResult(index, appointment, error, index in saved)
+            for index, (appointment, error) in enumerate(zip(appointments, errors))
+        ]
+    
+    @contextmanager
+    def _booking_locks(self, doctor_ids: Iterable[str], patient_ids: Iterable[str]) -> Iterator[None]:
+        """
+        Hold the locks of some doctors and patients for the duration of a with block.
+        
+        Args:
+            doctor_ids: The IDs of the doctors whose bookings are checked and changed
+            patient_ids: The IDs of the patients whose bookings are checked and changed
+        """
+        with ExitStack() as stack:
+            for locks, ids in ((self._doctor_locks, doctor_ids), (self._patient_locks, patient_ids)):
+                # Sorted, so requests locking overlapping IDs cannot deadlock
+                for id in sorted(set(ids)):
+                    stack.enter_context(locks.hold(id))
+            # A repository shared with other processes locks them out as well
+            transaction = getattr(self.appointment_repository, "transaction", None)
+            if transaction is not None:
+                stack.enter_context(transaction())
+            yield
+    
+    def _cached(self, key: Tuple[str, str], load: Callable[[], Any]) -> Any:
+        """
+        Read an appointment or a list of appointments through the cache, if
+        the service has one. Cached appointments are handed out as copies,
+        so changes made by the caller never reach the cache.
+        
+        Args:
+            key: The cache key
+            load: Function reading the value from the repository
+        
+        Returns:
+            The cached or loaded value
+        """
+        if self.cache is None:
+            return load()
+        value = self.cache.get_or_load(key, load)
+        if isinstance(value, list):
+            return [copy.copy(appointment) for appointment in value]
+        return copy.copy(value)
+    
+    def _invalidate(self, *appointments: Appointment) -> None:
+        """
+        Drop changed appointments and the lists containing them from the cache, if there is one.
+        
+        Args:
+            appointments: The changed appointments, as saved and as they were before
+        """
+        if self.cache is None:
+            return
+        keys = set()
+        for appointment in appointments:
+            keys.update((
+                ("appointment", appointment.appointment_id),
+                ("patient", appointment.patient_id),
+                ("doctor", appointment.doctor_id)
+            ))
+        self.cache.invalidate(*keys)
+    
+    def _publish(self, event_type: AppointmentEventType, appointment: Appointment,
+                 previous_date_time: Optional[datetime] = None) -> None:
+        """
+        Publish a lifecycle event of an appointment if the service has an event bus.
+        
+        Args:
+            event_type: The kind of change
+            appointment: The changed appointment, after it has been saved
+            previous_date_time: The date/time before a reschedule
+        """
+        if self.event_bus is not None:
+            self.event_bus.publish(AppointmentEvent.from_appointment(event_type, appointment, previous_date_time))
+    
+    def _check_booking_time(self, appointment: Appointment, now: datetime) -> None:
+        """
+        Check that an appointment is in the future and at least 24 hours in advance.
+        
+        Args:
+            appointment: The appointment being booked
+            now: The current time
+        
+        Raises:
+            ValueError: If the appointment is in the past or too soon
+        """
         if appointment.date_time < now:
             raise ValueError("Appointment time cannot be in the past")
         
         if appointment.date_time < now + timedelta(hours=24):
             raise ValueError("Appointments must be booked at least 24 hours in advance")
+    
+    def _count_daily_appointments(self, patient_id: str, daily_counts: Dict[Tuple[str, date], int]) -> None:
+        """
+        Add a patient's non-cancelled appointments to per-day booking counts.
         
-        # Check for doctor availability
-        doctor_appointments = self.appointment_repository.find_by_doctor_id(doctor.id)
-        for existing_appointment in doctor_appointments:
-            # Skip cancelled appointments
+        Args:
+            patient_id: The ID of the patient
+            daily_counts: Booking counts keyed by (patient ID, date), updated in place
+        """
+        for existing_appointment in self.appointment_repository.find_by_patient_id(patient_id):
             if existing_appointment.status == AppointmentStatus.CANCELLED:
                 continue
-                
-            # Check for time overlap
-            appointment_end_time = appointment.date_time + timedelta(minutes=appointment.duration)
-            existing_end_time = existing_appointment.date_time + timedelta(minutes=existing_appointment.duration)
-            
-            if (appointment.date_time <= existing_appointment.date_time < appointment_end_time or
-                appointment.date_time < existing_end_time <= appointment_end_time):
-                raise ValueError(f"Doctor is already booked for this time slot")
-        
-        # Check patient appointment limit (max 3 per day)
-        patient_appointments = self.appointment_repository.find_by_patient_id(patient.id)
-        same_day_appointments = [
-            a for a in patient_appointments 
-            if a.date_time.date() == appointment.date_time.date() and 
-            a.status != AppointmentStatus.CANCELLED
-        ]
+            day_key = (patient_id, existing_appointment.date_time.date())
+            daily_counts[day_key] = daily_counts.get(day_key, 0) + 1
+    
+    def _check_doctor_availability(self, appointment: Appointment, doctor_id: str) -> None:
+        """
+        Check that a doctor has no other active booking overlapping an appointment.
         
-        if len(same_day_appointments) >= 3:
-            raise ValueError("Patient cannot book more than 3 appointments in a single day")
+        Args:
+            appointment: The appointment being booked or moved
+            doctor_id: The ID of the doctor to check
         
-        # Save the appointment
-        self.appointment_repository.save(appointment)
-        return appointment
+        Raises:
+            ValueError: If the doctor is already booked for part of the time slot
+        """
+        appointment_end_time = appointment.date_time + timedelta(minutes=appointment.duration)
+        conflicts = self.appointment_repository.find_overlapping(
+            doctor_id, appointment.date_time, appointment_end_time
+        )
+        if any(conflict.appointment_id != appointment.appointment_id for conflict in conflicts):
+            raise ValueError("Doctor is already booked for this time slot")
     
     def get_appointment(self, appointment_id: str) -> Optional[Appointment]:
         """
@@ -100,11 +359,12 @@ class AppointmentService:
         
         Args:
             appointment_id: The ID of the appointment to get
-            
+        
         Returns:
             The appointment if found, None otherwise
         """
-        return self.appointment_repository.find_by_id(appointment_id)
+        return self._cached(("appointment", appointment_id),
+                            lambda: self.appointment_repository.find_by_id(appointment_id))
     
     def get_all_appointments(self) -> List[Appointment]:
         """
@@ -115,25 +375,104 @@ class AppointmentService:
         """
         return self.appointment_repository.find_all()
     
+    def iter_appointments(self) -> Iterator[Appointment]:
+        """
+        Iterate over all appointments without loading them into a list.
+        
+        Returns:
+            An iterator over all appointments
+        """
+        return self.appointment_repository.iter_all()
+    
+    def get_appointments_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False,
+                              status: Optional[AppointmentStatus] = None,
+                              appointment_type: Optional[AppointmentType] = None,
+                              start_date: Optional[datetime] = None,
+                              end_date: Optional[datetime] = None) -> Page[Appointment]:
+        """
+        Get one page of appointments ordered by date/time, optionally filtered
+        by status, type and an inclusive date window.
+        
+        Args:
+            limit: The maximum number of appointments on the page
+            cursor: The next_cursor of the previous page, or None for the first page
+            descending: Whether to order from the latest appointment
+            status: Only include appointments with this status
+            appointment_type: Only include appointments of this type
+            start_date: Only include appointments at or after this date/time
+            end_date: Only include appointments at or before this date/time
+        
+        Returns:
+            The page of appointments
+        
+        Raises:
+            ValueError: If the limit is not positive or the cursor is invalid
+        """
+        return self.appointment_repository.find_page(
+            limit, cursor, descending,
+            status=status,
+            appointment_type=appointment_type,
+            start_date=start_date,
+            end_date=end_date
+        )
+    
+    def get_appointment_etag(self, appointment: Appointment) -> Optional[str]:
+        """
+        Get the entity tag of an appointment, which changes whenever the appointment is saved.
+        
+        Args:
+            appointment: The appointment, as read from the repository
+        
+        Returns:
+            The tag, or None if the repository does not track versions
+        """
+        return entity_tag(self.appointment_repository, appointment)
+    
+    def get_appointments_etag(self) -> Optional[str]:
+        """
+        Get the entity tag of the appointment collection, which changes
+        whenever any appointment is saved or deleted. Get it before reading
+        the appointments.
+        
+        Returns:
+            The tag, or None if the repository does not track changes
+        """
+        return collection_tag(self.appointment_repository)
+    
+    def get_appointment_list_etag(self, appointments: List[Appointment]) -> Optional[str]:
+        """
+        Get the entity tag of a list of appointments, such as the appointments
+        of a patient or doctor, which may come from the cache.
+        
+        Args:
+            appointments: The appointments, in the order they are listed
+        
+        Returns:
+            The tag, or None if the repository does not track versions
+        """
+        return list_tag(self.appointment_repository, appointments, attrgetter("appointment_id"))
+    
     def update_appointment(self, appointment: Appointment) -> Appointment:
         """
         Update an existing appointment.
         
         Args:
             appointment: The appointment to update
-            
+        
         Returns:
             The updated appointment
-            
+        
         Raises:
             ValueError: If the appointment does not exist or validation fails
         """
-        existing_appointment = self.appointment_repository.find_by_id(appointment.id)
+        existing_appointment = self.appointment_repository.find_by_id(appointment.appointment_id)
         if not existing_appointment:
-            raise ValueError(f"Appointment with ID {appointment.id} not found")
+            raise ValueError(f"Appointment with ID {appointment.appointment_id} not found")
+        previous_date_time = existing_appointment.date_time
+        previous_status = existing_appointment.status
         
         # If date/time is being changed, validate the new time
-        if appointment.date_time != existing_appointment.date_time:
+        if appointment.date_time != previous_date_time:
             now = datetime.now()
             if appointment.date_time < now:
                 raise ValueError("Appointment time cannot be in the past")
@@ -141,8 +480,20 @@ class AppointmentService:
             if appointment.date_time < now + timedelta(hours=24):
                 raise ValueError("Appointment changes must be made at least 24 hours in advance")
         
-        # Save the updated appointment
-        self.appointment_repository.save(appointment)
+        with self._booking_locks([appointment.doctor_id], []):
+            # Check the (possibly changed) time against the doctor's other bookings
+            if appointment.status != AppointmentStatus.CANCELLED:
+                self._check_doctor_availability(appointment, appointment.doctor_id)
+            
+            # Save the updated appointment
+            self.appointment_repository.save(appointment)
+            self._invalidate(appointment, existing_appointment)
+        if appointment.status == AppointmentStatus.CANCELLED and previous_status != AppointmentStatus.CANCELLED:
+            self._publish(AppointmentEventType.CANCELLED, appointment)
+        elif appointment.date_time != previous_date_time:
+            self._publish(AppointmentEventType.RESCHEDULED, appointment, previous_date_time)
+        else:
+            self._publish(AppointmentEventType.UPDATED, appointment)
         return appointment
     
     def cancel_appointment(self, appointment_id: str) -> Appointment:
@@ -151,12 +502,12 @@ class AppointmentService:
         
         Args:
             appointment_id: The ID of the appointment to cancel
-            
+        
         Returns:
             The cancelled appointment
-            
+        
         Raises:
-            ValueError: If the appointment does not exist or cancellation is too late
+            ValueError: If the appointment does not exist, is already closed or cancellation is too late
         """
         appointment = self.appointment_repository.find_by_id(appointment_id)
         if not appointment:
@@ -167,22 +518,72 @@ class AppointmentService:
         if appointment.date_time < now + timedelta(hours=6):
             raise ValueError("Cancellations must be made at least 6 hours before the appointment")
         
-        # Update status to cancelled
-        appointment.status = AppointmentStatus.CANCELLED
+        if not appointment.cancel("Cancelled on request"):
+            raise ValueError(f"Appointment with ID {appointment_id} cannot be cancelled")
         self.appointment_repository.save(appointment)
+        self._invalidate(appointment)
+        self._publish(AppointmentEventType.CANCELLED, appointment)
         return appointment
     
+    def apply_remote_change(self, appointment_id: str, appointment: Optional[Appointment],
+                            previous: Optional[Tuple[str, str, datetime, int, AppointmentStatus]]) -> None:
+        """
+        Follow a change another worker process made to shared appointments;
+        subscribe it as a change listener of a shared-memory repository.
+        
+        The appointment and the lists holding it are dropped from the cache,
+        and the change is published on the event bus without recording it in
+        the outbox, where the other process recorded it, so that subscribers
+        such as the availability and reminder services follow it. A deleted
+        appointment is published as cancelled.
+        
+        Args:
+            appointment_id: The ID of the changed appointment
+            appointment: The stored appointment, or None if it was deleted
+            previous: The (doctor ID, patient ID, date/time, duration, status)
+                this process last knew of the appointment, or None if it is new to it
+        """
+        if self.cache is not None:
+            keys = {("appointment", appointment_id)}
+            if previous is not None:
+                keys.update((("doctor", previous[0]), ("patient", previous[1])))
+            if appointment is not None:
+                keys.update((("doctor", appointment.doctor_id), ("patient", appointment.patient_id)))
+            self.cache.invalidate(*keys)
+        if self.event_bus is None:
+            return
+        
+        if appointment is None:
+            if previous is None:
+                return
+            doctor_id, patient_id, date_time, duration, _ = previous
+            event = AppointmentEvent(AppointmentEventType.CANCELLED, appointment_id, patient_id,
+                                     doctor_id, date_time, duration, AppointmentStatus.CANCELLED)
+        elif previous is None:
+            event = AppointmentEvent.from_appointment(AppointmentEventType.CREATED, appointment)
+        else:
+            previous_date_time, previous_status = previous[2], previous[4]
+            if appointment.status == AppointmentStatus.CANCELLED and previous_status != AppointmentStatus.CANCELLED:
+                event = AppointmentEvent.from_appointment(AppointmentEventType.CANCELLED, appointment)
+            elif appointment.date_time != previous_date_time:
+                event = AppointmentEvent.from_appointment(AppointmentEventType.RESCHEDULED, appointment,
+                                                          previous_date_time)
+            else:
+                event = AppointmentEvent.from_appointment(AppointmentEventType.UPDATED, appointment)
+        self.event_bus.publish(event, record=False)
+    
     def get_patient_appointments(self, patient_id: str) -> List[Appointment]:
         """
         Get all appointments for a patient.
         
         Args:
             patient_id: The ID of the patient
-            
+        
         Returns:
             A list of appointments for the patient
         """
-        return self.appointment_repository.find_by_patient_id(patient_id)
+        return self._cached(("patient", patient_id),
+                            lambda: self.appointment_repository.find_by_patient_id(patient_id))
     
     def get_doctor_appointments(self, doctor_id: str) -> List[Appointment]:
         """
@@ -190,11 +591,12 @@ class AppointmentService:
         
         Args:
             doctor_id: The ID of the doctor
-            
+        
         Returns:
             A list of appointments for the doctor
         """
-        return self.appointment_repository.find_by_doctor_id(doctor_id)
+        return self._cached(("doctor", doctor_id),
+                            lambda: self.appointment_repository.find_by_doctor_id(doctor_id))
     
     def get_appointments_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Appointment]:
         """
@@ -203,7 +605,7 @@ class AppointmentService:
         Args:
             start_date: The start date of the range
             end_date: The end date of the range
-            
+        
         Returns:
             A list of appointments within the date range
         """
@@ -0,0 +1,204 @@
+"""
+Availability service implementation for searching free appointment slots across doctors.
+"""
+import heapq
+import threading
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime, time, timedelta
+from src.doctor import Doctor
+from src.enums import AppointmentStatus
+from src.schedule import MINUTES_PER_DAY, Schedule
+from src.time_slot import TimeSlot
+from repositories.doctor_repository import DoctorRepository
+from services.events import AppointmentEvent
+
+class SlotCandidate:
+    """
+    Earliest free slot found for one doctor.
+    """
+    
+    def __init__(self, doctor: Doctor, start_time: datetime, end_time: datetime):
+        """
+        Initialize the slot candidate.
+        
+        Args:
+            doctor: The doctor who is free
+            start_time: The start of the free slot
+            end_time: The end of the free slot
+        """
+        self.doctor = doctor
+        self.start_time = start_time
+        self.end_time = end_time
+
+class AvailabilityService:
+    """
+    Service class for finding the earliest free slots across many doctors.
+    
+    The free minutes of every candidate doctor on a day are stacked into one
+    integer, one lane of bits per doctor, so the runs long enough for the
+    requested duration are found for all doctors at once with a handful of
+    shift-and-AND operations instead of a scan per doctor and slot.
+    
+    Subscribed to the event bus with on_appointment_event, it books and
+    releases the minutes of appointments in the registered schedules as
+    they are created, rescheduled and cancelled.
+    """
+    
+    def __init__(self, doctor_repository: DoctorRepository):
+        """
+        Initialize the availability service with a repository.
+        
+        Args:
+            doctor_repository: Repository for doctor data access
+        """
+        self.doctor_repository = doctor_repository
+        self._schedules: Dict[str, Schedule] = {}
+        # Doctor ID and booked slot of each appointment applied from an event
+        self._booked: Dict[str, Tuple[str, TimeSlot]] = {}
+        self._lock = threading.Lock()
+    
+    def register_schedule(self, schedule: Schedule) -> None:
+        """
+        Register the schedule of a doctor, replacing any previous one.
+        
+        Args:
+            schedule: The schedule to search
+        """
+        with self._lock:
+            self._schedules[schedule.doctor_id] = schedule
+    
+    def get_schedule(self, doctor_id: str) -> Optional[Schedule]:
+        """
+        Get the registered schedule of a doctor.
+        
+        Args:
+            doctor_id: The ID of the doctor
+        
+        Returns:
+            The schedule if registered, None otherwise
+        """
+        return self._schedules.get(doctor_id)
+    
+    def on_appointment_event(self, event: AppointmentEvent) -> None:
+        """
+        Update the booked minutes of a doctor's schedule after an appointment
+        event, releasing the appointment's previous slot and booking its
+        current one unless it was cancelled. Appointments of doctors without
+        a registered schedule are ignored.
+        
+        Args:
+            event: The appointment event
+        """
+        with self._lock:
+            booked = self._booked.pop(event.appointment_id, None)
+            if booked is not None:
+                doctor_id, time_slot = booked
+                schedule = self._schedules.get(doctor_id)
+                if schedule is not None:
+                    schedule.release_slot(time_slot)
+            
+            schedule = self._schedules.get(event.doctor_id)
+            if schedule is None or event.status == AppointmentStatus.CANCELLED:
+                return
+            time_slot = TimeSlot(event.appointment_id, event.date_time,
+                                 event.date_time + timedelta(minutes=event.duration))
+            if schedule.book_slot(time_slot):
+                self._booked[event.appointment_id] = (event.doctor_id, time_slot)
+    
+    def find_earliest_slots(self, duration: int, start: datetime, end: datetime,
+                            specialization: Optional[str] = None,
+                            department: Optional[str] = None,
+                            limit: int = 5, step: int = 5) -> List[SlotCandidate]:
+        """
+        Find the earliest free slot of each matching doctor and return the
+        earliest ones across doctors.
+        
+        Args:
+            duration: The length of the slot in minutes
+            start: The earliest allowed start of the slot
+            end: The latest allowed end of the slot
+            specialization: Only search doctors with this specialization
+            department: Only search doctors in this department
+            limit: The maximum number of candidates (one per doctor) to return
+            step: Slots start on multiples of this many minutes after midnight
+        
+        Returns:
+            Up to limit candidates ordered by start time, then by doctor ID
+        
+        Raises:
+            ValueError: If the duration, limit or step is not positive
+        """
+        if duration < 1 or limit < 1 or step < 1:
+            raise ValueError("Duration, limit and step must be positive")
+        if duration > MINUTES_PER_DAY:
+            return []
+        
+        if specialization is not None:
+            doctors = self.doctor_repository.find_by_specialization(specialization)
+        else:
+            doctors = self.doctor_repository.find_all()
+        doctors = [
+            doctor for doctor in doctors
+            if doctor.doctor_id in self._schedules and (department is None or doctor.department == department)
+        ]
+        
+        # Each lane holds a day of minutes followed by zero guard bits, so
+        # shifting a lane right never pulls in minutes of the next lane
+        lane_width = MINUTES_PER_DAY + duration
+        lane_mask = (1 << lane_width) - 1
+        allowed_starts = sum(1 << minute for minute in range(0, MINUTES_PER_DAY, step))
+        
+        candidates: List[Tuple[datetime, str, SlotCandidate]] = []
+        day = start.date()
+        while doctors and len(candidates) < limit and day <= end.date():
+            window = self._window_mask(day, start, end, duration)
+            if window:
+                stacked = 0
+                for lane, doctor in enumerate(doctors):
+                    free = self._schedules[doctor.doctor_id].get_free_minute_mask(day)
+                    stacked |= free << (lane * lane_width)
+                
+                # Replicate the allowed starts of one lane into every lane
+                lanes = sum(1 << (lane * lane_width) for lane in range(len(doctors)))
+                starts = _run_starts(stacked, duration) & ((window & allowed_starts) * lanes)
+                
+                found = set()
+                midnight = datetime.combine(day, time.min)
+                while starts:
+                    # The lowest set bit is the earliest start of the lowest remaining lane
+                    bit = (starts & -starts).bit_length() - 1
+                    lane, minute = divmod(bit, lane_width)
+                    doctor = doctors[lane]
+                    start_time = midnight + timedelta(minutes=minute)
+                    candidates.append((start_time, doctor.doctor_id, SlotCandidate(
+                        doctor, start_time, start_time + timedelta(minutes=duration)
+                    )))
+                    found.add(lane)
+                    starts &= ~(lane_mask << (lane * lane_width))
+                doctors = [doctor for lane, doctor in enumerate(doctors) if lane not in found]
+            day += timedelta(days=1)
+        
+        return [candidate for _, _, candidate in heapq.nsmallest(limit, candidates, key=lambda c: c[:2])]
+    
+    @staticmethod
+    def _window_mask(day: date, start: datetime, end: datetime, duration: int) -> int:
+        """Get the bitmap of the minutes of a day at which a slot may start within [start, end]"""
+        midnight = datetime.combine(day, time.min)
+        first = max(0, -(-int((start - midnight).total_seconds()) // 60))
+        last = min(MINUTES_PER_DAY - duration, int((end - midnight).total_seconds()) // 60 - duration)
+        if last < first:
+            return 0
+        return ((1 << (last - first + 1)) - 1) << first
+
+def _run_starts(free: int, duration: int) -> int:
+    """
+    Get the bitmap of positions starting a run of at least duration set bits.
+    Doubles the run length checked per step, so it takes O(log duration) operations.
+    """
+    starts = free
+    length = 1
+    while length < duration:
+        shift = min(length, duration - length)
+        starts &= starts >> shift
+        length += shift
+    return starts
@@ -0,0 +1,158 @@
+"""
+Read-through LRU cache with time-to-live expiry for service reads.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class CacheStats:
+    """
+    Counters of a TTLCache, for tuning its size and time-to-live.
+    """
+    
+    def __init__(self):
+        """Initialize the counters at zero."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    def hit_rate(self) -> float:
+        """Get the fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the counters to a JSON-compatible dictionary."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate(),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
+
+class TTLCache:
+    """
+    Thread-safe least-recently-used cache whose entries expire after a
+    time-to-live.
+    
+    get_or_load() reads through to a loader on a miss. A value loaded while
+    any key was invalidated is returned but not stored, so a read racing a
+    write can never put the value from before the write back into the cache.
+    None is never cached, so entities created after a miss are found.
+    """
+    
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_size: The maximum number of entries, beyond which the least recently used is evicted
+            ttl: The number of seconds an entry stays valid
+            clock: Function returning the current time in seconds
+        
+        Raises:
+            ValueError: If the size or time-to-live is not positive
+        """
+        if max_size < 1 or ttl <= 0:
+            raise ValueError("Cache size and time-to-live must be positive")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.stats = CacheStats()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get the cached value of a key.
+        
+        Args:
+            key: The key to look up
+        
+        Returns:
+            The value, or None if the key is not cached or has expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    return value
+                del self._entries[key]
+                self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Cache a value, evicting the least recently used entries beyond the size limit.
+        
+        Args:
+            key: The key to cache the value under
+            value: The value to cache; None is ignored
+        """
+        if value is None:
+            return
+        with self._lock:
+            self._store(key, value)
+    
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Get the cached value of a key, loading and caching it on a miss.
+        
+        Args:
+            key: The key to look up
+            loader: Function returning the value of the key, called without the lock held
+        
+        Returns:
+            The cached or loaded value
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        generation = self._generation
+        value = loader()
+        if value is not None:
+            with self._lock:
+                if generation == self._generation:
+                    self._store(key, value)
+        return value
+    
+    def invalidate(self, *keys: Hashable) -> None:
+        """
+        Drop keys from the cache after the values behind them have changed.
+        
+        Args:
+            keys: The keys to drop
+        """
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self.stats.invalidations += 1
+    
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+    
+    def _store(self, key: Hashable, value: Any) -> None:
+        """Store an entry as the most recently used one; the lock must be held."""
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
@@ -1,23 +1,32 @@
 """
 Doctor service implementation for handling business logic related to doctors.
 """
-from typing import List, Optional
+import copy
+from typing import Iterator, List, Optional
 from src.doctor import Doctor
 from repositories.doctor_repository import DoctorRepository
+from repositories.paging import Page
+from services.cache import TTLCache
+from services.etags import collection_tag, entity_tag
 
 class DoctorService:
     """
     Service class for handling business logic related to doctors.
+    
+    With a cache, doctors read by ID are kept in it until they expire or
+    the service changes them.
     """
     
-    def __init__(self, doctor_repository: DoctorRepository):
+    def __init__(self, doctor_repository: DoctorRepository, cache: Optional[TTLCache] = None):
         """
         Initialize the doctor service with a repository.
         
         Args:
             doctor_repository: Repository for doctor data access
+            cache: Cache of doctors by ID, if any
         """
         self.doctor_repository = doctor_repository
+        self.cache = cache
     
     def create_doctor(self, doctor: Doctor) -> Doctor:
         """
@@ -25,16 +34,16 @@ class DoctorService:
         
         Args:
             doctor: The doctor to create
-            
+        
         Returns:
             The created doctor
         
         Raises:
             ValueError: If a doctor with the same ID already exists
         """
-        existing_doctor = self.doctor_repository.find_by_id(doctor.id)
+        existing_doctor = self.doctor_repository.find_by_id(doctor.doctor_id)
         if existing_doctor:
-            raise ValueError(f"Doctor with ID {doctor.id} already exists")
+            raise ValueError(f"Doctor with ID {doctor.doctor_id} already exists")
         
         # Save the doctor
         self.doctor_repository.save(doctor)
@@ -46,11 +55,14 @@ class DoctorService:
         
         Args:
             doctor_id: The ID of the doctor to get
-            
+        
         Returns:
             The doctor if found, None otherwise
         """
-        return self.doctor_repository.find_by_id(doctor_id)
+        if self.cache is None:
+            return self.doctor_repository.find_by_id(doctor_id)
+        # Hand out a copy, so changes made by the caller never reach the cached doctor
+        return copy.copy(self.cache.get_or_load(doctor_id, lambda: self.doctor_repository.find_by_id(doctor_id)))
     
     def get_all_doctors(self) -> List[Doctor]:
         """
@@ -61,25 +73,74 @@ class DoctorService:
         """
         return self.doctor_repository.find_all()
     
+    def iter_doctors(self) -> Iterator[Doctor]:
+        """
+        Iterate over all doctors without loading them into a list.
+        
+        Returns:
+            An iterator over all doctors
+        """
+        return self.doctor_repository.iter_all()
+    
+    def get_doctors_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False) -> Page[Doctor]:
+        """
+        Get one page of doctors ordered by ID.
+        
+        Args:
+            limit: The maximum number of doctors on the page
+            cursor: The next_cursor of the previous page, or None for the first page
+            descending: Whether to order by descending ID
+        
+        Returns:
+            The page of doctors
+        
+        Raises:
+            ValueError: If the limit is not positive or the cursor is invalid
+        """
+        return self.doctor_repository.find_page(limit, cursor, descending)
+    
+    def get_doctor_etag(self, doctor: Doctor) -> Optional[str]:
+        """
+        Get the entity tag of a doctor, which changes whenever the doctor is saved.
+        
+        Args:
+            doctor: The doctor, as read from the repository
+        
+        Returns:
+            The tag, or None if the repository does not track versions
+        """
+        return entity_tag(self.doctor_repository, doctor)
+    
+    def get_doctors_etag(self) -> Optional[str]:
+        """
+        Get the entity tag of the doctor collection, which changes whenever
+        any doctor is saved or deleted. Get it before reading the doctors.
+        
+        Returns:
+            The tag, or None if the repository does not track changes
+        """
+        return collection_tag(self.doctor_repository)
+    
     def update_doctor(self, doctor: Doctor) -> Doctor:
         """
         Update an existing doctor.
         
         Args:
             doctor: The doctor to update
-            
+        
         Returns:
             The updated doctor
-            
+        
         Raises:
             ValueError: If the doctor does not exist
         """
-        existing_doctor = self.doctor_repository.find_by_id(doctor.id)
+        existing_doctor = self.doctor_repository.find_by_id(doctor.doctor_id)
         if not existing_doctor:
-            raise ValueError(f"Doctor with ID {doctor.id} not found")
+            raise ValueError(f"Doctor with ID {doctor.doctor_id} not found")
         
         # Save the updated doctor
         self.doctor_repository.save(doctor)
+        self._invalidate(doctor.doctor_id)
         return doctor
     
     def delete_doctor(self, doctor_id: str) -> None:
@@ -88,7 +149,7 @@ class DoctorService:
         
         Args:
             doctor_id: The ID of the doctor to delete
-            
+        
         Raises:
             ValueError: If the doctor does not exist
         """
@@ -97,6 +158,7 @@ class DoctorService:
             raise ValueError(f"Doctor with ID {doctor_id} not found")
         
         self.doctor_repository.delete(doctor_id)
+        self._invalidate(doctor_id)
     
     def find_doctors_by_specialization(self, specialization: str) -> List[Doctor]:
         """
@@ -104,20 +166,26 @@ class DoctorService:
         
         Args:
             specialization: The specialization to search for
-            
+        
         Returns:
             A list of doctors with the specified specialization
         """
         return self.doctor_repository.find_by_specialization(specialization)
     
-    def find_doctors_by_name(self, name: str) -> List[Doctor]:
+    def find_doctors_by_name(self, name: str, limit: Optional[int] = None) -> List[Doctor]:
         """
         Find doctors by name.
         
         Args:
             name: The name to search for
-            
+            limit: The maximum number of doctors to return, or None for all
+        
         Returns:
-            A list of doctors with matching names
+            A list of doctors with matching names, best matches first
         """
-        return self.doctor_repository.find_by_name(name)
+        return self.doctor_repository.find_by_name(name, limit)
+    
+    def _invalidate(self, doctor_id: str) -> None:
+        """Drop a changed doctor from the cache, if there is one."""
+        if self.cache is not None:
+            self.cache.invalidate(doctor_id)
@@ -0,0 +1,66 @@
+"""
+Entity tags for conditional GET requests, derived from repository versions.
+"""
+import hashlib
+from typing import Any, Callable, Iterable, Optional
+from repositories.repository import Repository
+
+def entity_tag(repository: Repository, entity) -> Optional[str]:
+    """
+    Get the entity tag of a stored entity, which changes with every save of it.
+    
+    Args:
+        repository: The repository the entity was read from
+        entity: The entity
+    
+    Returns:
+        The tag, or None if the repository does not track versions
+    """
+    epoch = repository.storage_epoch()
+    # Unsaved and unversioned entities have version 0
+    version = getattr(entity, "version", 0)
+    if epoch is None or not version:
+        return None
+    return f"{epoch}.{version}"
+
+def collection_tag(repository: Repository) -> Optional[str]:
+    """
+    Get the entity tag of every entity in a repository, which changes with
+    every save and delete. Get it before reading the entities it describes,
+    so that a write racing the read changes the tag again afterwards.
+    
+    Args:
+        repository: The repository
+    
+    Returns:
+        The tag, or None if the repository does not track changes
+    """
+    epoch = repository.storage_epoch()
+    change_count = repository.change_count()
+    if epoch is None or change_count is None:
+        return None
+    return f"{epoch}.{change_count}"
+
+def list_tag(repository: Repository, entities: Iterable, id_of: Callable[[Any], str]) -> Optional[str]:
+    """
+    Get the entity tag of a list of entities read from a repository, which
+    changes whenever an entity joins or leaves the list or is saved. Unlike
+    collection_tag(), it describes exactly the entities given, so it also
+    suits lists that may come from a cache.
+    
+    Args:
+        repository: The repository the entities were read from
+        entities: The entities, in the order they are listed
+        id_of: Function getting the ID of an entity
+    
+    Returns:
+        The tag, or None if the repository does not track versions
+    """
+    epoch = repository.storage_epoch()
+    if epoch is None:
+        return None
+    versions = [(id_of(entity), getattr(entity, "version", 0)) for entity in entities]
+    if not all(version for _, version in versions):
+        return None
+    digest = hashlib.sha1(repr(versions).encode()).hexdigest()[:16]
+    return f"{epoch}.{digest}"
@@ -0,0 +1,332 @@
+"""
+In-process domain event bus for appointment lifecycle changes.
+"""
+import asyncio
+import inspect
+import json
+import sqlite3
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from src.enums import AppointmentStatus
+
+class AppointmentEventType(Enum):
+    """
+    Kinds of appointment lifecycle events.
+    """
+    CREATED = "CREATED"
+    UPDATED = "UPDATED"
+    RESCHEDULED = "RESCHEDULED"
+    CANCELLED = "CANCELLED"
+
+class AppointmentEvent:
+    """
+    Immutable record of a change to an appointment.
+    
+    Events carry the appointment's values at the time of the change rather
+    than the appointment object, so subscribers see what happened even if
+    the appointment changes again, and events can be stored and replayed.
+    """
+    
+    def __init__(self, event_type: AppointmentEventType, appointment_id: str, patient_id: str,
+                 doctor_id: str, date_time: datetime, duration: int, status: AppointmentStatus,
+                 previous_date_time: Optional[datetime] = None,
+                 event_id: Optional[str] = None, occurred_at: Optional[datetime] = None):
+        """
+        Initialize the event.
+        
+        Args:
+            event_type: The kind of change
+            appointment_id: The ID of the changed appointment
+            patient_id: The ID of the appointment's patient
+            doctor_id: The ID of the appointment's doctor
+            date_time: The appointment's date/time after the change
+            duration: The appointment's duration in minutes
+            status: The appointment's status after the change
+            previous_date_time: The date/time before a reschedule
+            event_id: The unique ID of the event (generated if omitted)
+            occurred_at: When the change happened (now if omitted)
+        """
+        self.event_type = event_type
+        self.appointment_id = appointment_id
+        self.patient_id = patient_id
+        self.doctor_id = doctor_id
+        self.date_time = date_time
+        self.duration = duration
+        self.status = status
+        self.previous_date_time = previous_date_time
+        self.event_id = event_id or str(uuid.uuid4())
+        self.occurred_at = occurred_at or datetime.now()
+    
+    @classmethod
+    def from_appointment(cls, event_type: AppointmentEventType, appointment,
+                         previous_date_time: Optional[datetime] = None) -> 'AppointmentEvent':
+        """
+        Create an event from the current state of an appointment.
+        
+        Args:
+            event_type: The kind of change
+            appointment: The changed appointment
+            previous_date_time: The date/time before a reschedule
+        
+        Returns:
+            The event
+        """
+        return cls(
+            event_type, appointment.appointment_id, appointment.patient_id, appointment.doctor_id,
+            appointment.date_time, appointment.duration, appointment.status, previous_date_time
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the event to a JSON-compatible dictionary."""
+        return {
+            "event_id": self.event_id,
+            "event_type": self.event_type.value,
+            "occurred_at": self.occurred_at.isoformat(),
+            "appointment_id": self.appointment_id,
+            "patient_id": self.patient_id,
+            "doctor_id": self.doctor_id,
+            "date_time": self.date_time.isoformat(),
+            "duration": self.duration,
+            "status": self.status.name,
+            "previous_date_time": self.previous_date_time.isoformat() if self.previous_date_time else None
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AppointmentEvent':
+        """Recreate an event from a dictionary produced by to_dict."""
+        previous_date_time = data.get("previous_date_time")
+        return cls(
+            AppointmentEventType(data["event_type"]),
+            data["appointment_id"],
+            data["patient_id"],
+            data["doctor_id"],
+            datetime.fromisoformat(data["date_time"]),
+            data["duration"],
+            AppointmentStatus[data["status"]],
+            datetime.fromisoformat(previous_date_time) if previous_date_time else None,
+            event_id=data["event_id"],
+            occurred_at=datetime.fromisoformat(data["occurred_at"])
+        )
+
+# A subscriber is a plain function or a coroutine function taking the event
+Subscriber = Callable[[AppointmentEvent], Any]
+
+class EventOutbox:
+    """
+    Durable SQLite log of published events.
+    
+    Events are recorded before they are delivered and marked once every
+    subscriber has run without raising, so events interrupted by a crash
+    or a failing subscriber are delivered again by EventBus.replay_pending()
+    after a restart. Subscribers of a durable bus must therefore tolerate
+    receiving an event more than once.
+    """
+    
+    def __init__(self, database_path: str):
+        """
+        Initialize the outbox and create its table.
+        
+        Args:
+            database_path: Path of the SQLite database file
+        """
+        self._connection = sqlite3.connect(database_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS event_outbox (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_id TEXT NOT NULL UNIQUE,
+                    payload TEXT NOT NULL,
+                    delivered INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_event_outbox_pending ON event_outbox (delivered, seq)"
+            )
+    
+    def append(self, event: AppointmentEvent) -> None:
+        """Record an event as not yet delivered."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO event_outbox (event_id, payload) VALUES (?, ?)",
+                (event.event_id, json.dumps(event.to_dict()))
+            )
+    
+    def mark_delivered(self, event_id: str) -> None:
+        """Mark an event as delivered to every subscriber."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE event_outbox SET delivered = 1 WHERE event_id = ?", (event_id,)
+            )
+    
+    def pending(self) -> List[AppointmentEvent]:
+        """Get the events not yet delivered, oldest first."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT payload FROM event_outbox WHERE delivered = 0 ORDER BY seq"
+            ).fetchall()
+        return [AppointmentEvent.from_dict(json.loads(payload)) for payload, in rows]
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+class EventBus:
+    """
+    In-process publish/subscribe bus for appointment events.
+    
+    Plain function subscribers run synchronously inside publish(), in
+    subscription order. Coroutine function subscribers are scheduled as tasks
+    on the running event loop, so publishing from a request handler never
+    waits for them. When publishing from another thread, such as a service
+    call run by a ServiceExecutor, they are handed to the loop given to
+    bind_loop(); without any loop they are run to completion.
+    An exception raised by one subscriber does not stop the others; the
+    latest max_errors of them are kept in errors instead, and the event is
+    left undelivered in the outbox.
+    """
+    
+    def __init__(self, outbox: Optional[EventOutbox] = None, max_errors: int = 100):
+        """
+        Initialize the bus.
+        
+        Args:
+            outbox: Durable outbox recording every published event, if any
+            max_errors: The number of subscriber exceptions kept in errors
+        """
+        self.outbox = outbox
+        self._subscribers: List[Tuple[Optional[AppointmentEventType], Subscriber]] = []
+        self._tasks = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.errors: Deque[Tuple[AppointmentEvent, BaseException]] = deque(maxlen=max_errors)
+    
+    def bind_loop(self, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """
+        Set the event loop that runs the async subscribers of events published
+        from other threads.
+        
+        Args:
+            loop: The event loop, or None to run them to completion in the publishing thread
+        """
+        self._loop = loop
+    
+    def subscribe(self, handler: Subscriber, event_type: Optional[AppointmentEventType] = None) -> None:
+        """
+        Subscribe a handler to one kind of event, or to all events.
+        
+        Args:
+            handler: Function or coroutine function called with each event
+            event_type: The kind of event to receive, or None for every kind
+        """
+        self._subscribers.append((event_type, handler))
+    
+    def unsubscribe(self, handler: Subscriber) -> None:
+        """
+        Remove every subscription of a handler.
+        
+        Args:
+            handler: The handler to remove
+        """
+        self._subscribers = [(t, h) for t, h in self._subscribers if h is not handler]
+    
+    def publish(self, event: AppointmentEvent, record: bool = True) -> None:
+        """
+        Publish an event to its subscribers.
+        
+        Args:
+            event: The event to publish
+            record: Whether to record the event in the outbox; events of
+                changes another process made, and recorded itself, are not
+        """
+        if record and self.outbox is not None:
+            self.outbox.append(event)
+        
+        # Whether to mark the event delivered in the outbox, which unrecorded events are not in
+        delivered = record
+        async_handlers = []
+        for event_type, handler in list(self._subscribers):
+            if event_type is not None and event_type != event.event_type:
+                continue
+            if inspect.iscoroutinefunction(handler):
+                async_handlers.append(handler)
+                continue
+            try:
+                handler(event)
+            except Exception as e:
+                self.errors.append((event, e))
+                delivered = False
+        
+        if async_handlers:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                if self._loop is not None and self._loop.is_running():
+                    self._loop.call_soon_threadsafe(self._start_async, event, async_handlers, delivered)
+                    return
+                for handler in async_handlers:
+                    if not asyncio.run(self._run_async(handler, event)):
+                        delivered = False
+            else:
+                self._start_async(event, async_handlers, delivered)
+                return
+        if self.outbox is not None and delivered:
+            self.outbox.mark_delivered(event.event_id)
+    
+    def replay_pending(self) -> int:
+        """
+        Publish again the outbox events that were never fully delivered.
+        
+        Returns:
+            The number of events replayed
+        """
+        if self.outbox is None:
+            return 0
+        events = self.outbox.pending()
+        for event in events:
+            self.publish(event)
+        return len(events)
+    
+    async def drain(self) -> None:
+        """Wait for the async subscribers of every published event to finish."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+    
+    def _start_async(self, event: AppointmentEvent, handlers: List[Subscriber], delivered: bool) -> None:
+        """
+        Schedule the async subscribers of an event as tasks; runs on the event loop.
+        
+        Args:
+            event: The event
+            handlers: The async subscribers of the event
+            delivered: Whether every sync subscriber of the event succeeded
+        """
+        loop = asyncio.get_running_loop()
+        pending = [self._spawn(loop, self._run_async(handler, event)) for handler in handlers]
+        if self.outbox is not None and delivered:
+            # Mark the event once its async subscribers have succeeded too
+            self._spawn(loop, self._mark_when_done(event, pending))
+    
+    def _spawn(self, loop: asyncio.AbstractEventLoop, coroutine) -> asyncio.Task:
+        """Run a coroutine as a task, keeping a reference until it is done."""
+        task = loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+    
+    async def _run_async(self, handler: Subscriber, event: AppointmentEvent) -> bool:
+        """Run an async subscriber, collecting its exception; returns whether it succeeded."""
+        try:
+            await handler(event)
+        except Exception as e:
+            self.errors.append((event, e))
+            return False
+        return True
+    
+    async def _mark_when_done(self, event: AppointmentEvent, pending: List[asyncio.Task]) -> None:
+        """Mark an event delivered once its async subscribers have finished, if all of them succeeded."""
+        if all(await asyncio.gather(*pending)):
+            self.outbox.mark_delivered(event.event_id)
@@ -0,0 +1,124 @@
+"""
+Bridge running blocking service calls from async code on a bounded thread pool.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar('T')  # Result type
+
+class ServiceBusyError(RuntimeError):
+    """
+    Raised when a blocking call waited too long for a place in the service pool.
+    """
+
+class ServiceExecutor:
+    """
+    Runs blocking service calls, such as those reaching file system or
+    database repositories, on a dedicated thread pool so that they never
+    stall the event loop.
+    
+    At most max_workers calls run at once and at most max_queued more wait
+    for a thread. A call finding the pool and its queue full waits up to
+    queue_timeout seconds for a place and then fails with ServiceBusyError,
+    so an overloaded server sheds requests instead of queueing them without
+    bound. A place is only given back when the call's thread finishes, even
+    if the awaiting request was cancelled first.
+    """
+    
+    def __init__(self, max_workers: int = 16, max_queued: int = 64, queue_timeout: float = 5.0):
+        """
+        Initialize the executor; the thread pool starts its threads on demand.
+        
+        Args:
+            max_workers: The number of threads running blocking calls
+            max_queued: The number of calls that may wait for a thread
+            queue_timeout: The number of seconds a call waits for a place before failing
+        
+        Raises:
+            ValueError: If the number of workers is not positive, or the queue size or timeout is negative
+        """
+        if max_workers < 1 or max_queued < 0 or queue_timeout < 0:
+            raise ValueError("Service executor needs at least one worker and a non-negative queue")
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="service")
+        # Created on first use, on the event loop that runs the calls
+        self._places: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+    
+    async def run(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking function on the pool and wait for its result.
+        
+        Args:
+            function: The function to run
+            args: Positional arguments of the function
+            kwargs: Keyword arguments of the function
+        
+        Returns:
+            The result of the function
+        
+        Raises:
+            ServiceBusyError: If no place in the pool freed up within queue_timeout
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._places = asyncio.Semaphore(self.max_workers + self.max_queued)
+        places = self._places
+        try:
+            await asyncio.wait_for(places.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ServiceBusyError(
+                f"Service pool busy: {self._in_flight} calls in flight for {self.max_workers} workers"
+            ) from None
+        
+        self._in_flight += 1
+        try:
+            future = self._pool.submit(functools.partial(function, *args, **kwargs))
+        except BaseException:
+            self._release(places)
+            raise
+        # Called when the thread finishes, or at once if the call is cancelled before starting
+        future.add_done_callback(lambda _: self._release_threadsafe(loop, places))
+        return await asyncio.wrap_future(future)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get the pool size and counters as a JSON-compatible dictionary."""
+        return {
+            "max_workers": self.max_workers,
+            "max_queued": self.max_queued,
+            "in_flight": self._in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected
+        }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the thread pool.
+        
+        Args:
+            wait: Whether to wait for the running calls to finish
+        """
+        self._pool.shutdown(wait=wait)
+    
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop, places: asyncio.Semaphore) -> None:
+        """Give back the place of a finished call from any thread."""
+        try:
+            loop.call_soon_threadsafe(self._release, places)
+        except RuntimeError:
+            # The event loop is closed, and the semaphore with it
+            pass
+    
+    def _release(self, places: asyncio.Semaphore) -> None:
+        """Give back the place of a finished call; runs on the event loop."""
+        self._in_flight -= 1
+        self.completed += 1
+        places.release()
@@ -0,0 +1,128 @@
+"""
+Per-key locks that only exist while they are in use, and a file lock
+electing one leader among processes.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Generic, Hashable, Iterator, Optional, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+K = TypeVar('K', bound=Hashable)  # Key type
+
+class _KeyLock:
+    """
+    Lock of one key and the number of threads holding or waiting for it.
+    """
+    
+    __slots__ = ('lock', 'users')
+    
+    def __init__(self):
+        """Initialize an unused lock."""
+        self.lock = threading.Lock()
+        self.users = 0
+
+class KeyedLocks(Generic[K]):
+    """
+    One lock per key, such as per doctor, so that threads working on
+    different keys never wait for each other.
+    
+    Locks are reference counted: a key's lock is created when the first
+    thread asks for it and dropped when the last thread holding or waiting
+    for it lets go, so the table only holds the keys in use instead of
+    every key ever locked.
+    """
+    
+    def __init__(self):
+        """Initialize an empty lock table."""
+        self._guard = threading.Lock()
+        self._locks: Dict[K, _KeyLock] = {}
+    
+    def __len__(self) -> int:
+        """Get the number of keys whose lock is held or waited for."""
+        return len(self._locks)
+    
+    @contextmanager
+    def hold(self, key: K) -> Iterator[None]:
+        """
+        Hold the lock of a key for the duration of a with block.
+        
+        Args:
+            key: The key to lock
+        """
+        with self._guard:
+            key_lock = self._locks.get(key)
+            if key_lock is None:
+                key_lock = self._locks[key] = _KeyLock()
+            key_lock.users += 1
+        try:
+            with key_lock.lock:
+                yield
+        finally:
+            with self._guard:
+                key_lock.users -= 1
+                if not key_lock.users:
+                    del self._locks[key]
+
+class LeaderLock:
+    """
+    Exclusive lock on a file that at most one process holds at a time, so
+    that work such as sending reminders runs in one of several worker
+    processes sharing the same storage.
+    
+    The lock is an fcntl lock, which the operating system releases when
+    the holding process exits, so a waiting process can take over from a
+    leader that died. Without fcntl (Windows) every process is a leader.
+    """
+    
+    def __init__(self, file_path: str):
+        """
+        Initialize the lock; nothing is locked until acquire() succeeds.
+        
+        Args:
+            file_path: Path of the lock file, created if it does not exist
+        """
+        self.file_path = file_path
+        self._fd: Optional[int] = None
+        self._held = False
+    
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process holds the lock."""
+        return self._held
+    
+    def acquire(self) -> bool:
+        """
+        Take the lock if no other process holds it, without waiting.
+        
+        Returns:
+            Whether this process now holds the lock
+        """
+        if self._held:
+            return True
+        if fcntl is None:
+            self._held = True
+            return True
+        if self._fd is None:
+            directory = os.path.dirname(self.file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._fd = os.open(self.file_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        self._held = True
+        return True
+    
+    def release(self) -> None:
+        """Let go of the lock, if held, and close the lock file."""
+        self._held = False
+        if self._fd is not None:
+            # Closing the file releases its lock
+            os.close(self._fd)
+            self._fd = None
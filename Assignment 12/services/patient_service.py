@@ -1,23 +1,32 @@
 """
 Patient service implementation for handling business logic related to patients.
 """
-from typing import List, Optional
+import copy
+from typing import Iterator, List, Optional
 from src.patient import Patient
 from repositories.patient_repository import PatientRepository
+from repositories.paging import Page
+from services.cache import TTLCache
+from services.etags import collection_tag, entity_tag
 
 class PatientService:
     """
     Service class for handling business logic related to patients.
+    
+    With a cache, patients read by ID are kept in it until they expire or
+    the service changes them.
     """
     
-    def __init__(self, patient_repository: PatientRepository):
+    def __init__(self, patient_repository: PatientRepository, cache: Optional[TTLCache] = None):
         """
         Initialize the patient service with a repository.
         
         Args:
             patient_repository: Repository for patient data access
+            cache: Cache of patients by ID, if any
         """
         self.patient_repository = patient_repository
+        self.cache = cache
     
     def create_patient(self, patient: Patient) -> Patient:
         """
@@ -25,7 +34,7 @@ class PatientService:
         
         Args:
             patient: The patient to create
-            
+        
         Returns:
             The created patient
         
@@ -47,11 +56,14 @@ class PatientService:
         
         Args:
             patient_id: The ID of the patient to get
-            
+        
         Returns:
             The patient if found, None otherwise
         """
-        return self.patient_repository.find_by_id(patient_id)
+        if self.cache is None:
+            return self.patient_repository.find_by_id(patient_id)
+        # Hand out a copy, so changes made by the caller never reach the cached patient
+        return copy.copy(self.cache.get_or_load(patient_id, lambda: self.patient_repository.find_by_id(patient_id)))
     
     def get_all_patients(self) -> List[Patient]:
         """
@@ -62,25 +74,80 @@ class PatientService:
         """
         return self.patient_repository.find_all()
     
+    def iter_patients(self) -> Iterator[Patient]:
+        """
+        Iterate over all patients without loading them into a list.
+        
+        Returns:
+            An iterator over all patients
+        """
+        return self.patient_repository.iter_all()
+    
+    def get_patients_page(self, limit: int, cursor: Optional[str] = None, descending: bool = False) -> Page[Patient]:
+        """
+        Get one page of patients ordered by ID.
+        
+        Args:
+            limit: The maximum number of patients on the page
+            cursor: The next_cursor of the previous page, or None for the first page
+            descending: Whether to order by descending ID
+        
+        Returns:
+            The page of patients
+        
+        Raises:
+            ValueError: If the limit is not positive or the cursor is invalid
+        """
+        return self.patient_repository.find_page(limit, cursor, descending)
+    
+    def get_patient_etag(self, patient: Patient) -> Optional[str]:
+        """
+        Get the entity tag of a patient, which changes whenever the patient is saved.
+        
+        Args:
+            patient: The patient, as read from the repository
+        
+        Returns:
+            The tag, or None if the repository does not track versions
+        """
+        return entity_tag(self.patient_repository, patient)
+    
+    def get_patients_etag(self) -> Optional[str]:
+        """
+        Get the entity tag of the patient collection, which changes whenever
+        any patient is saved or deleted. Get it before reading the patients.
+        
+        Returns:
+            The tag, or None if the repository does not track changes
+        """
+        return collection_tag(self.patient_repository)
+    
     def update_patient(self, patient: Patient) -> Patient:
         """
         Update an existing patient.
         
         Args:
             patient: The patient to update
-            
+        
         Returns:
             The updated patient
-            
+        
         Raises:
-            ValueError: If the patient does not exist
+            ValueError: If the patient does not exist or another patient
+                already uses the same email
         """
-        existing_patient = self.patient_repository.find_by_id(patient.id)
+        existing_patient = self.patient_repository.find_by_id(patient.patient_id)
         if not existing_patient:
-            raise ValueError(f"Patient with ID {patient.id} not found")
+            raise ValueError(f"Patient with ID {patient.patient_id} not found")
+        
+        # Check that a changed email is not taken by another patient
+        email_owner = self.patient_repository.find_by_email(patient.contact_info.email)
+        if email_owner and email_owner.patient_id != patient.patient_id:
+            raise ValueError(f"Patient with email {patient.contact_info.email} already exists")
         
         # Save the updated patient
         self.patient_repository.save(patient)
+        self._invalidate(patient.patient_id)
         return patient
     
     def delete_patient(self, patient_id: str) -> None:
@@ -89,7 +156,7 @@ class PatientService:
         
         Args:
             patient_id: The ID of the patient to delete
-            
+        
         Raises:
             ValueError: If the patient does not exist
         """
@@ -98,15 +165,22 @@ class PatientService:
             raise ValueError(f"Patient with ID {patient_id} not found")
         
         self.patient_repository.delete(patient_id)
+        self._invalidate(patient_id)
     
-    def find_patients_by_name(self, name: str) -> List[Patient]:
+    def find_patients_by_name(self, name: str, limit: Optional[int] = None) -> List[Patient]:
         """
         Find patients by name.
         
         Args:
             name: The name to search for
-            
+            limit: The maximum number of patients to return, or None for all
+        
         Returns:
-            A list of patients with matching names
+            A list of patients with matching names, best matches first
         """
-        return self.patient_repository.find_by_name(name)
+        return self.patient_repository.find_by_name(name, limit)
+    
+    def _invalidate(self, patient_id: str) -> None:
+        """Drop a changed patient from the cache, if there is one."""
+        if self.cache is not None:
+            self.cache.invalidate(patient_id)
@@ -0,0 +1,244 @@
+"""
+Appointment reminders kept in step with the appointment lifecycle events.
+"""
+import asyncio
+import heapq
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.appointment import Appointment
+from src.enums import AppointmentStatus, NotificationType, RecipientType
+from src.notification import Notification
+from services.events import AppointmentEvent, EventBus
+
+# Appointments in these states get no reminder
+CLOSED_STATUSES = (AppointmentStatus.CANCELLED, AppointmentStatus.COMPLETED, AppointmentStatus.NO_SHOW)
+
+class ReminderScheduler:
+    """
+    Time-ordered queue of the reminders still to be sent.
+    
+    Keeps a min-heap of (reminder time, appointment ID) entries, so adding,
+    moving or cancelling a reminder costs O(log n) and finding the due ones
+    only looks at the front of the heap instead of scanning every upcoming
+    appointment. Moved and cancelled reminders leave stale heap entries that
+    are skipped when they reach the front, and the heap is rebuilt once they
+    outnumber the live ones.
+    
+    Each appointment time is reminded exactly once: an appointment that was
+    already reminded is only scheduled again if it is moved to another time.
+    The record of a sent reminder is dropped once its appointment has
+    started, so memory only grows with the upcoming appointments.
+    
+    The scheduler is not thread-safe; use it from one event loop.
+    """
+    
+    def __init__(self, hours_before: float = 24):
+        """
+        Initialize an empty scheduler.
+        
+        Args:
+            hours_before: The number of hours before an appointment its reminder is sent
+        """
+        self.lead_time = timedelta(hours=hours_before)
+        self._heap: List[Tuple[datetime, str]] = []
+        # Reminder time, appointment time and patient ID of each pending reminder
+        self._pending: Dict[str, Tuple[datetime, datetime, str]] = {}
+        # Appointment time each sent reminder was for, and a min-heap of
+        # those times to forget them once the appointments have started
+        self._reminded: Dict[str, datetime] = {}
+        self._reminded_heap: List[Tuple[datetime, str]] = []
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def schedule(self, appointment_id: str, patient_id: str, date_time: datetime,
+                 status: AppointmentStatus = AppointmentStatus.SCHEDULED) -> bool:
+        """
+        Add or move the reminder of an appointment after it is created or changed.
+        
+        Args:
+            appointment_id: The ID of the appointment
+            patient_id: The ID of the patient to remind
+            date_time: The date and time of the appointment
+            status: The status of the appointment; closed appointments lose their reminder
+        
+        Returns:
+            Whether a reminder is now pending; closed appointments and
+            appointments already reminded for their current time get none
+        """
+        if status in CLOSED_STATUSES:
+            self.cancel(appointment_id)
+            return False
+        if self._reminded.get(appointment_id) == date_time:
+            return False
+        
+        remind_at = date_time - self.lead_time
+        entry = (remind_at, date_time, patient_id)
+        if self._pending.get(appointment_id) != entry:
+            self._pending[appointment_id] = entry
+            self._reminded.pop(appointment_id, None)
+            heapq.heappush(self._heap, (remind_at, appointment_id))
+            self._compact_if_needed()
+        return True
+    
+    def cancel(self, appointment_id: str) -> None:
+        """
+        Drop the reminder of a cancelled or deleted appointment.
+        
+        Args:
+            appointment_id: The ID of the appointment
+        """
+        self._pending.pop(appointment_id, None)
+        self._reminded.pop(appointment_id, None)
+        self._compact_if_needed()
+    
+    def next_reminder_time(self) -> Optional[datetime]:
+        """Get the time the earliest pending reminder is due, or None if none are pending."""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+    
+    def pop_due(self, now: Optional[datetime] = None) -> List[Tuple[str, str, datetime]]:
+        """
+        Remove the reminders due at or before a time.
+        Reminders of appointments that have already started are dropped.
+        
+        Args:
+            now: The current time (now if omitted)
+        
+        Returns:
+            (appointment ID, patient ID, appointment time) tuples in reminder time order
+        """
+        now = now or datetime.now()
+        self._forget_started(now)
+        due = []
+        while True:
+            self._discard_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            _, appointment_id = heapq.heappop(self._heap)
+            _, date_time, patient_id = self._pending.pop(appointment_id)
+            if date_time > now:
+                self._reminded[appointment_id] = date_time
+                heapq.heappush(self._reminded_heap, (date_time, appointment_id))
+                due.append((appointment_id, patient_id, date_time))
+    
+    def send_due_reminders(self, now: Optional[datetime] = None) -> List[Notification]:
+        """
+        Send a REMINDER notification to the patient of each due reminder.
+        
+        Args:
+            now: The current time (now if omitted)
+        
+        Returns:
+            The sent notifications
+        """
+        notifications = []
+        for appointment_id, patient_id, date_time in self.pop_due(now):
+            notification = Notification(
+                str(uuid.uuid4()), patient_id, RecipientType.PATIENT, NotificationType.REMINDER,
+                f"Reminder: you have an appointment on {date_time}", appointment_id
+            )
+            notification.send()
+            notifications.append(notification)
+        return notifications
+    
+    async def run(self, max_sleep: float = 60.0) -> None:
+        """
+        Send reminders as they fall due until cancelled.
+        
+        Args:
+            max_sleep: The maximum number of seconds to sleep before looking for due reminders again
+        """
+        while True:
+            self.send_due_reminders()
+            next_time = self.next_reminder_time()
+            delay = max_sleep
+            if next_time is not None:
+                delay = min(max_sleep, max(0.0, (next_time - datetime.now()).total_seconds()))
+            await asyncio.sleep(delay)
+    
+    def _forget_started(self, now: datetime) -> None:
+        """Drop the records of sent reminders for appointments that have started."""
+        while self._reminded_heap and self._reminded_heap[0][0] <= now:
+            date_time, appointment_id = heapq.heappop(self._reminded_heap)
+            if self._reminded.get(appointment_id) == date_time:
+                del self._reminded[appointment_id]
+    
+    def _is_stale(self, remind_at: datetime, appointment_id: str) -> bool:
+        """Check if a heap entry no longer matches the pending reminder of its appointment."""
+        entry = self._pending.get(appointment_id)
+        return entry is None or entry[0] != remind_at
+    
+    def _discard_stale(self) -> None:
+        """Pop stale entries off the front of the heap."""
+        while self._heap and self._is_stale(*self._heap[0]):
+            heapq.heappop(self._heap)
+    
+    def _compact_if_needed(self) -> None:
+        """Rebuild the heap from the pending reminders once most of its entries are stale."""
+        if len(self._heap) > 2 * len(self._pending) + 64:
+            self._heap = [(entry[0], appointment_id) for appointment_id, entry in self._pending.items()]
+            heapq.heapify(self._heap)
+
+class ReminderSubscriber:
+    """
+    Event bus subscriber adding, moving and dropping the reminder of each
+    changed appointment in a ReminderScheduler.
+    
+    The scheduler is not thread-safe, so the subscriber is a coroutine
+    function: the bus runs it on the bound event loop, the one that also
+    runs ReminderScheduler.run(), even for events published by service
+    calls on other threads.
+    """
+    
+    def __init__(self, scheduler: ReminderScheduler):
+        """
+        Initialize the subscriber.
+        
+        Args:
+            scheduler: The scheduler holding the pending reminders
+        """
+        self.scheduler = scheduler
+    
+    def subscribe(self, event_bus: EventBus) -> None:
+        """
+        Subscribe to every appointment event of a bus.
+        
+        Args:
+            event_bus: The bus appointment changes are published on
+        """
+        event_bus.subscribe(self.on_event)
+    
+    async def on_event(self, event: AppointmentEvent) -> None:
+        """
+        Update the reminder of the appointment an event is about; cancelled
+        appointments lose their reminder and created, updated and
+        rescheduled ones get one for their current time.
+        
+        Args:
+            event: The appointment event
+        """
+        self.scheduler.schedule(event.appointment_id, event.patient_id,
+                                event.date_time, event.status)
+    
+    def load(self, appointments: Iterable[Appointment], now: Optional[datetime] = None) -> int:
+        """
+        Schedule the reminders of stored appointments, such as when the
+        application starts with persistent storage. Call it on the event
+        loop running the scheduler.
+        
+        Args:
+            appointments: The stored appointments
+            now: The current time (now if omitted); appointments that have started are skipped
+        
+        Returns:
+            The number of reminders scheduled
+        """
+        now = now or datetime.now()
+        scheduled = 0
+        for appointment in appointments:
+            if appointment.date_time > now and self.scheduler.schedule(
+                    appointment.appointment_id, appointment.patient_id, appointment.date_time, appointment.status):
+                scheduled += 1
+        return scheduled
@@ -1,10 +1,12 @@
 """
 Integration tests for the appointment API endpoints.
 """
+import uuid
 import pytest
 from fastapi.testclient import TestClient
 from datetime import datetime, timedelta
-from api.main import app
+from api.main import app, event_bus
+from services.events import AppointmentEventType
 
 client = TestClient(app)
 
@@ -15,11 +17,12 @@ class TestAppointmentAPI:
     
     def setup_method(self):
         """Set up test fixtures before each test method."""
-        # Create a patient
+        # Create a patient; patients need a unique email, and every test
+        # shares the storage of the application
         patient_data = {
             "name": "Test Patient",
             "contact_info": {
-                "email": "test.patient@example.com",
+                "email": f"test.patient.{uuid.uuid4().hex}@example.com",
                 "phone": "123-456-7890",
                 "address": "123 Test St, Anytown, USA"
             }
@@ -32,7 +35,7 @@ class TestAppointmentAPI:
             "name": "Dr. Test Doctor",
             "specialization": "General Medicine",
             "contact_info": {
-                "email": "test.doctor@example.com",
+                "email": f"test.doctor.{uuid.uuid4().hex}@example.com",
                 "phone": "123-456-7890",
                 "address": "456 Test Medical Center, Anytown, USA"
             }
@@ -159,6 +162,39 @@ class TestAppointmentAPI:
         assert data["type"] == "FOLLOW_UP"
         assert data["notes"] == "Follow-up appointment"
     
+    def test_update_appointment_publishes_reschedule(self):
+        """Test that moving an appointment publishes a RESCHEDULED event from its previous time."""
+        # Create an appointment first
+        appointment_time = datetime.now() + timedelta(days=3)
+        appointment_data = {
+            "patient_id": self.patient_id,
+            "doctor_id": self.doctor_id,
+            "date_time": appointment_time.isoformat(),
+            "duration": 30,
+            "type": "REGULAR",
+            "notes": "Regular check-up"
+        }
+        create_response = client.post("/api/appointments", json=appointment_data)
+        appointment_id = create_response.json()["id"]
+        # Read it once, so the update starts from the cached appointment
+        client.get(f"/api/appointments/{appointment_id}")
+        
+        events = []
+        record = events.append
+        event_bus.subscribe(record, AppointmentEventType.RESCHEDULED)
+        try:
+            # Execute
+            new_time = datetime.now() + timedelta(days=4)
+            response = client.put(f"/api/appointments/{appointment_id}", json={"date_time": new_time.isoformat()})
+        finally:
+            event_bus.unsubscribe(record)
+        
+        # Verify
+        assert response.status_code == 200
+        assert [event.appointment_id for event in events] == [appointment_id]
+        assert events[0].previous_date_time == appointment_time
+        assert events[0].date_time == new_time
+    
     def test_cancel_appointment(self):
         """Test cancelling an appointment."""
         # Create an appointment first
@@ -230,3 +266,112 @@ class TestAppointmentAPI:
         assert isinstance(data, list)
         assert len(data) >= 1
         assert all(appointment["doctor_id"] == self.doctor_id for appointment in data)
+    
+    def test_create_appointments_batch(self):
+        """Test creating a batch of appointments with an intra-batch conflict."""
+        # Setup
+        appointment_time = datetime.now() + timedelta(days=5)
+        batch_data = {
+            "atomic": False,
+            "appointments": [
+                {
+                    "patient_id": self.patient_id,
+                    "doctor_id": self.doctor_id,
+                    "date_time": appointment_time.isoformat(),
+                    "duration": 30,
+                    "type": "REGULAR"
+                },
+                {
+                    "patient_id": self.patient_id,
+                    "doctor_id": self.doctor_id,
+                    "date_time": (appointment_time + timedelta(minutes=15)).isoformat(),
+                    "duration": 30,
+                    "type": "REGULAR"
+                },
+                {
+                    "patient_id": "non-existent-id",
+                    "doctor_id": self.doctor_id,
+                    "date_time": (appointment_time + timedelta(hours=2)).isoformat(),
+                    "duration": 30,
+                    "type": "REGULAR"
+                }
+            ]
+        }
+        
+        # Execute
+        response = client.post("/api/appointments/batch", json=batch_data)
+        
+        # Verify
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 1
+        assert data["failed"] == 2
+        assert [item["status"] for item in data["results"]] == ["CREATED", "FAILED", "FAILED"]
+        assert data["results"][0]["appointment"]["patient_id"] == self.patient_id
+        assert "already booked" in data["results"][1]["error"]
+        assert "not found" in data["results"][2]["error"]
+    
+    def test_create_appointments_batch_atomic(self):
+        """Test that an atomic batch with an invalid item creates nothing."""
+        # Setup
+        appointment_time = datetime.now() + timedelta(days=6)
+        batch_data = {
+            "appointments": [
+                {
+                    "patient_id": self.patient_id,
+                    "doctor_id": self.doctor_id,
+                    "date_time": appointment_time.isoformat(),
+                    "duration": 30,
+                    "type": "REGULAR"
+                },
+                {
+                    "patient_id": self.patient_id,
+                    "doctor_id": "non-existent-id",
+                    "date_time": (appointment_time + timedelta(hours=1)).isoformat(),
+                    "duration": 30,
+                    "type": "REGULAR"
+                }
+            ]
+        }
+        
+        # Execute
+        response = client.post("/api/appointments/batch", json=batch_data)
+        
+        # Verify
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 0
+        assert [item["status"] for item in data["results"]] == ["NOT_COMMITTED", "FAILED"]
+        # Verify nothing was stored
+        stored = client.get(f"/api/appointments/patient/{self.patient_id}")
+        assert stored.json() == []
+    
+    def test_create_appointments_batch_atomic_conflict(self):
+        """Test that an atomic batch of known patients and doctors is rejected whole on a conflict."""
+        # Setup
+        appointment_time = datetime.now() + timedelta(days=7)
+        batch_data = {
+            "appointments": [
+                {
+                    "patient_id": self.patient_id,
+                    "doctor_id": self.doctor_id,
+                    "date_time": (appointment_time + timedelta(minutes=offset)).isoformat(),
+                    "duration": 30,
+                    "type": "REGULAR"
+                }
+                for offset in (0, 15)
+            ]
+        }
+        
+        # Execute
+        response = client.post("/api/appointments/batch", json=batch_data)
+        
+        # Verify
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 0
+        assert data["failed"] == 1
+        assert [item["status"] for item in data["results"]] == ["NOT_COMMITTED", "FAILED"]
+        assert "already booked" in data["results"][1]["error"]
+        stored = client.get(f"/api/appointments/doctor/{self.doctor_id}")
+        assert stored.json() == []
@@ -1,6 +1,9 @@
 """
 Integration tests for the patient API endpoints.
 """
+import csv
+import io
+import json
 import pytest
 from fastapi.testclient import TestClient
 from api.main import app
@@ -56,6 +59,37 @@ class TestPatientAPI:
         assert isinstance(data, list)
         assert len(data) >= 1
     
+    def test_get_patients_paginated(self):
+        """Test paging through patients with the next cursor header."""
+        # Create two patients first
+        for name, email in (("Carol White", "carol.white@example.com"), ("Dan Brown", "dan.brown@example.com")):
+            client.post("/api/patients", json={
+                "name": name,
+                "contact_info": {
+                    "email": email,
+                    "phone": "123-456-7890",
+                    "address": "12 Elm St, Anytown, USA"
+                }
+            })
+        
+        # Execute
+        first_response = client.get("/api/patients", params={"limit": 1})
+        cursor = first_response.headers["X-Next-Cursor"]
+        second_response = client.get("/api/patients", params={"limit": 1, "cursor": cursor})
+        
+        # Verify
+        assert first_response.status_code == 200
+        assert second_response.status_code == 200
+        assert len(first_response.json()) == 1
+        assert len(second_response.json()) == 1
+        assert first_response.json()[0]["id"] < second_response.json()[0]["id"]
+        assert 'rel="next"' in first_response.headers["Link"]
+    
+    def test_get_patients_invalid_cursor(self):
+        """Test that an invalid cursor is rejected."""
+        response = client.get("/api/patients", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+    
     def test_get_patient(self):
         """Test getting a patient by ID."""
         # Create a patient first
@@ -170,3 +204,31 @@ class TestPatientAPI:
         assert isinstance(data, list)
         assert len(data) >= 1
         assert any(patient["name"] == "David Wilson" for patient in data)
+    
+    def test_export_patients(self):
+        """Test exporting patients as NDJSON and CSV."""
+        # Create a patient first
+        patient_data = {
+            "name": "Erin Green",
+            "contact_info": {
+                "email": "erin.green@example.com",
+                "phone": "123-456-7890",
+                "address": "404 Birch St, Anytown, USA"
+            }
+        }
+        client.post("/api/patients", json=patient_data)
+        
+        # Execute
+        ndjson_response = client.get("/api/export/patients")
+        csv_response = client.get("/api/export/patients", params={"format": "csv"})
+        
+        # Verify
+        assert ndjson_response.status_code == 200
+        assert ndjson_response.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in ndjson_response.text.splitlines()]
+        assert any(record["email"] == "erin.green@example.com" for record in records)
+        
+        assert csv_response.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(csv_response.text)))
+        assert len(rows) == len(records)
+        assert any(row["address"] == "404 Birch St, Anytown, USA" for row in rows)
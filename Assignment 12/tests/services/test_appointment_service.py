@@ -1,17 +1,30 @@
 """
 Unit tests for the appointment service.
 """
+import os
+import shutil
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import Mock, MagicMock
 from datetime import datetime, timedelta
 from src.appointment import Appointment
 from src.patient import Patient
 from src.doctor import Doctor
-from src.enums import AppointmentStatus
+from src.enums import AppointmentStatus, AppointmentType
 from repositories.appointment_repository import AppointmentRepository
 from repositories.patient_repository import PatientRepository
 from repositories.doctor_repository import DoctorRepository
+from repositories.paging import Page
+from repositories.sharedmemory.shared_appointment_table import fcntl
+from repositories.sharedmemory.sharedmemory_appointment_repository import SharedMemoryAppointmentRepository
+from src.schedule import Schedule
 from services.appointment_service import AppointmentService
+from services.availability_service import AvailabilityService
+from services.cache import TTLCache
+from services.events import AppointmentEventType, EventBus
+from services.reminders import ReminderScheduler, ReminderSubscriber
 
 class TestAppointmentService(unittest.TestCase):
     """
@@ -38,13 +51,13 @@ class TestAppointmentService(unittest.TestCase):
     def _create_sample_patient(self):
         """Create a sample patient for testing."""
         patient = MagicMock(spec=Patient)
-        patient.id = "patient-123"
+        patient.patient_id = "patient-123"
         return patient
     
     def _create_sample_doctor(self):
         """Create a sample doctor for testing."""
         doctor = MagicMock(spec=Doctor)
-        doctor.id = "doctor-123"
+        doctor.doctor_id = "doctor-123"
         return doctor
     
     def _create_sample_appointment(self):
@@ -52,22 +65,17 @@ class TestAppointmentService(unittest.TestCase):
         # Create appointment 48 hours in the future
         future_time = datetime.now() + timedelta(hours=48)
         
-        appointment = MagicMock(spec=Appointment)
-        appointment.id = "appointment-123"
-        appointment.patient = self.sample_patient
-        appointment.doctor = self.sample_doctor
-        appointment.date_time = future_time
-        appointment.duration = 30  # 30 minutes
-        appointment.status = AppointmentStatus.SCHEDULED
-        
-        return appointment
+        return Appointment(
+            "appointment-123", self.sample_patient.patient_id, self.sample_doctor.doctor_id,
+            future_time, 30, AppointmentType.REGULAR
+        )
     
     def test_create_appointment_success(self):
         """Test creating an appointment successfully."""
         # Setup
         self.patient_repository.find_by_id.return_value = self.sample_patient
         self.doctor_repository.find_by_id.return_value = self.sample_doctor
-        self.appointment_repository.find_by_doctor_id.return_value = []
+        self.appointment_repository.find_overlapping.return_value = []
         self.appointment_repository.find_by_patient_id.return_value = []
         
         # Execute
@@ -76,7 +84,11 @@ class TestAppointmentService(unittest.TestCase):
         # Verify
         self.patient_repository.find_by_id.assert_called_once_with("patient-123")
         self.doctor_repository.find_by_id.assert_called_once_with("doctor-123")
-        self.appointment_repository.find_by_doctor_id.assert_called_once_with("doctor-123")
+        self.appointment_repository.find_overlapping.assert_called_once_with(
+            "doctor-123",
+            self.sample_appointment.date_time,
+            self.sample_appointment.date_time + timedelta(minutes=30)
+        )
         self.appointment_repository.find_by_patient_id.assert_called_once_with("patient-123")
         self.appointment_repository.save.assert_called_once_with(self.sample_appointment)
         self.assertEqual(result, self.sample_appointment)
@@ -116,8 +128,8 @@ class TestAppointmentService(unittest.TestCase):
         
         # Set appointment time to the past
         past_appointment = MagicMock(spec=Appointment)
-        past_appointment.patient = self.sample_patient
-        past_appointment.doctor = self.sample_doctor
+        past_appointment.patient_id = self.sample_patient.patient_id
+        past_appointment.doctor_id = self.sample_doctor.doctor_id
         past_appointment.date_time = datetime.now() - timedelta(hours=1)
         
         # Execute and verify
@@ -135,8 +147,8 @@ class TestAppointmentService(unittest.TestCase):
         
         # Set appointment time to less than 24 hours in the future
         soon_appointment = MagicMock(spec=Appointment)
-        soon_appointment.patient = self.sample_patient
-        soon_appointment.doctor = self.sample_doctor
+        soon_appointment.patient_id = self.sample_patient.patient_id
+        soon_appointment.doctor_id = self.sample_doctor.doctor_id
         soon_appointment.date_time = datetime.now() + timedelta(hours=12)
         
         # Execute and verify
@@ -154,11 +166,12 @@ class TestAppointmentService(unittest.TestCase):
         
         # Create an existing appointment at the same time
         existing_appointment = MagicMock(spec=Appointment)
+        existing_appointment.appointment_id = "appointment-456"
         existing_appointment.date_time = self.sample_appointment.date_time
         existing_appointment.duration = 30
         existing_appointment.status = AppointmentStatus.SCHEDULED
         
-        self.appointment_repository.find_by_doctor_id.return_value = [existing_appointment]
+        self.appointment_repository.find_overlapping.return_value = [existing_appointment]
         self.appointment_repository.find_by_patient_id.return_value = []
         
         # Execute and verify
@@ -173,7 +186,7 @@ class TestAppointmentService(unittest.TestCase):
         # Setup
         self.patient_repository.find_by_id.return_value = self.sample_patient
         self.doctor_repository.find_by_id.return_value = self.sample_doctor
-        self.appointment_repository.find_by_doctor_id.return_value = []
+        self.appointment_repository.find_overlapping.return_value = []
         
         # Create three existing appointments on the same day
         appointment_date = self.sample_appointment.date_time.date()
@@ -197,6 +210,158 @@ class TestAppointmentService(unittest.TestCase):
         self.assertIn("3 appointments", str(context.exception))
         self.appointment_repository.save.assert_not_called()
     
+    def test_update_appointment_doctor_already_booked(self):
+        """Test moving an appointment onto another booking of the same doctor."""
+        # Setup
+        self.appointment_repository.find_by_id.return_value = self.sample_appointment
+        
+        existing_appointment = MagicMock(spec=Appointment)
+        existing_appointment.appointment_id = "appointment-456"
+        self.appointment_repository.find_overlapping.return_value = [existing_appointment]
+        
+        # Execute and verify
+        with self.assertRaises(ValueError) as context:
+            self.appointment_service.update_appointment(self.sample_appointment)
+        
+        self.assertIn("already booked", str(context.exception))
+        self.appointment_repository.save.assert_not_called()
+    
+    def test_update_appointment_ignores_own_booking(self):
+        """Test that an appointment does not conflict with its own time slot."""
+        # Setup
+        self.appointment_repository.find_by_id.return_value = self.sample_appointment
+        self.appointment_repository.find_overlapping.return_value = [self.sample_appointment]
+        
+        # Execute
+        result = self.appointment_service.update_appointment(self.sample_appointment)
+        
+        # Verify
+        self.appointment_repository.save.assert_called_once_with(self.sample_appointment)
+        self.assertEqual(result, self.sample_appointment)
+    
+    def _create_bulk_appointment(self, appointment_id, date_time):
+        """Create an appointment for the sample patient and doctor for bulk booking tests."""
+        return Appointment(appointment_id, self.sample_patient.patient_id, self.sample_doctor.doctor_id,
+                           date_time, 30, AppointmentType.REGULAR)
+    
+    def test_create_appointments_bulk_detects_intra_batch_conflicts(self):
+        """Test that overlapping appointments within one batch are rejected."""
+        # Setup
+        self.patient_repository.find_by_id.return_value = self.sample_patient
+        self.doctor_repository.find_by_id.return_value = self.sample_doctor
+        self.appointment_repository.find_overlapping.return_value = []
+        self.appointment_repository.find_by_patient_id.return_value = []
+        
+        start = self.sample_appointment.date_time
+        first = self._create_bulk_appointment("appointment-1", start)
+        overlapping = self._create_bulk_appointment("appointment-2", start + timedelta(minutes=10))
+        
+        # Execute
+        results = self.appointment_service.create_appointments_bulk([first, overlapping], atomic=False)
+        
+        # Verify
+        self.assertTrue(results[0].created)
+        self.assertIsNone(results[0].error)
+        self.assertFalse(results[1].created)
+        self.assertIn("already booked", results[1].error)
+        self.appointment_repository.save.assert_called_once_with(first)
+        
+        # The patient and doctor are looked up once for the whole batch
+        self.patient_repository.find_by_id.assert_called_once_with("patient-123")
+        self.doctor_repository.find_by_id.assert_called_once_with("doctor-123")
+        self.appointment_repository.find_by_patient_id.assert_called_once_with("patient-123")
+    
+    def test_create_appointments_bulk_atomic_rejects_whole_batch(self):
+        """Test that an atomic batch saves nothing when one appointment is invalid."""
+        # Setup
+        self.patient_repository.find_by_id.return_value = self.sample_patient
+        self.doctor_repository.find_by_id.return_value = self.sample_doctor
+        self.appointment_repository.find_overlapping.return_value = []
+        self.appointment_repository.find_by_patient_id.return_value = []
+        
+        valid = self._create_bulk_appointment("appointment-1", self.sample_appointment.date_time)
+        too_soon = self._create_bulk_appointment("appointment-2", datetime.now() + timedelta(hours=12))
+        
+        # Execute
+        results = self.appointment_service.create_appointments_bulk([valid, too_soon])
+        
+        # Verify
+        self.assertIsNone(results[0].error)
+        self.assertFalse(results[0].created)
+        self.assertIn("24 hours", results[1].error)
+        self.appointment_repository.save.assert_not_called()
+    
+    def test_create_appointments_bulk_atomic_rolls_back_failed_save(self):
+        """Test that an atomic batch deletes its saved appointments when a later save fails."""
+        # Setup
+        self.patient_repository.find_by_id.return_value = self.sample_patient
+        self.doctor_repository.find_by_id.return_value = self.sample_doctor
+        self.appointment_repository.find_overlapping.return_value = []
+        self.appointment_repository.find_by_patient_id.return_value = []
+        self.appointment_repository.save.side_effect = [None, None, OSError("disk full")]
+        
+        start = self.sample_appointment.date_time
+        appointments = [
+            self._create_bulk_appointment(f"appointment-{i}", start + timedelta(hours=i))
+            for i in range(3)
+        ]
+        
+        # Execute and verify
+        with self.assertRaises(OSError):
+            self.appointment_service.create_appointments_bulk(appointments)
+        self.assertEqual(
+            [call.args for call in self.appointment_repository.delete.call_args_list],
+            [("appointment-1",), ("appointment-0",)]
+        )
+    
+    def test_create_appointments_bulk_non_atomic_keeps_saved_before_failure(self):
+        """Test that a non-atomic batch keeps and announces the appointments saved before a failure."""
+        # Setup
+        self.patient_repository.find_by_id.return_value = self.sample_patient
+        self.doctor_repository.find_by_id.return_value = self.sample_doctor
+        self.appointment_repository.find_overlapping.return_value = []
+        self.appointment_repository.find_by_patient_id.return_value = []
+        self.appointment_repository.save.side_effect = [None, OSError("disk full")]
+        event_bus = EventBus()
+        events = []
+        event_bus.subscribe(events.append)
+        self.appointment_service.event_bus = event_bus
+        
+        start = self.sample_appointment.date_time
+        appointments = [
+            self._create_bulk_appointment(f"appointment-{i}", start + timedelta(hours=i))
+            for i in range(2)
+        ]
+        
+        # Execute and verify
+        with self.assertRaises(OSError):
+            self.appointment_service.create_appointments_bulk(appointments, atomic=False)
+        self.appointment_repository.delete.assert_not_called()
+        self.assertEqual([event.appointment_id for event in events], ["appointment-0"])
+    
+    def test_create_appointments_bulk_patient_daily_limit(self):
+        """Test that the daily limit counts existing and earlier batch appointments."""
+        # Setup
+        self.patient_repository.find_by_id.return_value = self.sample_patient
+        self.doctor_repository.find_by_id.return_value = self.sample_doctor
+        self.appointment_repository.find_overlapping.return_value = []
+        
+        start = self.sample_appointment.date_time.replace(hour=8, minute=0)
+        existing_appointment = self._create_bulk_appointment("appointment-0", start)
+        self.appointment_repository.find_by_patient_id.return_value = [existing_appointment]
+        
+        appointments = [
+            self._create_bulk_appointment(f"appointment-{i}", start + timedelta(hours=i))
+            for i in range(1, 4)
+        ]
+        
+        # Execute
+        results = self.appointment_service.create_appointments_bulk(appointments, atomic=False)
+        
+        # Verify
+        self.assertEqual([result.created for result in results], [True, True, False])
+        self.assertIn("3 appointments", results[2].error)
+    
     def test_get_appointment(self):
         """Test getting an appointment by ID."""
         # Setup
@@ -209,6 +374,28 @@ class TestAppointmentService(unittest.TestCase):
         self.appointment_repository.find_by_id.assert_called_once_with("appointment-123")
         self.assertEqual(result, self.sample_appointment)
     
+    def test_get_appointments_page(self):
+        """Test that page requests and filters are pushed down to the repository."""
+        # Setup
+        page = Page([self.sample_appointment], "next-cursor")
+        self.appointment_repository.find_page.return_value = page
+        start_date = datetime(2030, 1, 1)
+        
+        # Execute
+        result = self.appointment_service.get_appointments_page(
+            50, "cursor", status=AppointmentStatus.SCHEDULED, start_date=start_date
+        )
+        
+        # Verify
+        self.appointment_repository.find_page.assert_called_once_with(
+            50, "cursor", False,
+            status=AppointmentStatus.SCHEDULED,
+            appointment_type=None,
+            start_date=start_date,
+            end_date=None
+        )
+        self.assertIs(result, page)
+    
     def test_cancel_appointment_success(self):
         """Test cancelling an appointment successfully."""
         # Setup
@@ -235,6 +422,186 @@ class TestAppointmentService(unittest.TestCase):
         
         self.assertIn("6 hours", str(context.exception))
         self.appointment_repository.save.assert_not_called()
+    
+    def test_concurrent_bookings_of_one_slot(self):
+        """Test that only one of many concurrent bookings of the same slot succeeds."""
+        # Setup: a repository whose conflict check is slow enough for requests to interleave
+        saved = []
+        def find_overlapping(doctor_id, start, end):
+            conflicts = [a for a in saved if a.doctor_id == doctor_id and a.date_time < end
+                         and start < a.date_time + timedelta(minutes=a.duration)]
+            time.sleep(0.001)
+            return conflicts
+        self.appointment_repository.find_overlapping.side_effect = find_overlapping
+        self.appointment_repository.find_by_patient_id.return_value = []
+        self.appointment_repository.save.side_effect = saved.append
+        self.patient_repository.find_by_id.return_value = self.sample_patient
+        self.doctor_repository.find_by_id.return_value = self.sample_doctor
+        
+        start = self.sample_appointment.date_time
+        appointments = [self._create_bulk_appointment(f"appointment-{i}", start) for i in range(20)]
+        outcomes = []
+        def book(appointment):
+            try:
+                self.appointment_service.create_appointment(appointment)
+                outcomes.append(True)
+            except ValueError:
+                outcomes.append(False)
+        
+        # Execute
+        threads = [threading.Thread(target=book, args=(a,)) for a in appointments]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Verify
+        self.assertEqual(outcomes.count(True), 1)
+        self.assertEqual(len(saved), 1)
+        # The per-doctor and per-patient locks are dropped once unused
+        self.assertEqual(len(self.appointment_service._doctor_locks), 0)
+        self.assertEqual(len(self.appointment_service._patient_locks), 0)
+    
+    def test_cached_appointments_are_handed_out_as_copies(self):
+        """Test that updating a cached appointment compares against the unchanged stored one."""
+        # Setup
+        event_bus = EventBus()
+        events = []
+        event_bus.subscribe(events.append)
+        appointment_service = AppointmentService(
+            self.appointment_repository, self.patient_repository, self.doctor_repository,
+            event_bus, TTLCache()
+        )
+        self.appointment_repository.find_by_id.return_value = self.sample_appointment
+        self.appointment_repository.find_by_patient_id.return_value = [self.sample_appointment]
+        self.appointment_repository.find_overlapping.return_value = []
+        previous_date_time = self.sample_appointment.date_time
+        
+        # Execute: change the appointment read through the cache and save it
+        appointment = appointment_service.get_appointment("appointment-123")
+        appointment.reschedule(previous_date_time + timedelta(days=1))
+        listed = appointment_service.get_patient_appointments("patient-123")[0]
+        listed.notes = "Changed"
+        appointment_service.update_appointment(appointment)
+        
+        # Verify
+        self.assertIsNot(listed, self.sample_appointment)
+        self.assertEqual(self.sample_appointment.date_time, previous_date_time)
+        self.assertEqual([event.event_type for event in events], [AppointmentEventType.RESCHEDULED])
+        self.assertEqual(events[0].previous_date_time, previous_date_time)
+    
+    def test_lifecycle_events_published(self):
+        """Test that creating and cancelling an appointment publish events."""
+        # Setup
+        event_bus = EventBus()
+        events = []
+        event_bus.subscribe(events.append)
+        self.appointment_service.event_bus = event_bus
+        self.patient_repository.find_by_id.return_value = self.sample_patient
+        self.doctor_repository.find_by_id.return_value = self.sample_doctor
+        self.appointment_repository.find_overlapping.return_value = []
+        self.appointment_repository.find_by_patient_id.return_value = []
+        self.appointment_repository.find_by_id.return_value = self.sample_appointment
+        
+        # Execute
+        self.appointment_service.create_appointment(self.sample_appointment)
+        self.appointment_service.cancel_appointment("appointment-123")
+        
+        # Verify
+        self.assertEqual(
+            [event.event_type for event in events],
+            [AppointmentEventType.CREATED, AppointmentEventType.CANCELLED]
+        )
+        self.assertEqual(events[0].appointment_id, "appointment-123")
+        self.assertEqual(events[0].doctor_id, "doctor-123")
+        self.assertEqual(events[0].status, AppointmentStatus.SCHEDULED)
+        self.assertEqual(events[1].status, AppointmentStatus.CANCELLED)
+
+@unittest.skipIf(fcntl is None, "requires fcntl file locks")
+class TestSharedAppointmentChanges(unittest.TestCase):
+    """
+    Test cases for two worker processes' services sharing one appointment table.
+    
+    Each worker keeps its own cache, schedules and reminders; a change made
+    by one worker must reach the other's once it catches up with the table.
+    """
+    
+    def setUp(self):
+        """Set up two workers mapping the same table."""
+        self.directory = tempfile.mkdtemp()
+        file_path = os.path.join(self.directory, "appointments.shm")
+        patient = MagicMock(spec=Patient)
+        patient.patient_id = "patient-123"
+        doctor = MagicMock(spec=Doctor)
+        doctor.doctor_id = "doctor-123"
+        self.workers = [self._create_worker(file_path, patient, doctor) for _ in range(2)]
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        for worker in self.workers:
+            worker["repository"].close()
+        shutil.rmtree(self.directory)
+    
+    def _create_worker(self, file_path, patient, doctor):
+        """Create the services of one worker process, wired as in api.main."""
+        repository = SharedMemoryAppointmentRepository(file_path, capacity=4)
+        patient_repository = Mock(spec=PatientRepository)
+        patient_repository.find_by_id.return_value = patient
+        doctor_repository = Mock(spec=DoctorRepository)
+        doctor_repository.find_by_id.return_value = doctor
+        event_bus = EventBus()
+        events = []
+        event_bus.subscribe(events.append)
+        service = AppointmentService(repository, patient_repository, doctor_repository, event_bus, TTLCache())
+        availability_service = AvailabilityService(doctor_repository)
+        availability_service.register_schedule(Schedule("schedule-123", "doctor-123"))
+        event_bus.subscribe(availability_service.on_appointment_event)
+        reminder_scheduler = ReminderScheduler(hours_before=24)
+        ReminderSubscriber(reminder_scheduler).subscribe(event_bus)
+        repository.add_change_listener(service.apply_remote_change)
+        return {
+            "repository": repository, "service": service, "events": events,
+            "availability": availability_service, "reminders": reminder_scheduler
+        }
+    
+    def test_changes_reach_the_other_worker(self):
+        """Test that the other worker's cache, schedule and reminders follow created, moved and cancelled appointments."""
+        # Setup: the second worker caches the doctor's empty appointment list
+        writer, reader = self.workers
+        self.assertEqual(reader["service"].get_doctor_appointments("doctor-123"), [])
+        date_time = (datetime.now() + timedelta(days=3)).replace(second=0, microsecond=0)
+        appointment = Appointment("appointment-1", "patient-123", "doctor-123", date_time, 30,
+                                  AppointmentType.REGULAR)
+        
+        # Execute and verify: a booking
+        writer["service"].create_appointment(appointment)
+        reader["repository"].refresh()
+        self.assertEqual([a.appointment_id for a in reader["service"].get_doctor_appointments("doctor-123")],
+                         ["appointment-1"])
+        self.assertIn("appointment-1", reader["availability"]._booked)
+        self.assertEqual(reader["reminders"].next_reminder_time(), date_time - timedelta(hours=24))
+        
+        # A reschedule, after the reader cached the appointment
+        reader["service"].get_appointment("appointment-1")
+        moved = writer["service"].get_appointment("appointment-1")
+        moved.reschedule(date_time + timedelta(days=1))
+        writer["service"].update_appointment(moved)
+        reader["repository"].refresh()
+        self.assertEqual(reader["service"].get_appointment("appointment-1").date_time, date_time + timedelta(days=1))
+        self.assertEqual(reader["availability"]._booked["appointment-1"][1].start_time, date_time + timedelta(days=1))
+        self.assertEqual(reader["reminders"].next_reminder_time(), date_time)
+        
+        # A cancellation
+        writer["service"].cancel_appointment("appointment-1")
+        reader["repository"].refresh()
+        self.assertEqual(reader["service"].get_appointment("appointment-1").status, AppointmentStatus.CANCELLED)
+        self.assertNotIn("appointment-1", reader["availability"]._booked)
+        self.assertEqual(len(reader["reminders"]), 0)
+        
+        # Each worker published every change once, its own and the other's
+        expected = [AppointmentEventType.CREATED, AppointmentEventType.RESCHEDULED, AppointmentEventType.CANCELLED]
+        self.assertEqual([event.event_type for event in reader["events"]], expected)
+        self.assertEqual([event.event_type for event in writer["events"]], expected)
 
 if __name__ == "__main__":
     unittest.main()
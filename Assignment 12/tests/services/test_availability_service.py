@@ -0,0 +1,138 @@
+"""
+Unit tests for the availability service.
+"""
+import unittest
+from unittest.mock import Mock, MagicMock
+from datetime import datetime, timedelta
+from src.doctor import Doctor
+from src.enums import AppointmentStatus
+from src.schedule import DayOfWeek, Schedule, TimeRange
+from src.time_slot import TimeSlot
+from repositories.doctor_repository import DoctorRepository
+from services.availability_service import AvailabilityService
+from services.events import AppointmentEvent, AppointmentEventType, EventBus
+
+class TestAvailabilityService(unittest.TestCase):
+    """
+    Test cases for the availability service.
+    """
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.doctor_repository = Mock(spec=DoctorRepository)
+        self.availability_service = AvailabilityService(self.doctor_repository)
+        
+        # Monday 2030-01-07, 8:00
+        self.start = datetime(2030, 1, 7, 8, 0)
+        self.doctors = [
+            self._create_doctor("doctor-1", "Cardiology"),
+            self._create_doctor("doctor-2", "Cardiology"),
+            self._create_doctor("doctor-3", "Surgery")
+        ]
+        for doctor in self.doctors:
+            schedule = Schedule(f"schedule-{doctor.doctor_id}", doctor.doctor_id)
+            for day in (DayOfWeek.MONDAY, DayOfWeek.TUESDAY):
+                schedule.working_hours[day] = TimeRange(
+                    self.start.replace(hour=9), self.start.replace(hour=17)
+                )
+            self.availability_service.register_schedule(schedule)
+    
+    def _create_doctor(self, doctor_id, department):
+        """Create a sample cardiologist for testing."""
+        doctor = MagicMock(spec=Doctor)
+        doctor.doctor_id = doctor_id
+        doctor.specialization = "Cardiology"
+        doctor.department = department
+        return doctor
+    
+    def _block(self, doctor_id, start, end):
+        """Block time in the schedule of a doctor."""
+        schedule = self.availability_service.get_schedule(doctor_id)
+        schedule.add_blocked_time(TimeSlot(f"block-{doctor_id}-{start}", start, end))
+    
+    def test_find_earliest_slots_across_doctors(self):
+        """Test that the earliest free slot of each doctor is returned in order."""
+        # Setup
+        self.doctor_repository.find_by_specialization.return_value = self.doctors
+        self._block("doctor-1", self.start.replace(hour=9), self.start.replace(hour=9, minute=20))
+        self._block("doctor-2", self.start.replace(hour=9), self.start.replace(hour=10))
+        self._block("doctor-2", self.start.replace(hour=10, minute=20), self.start.replace(hour=17))
+        self._block("doctor-3", self.start.replace(hour=9), self.start.replace(hour=17))
+        
+        # Execute
+        candidates = self.availability_service.find_earliest_slots(
+            30, self.start, self.start + timedelta(days=14), specialization="Cardiology"
+        )
+        
+        # Verify
+        self.doctor_repository.find_by_specialization.assert_called_once_with("Cardiology")
+        self.assertEqual(
+            [(c.doctor.doctor_id, c.start_time) for c in candidates],
+            [
+                ("doctor-1", self.start.replace(hour=9, minute=20)),
+                ("doctor-2", self.start + timedelta(days=1, hours=1)),
+                ("doctor-3", self.start + timedelta(days=1, hours=1))
+            ]
+        )
+        self.assertEqual(candidates[0].end_time, self.start.replace(hour=9, minute=50))
+    
+    def test_find_earliest_slots_filters_and_limits(self):
+        """Test filtering by department and limiting the number of candidates."""
+        # Setup
+        self.doctor_repository.find_all.return_value = self.doctors
+        
+        # Execute
+        candidates = self.availability_service.find_earliest_slots(
+            30, self.start.replace(hour=16, minute=31), self.start + timedelta(days=14),
+            department="Cardiology", limit=1
+        )
+        
+        # Verify that the slot starting after 16:30 does not fit before 17:00
+        self.assertEqual(len(candidates), 1)
+        self.assertEqual(candidates[0].doctor.doctor_id, "doctor-1")
+        self.assertEqual(candidates[0].start_time, self.start + timedelta(days=1, hours=1))
+    
+    def test_find_earliest_slots_none_free(self):
+        """Test that no candidates are returned when nobody is free in the window."""
+        # Setup
+        self.doctor_repository.find_all.return_value = self.doctors
+        
+        # Execute and verify
+        self.assertEqual(self.availability_service.find_earliest_slots(
+            30, self.start + timedelta(days=2), self.start + timedelta(days=6)
+        ), [])
+        with self.assertRaises(ValueError):
+            self.availability_service.find_earliest_slots(0, self.start, self.start)
+    
+    def test_appointment_events_book_and_release_minutes(self):
+        """Test that created, rescheduled and cancelled appointments update the searched schedules."""
+        # Setup
+        self.doctor_repository.find_all.return_value = self.doctors[:1]
+        event_bus = EventBus()
+        event_bus.subscribe(self.availability_service.on_appointment_event)
+        nine = self.start.replace(hour=9)
+        def publish(event_type, date_time, status=AppointmentStatus.SCHEDULED):
+            event_bus.publish(AppointmentEvent(
+                event_type, "appointment-1", "patient-1", "doctor-1", date_time, 30, status
+            ))
+        def earliest():
+            return self.availability_service.find_earliest_slots(30, self.start, self.start + timedelta(days=1))[0].start_time
+        
+        # Execute and verify
+        publish(AppointmentEventType.CREATED, nine)
+        self.assertEqual(earliest(), nine + timedelta(minutes=30))
+        
+        publish(AppointmentEventType.RESCHEDULED, nine + timedelta(minutes=30))
+        self.assertEqual(earliest(), nine)
+        self.assertFalse(self.availability_service.get_schedule("doctor-1").is_range_available(
+            nine + timedelta(minutes=30), nine + timedelta(minutes=60)
+        ))
+        
+        publish(AppointmentEventType.CANCELLED, nine + timedelta(minutes=30), AppointmentStatus.CANCELLED)
+        self.assertTrue(self.availability_service.get_schedule("doctor-1").is_range_available(
+            nine, self.start.replace(hour=17)
+        ))
+        self.assertEqual(len(event_bus.errors), 0)
+
+if __name__ == "__main__":
+    unittest.main()
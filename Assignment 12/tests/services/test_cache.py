@@ -0,0 +1,73 @@
+"""
+Unit tests for the service cache.
+"""
+import unittest
+from services.cache import TTLCache
+
+class FakeClock:
+    """Clock that only moves when told to."""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+class TestTTLCache(unittest.TestCase):
+    """
+    Test cases for the LRU cache with time-to-live.
+    """
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.cache = TTLCache(max_size=2, ttl=10, clock=self.clock)
+    
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the entry unused for longest is evicted beyond the size limit."""
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.cache.put("c", 3)
+        
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.get("c"), 3)
+        self.assertEqual(self.cache.stats.evictions, 1)
+        self.assertEqual(self.cache.stats.hits, 3)
+        self.assertEqual(self.cache.stats.misses, 1)
+        self.assertEqual(self.cache.stats.hit_rate(), 0.75)
+    
+    def test_entries_expire(self):
+        """Test that entries are reloaded after their time-to-live."""
+        loads = []
+        def load():
+            loads.append(1)
+            return len(loads)
+        
+        self.assertEqual(self.cache.get_or_load("a", load), 1)
+        self.clock.now = 9.9
+        self.assertEqual(self.cache.get_or_load("a", load), 1)
+        self.clock.now = 10.0
+        self.assertEqual(self.cache.get_or_load("a", load), 2)
+        self.assertEqual(self.cache.stats.expirations, 1)
+    
+    def test_value_loaded_across_an_invalidation_is_not_stored(self):
+        """Test that a read racing a write cannot cache the value from before the write."""
+        def load_while_written():
+            self.cache.invalidate("a")
+            return "old"
+        
+        self.assertEqual(self.cache.get_or_load("a", load_while_written), "old")
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual(self.cache.get_or_load("a", lambda: "new"), "new")
+        self.assertEqual(self.cache.get("a"), "new")
+    
+    def test_none_is_not_cached(self):
+        """Test that missing values are looked up again."""
+        self.assertIsNone(self.cache.get_or_load("a", lambda: None))
+        self.assertEqual(self.cache.get_or_load("a", lambda: 1), 1)
+        self.assertEqual(len(self.cache), 1)
+
+if __name__ == "__main__":
+    unittest.main()
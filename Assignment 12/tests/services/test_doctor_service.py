@@ -7,6 +7,7 @@ from src.doctor import Doctor
 from src.contact_info import ContactInfo
 from src.schedule import Schedule
 from repositories.doctor_repository import DoctorRepository
+from services.cache import TTLCache
 from services.doctor_service import DoctorService
 
 class TestDoctorService(unittest.TestCase):
@@ -28,7 +29,7 @@ class TestDoctorService(unittest.TestCase):
         schedule = MagicMock(spec=Schedule)
         
         doctor = MagicMock(spec=Doctor)
-        doctor.id = "doctor-123"
+        doctor.doctor_id = "doctor-123"
         doctor.name = "Dr. Jane Smith"
         doctor.specialization = "Cardiology"
         doctor.contact_info = contact_info
@@ -135,6 +136,22 @@ class TestDoctorService(unittest.TestCase):
         self.assertIn("not found", str(context.exception))
         self.doctor_repository.delete.assert_not_called()
     
+    def test_cached_doctor_is_handed_out_as_copy(self):
+        """Test that changing a doctor read through the cache does not change the cached doctor."""
+        # Setup
+        doctor_service = DoctorService(self.doctor_repository, TTLCache())
+        self.doctor_repository.find_by_id.return_value = self.sample_doctor
+        
+        # Execute
+        first = doctor_service.get_doctor("doctor-123")
+        first.name = "Dr. Changed"
+        second = doctor_service.get_doctor("doctor-123")
+        
+        # Verify
+        self.assertEqual(doctor_service.cache.stats.hits, 1)
+        self.assertEqual(second.name, "Dr. Jane Smith")
+        self.assertEqual(self.sample_doctor.name, "Dr. Jane Smith")
+    
     def test_find_doctors_by_specialization(self):
         """Test finding doctors by specialization."""
         # Setup
@@ -158,7 +175,7 @@ class TestDoctorService(unittest.TestCase):
         result = self.doctor_service.find_doctors_by_name("Smith")
         
         # Verify
-        self.doctor_repository.find_by_name.assert_called_once_with("Smith")
+        self.doctor_repository.find_by_name.assert_called_once_with("Smith", None)
         self.assertEqual(result, doctors)
 
 if __name__ == "__main__":
@@ -0,0 +1,189 @@
+"""
+Unit tests for the domain event bus.
+"""
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from src.enums import AppointmentStatus
+from services.events import AppointmentEvent, AppointmentEventType, EventBus, EventOutbox
+
+class TestEventBus(unittest.TestCase):
+    """
+    Test cases for the event bus and its outbox.
+    """
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.event_bus = EventBus()
+        self.event = self._create_event(AppointmentEventType.CREATED)
+    
+    def _create_event(self, event_type):
+        """Create a sample event for testing."""
+        return AppointmentEvent(
+            event_type, "appointment-123", "patient-123", "doctor-123",
+            datetime(2030, 1, 1, 9, 0), 30, AppointmentStatus.SCHEDULED
+        )
+    
+    def test_publish_to_sync_subscribers(self):
+        """Test that sync subscribers receive the events they subscribed to."""
+        # Setup
+        all_events = []
+        cancellations = []
+        self.event_bus.subscribe(all_events.append)
+        self.event_bus.subscribe(cancellations.append, AppointmentEventType.CANCELLED)
+        cancelled = self._create_event(AppointmentEventType.CANCELLED)
+        
+        # Execute
+        self.event_bus.publish(self.event)
+        self.event_bus.publish(cancelled)
+        
+        # Assert
+        self.assertEqual(all_events, [self.event, cancelled])
+        self.assertEqual(cancellations, [cancelled])
+    
+    def test_failing_subscriber_does_not_stop_others(self):
+        """Test that an exception in one subscriber is collected and the others still run."""
+        # Setup
+        received = []
+        def failing_subscriber(event):
+            raise RuntimeError("boom")
+        self.event_bus.subscribe(failing_subscriber)
+        self.event_bus.subscribe(received.append)
+        
+        # Execute
+        self.event_bus.publish(self.event)
+        
+        # Assert
+        self.assertEqual(received, [self.event])
+        self.assertEqual(len(self.event_bus.errors), 1)
+        self.assertIsInstance(self.event_bus.errors[0][1], RuntimeError)
+    
+    def test_publish_to_async_subscribers(self):
+        """Test that async subscribers run as tasks on the running loop."""
+        # Setup
+        received = []
+        async def async_subscriber(event):
+            await asyncio.sleep(0)
+            received.append(event)
+        self.event_bus.subscribe(async_subscriber)
+        
+        async def publish_and_drain():
+            self.event_bus.publish(self.event)
+            self.assertEqual(received, [])
+            await self.event_bus.drain()
+        
+        # Execute
+        asyncio.run(publish_and_drain())
+        
+        # Assert
+        self.assertEqual(received, [self.event])
+    
+    def test_publish_from_another_thread(self):
+        """Test that async subscribers of events published off the loop run on the bound loop."""
+        # Setup
+        received = []
+        async def async_subscriber(event):
+            received.append(asyncio.get_running_loop())
+        self.event_bus.subscribe(async_subscriber)
+        
+        async def publish_from_thread():
+            loop = asyncio.get_running_loop()
+            self.event_bus.bind_loop(loop)
+            await loop.run_in_executor(None, self.event_bus.publish, self.event)
+            await asyncio.sleep(0)
+            await self.event_bus.drain()
+            return loop
+        
+        # Execute
+        loop = asyncio.run(publish_from_thread())
+        
+        # Assert
+        self.assertEqual(received, [loop])
+    
+    def test_outbox_replays_undelivered_events(self):
+        """Test that events left undelivered in the outbox are published again."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "events.db")
+            
+            # Record an event without delivering it, as after a crash
+            outbox = EventOutbox(path)
+            outbox.append(self.event)
+            outbox.close()
+            
+            # Replay it on a new bus over the same outbox
+            received = []
+            event_bus = EventBus(EventOutbox(path))
+            event_bus.subscribe(received.append)
+            self.assertEqual(event_bus.replay_pending(), 1)
+            
+            self.assertEqual([e.event_id for e in received], [self.event.event_id])
+            self.assertEqual(received[0].to_dict(), self.event.to_dict())
+            self.assertEqual(event_bus.outbox.pending(), [])
+            event_bus.outbox.close()
+    
+    def test_failed_events_stay_in_outbox(self):
+        """Test that an event a sync or async subscriber failed on is not marked delivered."""
+        def failing_subscriber(event):
+            raise RuntimeError("boom")
+        async def failing_async_subscriber(event):
+            raise RuntimeError("boom")
+        
+        for subscriber in (failing_subscriber, failing_async_subscriber):
+            with self.subTest(subscriber=subscriber.__name__), tempfile.TemporaryDirectory() as directory:
+                # Setup
+                event_bus = EventBus(EventOutbox(os.path.join(directory, "events.db")))
+                event_bus.subscribe(subscriber)
+                
+                async def publish_and_drain():
+                    event_bus.publish(self.event)
+                    await event_bus.drain()
+                
+                # Execute
+                asyncio.run(publish_and_drain())
+                
+                # Assert
+                self.assertEqual(len(event_bus.errors), 1)
+                self.assertEqual([e.event_id for e in event_bus.outbox.pending()], [self.event.event_id])
+                event_bus.outbox.close()
+    
+    def test_unrecorded_events_skip_the_outbox(self):
+        """Test that an event published without recording it reaches the subscribers but not the outbox."""
+        def failing_subscriber(event):
+            raise RuntimeError("boom")
+        
+        with tempfile.TemporaryDirectory() as directory:
+            # Setup
+            received = []
+            event_bus = EventBus(EventOutbox(os.path.join(directory, "events.db")))
+            event_bus.subscribe(received.append)
+            event_bus.subscribe(failing_subscriber)
+            
+            # Execute
+            event_bus.publish(self.event, record=False)
+            
+            # Assert: even a failed delivery leaves nothing to replay
+            self.assertEqual(received, [self.event])
+            self.assertEqual(len(event_bus.errors), 1)
+            self.assertEqual(event_bus.outbox.pending(), [])
+            event_bus.outbox.close()
+    
+    def test_errors_are_bounded(self):
+        """Test that only the latest subscriber exceptions are kept."""
+        # Setup
+        event_bus = EventBus(max_errors=3)
+        def failing_subscriber(event):
+            raise RuntimeError(event.event_id)
+        event_bus.subscribe(failing_subscriber)
+        events = [self._create_event(AppointmentEventType.UPDATED) for _ in range(5)]
+        
+        # Execute
+        for event in events:
+            event_bus.publish(event)
+        
+        # Assert
+        self.assertEqual([event for event, _ in event_bus.errors], events[2:])
+
+if __name__ == "__main__":
+    unittest.main()
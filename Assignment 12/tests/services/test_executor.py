@@ -0,0 +1,58 @@
+"""
+Unit tests for the service executor.
+"""
+import asyncio
+import threading
+import unittest
+from services.executor import ServiceBusyError, ServiceExecutor
+
+class TestServiceExecutor(unittest.TestCase):
+    """
+    Test cases for the bounded thread pool bridge.
+    """
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.executor = ServiceExecutor(max_workers=1, max_queued=0, queue_timeout=0.05)
+    
+    def tearDown(self):
+        """Stop the thread pool."""
+        self.executor.shutdown()
+    
+    def test_run_off_the_event_loop(self):
+        """Test that calls run on a pool thread and return their result."""
+        async def run():
+            return await self.executor.run(lambda x, y=0: (x + y, threading.get_ident()), 1, y=2)
+        
+        # Execute
+        result, thread_id = asyncio.run(run())
+        
+        # Assert
+        self.assertEqual(result, 3)
+        self.assertNotEqual(thread_id, threading.get_ident())
+        self.assertEqual(self.executor.stats()["completed"], 1)
+    
+    def test_full_pool_rejects_calls(self):
+        """Test that a call waiting too long for a place fails, and later calls succeed."""
+        # Setup
+        release = threading.Event()
+        
+        async def run():
+            blocked = asyncio.ensure_future(self.executor.run(release.wait))
+            await asyncio.sleep(0.01)
+            with self.assertRaises(ServiceBusyError):
+                await self.executor.run(lambda: None)
+            release.set()
+            await blocked
+            return await self.executor.run(lambda: "done")
+        
+        # Execute
+        result = asyncio.run(run())
+        
+        # Assert
+        self.assertEqual(result, "done")
+        self.assertEqual(self.executor.stats()["rejected"], 1)
+        self.assertEqual(self.executor.stats()["in_flight"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
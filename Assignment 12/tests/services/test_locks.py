@@ -0,0 +1,140 @@
+"""
+Unit tests for the per-key locks.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from services.locks import KeyedLocks, LeaderLock, fcntl
+
+class TestKeyedLocks(unittest.TestCase):
+    """
+    Test cases for the reference-counted lock table.
+    """
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.locks = KeyedLocks()
+    
+    def test_same_key_is_exclusive(self):
+        """Test that threads holding the same key run one at a time."""
+        # Setup
+        inside = []
+        overlaps = []
+        def work():
+            for _ in range(200):
+                with self.locks.hold("doctor-1"):
+                    inside.append(1)
+                    if len(inside) > 1:
+                        overlaps.append(1)
+                    inside.pop()
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        
+        # Execute
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        # Assert
+        self.assertEqual(overlaps, [])
+        self.assertEqual(len(self.locks), 0)
+    
+    def test_different_keys_do_not_wait(self):
+        """Test that holding one key does not block another."""
+        # Setup
+        acquired = threading.Event()
+        def hold_other():
+            with self.locks.hold("doctor-2"):
+                acquired.set()
+        
+        # Execute
+        with self.locks.hold("doctor-1"):
+            thread = threading.Thread(target=hold_other)
+            thread.start()
+            # Assert
+            self.assertTrue(acquired.wait(timeout=1))
+            thread.join()
+    
+    def test_unused_locks_are_dropped(self):
+        """Test that the table only holds the keys in use."""
+        # Execute
+        for i in range(1000):
+            with self.locks.hold(f"doctor-{i}"):
+                self.assertEqual(len(self.locks), 1)
+        
+        # Assert
+        self.assertEqual(len(self.locks), 0)
+        
+        # A failing block still lets go of its lock
+        with self.assertRaises(RuntimeError):
+            with self.locks.hold("doctor-1"):
+                raise RuntimeError("boom")
+        self.assertEqual(len(self.locks), 0)
+
+@unittest.skipIf(fcntl is None, "requires fcntl file locks")
+class TestLeaderLock(unittest.TestCase):
+    """
+    Test cases for electing one leader among processes.
+    """
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.lock_path = os.path.join(self.temp_dir.name, "reminders.lock")
+    
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+    
+    def test_one_leader_at_a_time(self):
+        """Test that a second lock on the same file waits until the leader lets go."""
+        # Setup
+        leader = LeaderLock(self.lock_path)
+        follower = LeaderLock(self.lock_path)
+        
+        # Execute and assert
+        self.assertTrue(leader.acquire())
+        self.assertTrue(leader.acquire())
+        self.assertFalse(follower.acquire())
+        self.assertFalse(follower.is_leader)
+        
+        leader.release()
+        self.assertTrue(follower.acquire())
+        self.assertTrue(follower.is_leader)
+        self.assertFalse(leader.acquire())
+        follower.release()
+    
+    def test_leader_in_another_process(self):
+        """Test that the lock held by another process is taken over once that process exits."""
+        # Setup: a process that holds the lock until its input is closed
+        script = (
+            "import sys\n"
+            "from services.locks import LeaderLock\n"
+            f"lock = LeaderLock({self.lock_path!r})\n"
+            "print(lock.acquire(), flush=True)\n"
+            "sys.stdin.read()\n"
+        )
+        process = subprocess.Popen(
+            [sys.executable, "-c", script], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            text=True, cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        )
+        lock = LeaderLock(self.lock_path)
+        try:
+            self.assertEqual(process.stdout.readline().strip(), "True")
+            
+            # Execute and assert
+            self.assertFalse(lock.acquire())
+            process.stdin.close()
+            process.wait(timeout=10)
+            self.assertTrue(lock.acquire())
+        finally:
+            lock.release()
+            if process.poll() is None:
+                process.kill()
+            process.stdout.close()
+
+if __name__ == "__main__":
+    unittest.main()
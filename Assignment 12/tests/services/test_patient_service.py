@@ -6,7 +6,9 @@ from unittest.mock import Mock, MagicMock
 from src.patient import Patient
 from src.contact_info import ContactInfo
 from repositories.patient_repository import PatientRepository
+from repositories.paging import Page
 from services.patient_service import PatientService
+from services.cache import TTLCache
 
 class TestPatientService(unittest.TestCase):
     """
@@ -27,7 +29,7 @@ class TestPatientService(unittest.TestCase):
         contact_info.email = "john.doe@example.com"
         
         patient = MagicMock(spec=Patient)
-        patient.id = "patient-123"
+        patient.patient_id = "patient-123"
         patient.name = "John Doe"
         patient.contact_info = contact_info
         
@@ -83,19 +85,49 @@ class TestPatientService(unittest.TestCase):
         self.patient_repository.find_all.assert_called_once()
         self.assertEqual(result, patients)
     
+    def test_get_patients_page(self):
+        """Test getting one page of patients."""
+        # Setup
+        page = Page([self.sample_patient])
+        self.patient_repository.find_page.return_value = page
+        
+        # Execute
+        result = self.patient_service.get_patients_page(20, descending=True)
+        
+        # Verify
+        self.patient_repository.find_page.assert_called_once_with(20, None, True)
+        self.assertIs(result, page)
+    
     def test_update_patient_success(self):
         """Test updating a patient successfully."""
         # Setup
         self.patient_repository.find_by_id.return_value = self.sample_patient
+        self.patient_repository.find_by_email.return_value = self.sample_patient
         
         # Execute
         result = self.patient_service.update_patient(self.sample_patient)
         
         # Verify
         self.patient_repository.find_by_id.assert_called_once_with("patient-123")
+        self.patient_repository.find_by_email.assert_called_once_with("john.doe@example.com")
         self.patient_repository.save.assert_called_once_with(self.sample_patient)
         self.assertEqual(result, self.sample_patient)
     
+    def test_update_patient_duplicate_email(self):
+        """Test updating a patient to an email used by another patient."""
+        # Setup
+        other_patient = MagicMock(spec=Patient)
+        other_patient.patient_id = "patient-456"
+        self.patient_repository.find_by_id.return_value = self.sample_patient
+        self.patient_repository.find_by_email.return_value = other_patient
+        
+        # Execute and verify
+        with self.assertRaises(ValueError) as context:
+            self.patient_service.update_patient(self.sample_patient)
+        
+        self.assertIn("already exists", str(context.exception))
+        self.patient_repository.save.assert_not_called()
+    
     def test_update_patient_not_found(self):
         """Test updating a non-existent patient."""
         # Setup
@@ -132,6 +164,27 @@ class TestPatientService(unittest.TestCase):
         self.assertIn("not found", str(context.exception))
         self.patient_repository.delete.assert_not_called()
     
+    def test_cached_reads_are_invalidated_by_writes(self):
+        """Test that patients are read once through the cache until they are updated."""
+        # Setup
+        patient_service = PatientService(self.patient_repository, TTLCache())
+        self.patient_repository.find_by_id.return_value = self.sample_patient
+        self.patient_repository.find_by_email.return_value = self.sample_patient
+        
+        # Execute
+        first = patient_service.get_patient("patient-123")
+        second = patient_service.get_patient("patient-123")
+        patient_service.update_patient(self.sample_patient)
+        patient_service.get_patient("patient-123")
+        
+        # Verify that each read gets its own copy of the cached patient
+        self.assertIsNot(first, second)
+        self.assertIsNot(first, self.sample_patient)
+        self.assertEqual(patient_service.cache.stats.hits, 1)
+        self.assertEqual(patient_service.cache.stats.invalidations, 1)
+        # Two cached reads, the update's own check and one read after the update
+        self.assertEqual(self.patient_repository.find_by_id.call_count, 3)
+    
     def test_find_patients_by_name(self):
         """Test finding patients by name."""
         # Setup
@@ -142,8 +195,25 @@ class TestPatientService(unittest.TestCase):
         result = self.patient_service.find_patients_by_name("John")
         
         # Verify
-        self.patient_repository.find_by_name.assert_called_once_with("John")
+        self.patient_repository.find_by_name.assert_called_once_with("John", None)
         self.assertEqual(result, patients)
+    
+    def test_etags(self):
+        """Test that entity tags combine the storage epoch with versions and change counts."""
+        # Setup
+        self.patient_repository.storage_epoch.return_value = "abc"
+        self.patient_repository.change_count.return_value = 7
+        self.sample_patient.version = 2
+        
+        # Execute and verify
+        self.assertEqual(self.patient_service.get_patient_etag(self.sample_patient), "abc.2")
+        self.assertEqual(self.patient_service.get_patients_etag(), "abc.7")
+        
+        # Unsaved patients and repositories without versions have no tag
+        self.sample_patient.version = 0
+        self.assertIsNone(self.patient_service.get_patient_etag(self.sample_patient))
+        self.patient_repository.storage_epoch.return_value = None
+        self.assertIsNone(self.patient_service.get_patients_etag())
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,172 @@
+"""
+Unit tests for the reminder scheduler and subscriber.
+"""
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+from datetime import datetime, timedelta
+from src.appointment import Appointment
+from src.enums import AppointmentStatus, NotificationStatus, NotificationType
+from services.events import AppointmentEvent, AppointmentEventType, EventBus
+from services.reminders import ReminderScheduler, ReminderSubscriber
+
+class TestReminderScheduler(unittest.TestCase):
+    """
+    Test cases for the heap of pending reminders.
+    """
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.now = datetime(2030, 1, 7, 9, 0)
+        self.scheduler = ReminderScheduler(hours_before=24)
+    
+    def _schedule(self, appointment_id, hours_from_now, status=AppointmentStatus.SCHEDULED):
+        """Schedule the reminder of an appointment starting a number of hours from now."""
+        return self.scheduler.schedule(appointment_id, f"patient-{appointment_id}",
+                                       self.now + timedelta(hours=hours_from_now), status)
+    
+    def _due_ids(self, hours_from_now):
+        """Pop the reminders due a number of hours from now and get their appointment IDs."""
+        return [appointment_id for appointment_id, _, _ in
+                self.scheduler.pop_due(self.now + timedelta(hours=hours_from_now))]
+    
+    def test_reminders_are_due_in_time_order(self):
+        """Test that reminders fall due lead_time before their appointments, earliest first."""
+        # Setup
+        for appointment_id, hours in (("a3", 30), ("a1", 25), ("a2", 28)):
+            self.assertTrue(self._schedule(appointment_id, hours))
+        
+        # Assert
+        self.assertEqual(self.scheduler.next_reminder_time(), self.now + timedelta(hours=1))
+        self.assertEqual(self._due_ids(0), [])
+        self.assertEqual(self._due_ids(4), ["a1", "a2"])
+        self.assertEqual(self._due_ids(10), ["a3"])
+        self.assertEqual(len(self.scheduler), 0)
+        self.assertIsNone(self.scheduler.next_reminder_time())
+    
+    def test_cancelled_and_moved_reminders(self):
+        """Test that cancelling drops a reminder and rescheduling moves it."""
+        # Setup
+        self._schedule("a1", 25)
+        self._schedule("a2", 26)
+        self._schedule("a3", 27)
+        
+        # Execute
+        self.scheduler.cancel("a1")
+        self.assertFalse(self._schedule("a2", 26, AppointmentStatus.CANCELLED))
+        self._schedule("a3", 48)
+        
+        # Assert
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertEqual(self._due_ids(10), [])
+        self.assertEqual(self._due_ids(24), ["a3"])
+    
+    def test_appointment_time_is_reminded_once(self):
+        """Test that an appointment is only reminded again after moving, and forgotten once started."""
+        # Setup
+        self._schedule("a1", 25)
+        self.assertEqual(self._due_ids(2), ["a1"])
+        
+        # Execute and assert: a later update at the same time gets no new reminder
+        self.assertFalse(self._schedule("a1", 25))
+        self.assertEqual(self._due_ids(3), [])
+        
+        self._due_ids(25)
+        self.assertEqual(self.scheduler._reminded, {})
+        self.assertEqual(self.scheduler._reminded_heap, [])
+    
+    def test_send_due_reminders(self):
+        """Test that due reminders are sent as REMINDER notifications to the patients."""
+        # Setup
+        self._schedule("a1", 25)
+        
+        # Execute
+        notifications = self.scheduler.send_due_reminders(self.now + timedelta(hours=2))
+        
+        # Assert
+        self.assertEqual(len(notifications), 1)
+        self.assertEqual(notifications[0].recipient_id, "patient-a1")
+        self.assertEqual(notifications[0].appointment_id, "a1")
+        self.assertEqual(notifications[0].type, NotificationType.REMINDER)
+        self.assertEqual(notifications[0].status, NotificationStatus.SENT)
+
+class TestReminderSubscriber(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for keeping reminders in step with appointment events.
+    """
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.event_bus = EventBus()
+        self.scheduler = ReminderScheduler(hours_before=24)
+        self.subscriber = ReminderSubscriber(self.scheduler)
+        self.subscriber.subscribe(self.event_bus)
+        self.date_time = datetime.now() + timedelta(days=3)
+    
+    def _create_event(self, event_type, date_time, status=AppointmentStatus.SCHEDULED, previous_date_time=None):
+        """Create a sample event for testing."""
+        return AppointmentEvent(
+            event_type, "appointment-123", "patient-123", "doctor-123",
+            date_time, 30, status, previous_date_time
+        )
+    
+    async def test_events_add_move_and_drop_the_reminder(self):
+        """Test that created, rescheduled and cancelled events update the scheduler."""
+        # Execute and assert
+        self.event_bus.publish(self._create_event(AppointmentEventType.CREATED, self.date_time))
+        await self.event_bus.drain()
+        self.assertEqual(self.scheduler.next_reminder_time(), self.date_time - timedelta(hours=24))
+        
+        moved = self.date_time + timedelta(days=1)
+        self.event_bus.publish(self._create_event(AppointmentEventType.RESCHEDULED, moved,
+                                                  previous_date_time=self.date_time))
+        await self.event_bus.drain()
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertEqual(self.scheduler.next_reminder_time(), moved - timedelta(hours=24))
+        
+        self.event_bus.publish(self._create_event(AppointmentEventType.CANCELLED, moved,
+                                                  AppointmentStatus.CANCELLED))
+        await self.event_bus.drain()
+        self.assertEqual(len(self.scheduler), 0)
+    
+    async def test_events_from_service_threads_run_on_the_loop(self):
+        """Test that events published on another thread update the scheduler on the bound loop."""
+        # Setup
+        self.event_bus.bind_loop(asyncio.get_running_loop())
+        event = self._create_event(AppointmentEventType.CREATED, self.date_time)
+        
+        # Execute
+        await asyncio.to_thread(self.event_bus.publish, event)
+        # Let the loop start the subscriber handed over by the thread
+        await asyncio.sleep(0)
+        await self.event_bus.drain()
+        
+        # Assert
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertEqual(len(self.event_bus.errors), 0)
+    
+    def test_load_schedules_upcoming_appointments(self):
+        """Test that loading stored appointments skips closed and started ones."""
+        # Setup
+        now = datetime.now()
+        appointments = []
+        for i, (hours, status) in enumerate([(48, AppointmentStatus.SCHEDULED),
+                                             (72, AppointmentStatus.CANCELLED),
+                                             (-1, AppointmentStatus.SCHEDULED)]):
+            appointment = MagicMock(spec=Appointment)
+            appointment.appointment_id = f"appointment-{i}"
+            appointment.patient_id = f"patient-{i}"
+            appointment.date_time = now + timedelta(hours=hours)
+            appointment.status = status
+            appointments.append(appointment)
+        
+        # Execute
+        scheduled = self.subscriber.load(appointments, now)
+        
+        # Assert
+        self.assertEqual(scheduled, 1)
+        self.assertEqual([appointment_id for appointment_id, _, _ in self.scheduler.pop_due(now + timedelta(hours=30))],
+                         ["appointment-0"])
+
+if __name__ == '__main__':
+    unittest.main()